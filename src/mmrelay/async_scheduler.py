@@ -0,0 +1,782 @@
+"""
+Asyncio-native scheduler for plugin background jobs.
+
+Jobs are kept in a hierarchical timer wheel and run as tasks on the relay's
+event loop: coroutine jobs are awaited directly and plain functions run in
+the default executor, so one slow job never delays the others. Each job can
+add random jitter to its start time, bound its run time with a timeout and
+choose what happens to runs that were missed while the loop was busy or the
+host was suspended.
+"""
+
+import asyncio
+import functools
+import inspect
+import itertools
+import math
+import random
+import re
+import threading
+import time
+from collections.abc import Callable, Hashable
+from typing import Any, cast
+
+from mmrelay.constants.plugins import (
+    SCHEDULE_MISSED_RUNS_CATCH_UP,
+    SCHEDULE_MISSED_RUNS_POLICIES,
+    SCHEDULE_MISSED_RUNS_RUN_ONCE,
+    SCHEDULE_MISSED_RUNS_SKIP,
+    SCHEDULER_MAX_CATCH_UP_RUNS,
+    SCHEDULER_SHUTDOWN_TIMEOUT_SECONDS,
+    SCHEDULER_TICK_SECONDS,
+    SCHEDULER_WHEEL_LEVELS,
+    SCHEDULER_WHEEL_SLOTS,
+)
+from mmrelay.log_utils import get_logger
+
+__all__ = [
+    "AsyncScheduler",
+    "JobBuilder",
+    "ScheduledJob",
+    "TimerWheel",
+]
+
+logger = get_logger(name="Scheduler")
+
+# Pseudo-levels for entries outside the wheel proper.
+_EXPIRED_LEVEL = -2
+_OVERFLOW_LEVEL = -1
+
+# Seconds per schedule unit, as named by the ``schedule`` library.
+_UNIT_SECONDS: dict[str, int] = {"seconds": 1, "minutes": 60, "hours": 3600}
+
+_HOURLY_AT_PATTERN = re.compile(r"(?:(\d{2}):(\d{2})|:(\d{2}))")
+_MINUTELY_AT_PATTERN = re.compile(r":(\d{2})")
+
+
+class TimerWheel:
+    """
+    Hierarchical timing wheel over integer ticks.
+
+    An entry is filed on the level of the most significant base-``slots``
+    digit in which its deadline differs from the current tick, in the slot
+    named by that digit. Entries on a lower level always expire before those
+    on a higher one, and moving the wheel forward only re-files the one slot
+    per level whose digit the current tick has just reached, so adding,
+    removing and expiring entries do not depend on how many are scheduled.
+    Deadlines beyond the top level wait in an overflow bucket.
+    """
+
+    def __init__(
+        self,
+        slots: int = SCHEDULER_WHEEL_SLOTS,
+        levels: int = SCHEDULER_WHEEL_LEVELS,
+        start_tick: int = 0,
+    ) -> None:
+        if slots < 2 or levels < 1:
+            raise ValueError("A timer wheel needs at least 2 slots and 1 level")
+        self._slots = slots
+        self._levels = levels
+        self._wheel: list[list[dict[Hashable, int]]] = [
+            [{} for _ in range(slots)] for _ in range(levels)
+        ]
+        self._overflow: dict[Hashable, int] = {}
+        self._expired: dict[Hashable, int] = {}
+        self._where: dict[Hashable, tuple[int, int]] = {}
+        self.current_tick = start_tick
+
+    def __len__(self) -> int:
+        return len(self._where)
+
+    def __contains__(self, key: object) -> bool:
+        return key in self._where
+
+    def _digit(self, tick: int, level: int) -> int:
+        return (tick // self._slots**level) % self._slots
+
+    def _place(self, key: Hashable, deadline: int) -> None:
+        if deadline < self.current_tick:
+            self._expired[key] = deadline
+            self._where[key] = (_EXPIRED_LEVEL, 0)
+            return
+        level = 0
+        deadline_prefix = deadline // self._slots
+        current_prefix = self.current_tick // self._slots
+        while deadline_prefix != current_prefix:
+            level += 1
+            deadline_prefix //= self._slots
+            current_prefix //= self._slots
+        if level >= self._levels:
+            self._overflow[key] = deadline
+            self._where[key] = (_OVERFLOW_LEVEL, 0)
+            return
+        slot = self._digit(deadline, level)
+        self._wheel[level][slot][key] = deadline
+        self._where[key] = (level, slot)
+
+    def add(self, key: Hashable, deadline: int) -> None:
+        """
+        Schedule `key` to expire at tick `deadline`, replacing any earlier deadline for it.
+
+        Parameters:
+            key (Hashable): Identifier of the entry.
+            deadline (int): Tick at which the entry expires; past ticks expire on the next advance.
+        """
+        self.remove(key)
+        self._place(key, deadline)
+
+    def remove(self, key: Hashable) -> bool:
+        """
+        Remove an entry.
+
+        Returns:
+            bool: `True` if the entry was scheduled, `False` otherwise.
+        """
+        location = self._where.pop(key, None)
+        if location is None:
+            return False
+        level, slot = location
+        if level == _EXPIRED_LEVEL:
+            del self._expired[key]
+        elif level == _OVERFLOW_LEVEL:
+            del self._overflow[key]
+        else:
+            del self._wheel[level][slot][key]
+        return True
+
+    def clear(self) -> None:
+        """Remove all entries."""
+        for level in self._wheel:
+            for slot in level:
+                slot.clear()
+        self._overflow.clear()
+        self._expired.clear()
+        self._where.clear()
+
+    def next_tick(self) -> int | None:
+        """
+        Return the earliest deadline in the wheel.
+
+        Returns:
+            int | None: The earliest deadline tick, or None when the wheel is empty.
+        """
+        if self._expired:
+            return self.current_tick
+        for level in range(self._levels):
+            slots = self._wheel[level]
+            current_digit = self._digit(self.current_tick, level)
+            # Entries on level 0 may expire at the current tick; on higher
+            # levels their digit is always past the current one.
+            first = current_digit if level == 0 else current_digit + 1
+            for digit in range(first, self._slots):
+                slot = slots[digit]
+                if slot:
+                    if level == 0:
+                        return self.current_tick - current_digit + digit
+                    return min(slot.values())
+        if self._overflow:
+            return min(self._overflow.values())
+        return None
+
+    def _move_to(self, tick: int) -> None:
+        # Callers never move past the earliest deadline, so only the slot each
+        # level's digit has just reached can hold entries that must move down.
+        self.current_tick = tick
+        if self._overflow:
+            overflow = list(self._overflow.items())
+            self._overflow.clear()
+            for key, deadline in overflow:
+                del self._where[key]
+                self._place(key, deadline)
+        for level in range(self._levels - 1, 0, -1):
+            slot = self._wheel[level][self._digit(tick, level)]
+            if slot:
+                entries = list(slot.items())
+                slot.clear()
+                for key, deadline in entries:
+                    del self._where[key]
+                    self._place(key, deadline)
+
+    def advance(self, tick: int) -> list[Hashable]:
+        """
+        Move the wheel forward to `tick` and collect the entries that expired.
+
+        Parameters:
+            tick (int): The new current tick; earlier ticks leave the wheel where it is.
+
+        Returns:
+            list[Hashable]: Keys of expired entries in deadline order; they are removed from the wheel.
+        """
+        due: list[Hashable] = []
+        if self._expired:
+            due.extend(sorted(self._expired, key=self._expired.__getitem__))
+            for key in due:
+                del self._where[key]
+            self._expired.clear()
+        while True:
+            next_tick = self.next_tick()
+            if next_tick is None or next_tick > tick:
+                if tick > self.current_tick:
+                    self._move_to(tick)
+                return due
+            self._move_to(next_tick)
+            slot = self._wheel[0][self._digit(next_tick, 0)]
+            due.extend(slot)
+            for key in slot:
+                del self._where[key]
+            slot.clear()
+
+
+class ScheduledJob:
+    """
+    A recurring job registered with an `AsyncScheduler`.
+
+    ``due`` is the job's position on its interval grid and ``next_run`` the
+    time it actually fires, which adds jitter; both use the scheduler's clock.
+    """
+
+    def __init__(
+        self,
+        scheduler: "AsyncScheduler",
+        job_id: int,
+        func: Callable[[], Any],
+        interval: float,
+        *,
+        tag: str | None,
+        due: float,
+        jitter: float,
+        missed_runs: str,
+        timeout: float | None,
+    ) -> None:
+        self.id = job_id
+        self.func = func
+        self.interval = interval
+        self.tag = tag
+        self.due = due
+        self.next_run = due
+        self.jitter = jitter
+        self.missed_runs = missed_runs
+        self.timeout = timeout
+        self.runs = 0
+        self.skipped_runs = 0
+        self.cancelled = False
+        self.task: asyncio.Task[None] | None = None
+        self._scheduler = scheduler
+
+    @property
+    def name(self) -> str:
+        """Return a label for log messages."""
+        return self.tag or getattr(self.func, "__qualname__", None) or f"job-{self.id}"
+
+    def cancel(self) -> None:
+        """Unschedule the job and cancel its run if one is in progress."""
+        self._scheduler.cancel(self)
+
+    def __repr__(self) -> str:
+        return (
+            f"ScheduledJob(id={self.id}, tag={self.tag!r}, "
+            f"interval={self.interval}, next_run={self.next_run:.3f})"
+        )
+
+
+class AsyncScheduler:
+    """
+    Runs recurring jobs on an asyncio event loop.
+
+    Jobs may be added and cancelled from any thread; they run on the loop
+    passed to `start`. A job whose previous run is still in progress when it
+    becomes due skips that run rather than overlapping with itself.
+
+    Missed-run policies apply when a job fires at least one full interval
+    late: ``"skip"`` drops the late run, ``"run_once"`` runs it once, and
+    ``"catch_up"`` replays every missed run (up to
+    `SCHEDULER_MAX_CATCH_UP_RUNS`) back to back. In every case the job stays
+    on its original interval grid.
+    """
+
+    def __init__(
+        self,
+        *,
+        clock: Callable[[], float] = time.monotonic,
+        tick_seconds: float = SCHEDULER_TICK_SECONDS,
+        rng: random.Random | None = None,
+    ) -> None:
+        if tick_seconds <= 0:
+            raise ValueError("tick_seconds must be positive")
+        self.clock = clock
+        self._tick_seconds = tick_seconds
+        self._origin = clock()
+        self._rng = rng or random.Random()
+        self._wheel = TimerWheel()
+        self._jobs: dict[int, ScheduledJob] = {}
+        self._job_ids = itertools.count(1)
+        self._lock = threading.RLock()
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._driver: asyncio.Task[None] | None = None
+        self._wakeup: asyncio.Event | None = None
+        self._tasks: set[asyncio.Task[None]] = set()
+        self._shutdown_task: asyncio.Task[None] | None = None
+
+    @property
+    def running(self) -> bool:
+        """Return whether the scheduler's driver task is active."""
+        return self._driver is not None and not self._driver.done()
+
+    def jobs(self, tag: str | None = None) -> list[ScheduledJob]:
+        """
+        Return the scheduled jobs, optionally only those with a given tag.
+
+        Parameters:
+            tag (str | None): Only return jobs registered with this tag.
+
+        Returns:
+            list[ScheduledJob]: Jobs ordered by registration.
+        """
+        with self._lock:
+            return [job for job in self._jobs.values() if tag is None or job.tag == tag]
+
+    def _deadline_tick(self, when: float) -> int:
+        # Round up so that a job never fires before its time.
+        return math.ceil((when - self._origin) / self._tick_seconds)
+
+    def _arm(self, job: ScheduledJob) -> None:
+        offset = self._rng.uniform(0, job.jitter) if job.jitter else 0.0
+        job.next_run = job.due + offset
+        self._wheel.add(job.id, self._deadline_tick(job.next_run))
+
+    def _in_loop_thread(self) -> bool:
+        try:
+            return asyncio.get_running_loop() is self._loop
+        except RuntimeError:
+            return False
+
+    def _wake(self) -> None:
+        loop, wakeup = self._loop, self._wakeup
+        if loop is None or wakeup is None or loop.is_closed():
+            return
+        if self._in_loop_thread():
+            wakeup.set()
+            return
+        try:
+            loop.call_soon_threadsafe(wakeup.set)
+        except RuntimeError:
+            # The loop closed between the check and the call.
+            pass
+
+    def schedule(
+        self,
+        func: Callable[[], Any],
+        interval: float,
+        *,
+        tag: str | None = None,
+        first_run: float | None = None,
+        jitter: float = 0.0,
+        missed_runs: str = SCHEDULE_MISSED_RUNS_RUN_ONCE,
+        timeout: float | None = None,
+    ) -> ScheduledJob:
+        """
+        Register a recurring job.
+
+        Parameters:
+            func (Callable[[], Any]): Coroutine function or plain callable to run; plain callables run in the default executor.
+            interval (float): Seconds between runs.
+            tag (str | None): Label used to cancel related jobs together, e.g. a plugin name.
+            first_run (float | None): Clock time of the first run; defaults to one interval from now.
+            jitter (float): Each run starts up to this many seconds after its slot on the interval grid.
+            missed_runs (str): One of ``"skip"``, ``"run_once"`` or ``"catch_up"``.
+            timeout (float | None): Cancel a run that takes longer than this many seconds. A plain callable keeps running in its worker thread; the scheduler stops waiting for it.
+
+        Returns:
+            ScheduledJob: Handle of the registered job.
+
+        Raises:
+            ValueError: If an argument is out of range.
+        """
+        if isinstance(interval, bool) or not interval > 0:
+            raise ValueError(f"interval must be a positive number, got {interval!r}")
+        if isinstance(jitter, bool) or not jitter >= 0:
+            raise ValueError(f"jitter must be a non-negative number, got {jitter!r}")
+        if timeout is not None and (isinstance(timeout, bool) or not timeout > 0):
+            raise ValueError(f"timeout must be a positive number, got {timeout!r}")
+        if missed_runs not in SCHEDULE_MISSED_RUNS_POLICIES:
+            raise ValueError(
+                f"missed_runs must be one of {sorted(SCHEDULE_MISSED_RUNS_POLICIES)}, got {missed_runs!r}"
+            )
+        with self._lock:
+            due = self.clock() + interval if first_run is None else first_run
+            job = ScheduledJob(
+                self,
+                next(self._job_ids),
+                func,
+                float(interval),
+                tag=tag,
+                due=due,
+                jitter=float(jitter),
+                missed_runs=missed_runs,
+                timeout=None if timeout is None else float(timeout),
+            )
+            self._jobs[job.id] = job
+            self._arm(job)
+        self._wake()
+        return job
+
+    def cancel(self, job: ScheduledJob) -> bool:
+        """
+        Unschedule a job and cancel its run if one is in progress.
+
+        Returns:
+            bool: `True` if the job was scheduled, `False` otherwise.
+        """
+        with self._lock:
+            known = self._jobs.pop(job.id, None) is not None
+            self._wheel.remove(job.id)
+            job.cancelled = True
+            task = job.task
+        if task is not None and not task.done():
+            if self._in_loop_thread():
+                task.cancel()
+            elif self._loop is not None and not self._loop.is_closed():
+                try:
+                    self._loop.call_soon_threadsafe(task.cancel)
+                except RuntimeError:
+                    pass
+        return known
+
+    def cancel_tag(self, tag: str) -> int:
+        """
+        Cancel every job registered with `tag`.
+
+        Returns:
+            int: Number of jobs cancelled.
+        """
+        return sum(self.cancel(job) for job in self.jobs(tag))
+
+    def next_run_delay(self) -> float | None:
+        """
+        Return the seconds until the next job is due.
+
+        Returns:
+            float | None: Non-negative delay, or None when no job is scheduled.
+        """
+        with self._lock:
+            tick = self._wheel.next_tick()
+        if tick is None:
+            return None
+        return max(0.0, self._origin + tick * self._tick_seconds - self.clock())
+
+    def _runs_for(self, job: ScheduledJob, now: float) -> int:
+        lateness = now - job.due
+        missed = int(lateness // job.interval) if lateness >= job.interval else 0
+        job.due += (missed + 1) * job.interval
+        self._arm(job)
+
+        if job.task is not None and not job.task.done():
+            job.skipped_runs += missed + 1
+            logger.debug("Scheduled job %s is still running; skipping run", job.name)
+            return 0
+        if missed and job.missed_runs == SCHEDULE_MISSED_RUNS_SKIP:
+            job.skipped_runs += missed + 1
+            logger.debug(
+                "Scheduled job %s missed %d run(s); skipping to the next slot",
+                job.name,
+                missed + 1,
+            )
+            return 0
+        if missed and job.missed_runs == SCHEDULE_MISSED_RUNS_CATCH_UP:
+            runs = min(missed + 1, SCHEDULER_MAX_CATCH_UP_RUNS)
+            job.skipped_runs += missed + 1 - runs
+            return runs
+        return 1
+
+    def run_due(self) -> int:
+        """
+        Start the jobs that are due; must be called on the scheduler's loop.
+
+        The driver task calls this whenever the next job is due. Tests with a
+        fake clock call it directly after moving the clock.
+
+        Returns:
+            int: Number of jobs started.
+        """
+        now = self.clock()
+        with self._lock:
+            # The epsilon keeps float rounding from holding a due tick back.
+            now_tick = math.floor((now - self._origin) / self._tick_seconds + 1e-9)
+            due = []
+            for key in self._wheel.advance(now_tick):
+                job = self._jobs.get(cast(int, key))
+                if job is not None:
+                    due.append((job, self._runs_for(job, now)))
+        started = 0
+        for job, runs in due:
+            if runs:
+                task = asyncio.get_running_loop().create_task(
+                    self._run(job, runs), name=f"scheduled-job-{job.name}"
+                )
+                job.task = task
+                self._tasks.add(task)
+                task.add_done_callback(self._tasks.discard)
+                started += 1
+        return started
+
+    async def _call(self, job: ScheduledJob) -> None:
+        if inspect.iscoroutinefunction(job.func):
+            awaitable = job.func()
+        else:
+            awaitable = asyncio.to_thread(job.func)
+        if job.timeout is None:
+            result = await awaitable
+        else:
+            result = await asyncio.wait_for(awaitable, job.timeout)
+        if inspect.isawaitable(result):
+            # A plain callable may still hand back a coroutine.
+            if job.timeout is None:
+                await result
+            else:
+                await asyncio.wait_for(result, job.timeout)
+
+    async def _run(self, job: ScheduledJob, runs: int) -> None:
+        for _ in range(runs):
+            if job.cancelled:
+                return
+            try:
+                await self._call(job)
+            except asyncio.TimeoutError:
+                logger.warning(
+                    "Scheduled job %s timed out after %.1fs", job.name, job.timeout
+                )
+            except Exception:
+                logger.exception("Scheduled job %s failed", job.name)
+            job.runs += 1
+
+    async def _drive(self) -> None:
+        wakeup = self._wakeup
+        if wakeup is None:
+            return
+        logger.debug("Plugin scheduler started")
+        while True:
+            wakeup.clear()
+            self.run_due()
+            delay = self.next_run_delay()
+            if delay is None:
+                await wakeup.wait()
+            elif delay > 0:
+                try:
+                    await asyncio.wait_for(wakeup.wait(), delay)
+                except asyncio.TimeoutError:
+                    pass
+            else:
+                await asyncio.sleep(0)
+
+    def _start_driver(self) -> None:
+        if self.running or self._loop is None:
+            return
+        self._wakeup = asyncio.Event()
+        self._driver = self._loop.create_task(self._drive(), name="plugin-scheduler")
+
+    def start(self, loop: asyncio.AbstractEventLoop | None = None) -> None:
+        """
+        Start running jobs on `loop`; may be called from any thread.
+
+        Parameters:
+            loop (asyncio.AbstractEventLoop | None): Loop to run on; defaults to the running loop.
+        """
+        if self.running:
+            return
+        self._loop = loop or asyncio.get_running_loop()
+        if self._in_loop_thread():
+            self._start_driver()
+        else:
+            self._loop.call_soon_threadsafe(self._start_driver)
+
+    async def shutdown(self) -> None:
+        """Cancel all jobs, the runs in progress and the driver, and wait for them to finish."""
+        with self._lock:
+            for job in self._jobs.values():
+                job.cancelled = True
+            self._jobs.clear()
+            self._wheel.clear()
+        driver, self._driver = self._driver, None
+        pending = [task for task in self._tasks if not task.done()]
+        if driver is not None:
+            pending.append(driver)
+        for task in pending:
+            task.cancel()
+        if pending:
+            await asyncio.gather(*pending, return_exceptions=True)
+        self._loop = None
+        logger.debug("Plugin scheduler stopped")
+
+    def close(self, timeout: float = SCHEDULER_SHUTDOWN_TIMEOUT_SECONDS) -> None:
+        """
+        Shut the scheduler down from any thread.
+
+        From another thread this waits up to `timeout` seconds for running
+        jobs to be cancelled; on the loop's own thread it cannot wait, so the
+        shutdown is only started and its task kept until it finishes.
+
+        Parameters:
+            timeout (float): Seconds to wait for the shutdown to complete.
+        """
+        loop = self._loop
+        if loop is None or loop.is_closed() or not loop.is_running():
+            with self._lock:
+                for job in self._jobs.values():
+                    job.cancelled = True
+                self._jobs.clear()
+                self._wheel.clear()
+            self._driver = None
+            self._loop = None
+            return
+        if self._in_loop_thread():
+            if self._shutdown_task is None or self._shutdown_task.done():
+                self._shutdown_task = loop.create_task(self.shutdown())
+            return
+        future = asyncio.run_coroutine_threadsafe(self.shutdown(), loop)
+        try:
+            future.result(timeout)
+        except TimeoutError:
+            logger.warning("Plugin scheduler did not stop within %.1fs", timeout)
+
+
+def _seconds_until_at(unit: str, at_time: str, now: float | None = None) -> float:
+    """
+    Return the seconds until the next wall-clock time matching an ``at`` spec.
+
+    Hourly jobs accept ``"MM:SS"`` or ``":MM"`` and minutely jobs ``":SS"``,
+    as in the ``schedule`` library.
+
+    Raises:
+        ValueError: If the spec is malformed or the unit does not support ``at``.
+    """
+    if not isinstance(at_time, str):
+        raise ValueError(f"Invalid time format for an {unit} job: {at_time!r}")
+    now = time.time() if now is None else now
+    local = time.localtime(now)
+    fraction = now - math.floor(now)
+    if unit == "hours":
+        match = _HOURLY_AT_PATTERN.fullmatch(at_time)
+        if match is None:
+            raise ValueError(f"Invalid time format for an hourly job: {at_time!r}")
+        if match.group(3) is not None:
+            minute, second = int(match.group(3)), 0
+        else:
+            minute, second = int(match.group(1)), int(match.group(2))
+        if minute > 59 or second > 59:
+            raise ValueError(f"Invalid time format for an hourly job: {at_time!r}")
+        period = 3600
+        offset = minute * 60 + second
+        position = local.tm_min * 60 + local.tm_sec + fraction
+    elif unit == "minutes":
+        match = _MINUTELY_AT_PATTERN.fullmatch(at_time)
+        if match is None or int(match.group(1)) > 59:
+            raise ValueError(f"Invalid time format for a minutely job: {at_time!r}")
+        period = 60
+        offset = int(match.group(1))
+        position = local.tm_sec + fraction
+    else:
+        raise ValueError(f"'at' is not supported for {unit} jobs")
+    return (offset - position) % period or float(period)
+
+
+class JobBuilder:
+    """
+    Fluent job definition mirroring the ``schedule`` library's chain.
+
+    ``JobBuilder(scheduler, 2).hours.at(":15").do(func)`` runs ``func`` every
+    two hours at a quarter past, like ``schedule.every(2).hours.at(":15")``.
+    """
+
+    def __init__(
+        self, scheduler: AsyncScheduler, interval: float, *, tag: str | None = None
+    ) -> None:
+        if (
+            isinstance(interval, bool)
+            or not isinstance(interval, (int, float))
+            or not interval > 0
+        ):
+            raise ValueError(f"Invalid schedule interval: {interval!r}")
+        self._scheduler = scheduler
+        self._interval = interval
+        self._tag = tag
+        self._unit: str | None = None
+        self._at_time: str | None = None
+        self._options: dict[str, Any] = {}
+
+    def _with_unit(self, unit: str) -> "JobBuilder":
+        self._unit = unit
+        return self
+
+    @property
+    def seconds(self) -> "JobBuilder":
+        """Measure the interval in seconds."""
+        return self._with_unit("seconds")
+
+    @property
+    def minutes(self) -> "JobBuilder":
+        """Measure the interval in minutes."""
+        return self._with_unit("minutes")
+
+    @property
+    def hours(self) -> "JobBuilder":
+        """Measure the interval in hours."""
+        return self._with_unit("hours")
+
+    def at(self, at_time: str) -> "JobBuilder":
+        """
+        Align runs to a wall-clock offset within each minute or hour.
+
+        Raises:
+            ValueError: If the spec does not fit the unit.
+        """
+        if self._unit is None:
+            raise ValueError("Set the time unit before calling at()")
+        _seconds_until_at(self._unit, at_time)
+        self._at_time = at_time
+        return self
+
+    def options(
+        self,
+        *,
+        jitter: float = 0.0,
+        timeout: float | None = None,
+        missed_runs: str = SCHEDULE_MISSED_RUNS_RUN_ONCE,
+    ) -> "JobBuilder":
+        """Set the jitter, timeout and missed-run policy passed to `AsyncScheduler.schedule`."""
+        self._options = {
+            "jitter": jitter,
+            "timeout": timeout,
+            "missed_runs": missed_runs,
+        }
+        return self
+
+    def do(self, func: Callable[..., Any], *args: Any, **kwargs: Any) -> ScheduledJob:
+        """
+        Register the job.
+
+        Parameters:
+            func (Callable[..., Any]): Coroutine function or plain callable to run.
+            *args: Positional arguments for `func`.
+            **kwargs: Keyword arguments for `func`.
+
+        Returns:
+            ScheduledJob: Handle of the registered job.
+
+        Raises:
+            ValueError: If no time unit was set or an option is out of range.
+        """
+        if self._unit is None:
+            raise ValueError("Set the time unit before calling do()")
+        first_run = None
+        if self._at_time is not None:
+            first_run = self._scheduler.clock() + _seconds_until_at(
+                self._unit, self._at_time
+            )
+        job_func = functools.partial(func, *args, **kwargs) if args or kwargs else func
+        return self._scheduler.schedule(
+            job_func,
+            self._interval * _UNIT_SECONDS[self._unit],
+            tag=self._tag,
+            first_run=first_run,
+            **self._options,
+        )
@@ -38,10 +38,12 @@ from mmrelay.constants.app import (
     DISK_SPACE_CRITICAL_DATABASE_GB,
     DISK_SPACE_OK_GB,
     DISK_SPACE_WARN_GB,
+    IMPORT_PROFILE_FILENAME,
     WINDOWS_PLATFORM,
 )
 from mmrelay.constants.cli import (
     FORBIDDEN_HOME_DIRECTORIES_UNIX,
+    IMPORT_PROFILE_CONSOLE_TOP_N,
     WINDOWS_FORBIDDEN_HOME_ENV_KEYS,
 )
 from mmrelay.constants.config import (
@@ -67,6 +69,7 @@ from mmrelay.constants.formats import (
     UNIX_SERIAL_PORT_PATTERN,
     WINDOWS_SERIAL_PORT_PATTERN,
 )
+from mmrelay.constants.messages import MAX_MESSAGE_FRAGMENTS
 from mmrelay.constants.network import (
     CONFIG_KEY_BLE_ADDRESS,
     CONFIG_KEY_CONNECTION_TYPE,
@@ -82,6 +85,12 @@ from mmrelay.constants.network import (
     MESHTASTIC_CHANNEL_MIN,
     MINIMUM_MESSAGE_DELAY,
 )
+from mmrelay.constants.replay import (
+    DEFAULT_REPLAY_SPEED,
+    DEFAULT_SYNTHETIC_INTERVAL_SECS,
+    DEFAULT_SYNTHETIC_NODE_COUNT,
+    DEFAULT_SYNTHETIC_PACKET_COUNT,
+)
 from mmrelay.e2ee_utils import E2EEStatus
 from mmrelay.log_utils import get_logger
 from mmrelay.paths import ensure_directories
@@ -296,6 +305,11 @@ def parse_arguments() -> argparse.Namespace:
         default=None,
     )
     parser.add_argument("--version", action="store_true", help="Show version and exit")
+    parser.add_argument(
+        "--profile-imports",
+        action="store_true",
+        help="Run the command under -X importtime and write an import-time report to the logs directory",
+    )
     # Deprecated flags (hidden from help but still functional)
     parser.add_argument(
         "--generate-config",
@@ -362,6 +376,69 @@ def parse_arguments() -> argparse.Namespace:
         help="Allow overwriting existing files at destination (backups will still be created)",
     )
 
+    # DB group
+    db_parser = subparsers.add_parser(
+        "db",
+        help="Database backup, restore, statistics and vacuum",
+        description="Back up the relay database while it is running, restore a snapshot, show its size and free space, or compact it",
+    )
+    db_subparsers = db_parser.add_subparsers(
+        dest="db_command", help="Database commands", required=True
+    )
+    db_backup_parser = db_subparsers.add_parser(
+        "backup",
+        help="Write an online backup of the database",
+        description="Copy the database with SQLite's online backup API; safe while the relay is running",
+    )
+    db_backup_parser.add_argument(
+        "--output",
+        default=None,
+        help="Backup file (default: a timestamped snapshot in the snapshot directory, pruned to database.backup.keep)",
+    )
+    db_backup_parser.add_argument(
+        "--database", default=None, help="Database to back up (default: configured)"
+    )
+    db_restore_parser = db_subparsers.add_parser(
+        "restore",
+        help="Restore the database from a snapshot",
+        description="Replace the database with a snapshot; the current database is backed up first",
+    )
+    db_restore_parser.add_argument(
+        "snapshot",
+        nargs="?",
+        default=None,
+        help="Snapshot or backup file to restore (default: the newest snapshot)",
+    )
+    db_restore_parser.add_argument(
+        "--database", default=None, help="Database to restore (default: configured)"
+    )
+    db_restore_parser.add_argument(
+        "--force",
+        action="store_true",
+        help="Restore even if MMRelay appears to be running",
+    )
+    db_stats_parser = db_subparsers.add_parser(
+        "stats",
+        help="Show database size, WAL size and free pages",
+        description="Report file, WAL and free-list sizes of the database",
+    )
+    db_stats_parser.add_argument(
+        "--database", default=None, help="Database to inspect (default: configured)"
+    )
+    db_vacuum_parser = db_subparsers.add_parser(
+        "vacuum",
+        help="Compact the database and enable incremental vacuum",
+        description="Rewrite the database with VACUUM and switch it to incremental auto-vacuum, so background maintenance can release free pages; run while the relay is stopped",
+    )
+    db_vacuum_parser.add_argument(
+        "--database", default=None, help="Database to vacuum (default: configured)"
+    )
+    db_vacuum_parser.add_argument(
+        "--force",
+        action="store_true",
+        help="Vacuum even if MMRelay appears to be running",
+    )
+
     # CONFIG group
     config_parser = subparsers.add_parser(
         "config",
@@ -483,6 +560,76 @@ def parse_arguments() -> argparse.Namespace:
         help="Allow overwriting existing files at destination (backups will still be created)",
     )
 
+    # REPLAY group
+    replay_parser = subparsers.add_parser(
+        "replay",
+        help="Record, generate, and replay mesh traffic for load testing",
+        description="Capture live packets or synthesize traffic, then replay it through the relay pipeline against a fake radio and stub Matrix homeserver",
+    )
+    replay_subparsers = replay_parser.add_subparsers(
+        dest="replay_command", help="Replay commands", required=True
+    )
+    replay_record_parser = replay_subparsers.add_parser(
+        "record",
+        help="Record sanitized packets from the configured radio",
+        description="Connect to the configured Meshtastic device and record received packets to a replay file",
+    )
+    replay_record_parser.add_argument(
+        "--output", required=True, help="Recording file (.gz to compress)"
+    )
+    replay_record_parser.add_argument(
+        "--duration",
+        type=float,
+        default=None,
+        help="Stop after this many seconds (default: until interrupted)",
+    )
+    replay_generate_parser = replay_subparsers.add_parser(
+        "generate",
+        help="Generate a synthetic traffic recording",
+        description="Generate a mix of text, telemetry, position, nodeinfo, and encrypted packets across virtual nodes",
+    )
+    replay_generate_parser.add_argument(
+        "--output", required=True, help="Recording file (.gz to compress)"
+    )
+    replay_generate_parser.add_argument(
+        "--nodes",
+        type=int,
+        default=DEFAULT_SYNTHETIC_NODE_COUNT,
+        help="Number of virtual nodes",
+    )
+    replay_generate_parser.add_argument(
+        "--count",
+        type=int,
+        default=DEFAULT_SYNTHETIC_PACKET_COUNT,
+        help="Number of packets to generate",
+    )
+    replay_generate_parser.add_argument(
+        "--interval",
+        type=float,
+        default=DEFAULT_SYNTHETIC_INTERVAL_SECS,
+        help="Mean seconds between packets",
+    )
+    replay_generate_parser.add_argument(
+        "--seed", type=int, default=None, help="Random seed for reproducible output"
+    )
+    replay_run_parser = replay_subparsers.add_parser(
+        "run",
+        help="Replay a recording through the relay pipeline",
+        description="Drive on_meshtastic_message, plugins, the message queue, and a scratch database with recorded packets",
+    )
+    replay_run_parser.add_argument("input", help="Recording file to replay")
+    replay_run_parser.add_argument(
+        "--speed",
+        type=float,
+        default=DEFAULT_REPLAY_SPEED,
+        help="Playback speed multiplier (0 = as fast as possible)",
+    )
+    replay_run_parser.add_argument(
+        "--database",
+        default=None,
+        help="Database path for the replay (default: a temporary file)",
+    )
+
     # Use parse_known_args to handle unknown arguments gracefully (e.g., pytest args)
     args, unknown = parser.parse_known_args()
     # If there are unknown arguments and we're not in a test invocation, warn about them
@@ -1595,10 +1742,22 @@ def check_config(args: argparse.Namespace | None = None) -> bool:
                         "type": (int, float),
                         "description": "Seconds between periodic long/short name-cache refreshes from NodeDB (set to 0 to disable periodic refresh)",
                     },
+                    "nodedb_snapshot_interval": {
+                        "type": (int, float),
+                        "description": "Seconds between NodeDB snapshot saves used to warm-start node lookups (set to 0 to disable)",
+                    },
+                    "nodedb_reconcile_interval": {
+                        "type": (int, float),
+                        "description": "Seconds between full NodeDB reconciles of the name-cache tables (set to 0 to reconcile on every refresh)",
+                    },
                     "meshnet_name": {
                         "type": str,
                         "description": "Name displayed for your meshnet in Matrix messages",
                     },
+                    "max_message_fragments": {
+                        "type": int,
+                        "description": "Packets a long Matrix message may be split into on the mesh (1 truncates to one packet)",
+                    },
                 }
 
                 warnings: list[str] = []
@@ -1609,6 +1768,9 @@ def check_config(args: argparse.Namespace | None = None) -> bool:
                         if option in {
                             "message_delay",
                             "nodedb_refresh_interval",
+                            "nodedb_reconcile_interval",
+                            "nodedb_snapshot_interval",
+                            "max_message_fragments",
                         } and isinstance(value, bool):
                             print(
                                 f"Error: '{option}' must be a number, got boolean: {value}",
@@ -1631,9 +1793,12 @@ def check_config(args: argparse.Namespace | None = None) -> bool:
                             )
                             return False
 
-                        if option in {"message_delay", "nodedb_refresh_interval"} and (
-                            not math.isfinite(value)
-                        ):
+                        if option in {
+                            "message_delay",
+                            "nodedb_refresh_interval",
+                            "nodedb_reconcile_interval",
+                            "nodedb_snapshot_interval",
+                        } and (not math.isfinite(value)):
                             print(
                                 f"Error: '{option}' must be a finite number, got: {value}",
                                 file=sys.stderr,
@@ -1654,6 +1819,30 @@ def check_config(args: argparse.Namespace | None = None) -> bool:
                                 file=sys.stderr,
                             )
                             return False
+                        if option == "nodedb_snapshot_interval" and value < 0:
+                            print(
+                                "Error: 'nodedb_snapshot_interval' must be >= 0 seconds (use 0 to disable), "
+                                f"got: {value}",
+                                file=sys.stderr,
+                            )
+                            return False
+                        if (
+                            option == "max_message_fragments"
+                            and not 1 <= value <= MAX_MESSAGE_FRAGMENTS
+                        ):
+                            print(
+                                f"Error: 'max_message_fragments' must be between 1 and {MAX_MESSAGE_FRAGMENTS}, "
+                                f"got: {value}",
+                                file=sys.stderr,
+                            )
+                            return False
+                        if option == "nodedb_reconcile_interval" and value < 0:
+                            print(
+                                "Error: 'nodedb_reconcile_interval' must be >= 0 seconds, "
+                                f"got: {value}",
+                                file=sys.stderr,
+                            )
+                            return False
                     else:
                         warnings.append(f"  - {option}: {config_info['description']}")
 
@@ -1728,6 +1917,9 @@ def main() -> int:
         # to write logs or temporary files.
         ensure_directories(create_missing=True)
 
+        if getattr(args, "profile_imports", False) is True:
+            return handle_profile_imports(args)
+
         args_dict = vars(args)
         has_modern_command = bool(getattr(args, "command", None))
         has_legacy_flag = any(
@@ -1785,7 +1977,7 @@ def handle_subcommand(args: argparse.Namespace) -> int:
     """
     Dispatch a top-level CLI subcommand to its handler.
 
-    Supported commands: config, auth, service, paths, doctor, verify-migration, migrate.
+    Supported commands: config, auth, service, paths, doctor, verify-migration, migrate, replay, db.
 
     Returns:
         Exit code returned by the invoked handler; `1` if the command is unknown.
@@ -1804,6 +1996,10 @@ def handle_subcommand(args: argparse.Namespace) -> int:
         return handle_verify_migration_command(args)
     elif args.command == "migrate":
         return handle_migrate_command(args)
+    elif args.command == "replay":
+        return handle_replay_command(args)
+    elif args.command == "db":
+        return handle_db_command(args)
     else:
         print(f"Unknown command: {args.command}")
         return 1
@@ -1968,6 +2164,56 @@ def _print_path_summary(paths_info: dict[str, Any]) -> None:
     print(f"\n⚙️  CLI Override: {paths_info.get('cli_override', 'None')}")
 
 
+def handle_profile_imports(args: argparse.Namespace) -> int:
+    """
+    Run the requested command in a child interpreter with ``-X importtime`` and report its import times.
+
+    A subcommand or legacy flag is re-run as ``python -m mmrelay`` with the same arguments minus ``--profile-imports``. Without a command only the relay's startup imports (``mmrelay.main``) are profiled, so no connections are opened. The full report is written to the logs directory and the slowest modules are printed.
+
+    Parameters:
+        args (argparse.Namespace): Parsed CLI namespace.
+
+    Returns:
+        int: The child's exit code, or 1 if the report could not be written.
+    """
+    from mmrelay.import_profile import format_import_report, run_with_importtime
+    from mmrelay.paths import get_logs_dir
+
+    forwarded = [arg for arg in sys.argv[1:] if arg != "--profile-imports"]
+    args_dict = vars(args)
+    has_command = bool(getattr(args, "command", None)) or any(
+        args_dict.get(flag)
+        for flag in (
+            "version",
+            "install_service",
+            "generate_config",
+            "check_config",
+            "auth",
+        )
+    )
+    if has_command:
+        python_args = ["-m", "mmrelay", *forwarded]
+        title = f"Import profile: mmrelay {' '.join(forwarded)}"
+    else:
+        python_args = ["-c", "import mmrelay.main"]
+        title = "Import profile: relay startup (import mmrelay.main)"
+
+    returncode, timings, other_lines = run_with_importtime(python_args)
+    for line in other_lines:
+        print(line, file=sys.stderr)
+
+    report_path = get_logs_dir() / IMPORT_PROFILE_FILENAME
+    try:
+        report_path.write_text(format_import_report(timings, title), encoding="utf-8")
+    except OSError as e:
+        print(f"❌ Could not write import profile to {report_path}: {e}")
+        return 1
+
+    print(format_import_report(timings, title, limit=IMPORT_PROFILE_CONSOLE_TOP_N))
+    print(f"📄 Full import profile written to {report_path}")
+    return returncode
+
+
 def handle_paths_command(_args: argparse.Namespace) -> int:
     """
     Display all path configuration and diagnostics.
@@ -2616,6 +2862,327 @@ def handle_migrate_command(args: argparse.Namespace) -> int:
         return 1
 
 
+def _print_replay_stats(stats: Any) -> None:
+    """Print a replay run's counters in a human-readable summary."""
+    summary = stats.as_dict()
+    print("Replay results")
+    print("==============")
+    print(
+        f"Packets replayed: {summary['packets_dispatched']}/{summary['packets_total']}"
+    )
+    print(f"Elapsed: {summary['elapsed_secs']}s")
+    print(f"Throughput: {summary['packets_per_second']} packets/s")
+    print(f"Matrix sends: {summary['matrix_sends']}")
+    print(f"Mesh sends: {summary['mesh_sends']}")
+    print(f"Handler errors: {summary['handler_errors']}")
+    print(f"Queue drops: {summary['queue_dropped']}")
+    print(f"Drained cleanly: {'yes' if summary['drained'] else 'no'}")
+    if summary["routing"]:
+        routing = ", ".join(
+            f"{action}={count}" for action, count in sorted(summary["routing"].items())
+        )
+        print(f"Routing: {routing}")
+    if summary["portnums"]:
+        portnums = ", ".join(
+            f"{name}={count}" for name, count in sorted(summary["portnums"].items())
+        )
+        print(f"Portnums: {portnums}")
+
+
+def _handle_replay_record(args: argparse.Namespace) -> int:
+    """Connect to the configured radio and record received packets until stopped."""
+    import time
+
+    from mmrelay.config import load_config
+    from mmrelay.meshtastic_utils import connect_meshtastic
+    from mmrelay.replay import PacketRecorder
+
+    config = load_config(args=args)
+    if not config:
+        print("❌ No configuration found; cannot connect to a Meshtastic device.")
+        return 1
+
+    recorder = PacketRecorder(args.output)
+    recorder.start()
+    client = None
+    try:
+        client = connect_meshtastic(passed_config=config)
+        if client is None:
+            print("❌ Could not connect to the configured Meshtastic device.")
+            return 1
+        print(f"Recording packets to {args.output} (Ctrl+C to stop)...")
+        deadline = (
+            time.monotonic() + args.duration if args.duration is not None else None
+        )
+        try:
+            while deadline is None or time.monotonic() < deadline:
+                time.sleep(0.5)
+        except KeyboardInterrupt:
+            pass
+    finally:
+        recorder.stop()
+        if client is not None:
+            with contextlib.suppress(Exception):
+                client.close()
+    print(f"✅ Recorded {recorder.packet_count} packets to {args.output}")
+    return 0
+
+
+def _handle_replay_generate(args: argparse.Namespace) -> int:
+    """Write a synthetic traffic recording."""
+    from mmrelay.replay import generate_synthetic_traffic, write_recording
+
+    try:
+        packets = generate_synthetic_traffic(
+            node_count=args.nodes,
+            packet_count=args.count,
+            interval_secs=args.interval,
+            seed=args.seed,
+        )
+    except ValueError as e:
+        print(f"❌ {e}")
+        return 1
+    written = write_recording(args.output, packets)
+    print(
+        f"✅ Wrote {written} synthetic packets from {args.nodes} nodes to {args.output}"
+    )
+    return 0
+
+
+def _handle_replay_run(args: argparse.Namespace) -> int:
+    """Replay a recording through the relay pipeline and print the counters."""
+    import asyncio
+    import tempfile
+
+    from mmrelay.config import load_config
+    from mmrelay.replay import (
+        ReplayFormatError,
+        build_replay_config,
+        load_recording,
+        run_replay,
+    )
+
+    try:
+        packets = load_recording(args.input)
+    except (OSError, ReplayFormatError) as e:
+        print(f"❌ Cannot read recording: {e}")
+        return 1
+
+    with tempfile.TemporaryDirectory(prefix="mmrelay-replay-") as scratch_dir:
+        database_path = args.database or os.path.join(scratch_dir, "replay.sqlite")
+        config = build_replay_config(
+            load_config(args=args) if args.config else {},
+            database_path=database_path,
+        )
+        print(
+            f"Replaying {len(packets)} packets from {args.input} at "
+            f"{'max' if args.speed == 0 else f'{args.speed}x'} speed..."
+        )
+        try:
+            stats = asyncio.run(run_replay(packets, config=config, speed=args.speed))
+        except ValueError as e:
+            print(f"❌ {e}")
+            return 1
+    _print_replay_stats(stats)
+    return 0 if stats.handler_errors == 0 else 1
+
+
+def handle_replay_command(args: argparse.Namespace) -> int:
+    """
+    Dispatch the "replay" command group to the selected subcommand handler.
+
+    Supported subcommands:
+        - "record": capture live packets from the configured radio to a file.
+        - "generate": write a synthetic traffic recording.
+        - "run": replay a recording against a fake radio and stub Matrix homeserver.
+
+    Parameters:
+        args (argparse.Namespace): CLI namespace containing `replay_command` and its options.
+
+    Returns:
+        int: Exit code (0 on success, 1 on failure or for unknown subcommands).
+    """
+    if args.replay_command == "record":
+        return _handle_replay_record(args)
+    elif args.replay_command == "generate":
+        return _handle_replay_generate(args)
+    elif args.replay_command == "run":
+        return _handle_replay_run(args)
+    else:
+        print(f"Unknown replay command: {args.replay_command}")
+        return 1
+
+
+def _resolve_db_command_paths(args: argparse.Namespace) -> tuple[str, str, int]:
+    """
+    Return the database path, snapshot directory and snapshot retention for a "db" subcommand.
+
+    Uses ``--database`` when given; otherwise the configured database path.
+    """
+    from mmrelay import db_utils
+    from mmrelay.config import load_config, set_config
+    from mmrelay.db_backup import get_snapshot_dir, get_snapshot_settings
+
+    config = load_config(args=args) or {}
+    if args.database:
+        db_path = args.database
+    else:
+        set_config(db_utils, config)
+        db_path = db_utils.get_db_path()
+    settings = get_snapshot_settings(config)
+    return db_path, get_snapshot_dir(db_path, settings.directory), settings.keep
+
+
+def _handle_db_backup(args: argparse.Namespace) -> int:
+    """Write an online backup, or a retained snapshot when no output is given."""
+    import sqlite3
+
+    from mmrelay.db_backup import BackupError, backup_database, create_snapshot
+
+    db_path, snapshot_dir, keep = _resolve_db_command_paths(args)
+    try:
+        if args.output:
+            result = backup_database(db_path, args.output)
+        else:
+            result = create_snapshot(db_path, snapshot_dir, keep=keep)
+    except (BackupError, sqlite3.Error, OSError) as e:
+        print(f"❌ Backup failed: {e}")
+        return 1
+    print(
+        f"✅ Backed up {db_path} to {result.path} "
+        f"({result.pages} pages in {result.elapsed_seconds:.2f}s)"
+    )
+    return 0
+
+
+def _handle_db_restore(args: argparse.Namespace) -> int:
+    """Restore the database from a snapshot after backing up the current one."""
+    import sqlite3
+
+    from mmrelay.db_backup import BackupError, list_snapshots, restore_database
+    from mmrelay.migrate import _is_mmrelay_running
+
+    db_path, snapshot_dir, _keep = _resolve_db_command_paths(args)
+    snapshot = args.snapshot
+    if snapshot is None:
+        snapshots = list_snapshots(db_path, snapshot_dir)
+        if not snapshots:
+            print(f"❌ No snapshots found in {snapshot_dir}")
+            return 1
+        snapshot = snapshots[-1]
+    if not args.force and _is_mmrelay_running():
+        print("❌ MMRelay appears to be running. Stop it before restoring.")
+        print("   Use --force to restore anyway.")
+        return 1
+    try:
+        pre_restore, _result = restore_database(snapshot, db_path)
+    except (BackupError, sqlite3.Error, OSError) as e:
+        print(f"❌ Restore failed: {e}")
+        return 1
+    if pre_restore is not None:
+        print(f"Previous database saved to {pre_restore.path}")
+    print(f"✅ Restored {db_path} from {snapshot}")
+    return 0
+
+
+def _handle_db_stats(args: argparse.Namespace) -> int:
+    """Print size, WAL and free-list figures for the database."""
+    import contextlib
+    import os
+    import sqlite3
+
+    from mmrelay.db_maintenance import collect_database_metrics
+
+    db_path, _snapshot_dir, _keep = _resolve_db_command_paths(args)
+    if not os.path.isfile(db_path):
+        print(f"❌ Database not found: {db_path}")
+        return 1
+    try:
+        with contextlib.closing(
+            sqlite3.connect(f"file:{db_path}?mode=ro", uri=True)
+        ) as conn:
+            metrics = collect_database_metrics(conn.cursor(), db_path)
+    except sqlite3.Error as e:
+        print(f"❌ Could not read database: {e}")
+        return 1
+
+    def _mib(size: int) -> str:
+        return f"{size / (1024 * 1024):.2f} MiB"
+
+    print(f"Database:    {metrics.path}")
+    print(f"File size:   {_mib(metrics.file_bytes)}")
+    print(f"WAL size:    {_mib(metrics.wal_bytes)}")
+    print(f"Pages:       {metrics.page_count} x {metrics.page_size} bytes")
+    print(f"Free pages:  {metrics.freelist_pages} ({_mib(metrics.free_bytes)})")
+    print(f"Auto-vacuum: {metrics.auto_vacuum}")
+    return 0
+
+
+def _handle_db_vacuum(args: argparse.Namespace) -> int:
+    """Compact the database and switch it to incremental auto-vacuum."""
+    import contextlib
+    import os
+    import sqlite3
+
+    from mmrelay.db_maintenance import (
+        collect_database_metrics,
+        enable_incremental_auto_vacuum,
+    )
+    from mmrelay.migrate import _is_mmrelay_running
+
+    db_path, _snapshot_dir, _keep = _resolve_db_command_paths(args)
+    if not os.path.isfile(db_path):
+        print(f"❌ Database not found: {db_path}")
+        return 1
+    if not args.force and _is_mmrelay_running():
+        print("❌ MMRelay appears to be running. Stop it before vacuuming.")
+        print("   Use --force to vacuum anyway.")
+        return 1
+    try:
+        with contextlib.closing(sqlite3.connect(db_path)) as conn:
+            cursor = conn.cursor()
+            before = collect_database_metrics(cursor, db_path)
+            enable_incremental_auto_vacuum(cursor)
+            after = collect_database_metrics(cursor, db_path)
+    except sqlite3.Error as e:
+        print(f"❌ Vacuum failed: {e}")
+        return 1
+    print(
+        f"✅ Vacuumed {db_path}: {before.file_bytes / (1024 * 1024):.2f} MiB -> "
+        f"{after.file_bytes / (1024 * 1024):.2f} MiB, auto-vacuum {after.auto_vacuum}"
+    )
+    return 0
+
+
+def handle_db_command(args: argparse.Namespace) -> int:
+    """
+    Dispatch the "db" command group to the selected subcommand handler.
+
+    Supported subcommands:
+        - "backup": write an online backup or a retained snapshot.
+        - "restore": replace the database with a snapshot.
+        - "stats": show database, WAL and free-list sizes.
+        - "vacuum": compact the database and enable incremental auto-vacuum.
+
+    Parameters:
+        args (argparse.Namespace): CLI namespace containing `db_command` and its options.
+
+    Returns:
+        int: Exit code (0 on success, 1 on failure or for unknown subcommands).
+    """
+    if args.db_command == "backup":
+        return _handle_db_backup(args)
+    elif args.db_command == "restore":
+        return _handle_db_restore(args)
+    elif args.db_command == "stats":
+        return _handle_db_stats(args)
+    elif args.db_command == "vacuum":
+        return _handle_db_vacuum(args)
+    else:
+        print(f"Unknown db command: {args.db_command}")
+        return 1
+
+
 def handle_service_command(args: argparse.Namespace) -> int:
     """
     Dispatch a service-related CLI subcommand.
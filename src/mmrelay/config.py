@@ -1111,6 +1111,12 @@ def save_credentials(
 
     logger.info("Successfully saved credentials to %s", target_path)
 
+    # Late import avoids circular dependency (e2ee_utils -> paths -> config).
+    from mmrelay.e2ee_utils import invalidate_e2ee_status
+
+    # Credentials presence is part of the memoized E2EE status.
+    invalidate_e2ee_status()
+
 
 # Use structured logging to align with the rest of the codebase.
 def _get_config_logger() -> "logging.Logger":
@@ -1407,6 +1413,12 @@ def load_config(
     """
     global relay_config, config_path
 
+    # Late import avoids circular dependency (e2ee_utils -> paths -> config).
+    from mmrelay.e2ee_utils import note_e2ee_config_loaded
+
+    # The memoized E2EE status describes the previous load.
+    note_e2ee_config_loaded()
+
     # If a specific config file was provided, use it
     if config_file and os.path.isfile(config_file):
         # Store the config path but don't log it yet - will be logged by main.py
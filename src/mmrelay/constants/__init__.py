@@ -11,6 +11,7 @@ This package organizes all application constants by functional area:
 - database: Database-related constants
 - config: Configuration section and key constants
 - plugins: Plugin system security and validation constants
+- replay: Traffic recording and load-generation constants
 
 Usage:
     from mmrelay.constants import queue
@@ -40,12 +40,15 @@ CONFIG_FILENAME: Final[str] = "config.yaml"
 REQUIREMENTS_FILENAME: Final[str] = "requirements.txt"
 STORE_DIRNAME: Final[str] = "store"
 MATRIX_DIRNAME: Final[str] = "matrix"
+SYNC_TOKEN_FILENAME: Final[str] = "sync_token.json"
 
 # Directory and file names
 DATABASE_DIRNAME: Final[str] = "database"
 DATABASE_FILENAME: Final[str] = "meshtastic.sqlite"
 LOGS_DIRNAME: Final[str] = "logs"
 LOG_FILENAME: Final[str] = "mmrelay.log"
+# Report written by `mmrelay --profile-imports` (in the logs directory)
+IMPORT_PROFILE_FILENAME: Final[str] = "import_profile.txt"
 PLUGINS_DIRNAME: Final[str] = "plugins"
 PLUGIN_DATA_DIRNAME: Final[str] = "data"
 # Alias for backward compatibility
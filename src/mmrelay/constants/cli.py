@@ -35,6 +35,9 @@ EXIT_CODE_SUCCESS: Final[int] = 0
 EXIT_CODE_ERROR: Final[int] = 1
 EXIT_CODE_SIGINT: Final[int] = 130
 
+# Modules slowest to import shown on the console by --profile-imports
+IMPORT_PROFILE_CONSOLE_TOP_N: Final[int] = 15
+
 # Windows path display sentinel
 WINDOWS_PATH_NOT_APPLICABLE_LABEL: Final[str] = "N/A (Windows)"
 
@@ -58,6 +61,10 @@ CLI_COMMANDS: Final[Mapping[str, str]] = MappingProxyType(
         "doctor": "mmrelay doctor",
         "verify_migration": "mmrelay verify-migration",
         "migrate": "mmrelay migrate",
+        # Load-testing commands
+        "replay_record": "mmrelay replay record",
+        "replay_generate": "mmrelay replay generate",
+        "replay_run": "mmrelay replay run",
         # Main commands
         "start_relay": "mmrelay",
         "show_version": "mmrelay --version",
@@ -47,6 +47,14 @@ CONFIG_KEY_BROADCAST_ENABLED: Final[str] = "broadcast_enabled"
 CONFIG_KEY_DETECTION_SENSOR: Final[str] = "detection_sensor"
 CONFIG_KEY_MESSAGE_DELAY: Final[str] = "message_delay"
 CONFIG_KEY_NODEDB_REFRESH_INTERVAL: Final[str] = "nodedb_refresh_interval"
+CONFIG_KEY_NODEDB_RECONCILE_INTERVAL: Final[str] = "nodedb_reconcile_interval"
+CONFIG_KEY_NODEDB_SNAPSHOT_INTERVAL: Final[str] = "nodedb_snapshot_interval"
+CONFIG_KEY_MAX_MESSAGE_FRAGMENTS: Final[str] = "max_message_fragments"
+CONFIG_KEY_REASSEMBLE_FRAGMENTS: Final[str] = "reassemble_fragments"
+CONFIG_KEY_INGEST_WORKERS: Final[str] = "ingest_workers"
+CONFIG_KEY_INGEST_QUEUE_SIZE: Final[str] = "ingest_queue_size"
+CONFIG_KEY_ADDITIONAL_RADIOS: Final[str] = "additional_radios"
+CONFIG_KEY_RADIO_NAME: Final[str] = "name"
 CONFIG_KEY_HEALTH_CHECK: Final[str] = "health_check"
 CONFIG_KEY_PACKET_ROUTING: Final[str] = "packet_routing"
 CONFIG_KEY_CHAT_PORTNUMS: Final[str] = "chat_portnums"
@@ -71,6 +79,13 @@ CONFIG_KEY_PATH: Final[str] = "path"
 CONFIG_KEY_MSG_MAP: Final[str] = "msg_map"
 CONFIG_KEY_MSGS_TO_KEEP: Final[str] = "msgs_to_keep"
 CONFIG_KEY_WIPE_ON_RESTART: Final[str] = "wipe_on_restart"
+CONFIG_KEY_PARTITION_ROWS: Final[str] = "partition_rows"
+CONFIG_KEY_BACKUP: Final[str] = "backup"
+CONFIG_KEY_INTERVAL_HOURS: Final[str] = "interval_hours"
+CONFIG_KEY_KEEP: Final[str] = "keep"
+CONFIG_KEY_DIRECTORY: Final[str] = "directory"
+CONFIG_KEY_MAINTENANCE: Final[str] = "maintenance"
+CONFIG_KEY_MAINTENANCE_INTERVAL: Final[str] = "interval_seconds"
 
 # Additional credential/config keys
 CONFIG_KEY_DEVICE_ID: Final[str] = "device_id"
@@ -101,6 +116,19 @@ DEFAULT_HEARTBEAT_INTERVAL: Final[int] = 60
 # Default refresh cadence in seconds. Setting this to 0.0 disables periodic
 # NodeDB-derived name-cache refresh after the first immediate pass.
 DEFAULT_NODEDB_REFRESH_INTERVAL: Final[float] = 15.0
+# Seconds between full NodeDB snapshot reconciles of the name tables; between
+# them only NODEINFO changes are written. 0 reconciles on every refresh.
+DEFAULT_NODEDB_RECONCILE_INTERVAL: Final[float] = 3600.0
+# Seconds between saves of the NodeDB snapshot used to warm-start lookups after
+# startup and reconnects. 0 disables the snapshot.
+DEFAULT_NODEDB_SNAPSHOT_INTERVAL: Final[float] = 300.0
+# Packets a long Matrix message may be split into on the mesh. 1 truncates
+# long messages to a single packet; fragmentation is opt-in.
+DEFAULT_MAX_MESSAGE_FRAGMENTS: Final[int] = 1
+# Whether marked packets from other relays are joined back into one message.
+# Off by default so ordinary text that happens to look like a marker is
+# relayed as it arrives.
+DEFAULT_REASSEMBLE_FRAGMENTS: Final[bool] = False
 DEFAULT_COLOR_ENABLED: Final[bool] = True
 DEFAULT_WIPE_ON_RESTART: Final[bool] = False
 DEFAULT_REQUIRE_BOT_MENTION: Final[bool] = True
@@ -20,6 +20,13 @@ DEFAULT_MAX_DATA_ROWS_PER_NODE_BASE: Final[int] = 100  # Base plugin default
 DEFAULT_MAX_DATA_ROWS_PER_NODE_MESH_RELAY: Final[int] = (
     50  # Reduced for mesh relay performance
 )
+# Rows per message_map partition table; 0 keeps the single message_map table
+DEFAULT_MSG_MAP_PARTITION_ROWS: Final[int] = 0
+# Smaller positive values are raised to this so every store does not scan a
+# long run of tiny partitions.
+MIN_MSG_MAP_PARTITION_ROWS: Final[int] = 100
+# Partition tables are named message_map_p000001, message_map_p000002, ...
+MESSAGE_MAP_PARTITION_PREFIX: Final[str] = "message_map_p"
 # Keep below SQLite's host-parameter limit (999 by default) to leave headroom.
 DEFAULT_NAME_PRUNE_CHUNK_SIZE: Final[int] = 900
 
@@ -35,6 +42,10 @@ DEFAULT_DISTANCE_KM_FALLBACK: Final[int] = (
     1000  # Fallback distance when calculation fails
 )
 DEFAULT_RADIUS_KM: Final[int] = 5  # Default radius for location-based filtering
+# Mean Earth radius (IUGG), the same value the haversine package uses
+EARTH_MEAN_RADIUS_KM: Final[float] = 6371.0088
+# Geohash length of spatial index buckets; 5 characters are cells of ~4.9 km x 4.9 km
+SPATIAL_INDEX_GEOHASH_PRECISION: Final[int] = 5
 
 # SQLite configuration defaults
 DEFAULT_ENABLE_WAL: Final[bool] = True
@@ -45,6 +56,10 @@ DEFAULT_EXTRA_PRAGMAS: Final[Mapping[str, PragmaValue]] = MappingProxyType(
         "temp_store": "MEMORY",
     }
 )
+# Page cache per connection in KiB (applied as a negative cache_size) and
+# memory-mapped I/O window; both can be overridden through database.pragmas
+DEFAULT_CACHE_SIZE_KIB: Final[int] = 8192
+DEFAULT_MMAP_SIZE_BYTES: Final[int] = 64 * 1024 * 1024
 SQLITE_JSON_EACH_PROBE_SQL: Final[str] = "SELECT value FROM json_each(?)"
 SQLITE_JSON_EACH_PROBE_PAYLOAD: Final[str] = '["probe"]'
 
@@ -70,6 +85,25 @@ LEGACY_DATABASE_SUBDIR: Final[str] = DATABASE_DIRNAME
 # Table and column names
 PLUGIN_DATA_TABLE: Final[str] = "plugin_data"
 PLUGIN_DATA_COLUMNS: Final[tuple[str, ...]] = ("plugin_name", "meshtastic_id", "data")
+PLUGIN_SERIES_TABLE: Final[str] = "plugin_series"
+PLUGIN_SERIES_COLUMNS: Final[tuple[str, ...]] = (
+    "plugin_name",
+    "meshtastic_id",
+    "metric",
+    "ts",
+    "value",
+)
+NODE_SNAPSHOT_TABLE: Final[str] = "node_snapshot"
+NODE_SNAPSHOT_COLUMNS: Final[tuple[str, ...]] = ("meshtastic_id", "data", "saved_at")
+MEDIA_CACHE_TABLE: Final[str] = "media_cache"
+MEDIA_CACHE_COLUMNS: Final[tuple[str, ...]] = (
+    "homeserver",
+    "sha256",
+    "encrypted",
+    "content_uri",
+    "file_info",
+    "last_used",
+)
 MESSAGE_MAP_TABLE: Final[str] = "message_map"
 MESSAGE_MAP_COLUMNS: Final[tuple[str, ...]] = (
     "meshtastic_id",
@@ -79,9 +113,27 @@ MESSAGE_MAP_COLUMNS: Final[tuple[str, ...]] = (
     "meshtastic_meshnet",
 )
 
+# plugin_data encoding: lists of at least this many same-shaped numeric dicts
+# are stored column by column
+PLUGIN_DATA_RECORDS_MIN_ROWS: Final[int] = 8
+# Other JSON values at least this long are stored zlib-compressed
+PLUGIN_DATA_COMPRESS_MIN_BYTES: Final[int] = 1024
+
+# NodeDB snapshot rows not refreshed from a live NodeDB for this long are dropped
+NODE_SNAPSHOT_MAX_AGE_SECS: Final[float] = 30 * 24 * 3600.0
+
+# Uploaded-media cache: entries kept (least recently used are dropped first) and
+# how long an unused entry may be reused before the image is uploaded again
+MEDIA_CACHE_MAX_ENTRIES: Final[int] = 512
+MEDIA_CACHE_MAX_AGE_SECS: Final[float] = 7 * 24 * 3600.0
+
 # SQLite pragmas
 PRAGMA_JOURNAL_MODE_WAL: Final[str] = "PRAGMA journal_mode=WAL"
 PRAGMA_FOREIGN_KEYS_ON: Final[str] = "PRAGMA foreign_keys=ON"
+# Takes effect for new databases; existing ones are converted by maintenance
+PRAGMA_AUTO_VACUUM_INCREMENTAL: Final[str] = "PRAGMA auto_vacuum=INCREMENTAL"
+# Applied last to read-pool connections so they cannot modify the database
+PRAGMA_QUERY_ONLY_ON: Final[str] = "PRAGMA query_only=ON"
 
 # PRAGMA validation patterns (security-critical)
 SQLITE_PRAGMA_NAME_PATTERN: Final[re.Pattern[str]] = re.compile(
@@ -102,8 +154,45 @@ SQLITE_SIDECAR_SUFFIXES: Final[tuple[str, ...]] = (
     "-journal",
 )
 
-# Database executor
+# Database executor: a single writer lane keeps async writes in submission order
 DB_EXECUTOR_MAX_WORKERS: Final[int] = 1
+# Async reads run on their own pool of query_only connections (WAL mode only)
+DB_READ_POOL_MAX_WORKERS: Final[int] = 4
+DB_READ_POOL_THREAD_PREFIX: Final[str] = "mmrelay-db-read"
+
+# Online backups: pages copied per backup step (1 MiB at the default 4 KiB page size)
+DB_BACKUP_PAGES_PER_STEP: Final[int] = 256
+# Pause between backup steps so relay writes are not starved
+DB_BACKUP_STEP_PAUSE_SECONDS: Final[float] = 0.005
+# Suffix of a backup that is still being written
+DB_BACKUP_PARTIAL_SUFFIX: Final[str] = ".partial"
+# Snapshot directory, created next to the database file
+DB_SNAPSHOT_DIRNAME: Final[str] = "backups"
+# Snapshot files are named <database stem>-<UTC timestamp>.sqlite
+DB_SNAPSHOT_TIMESTAMP_FORMAT: Final[str] = "%Y%m%dT%H%M%S%fZ"
+DB_SNAPSHOT_SUFFIX: Final[str] = ".sqlite"
+# Backup of the live database taken before a restore overwrites it
+DB_PRE_RESTORE_SUFFIX: Final[str] = ".pre-restore"
+DEFAULT_DB_SNAPSHOT_INTERVAL_HOURS: Final[float] = 24.0
+DEFAULT_DB_SNAPSHOTS_TO_KEEP: Final[int] = 7
+
+# Database maintenance (WAL checkpoints and incremental vacuum)
+DEFAULT_DB_MAINTENANCE_INTERVAL_SECONDS: Final[float] = 300.0
+# WAL size that triggers a PASSIVE checkpoint
+DB_WAL_PASSIVE_CHECKPOINT_BYTES: Final[int] = 4 * 1024 * 1024
+# WAL size that triggers a TRUNCATE checkpoint, which also shrinks the -wal file
+DB_WAL_TRUNCATE_CHECKPOINT_BYTES: Final[int] = 16 * 1024 * 1024
+# Free pages left in place for reuse by upcoming inserts
+DB_FREELIST_RESERVE_PAGES: Final[int] = 256
+# Pages released per incremental_vacuum statement and time budget per pass
+DB_INCREMENTAL_VACUUM_PAGES_PER_STEP: Final[int] = 128
+DB_INCREMENTAL_VACUUM_SLICE_SECONDS: Final[float] = 0.05
+# Seconds to wait for the snapshot and maintenance tasks at shutdown
+DB_TASK_SHUTDOWN_TIMEOUT_SECS: Final[float] = 5.0
+# PRAGMA auto_vacuum values
+SQLITE_AUTO_VACUUM_MODES: Final[Mapping[int, str]] = MappingProxyType(
+    {0: "none", 1: "full", 2: "incremental"}
+)
 
 # Plugin database template
 PLUGIN_DB_FILENAME_TEMPLATE: Final[str] = "plugin_data_{plugin_name}.sqlite"
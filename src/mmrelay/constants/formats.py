@@ -98,6 +98,9 @@ TELEMETRY_GRAPH_FILENAME: Final[str] = "graph.png"
 # Telemetry
 TELEMETRY_APP_PORTNUM: Final[str] = "TELEMETRY_APP"
 
+# Node info
+NODEINFO_APP_PORTNUM: Final[str] = "NODEINFO_APP"
+
 # Map settings
 DEFAULT_MAP_ZOOM: Final[int] = 12
 MAP_ZOOM_MIN: Final[int] = 0
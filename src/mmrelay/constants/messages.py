@@ -25,6 +25,19 @@ MESHNET_NAME_ABBREVIATION_LENGTH: Final[int] = 4  # Characters for short meshnet
 SHORTNAME_FALLBACK_LENGTH: Final[int] = 3  # Characters for shortname fallback
 MESSAGE_PREVIEW_LENGTH: Final[int] = 40  # Characters for message preview in logs
 DISPLAY_NAME_DEFAULT_LENGTH: Final[int] = 5  # Default display name truncation
+PREFIX_RENDER_CACHE_SIZE: Final[int] = 512  # Rendered prefixes kept per template
+
+# Long message fragmentation (Matrix -> mesh) and reassembly (mesh -> Matrix)
+# Markers look like "[a7 2/3] ": a per-message tag, the part number and the total.
+FRAGMENT_MARKER_FORMAT: Final[str] = "[{tag:02x} {part}/{total}] "
+FRAGMENT_MARKER_REGEX: Final[str] = r"\[([0-9a-f]{2}) ([1-9])/([1-9])\] "
+FRAGMENT_MARKER_BYTES: Final[int] = 9  # Encoded size of one marker
+MAX_MESSAGE_FRAGMENTS: Final[int] = 9  # Markers use single-digit counts
+FRAGMENT_GAP_MARKER: Final[str] = "[…]"  # Stands in for a fragment that never arrived
+FRAGMENT_REASSEMBLY_TIMEOUT_SECS: Final[float] = (
+    120.0  # Partial messages are flushed after this
+)
+FRAGMENT_REASSEMBLY_MAX_PENDING: Final[int] = 256  # Partial messages held at once
 
 # Ping plugin messages
 PING_FALLBACK_RESPONSE: Final[str] = "Pong..."
@@ -23,6 +23,9 @@ CONFIG_KEY_CONNECTION_TYPE: Final[str] = "connection_type"
 CONFIG_KEY_TIMEOUT: Final[str] = "timeout"
 CONFIG_KEY_PORT: Final[str] = "port"
 
+# Name reported for the main connection when additional radios are configured
+PRIMARY_RADIO_NAME: Final[str] = "primary"
+
 # Meshtastic TCP defaults
 DEFAULT_TCP_PORT: Final[int] = 4403
 
@@ -51,6 +54,10 @@ DEFAULT_HEARTBEAT_INTERVAL_SECS: Final[int] = 60  # seconds
 CONNECTION_RETRY_BACKOFF_BASE: Final[int] = 2
 CONNECTION_RETRY_BACKOFF_MAX_SECS: Final[int] = 60
 
+# Shared plugin HTTP client: pooled connections per host and cached responses
+HTTP_POOL_MAXSIZE: Final[int] = 10
+HTTP_CACHE_MAX_ENTRIES: Final[int] = 256
+
 # Matrix message limits
 MATRIX_MESSAGE_FETCH_LIMIT: Final[int] = 100
 
@@ -58,6 +65,23 @@ MATRIX_MESSAGE_FETCH_LIMIT: Final[int] = 100
 MATRIX_EARLY_SYNC_TIMEOUT: Final[int] = 2000  # milliseconds
 MATRIX_MAIN_SYNC_TIMEOUT: Final[int] = 5000  # milliseconds
 MATRIX_ROOM_SEND_TIMEOUT: Final[float] = 10.0  # seconds
+
+# Maximum Matrix room sends in flight at once when relaying to many rooms
+MATRIX_FANOUT_MAX_CONCURRENCY: Final[int] = 8
+
+# Per-homeserver Matrix send scheduler. Sends are unthrottled until the
+# homeserver answers M_LIMIT_EXCEEDED; the rate then starts at
+# MATRIX_SEND_RATE_AFTER_LIMIT, halves on every further 429 and grows by
+# MATRIX_SEND_RATE_INCREASE per successful send until it passes
+# MATRIX_SEND_RATE_MAX, at which point throttling is lifted again.
+MATRIX_ERRCODE_LIMIT_EXCEEDED: Final[str] = "M_LIMIT_EXCEEDED"
+MATRIX_SEND_RATE_AFTER_LIMIT: Final[float] = 1.0  # sends per second
+MATRIX_SEND_RATE_MIN: Final[float] = 0.1  # sends per second
+MATRIX_SEND_RATE_MAX: Final[float] = 20.0  # sends per second
+MATRIX_SEND_RATE_INCREASE: Final[float] = 0.1  # sends per second
+MATRIX_SEND_BURST: Final[int] = 5
+MATRIX_RATE_LIMIT_DEFAULT_RETRY_MS: Final[int] = 1000
+MATRIX_RATE_LIMIT_MAX_RETRY_MS: Final[int] = 60000
 MATRIX_TO_DEVICE_TIMEOUT: Final[float] = 10.0  # seconds
 MATRIX_LOGIN_TIMEOUT: Final[float] = 30.0  # seconds
 MATRIX_SYNC_OPERATION_TIMEOUT: Final[float] = 60.0  # seconds
@@ -65,6 +89,11 @@ MATRIX_SYNC_OPERATION_TIMEOUT: Final[float] = 60.0  # seconds
 # 0 means retry indefinitely (recommended for unattended service restarts).
 MATRIX_INITIAL_SYNC_MAX_ATTEMPTS: Final[int] = 0
 MATRIX_INITIAL_SYNC_RETRY_MAX_DELAY_SECS: Final[float] = 60.0
+# Timeline events per room returned by the startup sync. Older messages are
+# dropped by the startup timestamp filter anyway, so only the newest is kept.
+MATRIX_SYNC_FIRST_TIMELINE_LIMIT: Final[int] = 1
+# Minimum time between writes of the persisted sync token
+MATRIX_SYNC_TOKEN_SAVE_INTERVAL_SECS: Final[float] = 30.0
 
 # BLE-specific constants
 BLE_FUTURE_WATCHDOG_SECS: Final[float] = 120.0
@@ -81,11 +81,42 @@ DEFAULT_SUBPROCESS_TIMEOUT_SECONDS: Final[int] = 120
 GIT_COMMAND_TIMEOUT_SECONDS: Final[int] = 120
 GIT_RETRY_ATTEMPTS: Final[int] = 3
 GIT_RETRY_DELAY_SECONDS: Final[int] = 2
+# Community plugin repositories cloned/updated at the same time during startup
+COMMUNITY_PLUGIN_SYNC_MAX_WORKERS: Final[int] = 4
 WEATHER_API_TIMEOUT_SECONDS: Final[int] = 10
+# Weather responses are reused for this long; Open-Meteo updates every 15 min
+WEATHER_CACHE_TTL_SECONDS: Final[float] = 600.0
+# Cache key precision for coordinates (2 decimals is roughly 1 km)
+WEATHER_CACHE_COORD_DECIMALS: Final[int] = 2
+# plugin_data key prefix for persisted geocoding results
+WEATHER_GEOCODE_CACHE_KEY_PREFIX: Final[str] = "geocode:"
+# Persisted geocoding results kept; the oldest are pruned past this count
+WEATHER_GEOCODE_CACHE_MAX_ENTRIES: Final[int] = 500
+# Persisted geocoding results older than this are looked up again (30 days)
+WEATHER_GEOCODE_CACHE_MAX_AGE_SECONDS: Final[float] = 30 * 24 * 3600.0
 
 # Scheduler timing
 SCHEDULER_SHUTDOWN_TIMEOUT_SECONDS: Final[int] = 5
 SCHEDULER_LOOP_WAIT_SECONDS: Final[int] = 1
+# Resolution of the asyncio scheduler's timer wheel
+SCHEDULER_TICK_SECONDS: Final[float] = 0.1
+# Slots per wheel level; four levels of 64 slots span about 19 days at 0.1 s ticks
+SCHEDULER_WHEEL_SLOTS: Final[int] = 64
+SCHEDULER_WHEEL_LEVELS: Final[int] = 4
+# Upper bound on back-to-back runs when a "catch_up" job replays missed runs
+SCHEDULER_MAX_CATCH_UP_RUNS: Final[int] = 10
+
+# Missed-run policies for scheduled plugin jobs (schedule.missed_runs)
+SCHEDULE_MISSED_RUNS_SKIP: Final[str] = "skip"
+SCHEDULE_MISSED_RUNS_RUN_ONCE: Final[str] = "run_once"
+SCHEDULE_MISSED_RUNS_CATCH_UP: Final[str] = "catch_up"
+SCHEDULE_MISSED_RUNS_POLICIES: Final[frozenset[str]] = frozenset(
+    {
+        SCHEDULE_MISSED_RUNS_SKIP,
+        SCHEDULE_MISSED_RUNS_RUN_ONCE,
+        SCHEDULE_MISSED_RUNS_CATCH_UP,
+    }
+)
 
 # Sensitive URL parameters to redact
 SENSITIVE_URL_PARAMS: Final[frozenset[str]] = frozenset(
@@ -228,6 +259,11 @@ TELEMETRY_MAX_DATA_ROWS: Final[int] = 50
 # Health plugin constants
 LOW_BATTERY_THRESHOLD_PERCENT: Final[int] = 10
 
+# Nodes plugin constants
+# Longest time a cached !nodes response is reused; bounds how stale its
+# relative last-heard times can get
+NODES_RESPONSE_MAX_AGE_SECS: Final[float] = 60.0
+
 # Regex patterns
 PING_EXPLICIT_COMMAND_REGEX: Final[re.Pattern[str]] = re.compile(
     r"(?<!\w)!(ping)(?!\w)", re.IGNORECASE
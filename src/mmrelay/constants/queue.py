@@ -12,7 +12,11 @@ from mmrelay.constants.network import MINIMUM_MESSAGE_DELAY
 __all__ = [
     "CONNECTION_ERROR_KEYWORDS",
     "CONNECTION_RETRY_SLEEP_SEC",
+    "DEFAULT_INGEST_QUEUE_SIZE",
+    "DEFAULT_INGEST_WORKERS",
     "DEFAULT_MESSAGE_DELAY",
+    "INGEST_FULL_LOG_INTERVAL_SEC",
+    "INGEST_STOP_TIMEOUT_SEC",
     "MAX_QUEUE_SIZE",
     "MINIMUM_MESSAGE_DELAY",
     "QUEUE_EXECUTOR_MAX_WORKERS",
@@ -22,6 +26,9 @@ __all__ = [
     "QUEUE_MEDIUM_WATER_MARK",
     "QUEUE_POLL_INTERVAL_SEC",
     "QUEUE_WAIT_RETRY_SLEEP_SEC",
+    "RADIO_DEDUPE_MAX_ENTRIES",
+    "RADIO_DEDUPE_WINDOW_SEC",
+    "RADIO_RECONNECT_MAX_BACKOFF_SEC",
     "TASK_SHUTDOWN_TIMEOUT_SEC",
 ]
 
@@ -50,6 +57,22 @@ CONNECTION_RETRY_SLEEP_SEC: Final[float] = 1.0
 # Queue executor
 QUEUE_EXECUTOR_MAX_WORKERS: Final[int] = 1
 
+# Inbound packet ingestion (Meshtastic reader thread -> worker lanes)
+# 0 workers processes packets inline on the reader thread (legacy behavior).
+DEFAULT_INGEST_WORKERS: Final[int] = 2
+DEFAULT_INGEST_QUEUE_SIZE: Final[int] = 1000
+INGEST_FULL_LOG_INTERVAL_SEC: Final[float] = 5.0
+INGEST_STOP_TIMEOUT_SEC: Final[float] = 5.0
+
+# Multi-radio receive deduplication: a packet heard by several radios is
+# relayed once if the copies arrive within this window.
+RADIO_DEDUPE_WINDOW_SEC: Final[float] = 60.0
+RADIO_DEDUPE_MAX_ENTRIES: Final[int] = 4096
+
+# Upper bound on the doubling delay between reconnect attempts for a lost
+# additional radio.
+RADIO_RECONNECT_MAX_BACKOFF_SEC: Final[int] = 300
+
 # Connection error keywords for detection
 # Note: Keywords are lowercase; normalize error messages with .lower() before checking
 CONNECTION_ERROR_KEYWORDS: Final[frozenset[str]] = frozenset(
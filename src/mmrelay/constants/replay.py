@@ -0,0 +1,50 @@
+"""
+Traffic replay and load-generation constants.
+
+Contains the recording file format marker, default synthetic traffic shape,
+and virtual node identities used by ``mmrelay replay``.
+"""
+
+from types import MappingProxyType
+from typing import Final, Mapping
+
+# Recording file format
+REPLAY_FORMAT_NAME: Final[str] = "mmrelay-replay"
+REPLAY_FORMAT_VERSION: Final[int] = 1
+REPLAY_BYTES_MARKER: Final[str] = "__b64__"
+REPLAY_GZIP_SUFFIX: Final[str] = ".gz"
+
+# Replay timing
+DEFAULT_REPLAY_SPEED: Final[float] = 1.0
+# Speed value that disables inter-packet pacing entirely.
+REPLAY_SPEED_UNTHROTTLED: Final[float] = 0.0
+DEFAULT_REPLAY_DRAIN_TIMEOUT_SECS: Final[float] = 30.0
+
+# Synthetic traffic defaults
+DEFAULT_SYNTHETIC_NODE_COUNT: Final[int] = 20
+DEFAULT_SYNTHETIC_PACKET_COUNT: Final[int] = 500
+DEFAULT_SYNTHETIC_INTERVAL_SECS: Final[float] = 0.5
+SYNTHETIC_TRAFFIC_KINDS: Final[tuple[str, ...]] = (
+    "text",
+    "telemetry",
+    "position",
+    "nodeinfo",
+    "encrypted",
+)
+# Weights approximate a busy public mesh: mostly telemetry/position noise.
+DEFAULT_SYNTHETIC_TRAFFIC_MIX: Final[Mapping[str, float]] = MappingProxyType(
+    {
+        "text": 0.15,
+        "telemetry": 0.35,
+        "position": 0.30,
+        "nodeinfo": 0.12,
+        "encrypted": 0.08,
+    }
+)
+
+# Virtual node identities
+SYNTHETIC_RELAY_NODE_NUM: Final[int] = 0x0A000000
+SYNTHETIC_NODE_NUM_BASE: Final[int] = 0x0A000001
+SYNTHETIC_MESHNET_NAME: Final[str] = "replay"
+SYNTHETIC_MATRIX_ROOM_ID: Final[str] = "!replay:localhost"
+SYNTHETIC_MATRIX_USER_ID: Final[str] = "@replay-bot:localhost"
@@ -0,0 +1,446 @@
+"""
+Online backups and scheduled snapshots of the relay's SQLite database.
+
+Backups use SQLite's online backup API, which copies the database page by
+page through a separate connection, so they are safe while the relay keeps
+writing through `DatabaseManager`. The copy runs in small steps with a short
+pause between them. In WAL mode the source connection also holds one read
+snapshot for the whole copy; commits made meanwhile go to the WAL and do not
+force the copy to start over.
+
+A backup is written to a ``.partial`` file, checked with
+``PRAGMA integrity_check`` and only then renamed into place, so a snapshot
+that exists is always complete.
+"""
+
+import asyncio
+import contextlib
+import os
+import re
+import sqlite3
+import time
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, NamedTuple
+
+from mmrelay.constants.config import (
+    CONFIG_KEY_BACKUP,
+    CONFIG_KEY_DIRECTORY,
+    CONFIG_KEY_ENABLED,
+    CONFIG_KEY_INTERVAL_HOURS,
+    CONFIG_KEY_KEEP,
+    CONFIG_SECTION_DATABASE,
+)
+from mmrelay.constants.database import (
+    DB_BACKUP_PAGES_PER_STEP,
+    DB_BACKUP_PARTIAL_SUFFIX,
+    DB_BACKUP_STEP_PAUSE_SECONDS,
+    DB_PRE_RESTORE_SUFFIX,
+    DB_SNAPSHOT_DIRNAME,
+    DB_SNAPSHOT_SUFFIX,
+    DB_SNAPSHOT_TIMESTAMP_FORMAT,
+    DEFAULT_BUSY_TIMEOUT_MS,
+    DEFAULT_DB_SNAPSHOT_INTERVAL_HOURS,
+    DEFAULT_DB_SNAPSHOTS_TO_KEEP,
+)
+from mmrelay.log_utils import get_logger
+
+__all__ = [
+    "BackupError",
+    "BackupResult",
+    "SnapshotSettings",
+    "async_backup_database",
+    "backup_database",
+    "create_snapshot",
+    "get_snapshot_dir",
+    "get_snapshot_settings",
+    "list_snapshots",
+    "prune_snapshots",
+    "restore_database",
+    "run_scheduled_snapshots",
+]
+
+logger = get_logger(__name__)
+
+
+class BackupError(Exception):
+    """Raised when a backup or restore cannot be completed."""
+
+
+@dataclass(frozen=True)
+class BackupResult:
+    """Outcome of a completed backup."""
+
+    path: str
+    pages: int
+    steps: int
+    elapsed_seconds: float
+
+
+class SnapshotSettings(NamedTuple):
+    """Scheduled snapshot options from ``database.backup``."""
+
+    enabled: bool
+    interval_seconds: float
+    keep: int
+    directory: str | None
+
+
+def _integrity_check(conn: sqlite3.Connection) -> str:
+    """Return the first line of ``PRAGMA integrity_check`` ("ok" when healthy)."""
+    row = conn.execute("PRAGMA integrity_check").fetchone()
+    return str(row[0]) if row else "no result"
+
+
+def _remove_quietly(path: str) -> None:
+    with contextlib.suppress(FileNotFoundError):
+        os.remove(path)
+
+
+def backup_database(
+    source_path: str,
+    dest_path: str,
+    *,
+    pages_per_step: int = DB_BACKUP_PAGES_PER_STEP,
+    step_pause_seconds: float = DB_BACKUP_STEP_PAUSE_SECONDS,
+    busy_timeout_ms: int = DEFAULT_BUSY_TIMEOUT_MS,
+) -> BackupResult:
+    """
+    Copy a live SQLite database to `dest_path` with the online backup API.
+
+    Parameters:
+        source_path (str): Database to back up; other connections may keep writing to it.
+        dest_path (str): File to create or replace with the backup.
+        pages_per_step (int): Pages copied per backup step; -1 copies everything in one step.
+        step_pause_seconds (float): Sleep between steps, which lets writers take the database.
+        busy_timeout_ms (int): How long a step waits for a lock held by a writer.
+
+    Returns:
+        BackupResult: The backup path, page count, number of steps and elapsed time.
+
+    Raises:
+        BackupError: If the source does not exist or the copy fails its integrity check.
+        sqlite3.Error: If SQLite fails while copying.
+    """
+    if not os.path.isfile(source_path):
+        raise BackupError(f"Database not found: {source_path}")
+    dest_path = os.path.abspath(dest_path)
+    if os.path.abspath(source_path) == dest_path:
+        raise BackupError("Backup destination is the database itself")
+    os.makedirs(os.path.dirname(dest_path), exist_ok=True)
+    partial_path = dest_path + DB_BACKUP_PARTIAL_SUFFIX
+    _remove_quietly(partial_path)
+
+    started = time.monotonic()
+    steps = 0
+    total_pages = 0
+
+    def _progress(_status: int, remaining: int, total: int) -> None:
+        nonlocal steps, total_pages
+        steps += 1
+        total_pages = total
+        if remaining and step_pause_seconds > 0:
+            time.sleep(step_pause_seconds)
+
+    try:
+        with (
+            contextlib.closing(sqlite3.connect(source_path)) as source,
+            contextlib.closing(sqlite3.connect(partial_path)) as target,
+        ):
+            source.execute(f"PRAGMA busy_timeout = {int(busy_timeout_ms)}")
+            journal_mode = str(source.execute("PRAGMA journal_mode").fetchone()[0])
+            pin_snapshot = journal_mode.lower() == "wal"
+            if pin_snapshot:
+                # Reading inside one transaction keeps the same WAL snapshot
+                # across steps without blocking writers.
+                source.execute("BEGIN")
+                source.execute("SELECT count(*) FROM sqlite_master").fetchone()
+            try:
+                source.backup(target, pages=pages_per_step, progress=_progress)
+            finally:
+                if pin_snapshot:
+                    source.rollback()
+            # The copied header keeps the source's WAL flag; make the backup a
+            # single self-contained file.
+            target.execute("PRAGMA journal_mode=DELETE").fetchone()
+            result = _integrity_check(target)
+        if result != "ok":
+            raise BackupError(f"Backup failed its integrity check: {result}")
+        os.replace(partial_path, dest_path)
+    except BaseException:
+        _remove_quietly(partial_path)
+        raise
+
+    elapsed = time.monotonic() - started
+    logger.info(
+        "Backed up %s to %s (%d pages, %d steps, %.2fs)",
+        source_path,
+        dest_path,
+        total_pages,
+        steps,
+        elapsed,
+    )
+    return BackupResult(dest_path, total_pages, steps, elapsed)
+
+
+async def async_backup_database(
+    source_path: str, dest_path: str, **kwargs: Any
+) -> BackupResult:
+    """
+    Run `backup_database` in a worker thread.
+
+    Parameters:
+        source_path (str): Database to back up.
+        dest_path (str): File to create or replace with the backup.
+        **kwargs: Step options passed to `backup_database`.
+
+    Returns:
+        BackupResult: The completed backup.
+    """
+    return await asyncio.to_thread(backup_database, source_path, dest_path, **kwargs)
+
+
+def _snapshot_pattern(db_path: str) -> re.Pattern[str]:
+    stem = re.escape(Path(db_path).stem)
+    suffix = re.escape(DB_SNAPSHOT_SUFFIX)
+    return re.compile(rf"^{stem}-\d{{8}}T\d{{12}}Z{suffix}$")
+
+
+def get_snapshot_dir(db_path: str, directory: str | None = None) -> str:
+    """
+    Return the snapshot directory for a database.
+
+    Parameters:
+        db_path (str): Path of the database.
+        directory (str | None): Configured directory; defaults to ``backups`` next to the database.
+
+    Returns:
+        str: Absolute snapshot directory path.
+    """
+    if directory:
+        return os.path.abspath(os.path.expanduser(directory))
+    return os.path.join(os.path.dirname(os.path.abspath(db_path)), DB_SNAPSHOT_DIRNAME)
+
+
+def list_snapshots(db_path: str, snapshot_dir: str) -> list[str]:
+    """
+    List the snapshots of a database, oldest first.
+
+    Parameters:
+        db_path (str): Path of the database the snapshots were taken from.
+        snapshot_dir (str): Directory holding the snapshots.
+
+    Returns:
+        list[str]: Snapshot paths; names sort by their UTC timestamp.
+    """
+    pattern = _snapshot_pattern(db_path)
+    try:
+        names = os.listdir(snapshot_dir)
+    except FileNotFoundError:
+        return []
+    return [
+        os.path.join(snapshot_dir, name)
+        for name in sorted(names)
+        if pattern.fullmatch(name)
+    ]
+
+
+def prune_snapshots(db_path: str, snapshot_dir: str, keep: int) -> list[str]:
+    """
+    Delete all but the newest `keep` snapshots.
+
+    Parameters:
+        db_path (str): Path of the database the snapshots were taken from.
+        snapshot_dir (str): Directory holding the snapshots.
+        keep (int): Number of snapshots to keep; 0 or less keeps all of them.
+
+    Returns:
+        list[str]: Paths of the deleted snapshots.
+    """
+    if keep <= 0:
+        return []
+    removed = []
+    for path in list_snapshots(db_path, snapshot_dir)[:-keep]:
+        try:
+            os.remove(path)
+        except OSError as e:
+            logger.warning("Could not delete old database snapshot %s: %s", path, e)
+            continue
+        removed.append(path)
+    return removed
+
+
+def create_snapshot(
+    db_path: str,
+    snapshot_dir: str,
+    *,
+    keep: int = DEFAULT_DB_SNAPSHOTS_TO_KEEP,
+    **kwargs: Any,
+) -> BackupResult:
+    """
+    Take a timestamped snapshot of a database and apply the retention limit.
+
+    Parameters:
+        db_path (str): Database to snapshot.
+        snapshot_dir (str): Directory for the snapshot file.
+        keep (int): Number of snapshots to keep afterwards; 0 or less keeps all of them.
+        **kwargs: Step options passed to `backup_database`.
+
+    Returns:
+        BackupResult: The new snapshot.
+    """
+    timestamp = datetime.now(timezone.utc).strftime(DB_SNAPSHOT_TIMESTAMP_FORMAT)
+    name = f"{Path(db_path).stem}-{timestamp}{DB_SNAPSHOT_SUFFIX}"
+    result = backup_database(db_path, os.path.join(snapshot_dir, name), **kwargs)
+    for path in prune_snapshots(db_path, snapshot_dir, keep):
+        logger.debug("Deleted old database snapshot %s", path)
+    return result
+
+
+def restore_database(
+    snapshot_path: str, db_path: str, **kwargs: Any
+) -> tuple[BackupResult | None, BackupResult]:
+    """
+    Replace a database's contents with a snapshot.
+
+    The current database is first backed up next to itself with a
+    ``.pre-restore`` suffix. The snapshot is then copied in through the
+    backup API, so the database's own WAL and lock files stay consistent.
+
+    Parameters:
+        snapshot_path (str): Snapshot or backup file to restore.
+        db_path (str): Database to overwrite; created if missing.
+        **kwargs: Step options passed to `backup_database`.
+
+    Returns:
+        tuple[BackupResult | None, BackupResult]: The pre-restore backup
+        (None if there was no database) and the restore itself.
+
+    Raises:
+        BackupError: If the snapshot is missing or fails its integrity check.
+        sqlite3.Error: If SQLite fails while copying.
+    """
+    if not os.path.isfile(snapshot_path):
+        raise BackupError(f"Snapshot not found: {snapshot_path}")
+    snapshot_uri = f"{Path(snapshot_path).resolve().as_uri()}?mode=ro"
+    try:
+        with contextlib.closing(sqlite3.connect(snapshot_uri, uri=True)) as snapshot:
+            result = _integrity_check(snapshot)
+    except sqlite3.DatabaseError as e:
+        raise BackupError(f"Snapshot is not a usable database: {e}") from e
+    if result != "ok":
+        raise BackupError(f"Snapshot failed its integrity check: {result}")
+
+    pre_restore = None
+    if os.path.isfile(db_path):
+        timestamp = datetime.now(timezone.utc).strftime(DB_SNAPSHOT_TIMESTAMP_FORMAT)
+        pre_restore = backup_database(
+            db_path, f"{db_path}{DB_PRE_RESTORE_SUFFIX}.{timestamp}", **kwargs
+        )
+
+    started = time.monotonic()
+    with (
+        contextlib.closing(sqlite3.connect(snapshot_uri, uri=True)) as snapshot,
+        contextlib.closing(sqlite3.connect(db_path)) as target,
+    ):
+        busy_timeout_ms = int(kwargs.get("busy_timeout_ms", DEFAULT_BUSY_TIMEOUT_MS))
+        target.execute(f"PRAGMA busy_timeout = {busy_timeout_ms}")
+        snapshot.backup(target)
+        pages = int(target.execute("PRAGMA page_count").fetchone()[0])
+    elapsed = time.monotonic() - started
+    logger.info("Restored %s from %s", db_path, snapshot_path)
+    return pre_restore, BackupResult(os.path.abspath(db_path), pages, 1, elapsed)
+
+
+def get_snapshot_settings(config: dict[str, Any] | None) -> SnapshotSettings:
+    """
+    Read scheduled snapshot options from ``database.backup``.
+
+    Snapshots are off unless ``enabled`` is true. Invalid values are logged
+    and replaced by their defaults.
+
+    Parameters:
+        config (dict[str, Any] | None): Application configuration.
+
+    Returns:
+        SnapshotSettings: The resolved options.
+    """
+    database_section = (
+        config.get(CONFIG_SECTION_DATABASE) if isinstance(config, dict) else None
+    )
+    section = (
+        database_section.get(CONFIG_KEY_BACKUP)
+        if isinstance(database_section, dict)
+        else None
+    )
+    if not isinstance(section, dict):
+        section = {}
+
+    interval_hours = section.get(
+        CONFIG_KEY_INTERVAL_HOURS, DEFAULT_DB_SNAPSHOT_INTERVAL_HOURS
+    )
+    if (
+        isinstance(interval_hours, bool)
+        or not isinstance(interval_hours, (int, float))
+        or interval_hours <= 0
+    ):
+        logger.warning(
+            "Invalid database.backup.interval_hours=%r; defaulting to %s",
+            interval_hours,
+            DEFAULT_DB_SNAPSHOT_INTERVAL_HOURS,
+        )
+        interval_hours = DEFAULT_DB_SNAPSHOT_INTERVAL_HOURS
+
+    keep = section.get(CONFIG_KEY_KEEP, DEFAULT_DB_SNAPSHOTS_TO_KEEP)
+    if isinstance(keep, bool) or not isinstance(keep, int) or keep < 0:
+        logger.warning(
+            "Invalid database.backup.keep=%r; defaulting to %d",
+            keep,
+            DEFAULT_DB_SNAPSHOTS_TO_KEEP,
+        )
+        keep = DEFAULT_DB_SNAPSHOTS_TO_KEEP
+
+    directory = section.get(CONFIG_KEY_DIRECTORY)
+    return SnapshotSettings(
+        enabled=section.get(CONFIG_KEY_ENABLED) is True,
+        interval_seconds=float(interval_hours) * 3600,
+        keep=keep,
+        directory=directory if isinstance(directory, str) and directory else None,
+    )
+
+
+async def run_scheduled_snapshots(
+    shutdown_event: asyncio.Event, db_path: str, settings: SnapshotSettings
+) -> None:
+    """
+    Take a snapshot every ``settings.interval_seconds`` until shutdown.
+
+    A failed snapshot is logged and retried at the next interval.
+
+    Parameters:
+        shutdown_event (asyncio.Event): Set when the relay shuts down.
+        db_path (str): Database to snapshot.
+        settings (SnapshotSettings): Interval, retention and directory.
+    """
+    snapshot_dir = get_snapshot_dir(db_path, settings.directory)
+    logger.info(
+        "Database snapshots every %.1f hours to %s (keeping %d)",
+        settings.interval_seconds / 3600,
+        snapshot_dir,
+        settings.keep,
+    )
+    while not shutdown_event.is_set():
+        try:
+            await asyncio.wait_for(
+                shutdown_event.wait(), timeout=settings.interval_seconds
+            )
+            return
+        except asyncio.TimeoutError:
+            pass
+        try:
+            await asyncio.to_thread(
+                create_snapshot, db_path, snapshot_dir, keep=settings.keep
+            )
+        except (BackupError, sqlite3.Error, OSError):
+            logger.exception("Scheduled database snapshot failed")
@@ -0,0 +1,377 @@
+"""
+Periodic upkeep of the relay's SQLite database.
+
+SQLite's automatic checkpoints copy WAL frames back into the database but
+never shrink the -wal file, and pages freed by pruning ``message_map`` stay
+in the file until a vacuum. On a long-running relay both only ever grow to
+their peak size. `DatabaseMaintenance` keeps them bounded:
+
+- a PASSIVE checkpoint once the WAL passes a size threshold, and a TRUNCATE
+  checkpoint, which also resets the -wal file, past a larger one;
+- incremental vacuum in short time slices, each one a separate write
+  transaction, so relay writes interleave with it.
+
+Incremental vacuum needs ``auto_vacuum=INCREMENTAL``. `DatabaseManager`
+creates new databases that way; an existing database is converted by
+``mmrelay db vacuum`` while the relay is stopped, because the conversion is a
+full VACUUM that rewrites the file and blocks writers until it is done.
+
+Every pass also reports file, WAL and free-list metrics.
+"""
+
+import asyncio
+import os
+import sqlite3
+import time
+from collections.abc import Callable
+from dataclasses import dataclass
+from typing import Any, NamedTuple
+
+from mmrelay.constants.config import (
+    CONFIG_KEY_ENABLED,
+    CONFIG_KEY_MAINTENANCE,
+    CONFIG_KEY_MAINTENANCE_INTERVAL,
+    CONFIG_SECTION_DATABASE,
+)
+from mmrelay.constants.database import (
+    DB_FREELIST_RESERVE_PAGES,
+    DB_INCREMENTAL_VACUUM_PAGES_PER_STEP,
+    DB_INCREMENTAL_VACUUM_SLICE_SECONDS,
+    DB_WAL_PASSIVE_CHECKPOINT_BYTES,
+    DB_WAL_TRUNCATE_CHECKPOINT_BYTES,
+    DEFAULT_DB_MAINTENANCE_INTERVAL_SECONDS,
+    PRAGMA_AUTO_VACUUM_INCREMENTAL,
+    SQLITE_AUTO_VACUUM_MODES,
+)
+from mmrelay.db_runtime import DatabaseManager
+from mmrelay.log_utils import get_logger
+
+__all__ = [
+    "CHECKPOINT_PASSIVE",
+    "CHECKPOINT_TRUNCATE",
+    "DatabaseMaintenance",
+    "DatabaseMetrics",
+    "MaintenanceReport",
+    "MaintenanceSettings",
+    "collect_database_metrics",
+    "enable_incremental_auto_vacuum",
+    "get_maintenance_settings",
+    "run_database_maintenance",
+]
+
+logger = get_logger(__name__)
+
+CHECKPOINT_PASSIVE = "PASSIVE"
+CHECKPOINT_TRUNCATE = "TRUNCATE"
+
+
+@dataclass(frozen=True)
+class DatabaseMetrics:
+    """Size and free-space figures of a database and its WAL."""
+
+    path: str
+    file_bytes: int
+    wal_bytes: int
+    page_size: int
+    page_count: int
+    freelist_pages: int
+    auto_vacuum: str
+
+    @property
+    def free_bytes(self) -> int:
+        """Return the bytes held by pages on the free list."""
+        return self.freelist_pages * self.page_size
+
+    @property
+    def total_bytes(self) -> int:
+        """Return the combined size of the database and WAL files."""
+        return self.file_bytes + self.wal_bytes
+
+
+class MaintenanceSettings(NamedTuple):
+    """Maintenance options from ``database.maintenance`` and their thresholds."""
+
+    enabled: bool = True
+    interval_seconds: float = DEFAULT_DB_MAINTENANCE_INTERVAL_SECONDS
+    wal_passive_bytes: int = DB_WAL_PASSIVE_CHECKPOINT_BYTES
+    wal_truncate_bytes: int = DB_WAL_TRUNCATE_CHECKPOINT_BYTES
+    freelist_reserve_pages: int = DB_FREELIST_RESERVE_PAGES
+    vacuum_pages_per_step: int = DB_INCREMENTAL_VACUUM_PAGES_PER_STEP
+    vacuum_slice_seconds: float = DB_INCREMENTAL_VACUUM_SLICE_SECONDS
+
+
+class MaintenanceReport(NamedTuple):
+    """What one maintenance pass did."""
+
+    checkpoint: str | None
+    checkpoint_busy: bool
+    vacuumed_pages: int
+    metrics: DatabaseMetrics
+
+
+def _file_size(path: str) -> int:
+    try:
+        return os.path.getsize(path)
+    except OSError:
+        return 0
+
+
+def collect_database_metrics(cursor: sqlite3.Cursor, db_path: str) -> DatabaseMetrics:
+    """
+    Read page and file-size figures for a database.
+
+    Parameters:
+        cursor (sqlite3.Cursor): Cursor on a connection to the database.
+        db_path (str): Path of the database file; the WAL is ``<db_path>-wal``.
+
+    Returns:
+        DatabaseMetrics: Current sizes and free-list length.
+    """
+    page_size = int(cursor.execute("PRAGMA page_size").fetchone()[0])
+    page_count = int(cursor.execute("PRAGMA page_count").fetchone()[0])
+    freelist = int(cursor.execute("PRAGMA freelist_count").fetchone()[0])
+    auto_vacuum = int(cursor.execute("PRAGMA auto_vacuum").fetchone()[0])
+    return DatabaseMetrics(
+        path=db_path,
+        file_bytes=_file_size(db_path),
+        wal_bytes=_file_size(f"{db_path}-wal"),
+        page_size=page_size,
+        page_count=page_count,
+        freelist_pages=freelist,
+        auto_vacuum=SQLITE_AUTO_VACUUM_MODES.get(auto_vacuum, str(auto_vacuum)),
+    )
+
+
+def enable_incremental_auto_vacuum(cursor: sqlite3.Cursor) -> None:
+    """
+    Switch a database to incremental auto-vacuum.
+
+    This runs a full VACUUM, which rewrites the whole file and holds the
+    write lock until it finishes; run it while the relay is stopped.
+
+    Parameters:
+        cursor (sqlite3.Cursor): Cursor on a connection outside any transaction.
+    """
+    cursor.execute(PRAGMA_AUTO_VACUUM_INCREMENTAL)
+    cursor.execute("VACUUM")
+
+
+class DatabaseMaintenance:
+    """
+    Checkpoint and vacuum one database through its `DatabaseManager`.
+
+    All work goes through the manager's write lane, so it is serialized with
+    the relay's own writes. `tick` runs a pass once ``interval_seconds`` have
+    passed on `clock`; tests drive it with a fake clock.
+    """
+
+    def __init__(
+        self,
+        manager: DatabaseManager,
+        db_path: str,
+        *,
+        settings: MaintenanceSettings | None = None,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.manager = manager
+        self.db_path = db_path
+        self.settings = settings or MaintenanceSettings()
+        self.clock = clock
+        self._next_run = clock()
+        self._conversion_hint_logged = False
+
+    def metrics(self) -> DatabaseMetrics:
+        """Return the database's current metrics."""
+        return self.manager.run_sync(
+            lambda cursor: collect_database_metrics(cursor, self.db_path)
+        )
+
+    def checkpoint(self, mode: str) -> tuple[bool, int, int]:
+        """
+        Run a WAL checkpoint.
+
+        Parameters:
+            mode (str): `CHECKPOINT_PASSIVE` or `CHECKPOINT_TRUNCATE`.
+
+        Returns:
+            tuple[bool, int, int]: Whether a reader kept the checkpoint from
+            completing, the WAL frame count and the frames checkpointed.
+        """
+        if mode not in (CHECKPOINT_PASSIVE, CHECKPOINT_TRUNCATE):
+            raise ValueError(f"Unsupported checkpoint mode: {mode!r}")
+
+        def _checkpoint(cursor: sqlite3.Cursor) -> tuple[bool, int, int]:
+            busy, log_frames, checkpointed = cursor.execute(
+                f"PRAGMA wal_checkpoint({mode})"
+            ).fetchone()
+            return bool(busy), int(log_frames), int(checkpointed)
+
+        return self.manager.run_sync(_checkpoint, write=True)
+
+    def incremental_vacuum(self) -> int:
+        """
+        Release free pages beyond the reserve, for at most one time slice.
+
+        Each ``incremental_vacuum`` statement runs in its own write
+        transaction so relay writes can run between them.
+
+        Returns:
+            int: Number of pages released.
+        """
+        settings = self.settings
+        deadline = self.clock() + settings.vacuum_slice_seconds
+        released = 0
+
+        def _step(cursor: sqlite3.Cursor) -> int:
+            excess = (
+                int(cursor.execute("PRAGMA freelist_count").fetchone()[0])
+                - settings.freelist_reserve_pages
+            )
+            if excess <= 0:
+                return 0
+            pages = min(excess, settings.vacuum_pages_per_step)
+            # incremental_vacuum frees one page per sqlite3_step and returns
+            # no rows, so execute() would stop after a single page;
+            # executescript() steps the statement to completion.
+            cursor.executescript(f"PRAGMA incremental_vacuum({pages});")
+            return pages
+
+        while True:
+            pages = self.manager.run_sync(_step, write=True)
+            released += pages
+            if pages == 0 or self.clock() >= deadline:
+                return released
+
+    def run_once(self) -> MaintenanceReport:
+        """
+        Run one maintenance pass.
+
+        Returns:
+            MaintenanceReport: The checkpoint run (if any), pages vacuumed and the metrics afterwards.
+        """
+        before = self.metrics()
+        checkpoint_mode = None
+        busy = False
+        if before.wal_bytes >= self.settings.wal_truncate_bytes:
+            checkpoint_mode = CHECKPOINT_TRUNCATE
+        elif before.wal_bytes >= self.settings.wal_passive_bytes:
+            checkpoint_mode = CHECKPOINT_PASSIVE
+        if checkpoint_mode is not None:
+            busy = self.checkpoint(checkpoint_mode)[0]
+
+        vacuumed = 0
+        if before.freelist_pages > self.settings.freelist_reserve_pages:
+            if before.auto_vacuum == SQLITE_AUTO_VACUUM_MODES[2]:
+                vacuumed = self.incremental_vacuum()
+            elif not self._conversion_hint_logged:
+                self._conversion_hint_logged = True
+                logger.info(
+                    "Database %s uses auto_vacuum=%s, so %d free pages cannot be released; run `mmrelay db vacuum` while the relay is stopped to enable incremental vacuum",
+                    self.db_path,
+                    before.auto_vacuum,
+                    before.freelist_pages,
+                )
+
+        after = self.metrics()
+        logger.debug(
+            "Database maintenance: checkpoint=%s busy=%s vacuumed=%d file=%d wal=%d free_pages=%d",
+            checkpoint_mode,
+            busy,
+            vacuumed,
+            after.file_bytes,
+            after.wal_bytes,
+            after.freelist_pages,
+        )
+        return MaintenanceReport(checkpoint_mode, busy, vacuumed, after)
+
+    def tick(self) -> MaintenanceReport | None:
+        """
+        Run a pass if the maintenance interval has elapsed.
+
+        Returns:
+            MaintenanceReport | None: The pass's report, or None when it was not due.
+        """
+        now = self.clock()
+        if now < self._next_run:
+            return None
+        self._next_run = now + self.settings.interval_seconds
+        return self.run_once()
+
+
+def get_maintenance_settings(config: dict[str, Any] | None) -> MaintenanceSettings:
+    """
+    Read maintenance options from ``database.maintenance``.
+
+    Maintenance is on unless ``enabled`` is false. An invalid
+    ``interval_seconds`` is logged and replaced by the default.
+
+    Parameters:
+        config (dict[str, Any] | None): Application configuration.
+
+    Returns:
+        MaintenanceSettings: The resolved options.
+    """
+    database_section = (
+        config.get(CONFIG_SECTION_DATABASE) if isinstance(config, dict) else None
+    )
+    section = (
+        database_section.get(CONFIG_KEY_MAINTENANCE)
+        if isinstance(database_section, dict)
+        else None
+    )
+    if not isinstance(section, dict):
+        section = {}
+
+    interval = section.get(
+        CONFIG_KEY_MAINTENANCE_INTERVAL, DEFAULT_DB_MAINTENANCE_INTERVAL_SECONDS
+    )
+    if (
+        isinstance(interval, bool)
+        or not isinstance(interval, (int, float))
+        or interval <= 0
+    ):
+        logger.warning(
+            "Invalid database.maintenance.interval_seconds=%r; defaulting to %.1f",
+            interval,
+            DEFAULT_DB_MAINTENANCE_INTERVAL_SECONDS,
+        )
+        interval = DEFAULT_DB_MAINTENANCE_INTERVAL_SECONDS
+    return MaintenanceSettings(
+        enabled=section.get(CONFIG_KEY_ENABLED, True) is not False,
+        interval_seconds=float(interval),
+    )
+
+
+async def run_database_maintenance(
+    shutdown_event: asyncio.Event, settings: MaintenanceSettings
+) -> None:
+    """
+    Run maintenance passes on the relay database every ``settings.interval_seconds`` until shutdown.
+
+    The first pass runs right away. The database manager is looked up on
+    every pass, so a manager recreated after a configuration change is used.
+    A failed pass is logged and retried at the next interval.
+
+    Parameters:
+        shutdown_event (asyncio.Event): Set when the relay shuts down.
+        settings (MaintenanceSettings): Interval and thresholds.
+    """
+    from mmrelay.db_utils import _get_db_manager, get_db_path
+
+    maintenance: DatabaseMaintenance | None = None
+    while not shutdown_event.is_set():
+        try:
+            manager = await asyncio.to_thread(_get_db_manager)
+            if maintenance is None or maintenance.manager is not manager:
+                maintenance = DatabaseMaintenance(
+                    manager, get_db_path(), settings=settings
+                )
+            await asyncio.to_thread(maintenance.run_once)
+        except (sqlite3.Error, OSError, RuntimeError):
+            logger.exception("Database maintenance pass failed")
+        try:
+            await asyncio.wait_for(
+                shutdown_event.wait(), timeout=settings.interval_seconds
+            )
+        except asyncio.TimeoutError:
+            pass
@@ -20,9 +20,15 @@ from typing import Any, Generator, Optional
 
 from mmrelay.constants.database import (
     DB_EXECUTOR_MAX_WORKERS,
+    DB_READ_POOL_MAX_WORKERS,
+    DB_READ_POOL_THREAD_PREFIX,
     DEFAULT_BUSY_TIMEOUT_MS,
+    DEFAULT_CACHE_SIZE_KIB,
+    DEFAULT_MMAP_SIZE_BYTES,
+    PRAGMA_AUTO_VACUUM_INCREMENTAL,
     PRAGMA_FOREIGN_KEYS_ON,
     PRAGMA_JOURNAL_MODE_WAL,
+    PRAGMA_QUERY_ONLY_ON,
     SQLITE_IN_MEMORY_PATH,
     SQLITE_JSON_EACH_PROBE_PAYLOAD,
     SQLITE_JSON_EACH_PROBE_SQL,
@@ -122,11 +128,18 @@ class DatabaseManager:
     (created with `check_same_thread=False`). Write operations are serialized
     via an RLock to ensure only one writer executes at a time. Connections are
     tracked so they can be closed when the manager is reset.
+
+    `run_async` sends writes to a single-worker writer lane, so they run in
+    submission order. In WAL mode, async reads go to a separate pool of
+    ``query_only`` connections instead, so a long scan does not hold up point
+    lookups or writes queued behind it.
     """
 
     _path: str
     _enable_wal: bool
     _busy_timeout_ms: int
+    _cache_size_kib: int
+    _mmap_size_bytes: int
     _extra_pragmas: dict[str, Any]
     _thread_local: threading.local
     _write_lock: threading.RLock
@@ -139,6 +152,7 @@ class DatabaseManager:
     _closing: bool
     _supports_json_each: bool
     _async_executor: ThreadPoolExecutor
+    _read_executor: ThreadPoolExecutor | None
 
     def __init__(
         self,
@@ -147,6 +161,9 @@ class DatabaseManager:
         enable_wal: bool = True,
         busy_timeout_ms: int = DEFAULT_BUSY_TIMEOUT_MS,
         extra_pragmas: Optional[dict[str, Any]] = None,
+        cache_size_kib: int = DEFAULT_CACHE_SIZE_KIB,
+        mmap_size_bytes: int = DEFAULT_MMAP_SIZE_BYTES,
+        read_pool_size: int = DB_READ_POOL_MAX_WORKERS,
     ) -> None:
         """
         Create a DatabaseManager configured for the given SQLite file path.
@@ -158,6 +175,13 @@ class DatabaseManager:
             extra_pragmas (Optional[dict[str, Any]]): Additional PRAGMA directives to apply to each connection.
                 Keys are pragma names and values are either numeric or string pragma values. Invalid pragma
                 names or values will raise when a connection is created.
+            cache_size_kib (int): Page cache size per connection in KiB; 0 keeps SQLite's default.
+                A ``cache_size`` entry in `extra_pragmas` takes precedence.
+            mmap_size_bytes (int): Memory-mapped I/O window in bytes; 0 disables memory-mapped I/O.
+                A ``mmap_size`` entry in `extra_pragmas` takes precedence.
+            read_pool_size (int): Worker threads, each with its own ``query_only`` connection, for
+                `run_async` reads. 0 sends reads to the writer lane; the pool is also disabled for
+                in-memory databases and when WAL is off, where readers cannot run beside the writer.
 
         Notes:
             Construction eagerly creates and validates the first SQLite connection
@@ -169,6 +193,8 @@ class DatabaseManager:
         self._path = path
         self._enable_wal = enable_wal
         self._busy_timeout_ms = busy_timeout_ms
+        self._cache_size_kib = int(cache_size_kib)
+        self._mmap_size_bytes = int(mmap_size_bytes)
         self._extra_pragmas = extra_pragmas or {}
 
         self._thread_local = threading.local()
@@ -179,6 +205,13 @@ class DatabaseManager:
         self._active_sync_count = 0
         self._executor_lock = threading.Lock()
         self._async_executor = ThreadPoolExecutor(max_workers=DB_EXECUTOR_MAX_WORKERS)
+        self._read_executor = None
+        if read_pool_size > 0 and enable_wal and path != SQLITE_IN_MEMORY_PATH:
+            self._read_executor = ThreadPoolExecutor(
+                max_workers=int(read_pool_size),
+                thread_name_prefix=DB_READ_POOL_THREAD_PREFIX,
+                initializer=self._mark_read_worker,
+            )
         self._accepting_submissions = True
         self._closing = False
 
@@ -188,17 +221,22 @@ class DatabaseManager:
             self._thread_local.connection = self._create_connection()
         except BaseException:
             self._async_executor.shutdown(wait=False)
+            if self._read_executor is not None:
+                self._read_executor.shutdown(wait=False)
             raise
 
     # ------------------------------------------------------------------ #
     # Internal helpers
     # ------------------------------------------------------------------ #
 
-    def _create_connection(self) -> sqlite3.Connection:
+    def _create_connection(self, read_only: bool = False) -> sqlite3.Connection:
         """
         Create and configure a new sqlite3.Connection for the manager and register it for later cleanup.
 
-        Configures busy timeout, journal mode (WAL), foreign keys, and any validated extra PRAGMA directives. If configuration fails, the partially configured connection is closed before the error is propagated.
+        Configures busy timeout, incremental auto-vacuum for new databases, journal mode (WAL), page cache and mmap sizes, foreign keys, and any validated extra PRAGMA directives. If configuration fails, the partially configured connection is closed before the error is propagated.
+
+        Parameters:
+            read_only (bool): If true, finish with ``PRAGMA query_only=ON`` so the connection rejects writes.
 
         Returns:
             sqlite3.Connection: A configured and tracked SQLite connection.
@@ -214,10 +252,16 @@ class DatabaseManager:
             with self._write_lock:
                 if self._busy_timeout_ms:
                     conn.execute(f"PRAGMA busy_timeout = {int(self._busy_timeout_ms)}")
+                # Must precede journal_mode, which writes the header of a new database.
+                conn.execute(PRAGMA_AUTO_VACUUM_INCREMENTAL)
                 if self._enable_wal:
                     # journal_mode pragma returns the applied mode; ignore result
                     conn.execute(PRAGMA_JOURNAL_MODE_WAL)
                 conn.execute(PRAGMA_FOREIGN_KEYS_ON)
+                if self._cache_size_kib:
+                    # Negative values are KiB rather than pages.
+                    conn.execute(f"PRAGMA cache_size = {-abs(self._cache_size_kib)}")
+                conn.execute(f"PRAGMA mmap_size = {max(0, self._mmap_size_bytes)}")
                 for pragma, value in self._extra_pragmas.items():
                     # Validate pragma name to prevent injection.
                     if not SQLITE_PRAGMA_NAME_PATTERN.fullmatch(pragma):
@@ -250,6 +294,8 @@ class DatabaseManager:
                         conn.execute(f"PRAGMA {pragma} = {value}")
                     else:
                         raise TypeError(f"Invalid pragma value type: {type(value)}")
+                if read_only:
+                    conn.execute(PRAGMA_QUERY_ONLY_ON)
         except BaseException:
             # Ensure partially configured connection does not leak
             conn.close()
@@ -259,9 +305,10 @@ class DatabaseManager:
             self._connections.add(conn)
             pool_size = len(self._connections)
         logger.debug(
-            "DB conn created: id=%d path=%s manager=%d thread=%s(%d) pool_size=%d",
+            "DB conn created: id=%d path=%s read_only=%s manager=%d thread=%s(%d) pool_size=%d",
             id(conn),
             self._path,
+            read_only,
             id(self),
             threading.current_thread().name,
             threading.current_thread().ident,
@@ -293,10 +340,18 @@ class DatabaseManager:
                     conn = None
 
             if conn is None:
-                conn = self._create_connection()
+                conn = self._create_connection(
+                    read_only=getattr(self._thread_local, "read_only", False)
+                )
                 self._thread_local.connection = conn
             return conn
 
+    def _mark_read_worker(self) -> None:
+        """
+        Flag the current read-pool thread so its connection is opened ``query_only``.
+        """
+        self._thread_local.read_only = True
+
     @contextmanager
     def _sync_activity(self) -> Generator[None, None, None]:
         """
@@ -413,6 +468,9 @@ class DatabaseManager:
         """
         Run a database callable asynchronously and return its result.
 
+        Writes run on the single-worker writer lane in submission order. Reads run on the read pool
+        when there is one, where the connection is ``query_only``; `func` must not write there.
+
         Parameters:
             func (Callable[[sqlite3.Cursor], Any]): Callable that will be invoked with a managed SQLite cursor.
             write (bool, optional): If true, the callable receives a cursor from a transactional write context; otherwise a read-only context is used. Defaults to False.
@@ -433,7 +491,11 @@ class DatabaseManager:
                 raise sqlite3.ProgrammingError(
                     "DatabaseManager is closing, cannot submit new work"
                 )
-            worker_future = self._async_executor.submit(executor_func)
+            if write or self._read_executor is None:
+                executor = self._async_executor
+            else:
+                executor = self._read_executor
+            worker_future = executor.submit(executor_func)
         try:
             return await self._await_submitted_future(worker_future)
         except asyncio.CancelledError:
@@ -524,6 +586,8 @@ class DatabaseManager:
 
         with self._executor_lock:
             self._async_executor.shutdown(wait=True)
+            if self._read_executor is not None:
+                self._read_executor.shutdown(wait=True)
 
         with self._connections_lock:
             while self._active_sync_count > 0:
@@ -4,11 +4,13 @@ import logging
 import os
 import sqlite3
 import threading
-from collections.abc import Collection
+from collections.abc import Collection, Mapping
 from typing import Any, Callable, NamedTuple, cast
 
 from mmrelay.constants.app import DATABASE_FILENAME, LEGACY_DATA_SUBDIR
 from mmrelay.constants.config import (
+    CONFIG_KEY_MSG_MAP,
+    CONFIG_KEY_PARTITION_ROWS,
     CONFIG_SECTION_DATABASE,
     CONFIG_SECTION_DATABASE_LEGACY,
     ENV_BOOL_FALSE_VALUES,
@@ -20,16 +22,27 @@ from mmrelay.constants.database import (
     DEFAULT_BUSY_TIMEOUT_MS,
     DEFAULT_ENABLE_WAL,
     DEFAULT_EXTRA_PRAGMAS,
+    DEFAULT_MSG_MAP_PARTITION_ROWS,
     DEFAULT_NAME_PRUNE_CHUNK_SIZE,
     LEGACY_DATABASE_SUBDIR,
+    MEDIA_CACHE_COLUMNS,
+    MEDIA_CACHE_MAX_AGE_SECS,
+    MEDIA_CACHE_TABLE,
     MESSAGE_MAP_COLUMNS,
+    MESSAGE_MAP_PARTITION_PREFIX,
     MESSAGE_MAP_TABLE,
+    MIN_MSG_MAP_PARTITION_ROWS,
     NAMES_FIELD_LONGNAME,
     NAMES_FIELD_SHORTNAME,
     NAMES_TABLE_LONGNAMES,
     NAMES_TABLE_SHORTNAMES,
+    NODE_SNAPSHOT_COLUMNS,
+    NODE_SNAPSHOT_MAX_AGE_SECS,
+    NODE_SNAPSHOT_TABLE,
     PLUGIN_DATA_COLUMNS,
     PLUGIN_DATA_TABLE,
+    PLUGIN_SERIES_COLUMNS,
+    PLUGIN_SERIES_TABLE,
     PROTO_NODE_NAME_LONG,
     PROTO_NODE_NAME_SHORT,
     PragmaValue,
@@ -41,6 +54,11 @@ from mmrelay.paths import (
     is_deprecation_window_active,
     resolve_all_paths,
 )
+from mmrelay.plugin_data_codec import (
+    decode_plugin_data,
+    encode_plugin_data,
+    plugin_data_to_json,
+)
 
 
 class _InvalidNamesTableError(ValueError):
@@ -61,6 +79,7 @@ _VALID_TABLE_NAMES: frozenset[str] = frozenset(
         "message_map_old_temp",
         "message_map_stale_temp",
         "plugin_data",
+        "plugin_series",
         "longnames",
         "shortnames",
     }
@@ -116,6 +135,16 @@ class NodeNameEntry(NamedTuple):
 
 NodeNameState = tuple[NodeNameEntry, ...]
 
+
+class MediaCacheEntry(NamedTuple):
+    homeserver: str
+    sha256: str
+    encrypted: bool
+    content_uri: str
+    file_info: dict[str, Any] | None
+    last_used: float
+
+
 _CONFLICT_SENTINEL = object()
 _NODE_NAME_DEBUG_ID_SAMPLE_LIMIT = DEBUG_ID_SAMPLE_LIMIT
 
@@ -206,6 +235,64 @@ _CREATE_TABLE_MESSAGE_MAP_SQL = (
     "(meshtastic_id TEXT, matrix_event_id TEXT PRIMARY KEY, "
     "matrix_room_id TEXT, meshtastic_text TEXT, meshtastic_meshnet TEXT)"
 )
+_CREATE_TABLE_PLUGIN_SERIES_SQL = (
+    "CREATE TABLE IF NOT EXISTS plugin_series "
+    "(plugin_name TEXT NOT NULL, meshtastic_id TEXT NOT NULL, metric TEXT NOT NULL, "
+    "ts REAL NOT NULL, value REAL, "
+    "PRIMARY KEY (plugin_name, metric, meshtastic_id, ts)) WITHOUT ROWID"
+)
+_UPSERT_PLUGIN_SERIES_SQL = (
+    "INSERT INTO plugin_series (plugin_name, meshtastic_id, metric, ts, value) "
+    "VALUES (?, ?, ?, ?, ?) "
+    "ON CONFLICT (plugin_name, metric, meshtastic_id, ts) DO UPDATE SET value = excluded.value"
+)
+_GET_PLUGIN_SERIES_SQL = (
+    "SELECT meshtastic_id, ts, value FROM plugin_series "
+    "WHERE plugin_name=? AND metric=? AND ts>=? ORDER BY ts"
+)
+_GET_PLUGIN_SERIES_FOR_NODE_SQL = (
+    "SELECT meshtastic_id, ts, value FROM plugin_series "
+    "WHERE plugin_name=? AND metric=? AND meshtastic_id=? AND ts>=? ORDER BY ts"
+)
+_DELETE_PLUGIN_SERIES_FOR_NODE_SQL = (
+    "DELETE FROM plugin_series WHERE plugin_name=? AND meshtastic_id=?"
+)
+_PRUNE_PLUGIN_SERIES_SQL = "DELETE FROM plugin_series WHERE plugin_name=? AND ts<?"
+_CREATE_TABLE_NODE_SNAPSHOT_SQL = (
+    "CREATE TABLE IF NOT EXISTS node_snapshot "
+    "(meshtastic_id TEXT PRIMARY KEY, data TEXT NOT NULL, saved_at REAL NOT NULL)"
+)
+_UPSERT_NODE_SNAPSHOT_SQL = (
+    "INSERT INTO node_snapshot (meshtastic_id, data, saved_at) VALUES (?, ?, ?) "
+    "ON CONFLICT (meshtastic_id) DO UPDATE SET "
+    "data = excluded.data, saved_at = excluded.saved_at"
+)
+_GET_NODE_SNAPSHOT_SQL = (
+    "SELECT meshtastic_id, data, saved_at FROM node_snapshot WHERE saved_at>=?"
+)
+_PRUNE_NODE_SNAPSHOT_SQL = "DELETE FROM node_snapshot WHERE saved_at<?"
+_CREATE_TABLE_MEDIA_CACHE_SQL = (
+    "CREATE TABLE IF NOT EXISTS media_cache "
+    "(homeserver TEXT NOT NULL, sha256 TEXT NOT NULL, encrypted INTEGER NOT NULL, "
+    "content_uri TEXT NOT NULL, file_info TEXT, last_used REAL NOT NULL, "
+    "PRIMARY KEY (homeserver, sha256, encrypted))"
+)
+_UPSERT_MEDIA_CACHE_SQL = (
+    "INSERT INTO media_cache "
+    "(homeserver, sha256, encrypted, content_uri, file_info, last_used) "
+    "VALUES (?, ?, ?, ?, ?, ?) "
+    "ON CONFLICT (homeserver, sha256, encrypted) DO UPDATE SET "
+    "content_uri = excluded.content_uri, file_info = excluded.file_info, "
+    "last_used = excluded.last_used"
+)
+_GET_MEDIA_CACHE_SQL = (
+    "SELECT homeserver, sha256, encrypted, content_uri, file_info, last_used "
+    "FROM media_cache WHERE last_used>=? ORDER BY last_used DESC LIMIT ?"
+)
+_PRUNE_MEDIA_CACHE_SQL = (
+    "DELETE FROM media_cache WHERE last_used<? OR rowid NOT IN "
+    "(SELECT rowid FROM media_cache ORDER BY last_used DESC LIMIT ?)"
+)
 _UPSERT_PLUGIN_DATA_SQL = (
     "INSERT INTO plugin_data (plugin_name, meshtastic_id, data) VALUES (?, ?, ?) "
     "ON CONFLICT (plugin_name, meshtastic_id) DO UPDATE SET data = excluded.data"
@@ -217,6 +304,13 @@ _GET_PLUGIN_DATA_SQL = (
     "SELECT data FROM plugin_data WHERE plugin_name=? AND meshtastic_id=?"
 )
 _GET_ALL_PLUGIN_DATA_SQL = "SELECT data FROM plugin_data WHERE plugin_name=?"
+# Upserts keep a row's rowid, so rowid order is the order keys were first stored.
+_PRUNE_PLUGIN_DATA_SQL = (
+    "DELETE FROM plugin_data WHERE rowid IN "
+    "(SELECT rowid FROM plugin_data "
+    "WHERE plugin_name=? AND substr(meshtastic_id, 1, ?)=? "
+    "ORDER BY rowid DESC LIMIT -1 OFFSET ?)"
+)
 _UPSERT_MESSAGE_MAP_SQL = (
     "INSERT INTO message_map (meshtastic_id, matrix_event_id, matrix_room_id, meshtastic_text, meshtastic_meshnet) "
     "VALUES (?, ?, ?, ?, ?) "
@@ -321,11 +415,73 @@ _CREATE_INDEX_MESSAGE_MAP_ID_SQL = (
 )
 _DELETE_FROM_MESSAGE_MAP_SQL = "DELETE FROM message_map"
 _SELECT_COUNT_MESSAGE_MAP_SQL = "SELECT COUNT(*) FROM message_map"
+_SELECT_MESSAGE_MAP_EVENT_EXISTS_SQL = (
+    "SELECT 1 FROM message_map WHERE matrix_event_id=?"
+)
 _DELETE_OLDEST_MESSAGE_MAP_SQL = (
     "DELETE FROM message_map WHERE rowid IN "
     "(SELECT rowid FROM message_map ORDER BY rowid ASC LIMIT ?)"
 )
 
+# Partition tables share the message_map schema. Their names are built from an
+# integer sequence number by _message_map_partition_table(), never from input.
+# A name range rather than a bound GLOB pattern keeps the sqlite_master scan cheap.
+_MESSAGE_MAP_PARTITION_NAME_RANGE = (
+    f"type='table' AND name BETWEEN '{MESSAGE_MAP_PARTITION_PREFIX}000000' "
+    f"AND '{MESSAGE_MAP_PARTITION_PREFIX}999999'"
+)
+_LIST_MESSAGE_MAP_PARTITIONS_SQL = (
+    f"SELECT name FROM sqlite_master WHERE {_MESSAGE_MAP_PARTITION_NAME_RANGE}"
+)
+# Largest sequence number the six-digit partition names can hold.
+_MESSAGE_MAP_PARTITION_MAX_SEQ = 999_999
+# Zero-padded sequence numbers sort by name, oldest partition first.
+_MESSAGE_MAP_PARTITION_BOUNDS_SQL = (
+    "SELECT min(name), max(name) FROM sqlite_master "
+    f"WHERE {_MESSAGE_MAP_PARTITION_NAME_RANGE}"
+)
+_CREATE_TABLE_MESSAGE_MAP_PARTITION_SQL = (
+    "CREATE TABLE IF NOT EXISTS {table} "
+    "(meshtastic_id TEXT, matrix_event_id TEXT PRIMARY KEY, "
+    "matrix_room_id TEXT, meshtastic_text TEXT, meshtastic_meshnet TEXT)"
+)
+_CREATE_INDEX_MESSAGE_MAP_PARTITION_ID_SQL = (
+    "CREATE INDEX IF NOT EXISTS idx_{table}_meshtastic_id ON {table} (meshtastic_id)"
+)
+_UPSERT_MESSAGE_MAP_PARTITION_SQL = (
+    "INSERT INTO {table} (meshtastic_id, matrix_event_id, matrix_room_id, meshtastic_text, meshtastic_meshnet) "
+    "VALUES (?, ?, ?, ?, ?) "
+    "ON CONFLICT(matrix_event_id) DO UPDATE SET "
+    "meshtastic_id=excluded.meshtastic_id, "
+    "matrix_room_id=excluded.matrix_room_id, "
+    "meshtastic_text=excluded.meshtastic_text, "
+    "meshtastic_meshnet=excluded.meshtastic_meshnet"
+)
+_GET_MESSAGE_MAP_PARTITION_BY_MESHTASTIC_ID_SQL = (
+    "SELECT matrix_event_id, matrix_room_id, meshtastic_text, meshtastic_meshnet "
+    "FROM {table} WHERE meshtastic_id=? ORDER BY rowid DESC LIMIT 1"
+)
+_GET_MESSAGE_MAP_PARTITION_BY_MATRIX_EVENT_ID_SQL = (
+    "SELECT meshtastic_id, matrix_room_id, meshtastic_text, meshtastic_meshnet "
+    "FROM {table} WHERE matrix_event_id=?"
+)
+# Partitions are append-only, so max(rowid) is their row count without a scan.
+_SELECT_ROWS_MESSAGE_MAP_PARTITION_SQL = "SELECT max(rowid) FROM {table}"
+_SELECT_MESSAGE_MAP_PARTITION_EVENT_EXISTS_SQL = (
+    "SELECT 1 FROM {table} WHERE matrix_event_id=?"
+)
+_DROP_TABLE_MESSAGE_MAP_PARTITION_SQL = "DROP TABLE IF EXISTS {table}"
+_DROP_INDEX_MESSAGE_MAP_PARTITION_ID_SQL = (
+    "DROP INDEX IF EXISTS idx_{table}_meshtastic_id"
+)
+_RENAME_TABLE_MESSAGE_MAP_PARTITION_SQL = "ALTER TABLE {table} RENAME TO {new_table}"
+_MERGE_MESSAGE_MAP_PARTITION_SQL = (
+    "INSERT OR REPLACE INTO message_map "
+    "(meshtastic_id, matrix_event_id, matrix_room_id, meshtastic_text, meshtastic_meshnet) "
+    "SELECT meshtastic_id, matrix_event_id, matrix_room_id, meshtastic_text, meshtastic_meshnet "
+    "FROM {table} ORDER BY rowid"
+)
+
 if MESSAGE_MAP_TABLE != "message_map":
     raise RuntimeError(
         "Message-map constants changed; update static SQL literals in db_utils."
@@ -349,6 +505,41 @@ if (PLUGIN_DATA_TABLE, *PLUGIN_DATA_COLUMNS) != (
         "Plugin-data constants changed; update static SQL literals in db_utils."
     )
 
+if (PLUGIN_SERIES_TABLE, *PLUGIN_SERIES_COLUMNS) != (
+    "plugin_series",
+    "plugin_name",
+    "meshtastic_id",
+    "metric",
+    "ts",
+    "value",
+):
+    raise RuntimeError(
+        "Plugin-series constants changed; update static SQL literals in db_utils."
+    )
+
+if (NODE_SNAPSHOT_TABLE, *NODE_SNAPSHOT_COLUMNS) != (
+    "node_snapshot",
+    "meshtastic_id",
+    "data",
+    "saved_at",
+):
+    raise RuntimeError(
+        "Node-snapshot constants changed; update static SQL literals in db_utils."
+    )
+
+if (MEDIA_CACHE_TABLE, *MEDIA_CACHE_COLUMNS) != (
+    "media_cache",
+    "homeserver",
+    "sha256",
+    "encrypted",
+    "content_uri",
+    "file_info",
+    "last_used",
+):
+    raise RuntimeError(
+        "Media-cache constants changed; update static SQL literals in db_utils."
+    )
+
 if tuple(MESSAGE_MAP_COLUMNS) != (
     "meshtastic_id",
     "matrix_event_id",
@@ -785,7 +976,7 @@ def initialize_database() -> None:
     """
     Initializes the SQLite database schema for the relay application.
 
-    Creates required tables (`longnames`, `shortnames`, `plugin_data`, and `message_map`) if they do not exist, and ensures the `meshtastic_meshnet` column is present in `message_map`. Raises an exception if database initialization fails.
+    Creates required tables (`longnames`, `shortnames`, `plugin_data`, `plugin_series`, `node_snapshot`, `media_cache`, and `message_map`) if they do not exist, and ensures the `meshtastic_meshnet` column is present in `message_map`. Raises an exception if database initialization fails.
     """
     db_path = get_db_path()
     # Check if database exists
@@ -799,9 +990,10 @@ def initialize_database() -> None:
         """
         Create required SQLite tables for the application's schema and apply minimal schema migrations.
 
-        Creates tables: `longnames`, `shortnames`, `plugin_data`, and `message_map`. Attempts to add the
+        Creates tables: `longnames`, `shortnames`, `plugin_data`, `plugin_series`, `node_snapshot`, `media_cache`, and `message_map`. Attempts to add the
         `meshtastic_meshnet` column and to create an index on `message_map(meshtastic_id)`; failures
-        from those upgrade attempts are ignored (safe no-op if already applied).
+        from those upgrade attempts are ignored (safe no-op if already applied). When message_map
+        partitioning is disabled, partitions left from an earlier run are merged back into `message_map`.
 
         Parameters:
             cursor: An sqlite3.Cursor positioned on the target database; used to execute DDL statements.
@@ -809,6 +1001,9 @@ def initialize_database() -> None:
         cursor.execute(_CREATE_TABLE_NAMES_LONG_SQL)
         cursor.execute(_CREATE_TABLE_NAMES_SHORT_SQL)
         cursor.execute(_CREATE_TABLE_PLUGIN_DATA_SQL)
+        cursor.execute(_CREATE_TABLE_PLUGIN_SERIES_SQL)
+        cursor.execute(_CREATE_TABLE_NODE_SNAPSHOT_SQL)
+        cursor.execute(_CREATE_TABLE_MEDIA_CACHE_SQL)
         cursor.execute(_CREATE_TABLE_MESSAGE_MAP_SQL)
         _legacy_table = _MESSAGE_MAP_LEGACY_TABLE
         _validate_identifier(_legacy_table, _VALID_TABLE_NAMES)
@@ -995,6 +1190,14 @@ def initialize_database() -> None:
 
         cursor.execute(_CREATE_INDEX_MESSAGE_MAP_ID_SQL)
 
+        if _get_message_map_partition_rows(warn=True) == 0:
+            merged = _merge_message_map_partitions(cursor)
+            if merged:
+                logger.info(
+                    "Merged %s message_map partitions back into message_map",
+                    merged,
+                )
+
     try:
         manager.run_sync(_initialize, write=True)
     except sqlite3.Error:
@@ -1006,7 +1209,7 @@ def store_plugin_data(plugin_name: str, meshtastic_id: int | str, data: Any) ->
     """
     Store or update JSON-serializable plugin data for a given plugin and Meshtastic node.
 
-    The provided `data` is JSON-serialized and written to the `plugin_data` table keyed by `plugin_name` and the string form of `meshtastic_id`. If `data` is not JSON-serializable the function logs the error and does not write to the database.
+    The provided `data` is encoded with `encode_plugin_data` (JSON text, or a compact BLOB for larger values) and written to the `plugin_data` table keyed by `plugin_name` and the string form of `meshtastic_id`. If `data` is not JSON-serializable the function logs the error and does not write to the database.
 
     Parameters:
         plugin_name (str): The name of the plugin.
@@ -1018,7 +1221,7 @@ def store_plugin_data(plugin_name: str, meshtastic_id: int | str, data: Any) ->
 
     # Serialize payload up front to surface JSON errors before opening a write txn
     try:
-        payload = json.dumps(data)
+        payload = encode_plugin_data(data)
     except (TypeError, ValueError):
         logger.exception(
             "Plugin data for %s/%s is not JSON-serializable", plugin_name, meshtastic_id
@@ -1027,7 +1230,7 @@ def store_plugin_data(plugin_name: str, meshtastic_id: int | str, data: Any) ->
 
     def _store(cursor: sqlite3.Cursor) -> None:
         """
-        Upserts JSON-serialized plugin data for a plugin and Meshtastic node using the provided DB cursor.
+        Upserts encoded plugin data for a plugin and Meshtastic node using the provided DB cursor.
 
         Uses `plugin_name`, `id_key`, and `payload` from the enclosing scope to insert a new row into `plugin_data` or update the existing row on conflict.
 
@@ -1076,9 +1279,36 @@ def delete_plugin_data(plugin_name: str, meshtastic_id: int | str) -> None:
         )
 
 
+def prune_plugin_data(plugin_name: str, key_prefix: str, keep: int) -> int:
+    """
+    Delete a plugin's oldest data rows whose key starts with `key_prefix`, keeping the newest `keep`.
+
+    Parameters:
+        plugin_name (str): The name of the plugin.
+        key_prefix (str): Only rows whose `meshtastic_id` key starts with this are considered.
+        keep (int): Number of most recently added matching rows to keep.
+
+    Returns:
+        int: Number of rows deleted (0 on error).
+    """
+    manager = _get_db_manager()
+    params = (plugin_name, len(key_prefix), key_prefix, max(0, int(keep)))
+    try:
+        return cast(
+            int,
+            manager.run_sync(
+                lambda cursor: cursor.execute(_PRUNE_PLUGIN_DATA_SQL, params).rowcount,
+                write=True,
+            ),
+        )
+    except sqlite3.Error:
+        logger.exception("Database error pruning plugin data for %s", plugin_name)
+        return 0
+
+
 def get_plugin_data_for_node(plugin_name: str, meshtastic_id: int | str) -> Any:
     """
-    Retrieve the JSON-serialized value for a plugin and Meshtastic node.
+    Retrieve the stored value for a plugin and Meshtastic node.
 
     If no row exists or a database/decoding error occurs, returns an empty list as a fallback.
 
@@ -1087,7 +1317,7 @@ def get_plugin_data_for_node(plugin_name: str, meshtastic_id: int | str) -> Any:
         meshtastic_id (int | str): Identifier of the Meshtastic node; will be normalized to a string.
 
     Returns:
-        Any: The deserialized JSON value (may be dict, list, scalar, etc.) for the given plugin and node, or `[]` if none is stored or on error.
+        Any: The decoded value (may be dict, list, scalar, etc.) for the given plugin and node, or `[]` if none is stored or on error.
     """
     manager = _get_db_manager()
     id_key = str(meshtastic_id)
@@ -1113,8 +1343,8 @@ def get_plugin_data_for_node(plugin_name: str, meshtastic_id: int | str) -> Any:
         return []
 
     try:
-        return json.loads(result[0] if result else "[]")
-    except (json.JSONDecodeError, TypeError):
+        return decode_plugin_data(result[0] if result else "[]")
+    except (ValueError, TypeError):
         logger.exception(
             "Failed to decode JSON data for plugin %s, node %s",
             plugin_name,
@@ -1131,7 +1361,7 @@ def get_plugin_data(plugin_name: str) -> list[tuple[Any, ...]]:
         plugin_name (str): Name of the plugin to query.
 
     Returns:
-        list[tuple]: Rows matching the plugin; each row is a single-item tuple containing the stored JSON string from the `data` column.
+        list[tuple]: Rows matching the plugin; each row is a single-item tuple containing the stored value as a JSON string. Rows stored in a BLOB format are converted to JSON; rows that cannot be decoded are logged and skipped.
     """
     manager = _get_db_manager()
 
@@ -1158,7 +1388,320 @@ def get_plugin_data(plugin_name: str) -> list[tuple[Any, ...]]:
         )
         return []
 
-    return cast(list[tuple[Any, ...]], result)
+    rows: list[tuple[Any, ...]] = []
+    for row in cast(list[tuple[Any, ...]], result):
+        if isinstance(row[0], str):
+            rows.append(row)
+            continue
+        try:
+            rows.append((plugin_data_to_json(row[0]),))
+        except (ValueError, TypeError):
+            logger.exception("Failed to decode stored data for plugin %s", plugin_name)
+    return rows
+
+
+def store_plugin_series(
+    plugin_name: str,
+    meshtastic_id: int | str,
+    timestamp: float,
+    values: dict[str, float | int | None],
+) -> None:
+    """
+    Record numeric samples for a node in the `plugin_series` table, one row per metric.
+
+    Unlike `store_plugin_data`, which rewrites a node's whole value, each sample is a
+    separate typed row, so appending and reading a time range never touch older samples.
+    A sample stored again for the same metric and timestamp replaces the earlier one.
+
+    Parameters:
+        plugin_name (str): The name of the plugin.
+        meshtastic_id (int | str): The Meshtastic node identifier; it is converted to a string for storage.
+        timestamp (float): Sample time in seconds since the epoch.
+        values (dict[str, float | int | None]): Metric name to value; None records a missing reading.
+    """
+    manager = _get_db_manager()
+    id_key = str(meshtastic_id)
+    rows = [
+        (plugin_name, id_key, metric, float(timestamp), value)
+        for metric, value in values.items()
+    ]
+    if not rows:
+        return
+
+    try:
+        manager.run_sync(
+            lambda cursor: cursor.executemany(_UPSERT_PLUGIN_SERIES_SQL, rows),
+            write=True,
+        )
+    except sqlite3.Error:
+        logger.exception(
+            "Database error storing plugin series for %s, %s",
+            plugin_name,
+            meshtastic_id,
+        )
+
+
+def get_plugin_series(
+    plugin_name: str,
+    metric: str,
+    *,
+    meshtastic_id: int | str | None = None,
+    since: float | None = None,
+) -> list[tuple[str, float, float | None]]:
+    """
+    Read samples of one metric from the `plugin_series` table in time order.
+
+    Parameters:
+        plugin_name (str): The name of the plugin.
+        metric (str): Metric name passed to `store_plugin_series`.
+        meshtastic_id (int | str | None): Limit the result to one node; all nodes when None.
+        since (float | None): Only return samples at or after this timestamp.
+
+    Returns:
+        list[tuple[str, float, float | None]]: (meshtastic_id, timestamp, value) rows, or `[]` on error.
+    """
+    manager = _get_db_manager()
+    lower_bound = float("-inf") if since is None else float(since)
+    if meshtastic_id is None:
+        query: tuple[str, tuple[Any, ...]] = (
+            _GET_PLUGIN_SERIES_SQL,
+            (plugin_name, metric, lower_bound),
+        )
+    else:
+        query = (
+            _GET_PLUGIN_SERIES_FOR_NODE_SQL,
+            (plugin_name, metric, str(meshtastic_id), lower_bound),
+        )
+
+    try:
+        return cast(
+            list[tuple[str, float, float | None]],
+            manager.run_sync(lambda cursor: cursor.execute(*query).fetchall()),
+        )
+    except (MemoryError, sqlite3.Error):
+        logger.exception(
+            "Database error retrieving plugin series %s for %s", metric, plugin_name
+        )
+        return []
+
+
+def delete_plugin_series(plugin_name: str, meshtastic_id: int | str) -> None:
+    """
+    Remove every stored sample of a plugin for a Meshtastic node.
+
+    Parameters:
+        plugin_name (str): The name of the plugin.
+        meshtastic_id (int | str): The Meshtastic node identifier.
+    """
+    manager = _get_db_manager()
+    id_key = str(meshtastic_id)
+    try:
+        manager.run_sync(
+            lambda cursor: cursor.execute(
+                _DELETE_PLUGIN_SERIES_FOR_NODE_SQL, (plugin_name, id_key)
+            ),
+            write=True,
+        )
+    except sqlite3.Error:
+        logger.exception(
+            "Database error deleting plugin series for %s, %s",
+            plugin_name,
+            meshtastic_id,
+        )
+
+
+def prune_plugin_series(plugin_name: str, older_than: float) -> int:
+    """
+    Delete a plugin's samples recorded before a timestamp.
+
+    Parameters:
+        plugin_name (str): The name of the plugin.
+        older_than (float): Samples with a timestamp below this value are removed.
+
+    Returns:
+        int: Number of samples deleted (0 on error).
+    """
+    manager = _get_db_manager()
+    try:
+        return cast(
+            int,
+            manager.run_sync(
+                lambda cursor: cursor.execute(
+                    _PRUNE_PLUGIN_SERIES_SQL, (plugin_name, float(older_than))
+                ).rowcount,
+                write=True,
+            ),
+        )
+    except sqlite3.Error:
+        logger.exception("Database error pruning plugin series for %s", plugin_name)
+        return 0
+
+
+def save_node_snapshot(nodes: Mapping[str, dict[str, Any]], saved_at: float) -> bool:
+    """
+    Persist NodeDB entries to the `node_snapshot` table in one transaction.
+
+    Rows not refreshed for `NODE_SNAPSHOT_MAX_AGE_SECS` are dropped in the same transaction.
+
+    Parameters:
+        nodes (Mapping[str, dict[str, Any]]): JSON-serializable NodeDB entries keyed by node ID.
+        saved_at (float): Save time in seconds since the epoch.
+
+    Returns:
+        bool: True if the transaction committed, False on database or encoding errors.
+    """
+    manager = _get_db_manager()
+    try:
+        rows = [
+            (str(node_id), json.dumps(node, separators=(",", ":")), float(saved_at))
+            for node_id, node in nodes.items()
+        ]
+    except (TypeError, ValueError):
+        logger.exception("Failed to encode NodeDB snapshot")
+        return False
+
+    def _save(cursor: sqlite3.Cursor) -> None:
+        cursor.executemany(_UPSERT_NODE_SNAPSHOT_SQL, rows)
+        cursor.execute(
+            _PRUNE_NODE_SNAPSHOT_SQL, (float(saved_at) - NODE_SNAPSHOT_MAX_AGE_SECS,)
+        )
+
+    try:
+        manager.run_sync(_save, write=True)
+    except sqlite3.Error:
+        logger.exception("Database error saving NodeDB snapshot")
+        return False
+    return True
+
+
+def load_node_snapshot(now: float) -> dict[str, tuple[dict[str, Any], float]]:
+    """
+    Read the saved NodeDB entries that are younger than `NODE_SNAPSHOT_MAX_AGE_SECS`.
+
+    Parameters:
+        now (float): Current time in seconds since the epoch.
+
+    Returns:
+        dict[str, tuple[dict[str, Any], float]]: Node ID to (entry, saved_at); `{}` on error.
+        Rows that do not decode to a dict are skipped.
+    """
+    manager = _get_db_manager()
+    try:
+        rows = manager.run_sync(
+            lambda cursor: cursor.execute(
+                _GET_NODE_SNAPSHOT_SQL, (float(now) - NODE_SNAPSHOT_MAX_AGE_SECS,)
+            ).fetchall()
+        )
+    except (MemoryError, sqlite3.Error):
+        logger.exception("Database error loading NodeDB snapshot")
+        return {}
+
+    snapshot: dict[str, tuple[dict[str, Any], float]] = {}
+    for node_id, data, saved_at in rows:
+        try:
+            node = json.loads(data)
+        except (TypeError, ValueError):
+            logger.warning("Skipping undecodable NodeDB snapshot row for %s", node_id)
+            continue
+        if isinstance(node, dict):
+            snapshot[node_id] = (node, saved_at)
+    return snapshot
+
+
+def save_media_cache_entry(entry: MediaCacheEntry, max_entries: int) -> bool:
+    """
+    Persist an uploaded-media cache entry and trim the `media_cache` table.
+
+    Entries beyond the `max_entries` most recently used ones, and entries unused
+    for `MEDIA_CACHE_MAX_AGE_SECS`, are dropped in the same transaction.
+
+    Parameters:
+        entry (MediaCacheEntry): Entry to insert or refresh.
+        max_entries (int): Number of most recently used entries to keep.
+
+    Returns:
+        bool: True if the transaction committed, False on database or encoding errors.
+    """
+    manager = _get_db_manager()
+    try:
+        file_info = (
+            json.dumps(entry.file_info, separators=(",", ":"))
+            if entry.file_info is not None
+            else None
+        )
+    except (TypeError, ValueError):
+        logger.exception("Failed to encode media cache entry")
+        return False
+    row = (
+        entry.homeserver,
+        entry.sha256,
+        int(bool(entry.encrypted)),
+        entry.content_uri,
+        file_info,
+        float(entry.last_used),
+    )
+
+    def _save(cursor: sqlite3.Cursor) -> None:
+        cursor.execute(_UPSERT_MEDIA_CACHE_SQL, row)
+        cursor.execute(
+            _PRUNE_MEDIA_CACHE_SQL,
+            (float(entry.last_used) - MEDIA_CACHE_MAX_AGE_SECS, int(max_entries)),
+        )
+
+    try:
+        manager.run_sync(_save, write=True)
+    except sqlite3.Error:
+        logger.exception("Database error saving media cache entry")
+        return False
+    return True
+
+
+def load_media_cache(now: float, max_entries: int) -> list[MediaCacheEntry]:
+    """
+    Read the most recently used uploaded-media cache entries.
+
+    Parameters:
+        now (float): Current time in seconds since the epoch; entries unused for
+            `MEDIA_CACHE_MAX_AGE_SECS` are skipped.
+        max_entries (int): Maximum number of entries to return.
+
+    Returns:
+        list[MediaCacheEntry]: Entries from least to most recently used; `[]` on error.
+    """
+    manager = _get_db_manager()
+    try:
+        rows = manager.run_sync(
+            lambda cursor: cursor.execute(
+                _GET_MEDIA_CACHE_SQL,
+                (float(now) - MEDIA_CACHE_MAX_AGE_SECS, int(max_entries)),
+            ).fetchall()
+        )
+    except (MemoryError, sqlite3.Error):
+        logger.exception("Database error loading media cache")
+        return []
+
+    entries = []
+    for homeserver, sha256, encrypted, content_uri, file_info, last_used in reversed(
+        rows
+    ):
+        try:
+            decoded_info = json.loads(file_info) if file_info is not None else None
+        except (TypeError, ValueError):
+            logger.warning("Skipping undecodable media cache row for %s", content_uri)
+            continue
+        if decoded_info is not None and not isinstance(decoded_info, dict):
+            continue
+        entries.append(
+            MediaCacheEntry(
+                homeserver,
+                sha256,
+                bool(encrypted),
+                content_uri,
+                decoded_info,
+                last_used,
+            )
+        )
+    return entries
 
 
 def get_longname(meshtastic_id: int | str) -> str | None:
@@ -1870,6 +2413,57 @@ def sync_name_tables_if_changed(
     return previous_state
 
 
+def upsert_node_names(entries: Collection[NodeNameEntry]) -> bool:
+    """
+    Write changed node names to the longname/shortname tables in one transaction.
+
+    Only names that are set are written; a `None` field leaves the stored value untouched.
+    Clearing names and pruning departed nodes is left to `sync_name_tables_if_changed`.
+
+    Parameters:
+        entries (Collection[NodeNameEntry]): Per-node name changes.
+
+    Returns:
+        bool: True if the transaction committed (or there was nothing to write), False on database errors.
+    """
+    if not entries:
+        return True
+    manager = _get_db_manager()
+    long_upsert_sql = _UPSERT_NAME_SQL_BY_TABLE[NAMES_TABLE_LONGNAMES]
+    short_upsert_sql = _UPSERT_NAME_SQL_BY_TABLE[NAMES_TABLE_SHORTNAMES]
+
+    def _upsert(cursor: sqlite3.Cursor) -> None:
+        cursor.executemany(
+            long_upsert_sql,
+            [
+                (entry.meshtastic_id, entry.long_name)
+                for entry in entries
+                if entry.long_name is not None
+            ],
+        )
+        cursor.executemany(
+            short_upsert_sql,
+            [
+                (entry.meshtastic_id, entry.short_name)
+                for entry in entries
+                if entry.short_name is not None
+            ],
+        )
+
+    try:
+        manager.run_sync(_upsert, write=True)
+    except sqlite3.Error:
+        logger.exception("Database error writing node-name changes")
+        return False
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug(
+            "Node-name changes written for %d IDs: %s",
+            len(entries),
+            _format_node_id_sample([entry.meshtastic_id for entry in entries]),
+        )
+    return True
+
+
 def _update_names_core(
     nodes: dict[str, Any],
     *,
@@ -2274,6 +2868,307 @@ def update_shortnames(nodes: dict[str, Any]) -> bool:
     )
 
 
+def _get_message_map_partition_rows(*, warn: bool = False) -> int:
+    """
+    Return the configured number of rows per message_map partition table.
+
+    Reads `database.msg_map.partition_rows`, falling back to the legacy `db.msg_map` section.
+
+    Parameters:
+        warn (bool): Log a warning when the configured value is invalid.
+
+    Positive values below `MIN_MSG_MAP_PARTITION_ROWS` are raised to it.
+
+    Returns:
+        int: Rows per partition, or 0 when partitioning is disabled, unset or invalid.
+    """
+    if not isinstance(config, dict):
+        return DEFAULT_MSG_MAP_PARTITION_ROWS
+    msg_map_cfg: Any = None
+    for section_name in (CONFIG_SECTION_DATABASE, CONFIG_SECTION_DATABASE_LEGACY):
+        section = config.get(section_name)
+        if isinstance(section, dict) and isinstance(
+            section.get(CONFIG_KEY_MSG_MAP), dict
+        ):
+            msg_map_cfg = section[CONFIG_KEY_MSG_MAP]
+            break
+    if msg_map_cfg is None:
+        return DEFAULT_MSG_MAP_PARTITION_ROWS
+    value = msg_map_cfg.get(CONFIG_KEY_PARTITION_ROWS, DEFAULT_MSG_MAP_PARTITION_ROWS)
+    if isinstance(value, bool) or not isinstance(value, int) or value < 0:
+        if warn:
+            logger.warning(
+                "Invalid msg_map.partition_rows value %r; message_map partitioning is disabled",
+                value,
+            )
+        return DEFAULT_MSG_MAP_PARTITION_ROWS
+    if 0 < value < MIN_MSG_MAP_PARTITION_ROWS:
+        if warn:
+            logger.warning(
+                "msg_map.partition_rows value %s is below the minimum; using %s",
+                value,
+                MIN_MSG_MAP_PARTITION_ROWS,
+            )
+        return MIN_MSG_MAP_PARTITION_ROWS
+    return value
+
+
+def _message_map_partition_table(seq: int) -> str:
+    """
+    Return the table name of the message_map partition with sequence number `seq`.
+    """
+    return f"{MESSAGE_MAP_PARTITION_PREFIX}{int(seq):06d}"
+
+
+def _list_message_map_partitions(cursor: sqlite3.Cursor) -> list[int]:
+    """
+    List the sequence numbers of existing message_map partitions, oldest first.
+
+    Parameters:
+        cursor (sqlite3.Cursor): Cursor used to query sqlite_master.
+
+    Returns:
+        list[int]: Partition sequence numbers in ascending order.
+    """
+    cursor.execute(_LIST_MESSAGE_MAP_PARTITIONS_SQL)
+    sequences = []
+    for row in cursor.fetchall():
+        suffix = str(row[0])[len(MESSAGE_MAP_PARTITION_PREFIX) :]
+        if suffix.isdigit():
+            sequences.append(int(suffix))
+    return sorted(sequences)
+
+
+def _message_map_partition_bounds(cursor: sqlite3.Cursor) -> tuple[int, int]:
+    """
+    Return the sequence numbers of the oldest and newest message_map partitions.
+
+    Partitions are only ever added after the newest and dropped from the oldest, so every
+    sequence number between the two exists.
+
+    Returns:
+        tuple[int, int]: `(oldest, newest)`, or `(0, 0)` when there are no partitions.
+    """
+    cursor.execute(_MESSAGE_MAP_PARTITION_BOUNDS_SQL)
+    row = cursor.fetchone()
+    bounds = []
+    for name in row or (None, None):
+        suffix = str(name or "")[len(MESSAGE_MAP_PARTITION_PREFIX) :]
+        bounds.append(int(suffix) if suffix.isdigit() else 0)
+    if not all(bounds):
+        return 0, 0
+    return bounds[0], bounds[1]
+
+
+def _message_map_partition_rows(cursor: sqlite3.Cursor, seq: int) -> int:
+    """
+    Return the number of rows written to a message_map partition.
+    """
+    table = _message_map_partition_table(seq)
+    cursor.execute(
+        _SELECT_ROWS_MESSAGE_MAP_PARTITION_SQL.format(table=table)  # nosec B608
+    )
+    row = cursor.fetchone()
+    return int(row[0] or 0) if row else 0
+
+
+def _drop_message_map_partition(cursor: sqlite3.Cursor, seq: int) -> None:
+    """
+    Drop a message_map partition table together with its index.
+    """
+    table = _message_map_partition_table(seq)
+    cursor.execute(
+        _DROP_TABLE_MESSAGE_MAP_PARTITION_SQL.format(table=table)  # nosec B608
+    )
+
+
+def _renumber_message_map_partitions(cursor: sqlite3.Cursor) -> int:
+    """
+    Renumber the existing message_map partitions from 1, keeping their order.
+
+    Called when the newest sequence number reaches the largest six-digit name.
+    Each partition's index is recreated under its new name so it cannot clash
+    with the index of a partition created later.
+
+    Parameters:
+        cursor (sqlite3.Cursor): Cursor inside the write transaction.
+
+    Returns:
+        int: Sequence number of the newest partition after renumbering.
+    """
+    sequences = _list_message_map_partitions(cursor)
+    # Ascending order: each target was vacated by an earlier rename.
+    for new_seq, seq in enumerate(sequences, 1):
+        if new_seq == seq:
+            continue
+        table = _message_map_partition_table(seq)
+        new_table = _message_map_partition_table(new_seq)
+        cursor.execute(
+            _DROP_INDEX_MESSAGE_MAP_PARTITION_ID_SQL.format(table=table)  # nosec B608
+        )
+        cursor.execute(
+            _RENAME_TABLE_MESSAGE_MAP_PARTITION_SQL.format(  # nosec B608
+                table=table, new_table=new_table
+            )
+        )
+        cursor.execute(
+            _CREATE_INDEX_MESSAGE_MAP_PARTITION_ID_SQL.format(  # nosec B608
+                table=new_table
+            )
+        )
+    return len(sequences)
+
+
+def _get_writable_message_map_partition(
+    cursor: sqlite3.Cursor, partition_rows: int
+) -> str:
+    """
+    Return the partition new message_map rows go to, starting a new one when the newest is full.
+
+    When the newest partition already has the largest sequence number, the
+    partitions are renumbered from 1 first; if none can be freed that way the
+    newest partition keeps growing.
+
+    Parameters:
+        cursor (sqlite3.Cursor): Cursor inside the write transaction.
+        partition_rows (int): Rows per partition.
+
+    Returns:
+        str: Name of the partition table to insert into.
+    """
+    _oldest, newest = _message_map_partition_bounds(cursor)
+    if newest and _message_map_partition_rows(cursor, newest) < partition_rows:
+        return _message_map_partition_table(newest)
+    if newest >= _MESSAGE_MAP_PARTITION_MAX_SEQ:
+        newest = _renumber_message_map_partitions(cursor)
+        if newest >= _MESSAGE_MAP_PARTITION_MAX_SEQ:
+            return _message_map_partition_table(newest)
+    table = _message_map_partition_table(newest + 1)
+    cursor.execute(
+        _CREATE_TABLE_MESSAGE_MAP_PARTITION_SQL.format(table=table)  # nosec B608
+    )
+    cursor.execute(
+        _CREATE_INDEX_MESSAGE_MAP_PARTITION_ID_SQL.format(table=table)  # nosec B608
+    )
+    return table
+
+
+def _lookup_message_map(
+    cursor: sqlite3.Cursor,
+    table_sql: str,
+    partition_sql: str,
+    params: tuple[Any, ...],
+) -> tuple[Any, ...] | None:
+    """
+    Run a single-row message_map lookup, checking the newest partitions first.
+
+    The base message_map table holds rows written before partitioning was enabled, so it is checked last.
+
+    Parameters:
+        cursor (sqlite3.Cursor): Cursor used to run the queries.
+        table_sql (str): Query against the base message_map table.
+        partition_sql (str): The same query as a template with a `{table}` placeholder.
+        params (tuple[Any, ...]): Query parameters.
+
+    Returns:
+        tuple[Any, ...] | None: The first matching row, or `None` if no table has one.
+    """
+    if _get_message_map_partition_rows() > 0:
+        oldest, newest = _message_map_partition_bounds(cursor)
+        for seq in range(newest, oldest - 1, -1) if newest else ():
+            table = _message_map_partition_table(seq)
+            cursor.execute(partition_sql.format(table=table), params)  # nosec B608
+            row = cursor.fetchone()
+            if row:
+                return cast(tuple[Any, ...], row)
+    cursor.execute(table_sql, params)
+    return cast(tuple[Any, ...] | None, cursor.fetchone())
+
+
+def _find_message_map_event_table(
+    cursor: sqlite3.Cursor, matrix_event_id: str
+) -> str | None:
+    """
+    Return the message_map table that already holds `matrix_event_id`, if any.
+
+    Partitions are checked newest first, then the base message_map table.
+
+    Parameters:
+        cursor (sqlite3.Cursor): Cursor used to run the queries.
+        matrix_event_id (str): Matrix event ID to look for.
+
+    Returns:
+        str | None: Name of the table holding the event, or None if no table does.
+    """
+    oldest, newest = _message_map_partition_bounds(cursor)
+    for seq in range(newest, oldest - 1, -1) if newest else ():
+        table = _message_map_partition_table(seq)
+        cursor.execute(
+            _SELECT_MESSAGE_MAP_PARTITION_EVENT_EXISTS_SQL.format(  # nosec B608
+                table=table
+            ),
+            (matrix_event_id,),
+        )
+        if cursor.fetchone():
+            return table
+    cursor.execute(_SELECT_MESSAGE_MAP_EVENT_EXISTS_SQL, (matrix_event_id,))
+    return MESSAGE_MAP_TABLE if cursor.fetchone() else None
+
+
+def _merge_message_map_partitions(cursor: sqlite3.Cursor) -> int:
+    """
+    Fold all message_map partitions back into the base table and drop them.
+
+    Used when partitioning has been turned off so existing mappings stay reachable.
+
+    Returns:
+        int: Number of partitions merged.
+    """
+    sequences = _list_message_map_partitions(cursor)
+    for seq in sequences:
+        table = _message_map_partition_table(seq)
+        cursor.execute(
+            _MERGE_MESSAGE_MAP_PARTITION_SQL.format(table=table)  # nosec B608
+        )
+        _drop_message_map_partition(cursor, seq)
+    return len(sequences)
+
+
+def _prune_message_map_partitions(cursor: sqlite3.Cursor, msgs_to_keep: int) -> int:
+    """
+    Expire message_map rows by dropping whole partitions.
+
+    Rows left in the base table from before partitioning are trimmed row by row first. Partitions are
+    then dropped, oldest first, while the rows that remain still number at least `msgs_to_keep`; the
+    newest partition is never dropped. Up to one partition's worth of extra rows may therefore be kept.
+
+    Returns:
+        int: Number of rows removed.
+    """
+    counts = [
+        (seq, _message_map_partition_rows(cursor, seq))
+        for seq in _list_message_map_partitions(cursor)
+    ]
+    cursor.execute(_SELECT_COUNT_MESSAGE_MAP_SQL)
+    row = cursor.fetchone()
+    base_rows = row[0] if row else 0
+    total = base_rows + sum(count for _seq, count in counts)
+
+    removed = 0
+    if base_rows and total > msgs_to_keep:
+        to_delete = min(base_rows, total - msgs_to_keep)
+        cursor.execute(_DELETE_OLDEST_MESSAGE_MAP_SQL, (to_delete,))
+        total -= to_delete
+        removed += to_delete
+    for seq, count in counts[:-1]:
+        if total - count < msgs_to_keep:
+            break
+        _drop_message_map_partition(cursor, seq)
+        total -= count
+        removed += count
+    return removed
+
+
 def _store_message_map_core(
     cursor: sqlite3.Cursor,
     meshtastic_id: str,
@@ -2285,6 +3180,9 @@ def _store_message_map_core(
     """
     Insert or update a mapping between a Meshtastic message (or node) and a Matrix event.
 
+    When `database.msg_map.partition_rows` is set, a new row goes to the newest message_map partition;
+    an event already stored in an older partition or the base table is updated where it is.
+
     Parameters:
         cursor (sqlite3.Cursor): Active database cursor used to execute the statement.
         meshtastic_id (str): Meshtastic message or node identifier (string-normalized).
@@ -2293,16 +3191,25 @@ def _store_message_map_core(
         meshtastic_text (str): Text content of the Meshtastic message.
         meshtastic_meshnet (str | None): Optional meshnet flag or value associated with the Meshtastic message.
     """
-    cursor.execute(
-        _UPSERT_MESSAGE_MAP_SQL,
-        (
-            meshtastic_id,
-            matrix_event_id,
-            matrix_room_id,
-            meshtastic_text,
-            meshtastic_meshnet,
-        ),
+    params = (
+        meshtastic_id,
+        matrix_event_id,
+        matrix_room_id,
+        meshtastic_text,
+        meshtastic_meshnet,
     )
+    partition_rows = _get_message_map_partition_rows()
+    if partition_rows > 0:
+        table = _find_message_map_event_table(
+            cursor, matrix_event_id
+        ) or _get_writable_message_map_partition(cursor, partition_rows)
+        if table != MESSAGE_MAP_TABLE:
+            cursor.execute(
+                _UPSERT_MESSAGE_MAP_PARTITION_SQL.format(table=table),  # nosec B608
+                params,
+            )
+            return
+    cursor.execute(_UPSERT_MESSAGE_MAP_SQL, params)
 
 
 def store_message_map(
@@ -2370,8 +3277,12 @@ def get_message_map_by_meshtastic_id(
         Returns:
             `(matrix_event_id, matrix_room_id, meshtastic_text, meshtastic_meshnet)` tuple if a row exists, `None` otherwise.
         """
-        cursor.execute(_GET_MESSAGE_MAP_BY_MESHTASTIC_ID_SQL, (id_key,))
-        return cast(tuple[Any, ...] | None, cursor.fetchone())
+        return _lookup_message_map(
+            cursor,
+            _GET_MESSAGE_MAP_BY_MESHTASTIC_ID_SQL,
+            _GET_MESSAGE_MAP_PARTITION_BY_MESHTASTIC_ID_SQL,
+            (id_key,),
+        )
 
     try:
         result = manager.run_sync(_fetch)
@@ -2396,6 +3307,48 @@ def get_message_map_by_meshtastic_id(
         return None
 
 
+def _fetch_message_map_by_matrix_event_id(
+    cursor: sqlite3.Cursor, matrix_event_id: str
+) -> tuple[Any, ...] | None:
+    """
+    Fetch a single row from message_map for a Matrix event ID.
+
+    Parameters:
+        cursor (sqlite3.Cursor): SQLite cursor used to execute the query.
+        matrix_event_id (str): Matrix event ID to look up.
+
+    Returns:
+        tuple[Any, ...] | None: Tuple (meshtastic_id, matrix_room_id, meshtastic_text, meshtastic_meshnet) if a matching row is found, `None` otherwise.
+    """
+    return _lookup_message_map(
+        cursor,
+        _GET_MESSAGE_MAP_BY_MATRIX_EVENT_ID_SQL,
+        _GET_MESSAGE_MAP_PARTITION_BY_MATRIX_EVENT_ID_SQL,
+        (matrix_event_id,),
+    )
+
+
+def _unpack_matrix_event_message_map_row(
+    result: tuple[Any, ...] | None, matrix_event_id: str
+) -> tuple[str, str, str, str | None] | None:
+    """
+    Convert a message_map row fetched by Matrix event ID into the public tuple, logging malformed rows.
+    """
+    logger.debug(
+        "Retrieved message map by matrix_event_id=%s: %s", matrix_event_id, result
+    )
+    if not result:
+        return None
+    try:
+        return result[0], result[1], result[2], result[3]
+    except (IndexError, TypeError):
+        logger.exception(
+            "Malformed data in message_map for matrix_event_id %s",
+            matrix_event_id,
+        )
+        return None
+
+
 def get_message_map_by_matrix_event_id(
     matrix_event_id: str,
 ) -> tuple[str, str, str, str | None] | None:
@@ -2410,34 +3363,44 @@ def get_message_map_by_matrix_event_id(
     """
     manager = _get_db_manager()
 
-    def _fetch(cursor: sqlite3.Cursor) -> tuple[Any, ...] | None:
-        """
-        Fetch a single row from message_map for the Matrix event ID taken from the enclosing scope.
+    try:
+        result = manager.run_sync(
+            lambda cursor: _fetch_message_map_by_matrix_event_id(
+                cursor, matrix_event_id
+            )
+        )
+        return _unpack_matrix_event_message_map_row(result, matrix_event_id)
+    except (UnicodeDecodeError, sqlite3.Error):
+        logger.exception(
+            "Database error retrieving message map for matrix_event_id %s",
+            matrix_event_id,
+        )
+        return None
 
-        Parameters:
-            cursor (sqlite3.Cursor): SQLite cursor used to execute the query.
 
-        Returns:
-            tuple[Any, ...] | None: Tuple (meshtastic_id, matrix_room_id, meshtastic_text, meshtastic_meshnet) if a matching row is found, `None` otherwise.
-        """
-        cursor.execute(_GET_MESSAGE_MAP_BY_MATRIX_EVENT_ID_SQL, (matrix_event_id,))
-        return cast(tuple[Any, ...] | None, cursor.fetchone())
+async def async_get_message_map_by_matrix_event_id(
+    matrix_event_id: str,
+) -> tuple[str, str, str, str | None] | None:
+    """
+    Retrieve the mapping row for a given Matrix event ID without blocking the event loop.
 
+    The lookup runs on the database read pool, so it does not queue behind
+    writes or long scans on the writer lane.
+
+    Parameters:
+        matrix_event_id (str): Matrix event ID to look up.
+
+    Returns:
+        tuple[str, str, str, str | None] | None: A tuple (meshtastic_id, matrix_room_id, meshtastic_text, meshtastic_meshnet) if a matching row exists, `None` otherwise.
+    """
     try:
-        result = manager.run_sync(_fetch)
-        logger.debug(
-            "Retrieved message map by matrix_event_id=%s: %s", matrix_event_id, result
-        )
-        if not result:
-            return None
-        try:
-            return result[0], result[1], result[2], result[3]
-        except (IndexError, TypeError):
-            logger.exception(
-                "Malformed data in message_map for matrix_event_id %s",
-                matrix_event_id,
+        manager = await asyncio.to_thread(_get_db_manager)
+        result = await manager.run_async(
+            lambda cursor: _fetch_message_map_by_matrix_event_id(
+                cursor, matrix_event_id
             )
-            return None
+        )
+        return _unpack_matrix_event_message_map_row(result, matrix_event_id)
     except (UnicodeDecodeError, sqlite3.Error):
         logger.exception(
             "Database error retrieving message map for matrix_event_id %s",
@@ -2454,12 +3417,14 @@ def wipe_message_map() -> None:
 
     def _wipe(cursor: sqlite3.Cursor) -> None:
         """
-        Delete all rows from the message_map table.
+        Delete all rows from the message_map table and drop its partitions.
 
         Parameters:
             cursor (sqlite3.Cursor): Cursor used to execute the deletion.
         """
         cursor.execute(_DELETE_FROM_MESSAGE_MAP_SQL)
+        for seq in _list_message_map_partitions(cursor):
+            _drop_message_map_partition(cursor, seq)
 
     try:
         manager.run_sync(_wipe, write=True)
@@ -2472,9 +3437,13 @@ def _prune_message_map_core(cursor: sqlite3.Cursor, msgs_to_keep: int) -> int:
     """
     Prune the message_map table to retain only the most recent msgs_to_keep rows.
 
+    With partitioning enabled, expired rows are removed by dropping whole partitions.
+
     Returns:
         int: Number of rows deleted (0 if no rows were removed).
     """
+    if _get_message_map_partition_rows() > 0:
+        return _prune_message_map_partitions(cursor, msgs_to_keep)
     cursor.execute(_SELECT_COUNT_MESSAGE_MAP_SQL)
     row = cursor.fetchone()
     total = row[0] if row else 0
@@ -7,6 +7,7 @@ formatting across all components of the meshtastic-matrix-relay application.
 
 import os
 import sys
+import threading
 from typing import Any, Dict, List, Literal, Optional, TypedDict
 
 from mmrelay.cli_utils import get_command
@@ -167,6 +168,149 @@ def get_e2ee_status(
     return status
 
 
+def _e2ee_config_fingerprint(config: Dict[str, Any]) -> tuple[Any, Any]:
+    """Return the config values `get_e2ee_status` depends on."""
+    matrix_section = config.get(CONFIG_SECTION_MATRIX, {})
+    if not isinstance(matrix_section, dict):
+        return (None, None)
+    return tuple(  # type: ignore[return-value]
+        (
+            section.get("enabled")
+            if isinstance(section := matrix_section.get(key), dict)
+            else None
+        )
+        for key in ("e2ee", "encryption")
+    )
+
+
+class E2EEStatusService:
+    """
+    Memoized E2EE status plus the encryption state of each Matrix room.
+
+    `get_e2ee_status` probes the platform, the crypto dependencies and several
+    credentials locations on disk. The relay consults it on every send into an
+    encrypted room it cannot encrypt for, so the result is computed once per
+    configuration and reused until `invalidate` is called (credentials saved,
+    E2EE store created), the configuration is reloaded, or a different config
+    path or E2EE setting is passed in.
+    """
+
+    def __init__(self) -> None:
+        self._status: E2EEStatus | None = None
+        self._key: tuple[Any, ...] | None = None
+        self._config_generation = 0
+        self._encrypted_rooms: set[str] = set()
+        self._lock = threading.Lock()
+
+    def _cache_key(
+        self, config: Dict[str, Any], config_path: Optional[str]
+    ) -> tuple[Any, ...]:
+        return (
+            self._config_generation,
+            config_path,
+            _e2ee_config_fingerprint(config),
+        )
+
+    def note_config_loaded(self) -> None:
+        """Start a new configuration generation; statuses memoized for earlier loads no longer match."""
+        with self._lock:
+            self._config_generation += 1
+
+    def peek(
+        self, config: Dict[str, Any], config_path: Optional[str] = None
+    ) -> E2EEStatus | None:
+        """
+        Return the memoized status for this configuration without probing, or None on a miss.
+        """
+        key = self._cache_key(config, config_path)
+        with self._lock:
+            if self._status is None or self._key != key:
+                return None
+            return _copy_status(self._status)
+
+    def get(
+        self, config: Dict[str, Any], config_path: Optional[str] = None
+    ) -> E2EEStatus:
+        """
+        Return the E2EE status for this configuration, computing it on a cache miss.
+
+        Parameters:
+            config (Dict[str, Any]): Parsed application configuration.
+            config_path (Optional[str]): Path to the application config file.
+
+        Returns:
+            E2EEStatus: A copy of the memoized status; see `get_e2ee_status`.
+        """
+        cached = self.peek(config, config_path)
+        if cached is not None:
+            return cached
+        key = self._cache_key(config, config_path)
+        status = get_e2ee_status(config, config_path)
+        with self._lock:
+            self._status = status
+            self._key = key
+        return _copy_status(status)
+
+    def invalidate(self) -> None:
+        """Forget the memoized status so the next `get` probes again."""
+        with self._lock:
+            self._status = None
+            self._key = None
+
+    def note_room_encrypted(self, room_id: str) -> None:
+        """Record that a room has encryption enabled (from an ``m.room.encryption`` state event)."""
+        with self._lock:
+            self._encrypted_rooms.add(room_id)
+
+    def is_room_encrypted(self, room_id: str, room: Any = None) -> bool:
+        """
+        Return whether a room is encrypted.
+
+        Matrix rooms cannot turn encryption off again, so a room seen with an
+        ``m.room.encryption`` state event stays encrypted; otherwise the
+        client's room state is consulted.
+
+        Parameters:
+            room_id (str): Matrix room ID.
+            room: The client's room object, if known.
+        """
+        if room_id in self._encrypted_rooms:
+            return True
+        return bool(getattr(room, "encrypted", False))
+
+    def reset(self) -> None:
+        """Forget the memoized status and all room encryption state."""
+        with self._lock:
+            self._status = None
+            self._key = None
+            self._encrypted_rooms.clear()
+
+
+def _copy_status(status: E2EEStatus) -> E2EEStatus:
+    copied = status.copy()
+    if "issues" in status:
+        copied["issues"] = list(status["issues"])
+    return copied
+
+
+_status_service = E2EEStatusService()
+
+
+def get_e2ee_status_service() -> E2EEStatusService:
+    """Return the process-wide E2EE status service."""
+    return _status_service
+
+
+def invalidate_e2ee_status() -> None:
+    """Forget the memoized E2EE status, e.g. after credentials were written."""
+    _status_service.invalidate()
+
+
+def note_e2ee_config_loaded() -> None:
+    """Mark the memoized E2EE status as belonging to the previous configuration load."""
+    _status_service.note_config_loaded()
+
+
 def _check_credentials_available(
     config_path: Optional[str] = None, paths_info: Optional[Dict[str, Any]] = None
 ) -> bool:
@@ -0,0 +1,174 @@
+"""
+Shared HTTP client for plugins that call external JSON APIs.
+
+Plugins fetch from worker threads (via ``asyncio.to_thread``), so this
+layer is thread-safe: one pooled ``requests.Session`` is shared by all
+callers, identical requests that are already in flight are coalesced into a
+single upstream call, and decoded responses are kept in a TTL cache.
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Hashable, Mapping
+from concurrent.futures import Future
+from typing import Any
+
+import requests
+
+from mmrelay.constants.network import HTTP_CACHE_MAX_ENTRIES, HTTP_POOL_MAXSIZE
+
+__all__ = [
+    "CachedHttpClient",
+    "close_http_session",
+    "get_http_session",
+    "http_get",
+]
+
+_session: requests.Session | None = None
+_session_lock = threading.Lock()
+
+
+def get_http_session() -> requests.Session:
+    """
+    Return the process-wide pooled HTTP session, creating it on first use.
+
+    Returns:
+        requests.Session: Session keeping up to `HTTP_POOL_MAXSIZE` connections per host.
+    """
+    global _session
+    with _session_lock:
+        if _session is None:
+            session = requests.Session()
+            adapter = requests.adapters.HTTPAdapter(pool_maxsize=HTTP_POOL_MAXSIZE)
+            session.mount("https://", adapter)
+            session.mount("http://", adapter)
+            _session = session
+        return _session
+
+
+def close_http_session() -> None:
+    """Close the shared session and its pooled connections."""
+    global _session
+    with _session_lock:
+        session, _session = _session, None
+    if session is not None:
+        session.close()
+
+
+def http_get(
+    url: str, params: Mapping[str, str] | None = None, timeout: float | None = None
+) -> requests.Response:
+    """
+    Send a GET request through the shared pooled session.
+
+    Parameters:
+        url (str): Request URL.
+        params (Mapping[str, str] | None): Query parameters.
+        timeout (float | None): Request timeout in seconds.
+
+    Returns:
+        requests.Response: The response; the status is not checked.
+    """
+    session = get_http_session()
+    if params is None:
+        return session.get(url, timeout=timeout)
+    return session.get(url, params=params, timeout=timeout)
+
+
+class CachedHttpClient:
+    """
+    JSON GET client with in-flight request coalescing and a TTL cache.
+
+    Cached values are shared between callers and must be treated as read-only.
+    Failed requests are not cached; callers waiting on a coalesced request
+    receive the same exception as the caller that made it.
+    """
+
+    def __init__(
+        self,
+        ttl: float,
+        timeout: float,
+        max_entries: int = HTTP_CACHE_MAX_ENTRIES,
+    ) -> None:
+        """
+        Parameters:
+            ttl (float): Seconds a successful response is served from the cache.
+            timeout (float): Request timeout in seconds.
+            max_entries (int): Maximum cached responses; the least recently used are evicted first.
+        """
+        self.ttl = ttl
+        self.timeout = timeout
+        self.max_entries = max_entries
+        self.upstream_requests = 0
+        self.cache_hits = 0
+        self.coalesced_requests = 0
+        self._cache: OrderedDict[Hashable, tuple[float, Any]] = OrderedDict()
+        self._in_flight: dict[Hashable, Future[Any]] = {}
+        self._lock = threading.Lock()
+
+    def get_json(
+        self,
+        url: str,
+        params: Mapping[str, str] | None = None,
+        cache_key: Hashable | None = None,
+    ) -> Any:
+        """
+        GET `url` and return the decoded JSON body, from the cache when possible.
+
+        Parameters:
+            url (str): Request URL.
+            params (Mapping[str, str] | None): Query parameters.
+            cache_key (Hashable | None): Key identifying equivalent requests; defaults to the URL and parameters.
+
+        Returns:
+            Any: The decoded JSON response.
+
+        Raises:
+            requests.exceptions.RequestException: If the request fails or returns an error status.
+            ValueError: If the response body is not valid JSON.
+        """
+        if cache_key is None:
+            cache_key = (url, tuple(sorted(params.items())) if params else ())
+
+        with self._lock:
+            cached = self._cache.get(cache_key)
+            if cached is not None and cached[0] > time.monotonic():
+                self._cache.move_to_end(cache_key)
+                self.cache_hits += 1
+                return cached[1]
+            pending = self._in_flight.get(cache_key)
+            if pending is not None:
+                self.coalesced_requests += 1
+            else:
+                future: Future[Any] = Future()
+                self._in_flight[cache_key] = future
+                self.upstream_requests += 1
+        if pending is not None:
+            return pending.result()
+
+        try:
+            data = self._fetch(url, params)
+        except BaseException as exc:
+            with self._lock:
+                self._in_flight.pop(cache_key, None)
+            future.set_exception(exc)
+            raise
+        with self._lock:
+            self._cache[cache_key] = (time.monotonic() + self.ttl, data)
+            self._cache.move_to_end(cache_key)
+            while len(self._cache) > self.max_entries:
+                self._cache.popitem(last=False)
+            self._in_flight.pop(cache_key, None)
+        future.set_result(data)
+        return data
+
+    def _fetch(self, url: str, params: Mapping[str, str] | None) -> Any:
+        response = http_get(url, params=params, timeout=self.timeout)
+        response.raise_for_status()
+        return response.json()
+
+    def clear(self) -> None:
+        """Drop all cached responses."""
+        with self._lock:
+            self._cache.clear()
@@ -0,0 +1,137 @@
+"""
+Import-time profiling for ``mmrelay --profile-imports``.
+
+The command being profiled runs in a child interpreter started with
+``-X importtime``, so every module it imports is timed, including the ones
+the CLI itself needs before it parses arguments. The child's timing output
+is parsed into `ImportTiming` records and written to a report.
+"""
+
+import os
+import subprocess  # nosec B404 - runs the current interpreter with fixed arguments
+import sys
+from collections.abc import Iterable, Mapping, Sequence
+from dataclasses import dataclass
+
+__all__ = [
+    "ImportTiming",
+    "format_import_report",
+    "parse_importtime",
+    "run_with_importtime",
+    "total_import_time_us",
+]
+
+_IMPORTTIME_PREFIX = "import time:"
+
+
+@dataclass(frozen=True)
+class ImportTiming:
+    """Timing of one imported module, as reported by ``-X importtime``."""
+
+    module: str
+    self_us: int
+    cumulative_us: int
+    depth: int
+
+
+def parse_importtime(lines: Iterable[str]) -> tuple[list[ImportTiming], list[str]]:
+    """
+    Split ``-X importtime`` output from other stderr lines.
+
+    Parameters:
+        lines (Iterable[str]): Lines written to stderr by the profiled interpreter.
+
+    Returns:
+        tuple[list[ImportTiming], list[str]]: The timings in the order modules
+        finished importing, and the lines that were not timing records.
+    """
+    timings: list[ImportTiming] = []
+    other: list[str] = []
+    for line in lines:
+        line = line.rstrip("\n")
+        if not line.startswith(_IMPORTTIME_PREFIX):
+            other.append(line)
+            continue
+        fields = line[len(_IMPORTTIME_PREFIX) :].split("|", 2)
+        if len(fields) != 3:
+            other.append(line)
+            continue
+        self_field, cumulative_field, name_field = fields
+        try:
+            self_us = int(self_field)
+            cumulative_us = int(cumulative_field)
+        except ValueError:
+            # The "self [us] | cumulative | imported package" header.
+            continue
+        module = name_field.strip()
+        # One leading space, then two more per nesting level.
+        depth = max(0, (len(name_field) - len(name_field.lstrip(" ")) - 1) // 2)
+        timings.append(ImportTiming(module, self_us, cumulative_us, depth))
+    return timings, other
+
+
+def total_import_time_us(timings: Iterable[ImportTiming]) -> int:
+    """Return the time spent in top-level imports, in microseconds."""
+    return sum(timing.cumulative_us for timing in timings if timing.depth == 0)
+
+
+def run_with_importtime(
+    python_args: Sequence[str], env: Mapping[str, str] | None = None
+) -> tuple[int, list[ImportTiming], list[str]]:
+    """
+    Run the current interpreter with ``-X importtime`` and collect its timings.
+
+    The child's standard output is passed through unchanged.
+
+    Parameters:
+        python_args (Sequence[str]): Interpreter arguments, e.g. ``["-m", "mmrelay", "config", "check"]``.
+        env (Mapping[str, str] | None): Environment for the child; defaults to the current one.
+
+    Returns:
+        tuple[int, list[ImportTiming], list[str]]: The child's exit code, its
+        import timings, and its other stderr lines.
+    """
+    child_env = dict(os.environ if env is None else env)
+    # A child started with -X importtime must not inherit a conflicting setting.
+    child_env.pop("PYTHONPROFILEIMPORTTIME", None)
+    completed = subprocess.run(  # nosec B603 - fixed interpreter and arguments
+        [sys.executable, "-X", "importtime", *python_args],
+        stderr=subprocess.PIPE,
+        text=True,
+        env=child_env,
+        check=False,
+    )
+    timings, other = parse_importtime(completed.stderr.splitlines())
+    return completed.returncode, timings, other
+
+
+def format_import_report(
+    timings: Sequence[ImportTiming], title: str, limit: int | None = None
+) -> str:
+    """
+    Format import timings as a table sorted by cumulative time.
+
+    Parameters:
+        timings (Sequence[ImportTiming]): Timings from `parse_importtime`.
+        title (str): First line of the report, e.g. the profiled command.
+        limit (int | None): Show only this many of the slowest modules.
+
+    Returns:
+        str: The report text.
+    """
+    ranked = sorted(timings, key=lambda timing: timing.cumulative_us, reverse=True)
+    if limit is not None:
+        ranked = ranked[:limit]
+    lines = [
+        title,
+        f"Modules imported: {len(timings)}",
+        f"Total import time: {total_import_time_us(timings) / 1000:.1f} ms",
+        "",
+        f"{'cumulative ms':>14}  {'self ms':>9}  module",
+    ]
+    lines.extend(
+        f"{timing.cumulative_us / 1000:>14.1f}  {timing.self_us / 1000:>9.1f}  "
+        f"{timing.module}"
+        for timing in ranked
+    )
+    return "\n".join(lines) + "\n"
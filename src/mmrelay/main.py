@@ -20,8 +20,9 @@ from nio import (
     RoomMessageEmote,
     RoomMessageNotice,
     RoomMessageText,
+    SyncResponse,
 )
-from nio.events.room_events import RoomMemberEvent
+from nio.events.room_events import RoomEncryptionEvent, RoomMemberEvent
 
 from mmrelay._version import __version__
 from mmrelay.cli_utils import msg_suggest_check_config, msg_suggest_generate_config
@@ -48,6 +49,7 @@ from mmrelay.constants.config import (
     LEGACY_LAYOUT_FINAL_MIGRATION_SERIES,
     LEGACY_LAYOUT_REMOVAL_VERSION,
 )
+from mmrelay.constants.database import DB_TASK_SHUTDOWN_TIMEOUT_SECS
 from mmrelay.constants.network import (
     MATRIX_CLIENT_CLOSE_TIMEOUT_SECS,
     MESHTASTIC_CLOSE_TIMEOUT_SECS,
@@ -55,14 +57,18 @@ from mmrelay.constants.network import (
     NODEDB_BACKOFF_MAX_SECS,
     NODEDB_SHUTDOWN_TIMEOUT_SECS,
 )
-from mmrelay.constants.queue import DEFAULT_MESSAGE_DELAY
+from mmrelay.constants.queue import DEFAULT_MESSAGE_DELAY, INGEST_STOP_TIMEOUT_SEC
+from mmrelay.db_backup import get_snapshot_settings, run_scheduled_snapshots
+from mmrelay.db_maintenance import get_maintenance_settings, run_database_maintenance
 from mmrelay.db_utils import (
+    get_db_path,
     initialize_database,
     wipe_message_map,
 )
 from mmrelay.log_utils import get_logger
 from mmrelay.matrix_utils import InviteMemberEvent  # type: ignore[attr-defined]
 from mmrelay.matrix_utils import (
+    SyncTokenRecorder,
     connect_matrix,
     join_matrix_room,
 )
@@ -70,6 +76,7 @@ from mmrelay.matrix_utils import logger as matrix_logger
 from mmrelay.matrix_utils import (
     on_decryption_failure,
     on_invite,
+    on_room_encryption,
     on_room_member,
     on_room_message,
 )
@@ -81,7 +88,11 @@ from mmrelay.message_queue import (
     stop_message_queue,
 )
 from mmrelay.paths import get_home_dir, get_legacy_dirs, get_legacy_env_vars
-from mmrelay.plugin_loader import load_plugins, shutdown_plugins
+from mmrelay.plugin_loader import (
+    load_plugins,
+    set_scheduler_event_loop,
+    shutdown_plugins,
+)
 
 # Import as module to set event_loop.
 from mmrelay import meshtastic_utils  # isort: skip
@@ -427,6 +438,8 @@ async def main(config: dict[str, Any]) -> None:
     try:
         # Initialize the SQLite database
         initialize_database()
+        # Serve node lookups from the saved NodeDB until the radio streams it
+        meshtastic_utils.hydrate_node_snapshot(config)
 
         # Check database config for wipe_on_restart (preferred format)
         database_config = config.get(CONFIG_SECTION_DATABASE)
@@ -484,10 +497,14 @@ async def main(config: dict[str, Any]) -> None:
     ready_task: asyncio.Task[None] | None = None
     check_connection_task: asyncio.Task[Any] | None = None
     node_name_refresh_task: asyncio.Task[None] | None = None
+    snapshot_task: asyncio.Task[None] | None = None
+    maintenance_task: asyncio.Task[None] | None = None
+    node_snapshot_task: asyncio.Task[None] | None = None
     matrix_client: Any | None = None
     fatal_exception: BaseException | None = None
     plugins_cleanup_needed = False
     message_queue_cleanup_needed = False
+    packet_ingest_cleanup_needed = False
 
     def _set_shutdown_flag() -> None:
         """
@@ -712,6 +729,8 @@ async def main(config: dict[str, Any]) -> None:
     try:
         # Load plugins early (run in executor to avoid blocking event loop with time.sleep)
         plugins_cleanup_needed = True
+        # Plugin background jobs run on this loop.
+        set_scheduler_event_loop(loop)
         await loop.run_in_executor(
             None, functools.partial(load_plugins, passed_config=config)
         )
@@ -734,6 +753,10 @@ async def main(config: dict[str, Any]) -> None:
             )
         message_queue_cleanup_needed = True
 
+        # Decouple Meshtastic packet handling from the radio reader thread
+        meshtastic_utils.start_packet_ingest(config)
+        packet_ingest_cleanup_needed = True
+
         # Connect to Meshtastic
         meshtastic_utils.meshtastic_client = await asyncio.to_thread(
             connect_meshtastic, passed_config=config
@@ -742,6 +765,9 @@ async def main(config: dict[str, Any]) -> None:
             raise ConnectionError(
                 "Failed to connect to Meshtastic. Cannot continue without a relay client."
             )
+        await asyncio.to_thread(
+            meshtastic_utils.connect_additional_radios, config, message_delay
+        )
 
         # Connect to Matrix
         matrix_client = await connect_matrix(passed_config=config)
@@ -775,10 +801,22 @@ async def main(config: dict[str, Any]) -> None:
         matrix_client.add_event_callback(
             cast(Any, on_room_member), cast(Any, (RoomMemberEvent,))
         )
+        # Track m.room.encryption state so sends know which rooms are encrypted
+        matrix_client.add_event_callback(
+            cast(Any, on_room_encryption), cast(Any, (RoomEncryptionEvent,))
+        )
         # Add InviteMemberEvent callback to automatically join mapped rooms on invite
         matrix_client.add_event_callback(
             cast(Any, on_invite), cast(Any, (InviteMemberEvent,))
         )
+        # Persist the sync token so the next startup can resume from it
+        sync_token_recorder = getattr(
+            matrix_client, "mmrelay_sync_token_recorder", None
+        )
+        if isinstance(sync_token_recorder, SyncTokenRecorder):
+            matrix_client.add_response_callback(
+                cast(Any, sync_token_recorder), cast(Any, SyncResponse)
+            )
 
         # Handle signals differently based on the platform
         if sys.platform != WINDOWS_PLATFORM:
@@ -865,6 +903,12 @@ async def main(config: dict[str, Any]) -> None:
                 )
         await _cleanup_meshtastic_reconnect_state(context="startup rollback")
         _remove_ready_file()
+        if packet_ingest_cleanup_needed:
+            await _run_blocking_shutdown_step(
+                meshtastic_utils.stop_packet_ingest,
+                step_name="packet ingest",
+                timeout_seconds=INGEST_STOP_TIMEOUT_SEC,
+            )
         if plugins_cleanup_needed:
             await _run_blocking_shutdown_step(
                 shutdown_plugins,
@@ -877,6 +921,7 @@ async def main(config: dict[str, Any]) -> None:
                 step_name="message queue",
                 timeout_seconds=_MESSAGE_QUEUE_SHUTDOWN_TIMEOUT_SECONDS,
             )
+        await asyncio.to_thread(meshtastic_utils.close_additional_radios)
         await _close_matrix_client_best_effort(context="startup rollback")
         await _close_meshtastic_client_best_effort(context="startup rollback")
         await asyncio.to_thread(meshtastic_utils.shutdown_shared_executors)
@@ -1048,6 +1093,28 @@ async def main(config: dict[str, Any]) -> None:
                     nodedb_refresh_interval_seconds,
                 )
             )
+            snapshot_settings = get_snapshot_settings(config)
+            if snapshot_settings.enabled:
+                snapshot_task = asyncio.create_task(
+                    run_scheduled_snapshots(
+                        shutdown_event, get_db_path(), snapshot_settings
+                    )
+                )
+            nodedb_snapshot_interval_seconds = (
+                meshtastic_utils.get_nodedb_snapshot_interval_seconds(config)
+            )
+            if nodedb_snapshot_interval_seconds > 0:
+                node_snapshot_task = asyncio.create_task(
+                    meshtastic_utils.persist_node_snapshot(
+                        shutdown_event,
+                        interval_seconds=nodedb_snapshot_interval_seconds,
+                    )
+                )
+            maintenance_settings = get_maintenance_settings(config)
+            if maintenance_settings.enabled:
+                maintenance_task = asyncio.create_task(
+                    run_database_maintenance(shutdown_event, maintenance_settings)
+                )
 
             # Ensure message queue processor is started now that event loop is running.
             get_message_queue().ensure_processor_started()
@@ -1206,6 +1273,21 @@ async def main(config: dict[str, Any]) -> None:
             task_name="NodeDB name-cache refresh task",
             timeout_seconds=NODEDB_SHUTDOWN_TIMEOUT_SECS,
         )
+        await _await_background_task_shutdown(
+            node_snapshot_task,
+            task_name="NodeDB snapshot task",
+            timeout_seconds=NODEDB_SHUTDOWN_TIMEOUT_SECS,
+        )
+        await _await_background_task_shutdown(
+            snapshot_task,
+            task_name="database snapshot task",
+            timeout_seconds=DB_TASK_SHUTDOWN_TIMEOUT_SECS,
+        )
+        await _await_background_task_shutdown(
+            maintenance_task,
+            task_name="database maintenance task",
+            timeout_seconds=DB_TASK_SHUTDOWN_TIMEOUT_SECS,
+        )
         await _await_background_task_shutdown(
             check_connection_task,
             task_name="connection health task",
@@ -1213,6 +1295,11 @@ async def main(config: dict[str, Any]) -> None:
         )
         await _cleanup_meshtastic_reconnect_state(context="shutdown")
         # Cleanup
+        await _run_blocking_shutdown_step(
+            meshtastic_utils.stop_packet_ingest,
+            step_name="packet ingest",
+            timeout_seconds=INGEST_STOP_TIMEOUT_SEC,
+        )
         matrix_logger.info("Stopping plugins...")
         await _run_blocking_shutdown_step(
             shutdown_plugins,
@@ -1225,6 +1312,7 @@ async def main(config: dict[str, Any]) -> None:
             step_name="message queue",
             timeout_seconds=_MESSAGE_QUEUE_SHUTDOWN_TIMEOUT_SECONDS,
         )
+        await asyncio.to_thread(meshtastic_utils.close_additional_radios)
         await _close_matrix_client_best_effort(context="shutdown")
         await _close_meshtastic_client_best_effort(context="shutdown")
         await asyncio.to_thread(meshtastic_utils.shutdown_shared_executors)
@@ -1291,6 +1379,9 @@ def run_main(args: Any) -> int:
     set_config(db_utils, config)
     set_config(base_plugin, config)
 
+    # Compile prefix formats now so a bad prefix_format is reported at startup
+    matrix_utils.compile_prefix_templates(config)
+
     # Get config path and log file path for logging
     from mmrelay.config import config_path
     from mmrelay.log_utils import log_file_path
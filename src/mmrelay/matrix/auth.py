@@ -111,6 +111,8 @@ async def _configure_e2ee(
                         await asyncio.to_thread(
                             os.makedirs, e2ee_store_path, exist_ok=True
                         )
+                        # A new E2EE session starts here; probe the status again.
+                        facade.get_e2ee_status_service().invalidate()
                     except OSError as e:
                         facade.logger.error(
                             "Could not create E2EE store directory %s: %s; disabling E2EE for this session.",
@@ -184,6 +186,8 @@ def _initialize_matrix_client(
 
     Returns:
         AsyncClient: A configured AsyncClient instance ready for login and synchronization.
+            Retry limits are zero so room sends see their own 429s; 429s from sync are
+            fed to the send scheduler through a response callback.
     """
     client_config = facade.build_matrix_client_config(
         e2ee_enabled=e2ee_enabled,
@@ -204,7 +208,9 @@ def _initialize_matrix_client(
     if device_id:
         client_kwargs["device_id"] = device_id
 
-    return facade.AsyncClient(**client_kwargs)
+    client = facade.AsyncClient(**client_kwargs)
+    facade.watch_rate_limited_responses(client)
+    return client
 
 
 async def _perform_matrix_login(
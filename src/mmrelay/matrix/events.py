@@ -1,7 +1,7 @@
 """Matrix event handlers.
 
 Extracted from matrix_utils.py — on_room_message, on_decryption_failure,
-on_room_member, and on_invite.
+on_room_member, and on_invite; on_room_encryption tracks encrypted rooms.
 """
 
 import asyncio
@@ -27,7 +27,7 @@ try:
 except ImportError:
     from nio.events.invite_events import InviteMemberEvent
 
-from nio.events.room_events import RoomMemberEvent
+from nio.events.room_events import RoomEncryptionEvent, RoomMemberEvent
 
 import mmrelay.matrix_utils as facade
 from mmrelay.constants.formats import MATRIX_SUPPRESS_KEY
@@ -36,6 +36,7 @@ __all__ = [
     "on_decryption_failure",
     "on_room_message",
     "on_room_member",
+    "on_room_encryption",
     "on_invite",
 ]
 
@@ -415,8 +416,8 @@ async def on_room_message(
             return
 
         if original_matrix_event_id:
-            orig = await asyncio.to_thread(
-                facade.get_message_map_by_matrix_event_id, original_matrix_event_id
+            orig = await facade.async_get_message_map_by_matrix_event_id(
+                original_matrix_event_id
             )
             if not orig:
                 facade.logger.debug(
@@ -561,17 +562,20 @@ async def on_room_message(
                 )
             if not text and mesh_text_override:
                 text = mesh_text_override
-            text = facade.truncate_message(text)
             prefix = facade.get_matrix_prefix(
                 facade.config, longname, shortname, short_meshnet_name
             )
-            full_message = f"{prefix}{text}"
             if not text:
                 facade.logger.warning(
                     "Remote meshnet message from %s had empty text after formatting; skipping relay",
                     meshnet_name,
                 )
                 return
+            mesh_fragments = facade.fragment_message(
+                text,
+                prefix,
+                max_fragments=facade.get_max_message_fragments(facade.config),
+            )
         else:
             return
     else:
@@ -582,8 +586,13 @@ async def on_room_message(
         facade.logger.debug(
             f"Processing matrix message from [{full_display_name}]: {text}"
         )
-        full_message = f"{prefix}{text}"
-        full_message = facade.truncate_message(full_message)
+        # Long messages are split after the prefix is applied, so every
+        # fragment fits the real payload budget.
+        mesh_fragments = facade.fragment_message(
+            text,
+            prefix,
+            max_fragments=facade.get_max_message_fragments(facade.config),
+        )
 
     portnum = event.source["content"].get("meshtastic_portnum")
     if isinstance(portnum, str):
@@ -699,16 +708,41 @@ async def on_room_message(
                     msgs_to_keep,
                 )
 
-            success = facade.queue_message(
-                meshtastic_interface.sendText,
-                text=full_message,
-                channelIndex=meshtastic_channel,
-                description=f"Message from {full_display_name}",
-                mapping_info=mapping_info,
+            send_interface, radio_queue = facade.select_radio_for_send(
+                meshtastic_interface
             )
+            # Fragments go through the queue one by one so they are paced by
+            # message_delay like any other packet. Only the first one carries
+            # the mapping, so mesh replies to the start of a message resolve.
+            fragment_count = len(mesh_fragments)
+            success = False
+            for index, fragment in enumerate(mesh_fragments, start=1):
+                description = f"Message from {full_display_name}"
+                if fragment_count > 1:
+                    description += f" (part {index}/{fragment_count})"
+                if radio_queue is None:
+                    success = facade.queue_message(
+                        meshtastic_interface.sendText,
+                        text=fragment,
+                        channelIndex=meshtastic_channel,
+                        description=description,
+                        mapping_info=mapping_info if index == 1 else None,
+                    )
+                else:
+                    success = radio_queue.enqueue(
+                        send_interface.sendText,
+                        text=fragment,
+                        channelIndex=meshtastic_channel,
+                        description=description,
+                        mapping_info=mapping_info if index == 1 else None,
+                    )
+                if not success:
+                    break
 
             if success:
-                queue_size = facade.get_message_queue().get_queue_size()
+                if radio_queue is None:
+                    radio_queue = facade.get_message_queue()
+                queue_size = radio_queue.get_queue_size()
 
                 if queue_size > 1:
                     meshtastic_logger.info(
@@ -735,6 +769,16 @@ async def on_room_member(room: MatrixRoom, event: RoomMemberEvent) -> None:
     """
 
 
+async def on_room_encryption(room: MatrixRoom, event: RoomEncryptionEvent) -> None:
+    """
+    Record that a room turned on encryption, from its ``m.room.encryption`` state event.
+
+    The E2EE status service keeps the per-room state so the send path can decide
+    whether a room is encrypted without waiting for the client's room state.
+    """
+    facade.get_e2ee_status_service().note_room_encrypted(room.room_id)
+
+
 async def on_invite(room: MatrixRoom, event: InviteMemberEvent) -> None:
     """
     Handle an invite targeted at the bot and join the room when it is configured in matrix_rooms.
@@ -0,0 +1,203 @@
+"""Bounded fan-out of one Meshtastic message to several Matrix rooms.
+
+A channel mapped to many rooms produces one `matrix_relay` call per room.
+The dispatcher gives those calls a shared, render-once `RelayFanout`,
+caps how many room sends run at the same time and keeps sends to the same
+room in the order they were dispatched. Delivery latency is tracked per room.
+"""
+
+import asyncio
+import contextlib
+import threading
+import time
+import weakref
+from typing import Any, AsyncIterator, Callable, Iterable
+
+from mmrelay.constants.network import MATRIX_FANOUT_MAX_CONCURRENCY
+from mmrelay.log_utils import get_logger
+
+__all__ = [
+    "MatrixFanoutDispatcher",
+    "RelayFanout",
+    "get_matrix_fanout_stats",
+    "matrix_room_slot",
+    "record_matrix_delivery_latency",
+    "start_matrix_fanout",
+]
+
+logger = get_logger(name="Matrix")
+
+
+class RelayFanout:
+    """
+    One message on its way to a set of Matrix rooms.
+
+    The rendered plain and HTML bodies are computed by the first room send
+    and reused by the rest. Latencies are measured from creation, i.e. from
+    when the packet was handed to the relay.
+    """
+
+    __slots__ = (
+        "message",
+        "room_ids",
+        "started",
+        "latencies",
+        "_rendered",
+        "_remaining",
+        "_lock",
+    )
+
+    def __init__(self, message: str, room_ids: Iterable[str]) -> None:
+        self.message = message
+        self.room_ids = tuple(room_ids)
+        self.started = time.monotonic()
+        self.latencies: dict[str, float] = {}
+        self._rendered: tuple[str, str] | None = None
+        self._remaining = len(self.room_ids)
+        self._lock = threading.Lock()
+
+    def render(self, renderer: Callable[[str], tuple[str, str]]) -> tuple[str, str]:
+        """Return ``(plain_body, formatted_body)``, calling `renderer` only once."""
+        rendered = self._rendered
+        if rendered is None:
+            rendered = renderer(self.message)
+            self._rendered = rendered
+        return rendered
+
+    def complete(self, room_id: str, delivered: bool) -> float | None:
+        """
+        Record that the send to `room_id` finished.
+
+        Returns:
+            float | None: Seconds from fan-out start to delivery, or None if the send failed.
+        """
+        latency = time.monotonic() - self.started if delivered else None
+        with self._lock:
+            if latency is not None:
+                self.latencies[room_id] = latency
+            self._remaining -= 1
+            finished = self._remaining == 0
+        if finished and self.latencies:
+            logger.debug(
+                "Delivered to %d/%d Matrix rooms; last delivery after %.0f ms",
+                len(self.latencies),
+                len(self.room_ids),
+                max(self.latencies.values()) * 1000,
+            )
+        return latency
+
+
+class _RoomLatency:
+    __slots__ = ("count", "total", "last", "max")
+
+    def __init__(self) -> None:
+        self.count = 0
+        self.total = 0.0
+        self.last = 0.0
+        self.max = 0.0
+
+    def add(self, latency: float) -> None:
+        self.count += 1
+        self.total += latency
+        self.last = latency
+        if latency > self.max:
+            self.max = latency
+
+
+class MatrixFanoutDispatcher:
+    """
+    Concurrency limit, per-room ordering and latency stats for Matrix room sends.
+
+    Asyncio primitives are bound to an event loop, so the semaphore and room
+    locks are kept per loop.
+    """
+
+    def __init__(self, max_concurrency: int = MATRIX_FANOUT_MAX_CONCURRENCY) -> None:
+        """
+        Parameters:
+            max_concurrency (int): Maximum number of room sends in flight at once; must be positive.
+
+        Raises:
+            ValueError: If `max_concurrency` is not positive.
+        """
+        if max_concurrency <= 0:
+            raise ValueError("max_concurrency must be positive")
+        self.max_concurrency = max_concurrency
+        self._loop_state: weakref.WeakKeyDictionary[
+            asyncio.AbstractEventLoop,
+            tuple[asyncio.Semaphore, dict[str, asyncio.Lock]],
+        ] = weakref.WeakKeyDictionary()
+        self._stats: dict[str, _RoomLatency] = {}
+        self._stats_lock = threading.Lock()
+
+    def _state(self) -> tuple[asyncio.Semaphore, dict[str, asyncio.Lock]]:
+        loop = asyncio.get_running_loop()
+        state = self._loop_state.get(loop)
+        if state is None:
+            state = (asyncio.Semaphore(self.max_concurrency), {})
+            self._loop_state[loop] = state
+        return state
+
+    @contextlib.asynccontextmanager
+    async def room_slot(self, room_id: str) -> AsyncIterator[None]:
+        """
+        Hold the send slot for `room_id`.
+
+        Waits for earlier sends to the same room first, then for a free
+        concurrency slot, so a busy room never blocks the global limit.
+        """
+        semaphore, room_locks = self._state()
+        room_lock = room_locks.get(room_id)
+        if room_lock is None:
+            room_lock = room_locks[room_id] = asyncio.Lock()
+        async with room_lock, semaphore:
+            yield
+
+    def record_latency(self, room_id: str, latency: float) -> None:
+        """Add one delivery latency sample (seconds) for `room_id`."""
+        with self._stats_lock:
+            stats = self._stats.get(room_id)
+            if stats is None:
+                stats = self._stats[room_id] = _RoomLatency()
+            stats.add(latency)
+
+    def get_stats(self) -> dict[str, dict[str, float]]:
+        """
+        Return per-room delivery latency statistics.
+
+        Returns:
+            dict: Maps room id to ``count``, ``last_ms``, ``avg_ms`` and ``max_ms``.
+        """
+        with self._stats_lock:
+            return {
+                room_id: {
+                    "count": stats.count,
+                    "last_ms": stats.last * 1000,
+                    "avg_ms": stats.total / stats.count * 1000,
+                    "max_ms": stats.max * 1000,
+                }
+                for room_id, stats in self._stats.items()
+            }
+
+
+_dispatcher = MatrixFanoutDispatcher()
+
+
+def start_matrix_fanout(message: str, room_ids: Iterable[str]) -> RelayFanout:
+    """Create the shared fan-out state for relaying `message` to `room_ids`."""
+    return RelayFanout(message, room_ids)
+
+
+def matrix_room_slot(room_id: str) -> contextlib.AbstractAsyncContextManager[None]:
+    """Acquire the global dispatcher's send slot for `room_id`."""
+    return _dispatcher.room_slot(room_id)
+
+
+def record_matrix_delivery_latency(room_id: str, latency: float) -> None:
+    """Record one delivery latency sample (seconds) for `room_id`."""
+    _dispatcher.record_latency(room_id, latency)
+
+
+def get_matrix_fanout_stats() -> dict[str, dict[str, Any]]:
+    """Return per-room Matrix delivery latency statistics."""
+    return _dispatcher.get_stats()
@@ -1,5 +1,9 @@
+import asyncio
+import hashlib
 import io
 import os
+import time
+from dataclasses import dataclass
 from types import SimpleNamespace
 from typing import Any
 
@@ -8,9 +12,11 @@ from PIL import Image
 
 import mmrelay.matrix_utils as facade
 from mmrelay.constants.domain import MATRIX_EVENT_TYPE_ROOM_MESSAGE
+from mmrelay.db_utils import MediaCacheEntry
 
 __all__ = [
     "ImageUploadError",
+    "UploadedMedia",
     "upload_image",
     "send_room_image",
     "send_image",
@@ -38,20 +44,30 @@ class ImageUploadError(RuntimeError):
         self.upload_response = upload_response
 
 
-async def upload_image(
-    client: AsyncClient, image: Image.Image, filename: str
-) -> UploadResponse | UploadError | SimpleNamespace:
+@dataclass(frozen=True)
+class UploadedMedia:
     """
-    Upload an image to the Matrix content repository and return the upload result.
+    An encrypted attachment in the content repository, returned by encrypted uploads.
+
+    `file_info` holds the attachment's decryption keys. The media cache stores
+    them in plaintext in the ``media_cache`` table, so database backups carry
+    them too.
+    """
+
+    content_uri: str
+    file_info: dict[str, Any] | None = None
+
+
+def _encode_image(image: Image.Image, filename: str) -> tuple[bytes, str]:
+    """
+    Encode a Pillow image in the format implied by `filename`, falling back to PNG.
 
     Parameters:
-        client (AsyncClient): Matrix nio client used to perform the upload.
-        image (PIL.Image.Image): Pillow image to upload.
-        filename (str): Filename used to infer the image MIME type and as the uploaded filename.
+        image (PIL.Image.Image): Pillow image to encode.
+        filename (str): Filename whose extension selects the image format.
 
     Returns:
-        UploadResponse on success (contains `content_uri`).
-        On failure, a SimpleNamespace-like object with `message` and optional `status_code` attributes describing the error.
+        tuple[bytes, str]: The encoded image and its MIME type.
     """
     image_format = os.path.splitext(filename)[1][1:].upper() or "PNG"
     if image_format == "JPG":
@@ -70,38 +86,99 @@ async def upload_image(
         image.save(buffer, format="PNG")
         content_type = "image/png"
 
-    image_data = buffer.getvalue()
+    return buffer.getvalue(), content_type
+
+
+async def upload_image(
+    client: AsyncClient, image: Image.Image, filename: str, *, encrypt: bool = False
+) -> UploadResponse | UploadedMedia | UploadError | SimpleNamespace:
+    """
+    Upload an image to the Matrix content repository and return the upload result.
+
+    The image is encoded in a worker thread. An image whose encoded bytes were
+    already uploaded to the same homeserver is not uploaded again; the cached
+    ``mxc://`` URI (and, for encrypted uploads, its decryption keys) is returned.
+    Decryption keys of encrypted uploads are kept in plaintext in the
+    ``media_cache`` table and in database backups, so anyone who can read the
+    database can decrypt those attachments.
 
+    Parameters:
+        client (AsyncClient): Matrix nio client used to perform the upload.
+        image (PIL.Image.Image): Pillow image to upload.
+        filename (str): Filename used to infer the image MIME type and as the uploaded filename.
+        encrypt (bool): Upload an encrypted attachment for an encrypted room.
+
+    Returns:
+        UploadResponse on success for a plain upload, cached or not (contains
+        `content_uri`); UploadedMedia for an encrypted upload, which also carries
+        `file_info`.
+        On failure, a SimpleNamespace-like object with `message` and optional `status_code` attributes describing the error.
+    """
+    image_data, content_type = await asyncio.to_thread(_encode_image, image, filename)
+    homeserver = str(getattr(client, "homeserver", "") or "")
+    digest = hashlib.sha256(image_data).hexdigest()
+    media_cache = facade.get_media_cache()
+
+    cached = await asyncio.to_thread(media_cache.lookup, homeserver, digest, encrypt)
+    if cached is not None:
+        facade.logger.debug(
+            "Reusing uploaded media %s for unchanged image %s",
+            cached.content_uri,
+            filename,
+        )
+        if not encrypt:
+            return UploadResponse(cached.content_uri)
+        return UploadedMedia(cached.content_uri, dict(cached.file_info or {}))
+
+    upload_kwargs: dict[str, Any] = {"encrypt": True} if encrypt else {}
     try:
-        response, _ = await client.upload(
+        response, decryption_info = await client.upload(
             io.BytesIO(image_data),
             content_type=content_type,
             filename=filename,
             filesize=len(image_data),
+            **upload_kwargs,
         )
     except facade.NIO_COMM_EXCEPTIONS as e:
         facade.logger.exception("Image upload failed due to a network error")
         return SimpleNamespace(message=str(e), status_code=None)
-    else:
+
+    content_uri = getattr(response, "content_uri", None)
+    # Only successful uploads carry an mxc:// URI.
+    if not isinstance(content_uri, str) or not content_uri.startswith("mxc://"):
         return response
 
+    file_info = None
+    if encrypt:
+        file_info = dict(decryption_info or {})
+        response = UploadedMedia(content_uri, file_info)
+    await asyncio.to_thread(
+        media_cache.store,
+        MediaCacheEntry(
+            homeserver, digest, encrypt, content_uri, file_info, time.time()
+        ),
+    )
+    return response
+
 
 async def send_room_image(
     client: AsyncClient,
     room_id: str,
-    upload_response: UploadResponse | UploadError | SimpleNamespace | None,
+    upload_response: (
+        UploadResponse | UploadedMedia | UploadError | SimpleNamespace | None
+    ),
     filename: str = "image.png",
     reply_to_event_id: str | None = None,
 ) -> None:
     """
     Send an uploaded image to a Matrix room.
 
-    If `upload_response` exposes a `content_uri`, sends an `m.image` message referencing that URI and using `filename` as the body. If `content_uri` is missing, logs an error and raises ImageUploadError.
+    If `upload_response` exposes a `content_uri`, sends an `m.image` message referencing that URI and using `filename` as the body. Encrypted uploads (those carrying `file_info`) are referenced through the event's `file` object instead of `url`. If `content_uri` is missing, logs an error and raises ImageUploadError.
 
     Parameters:
         client (AsyncClient): Matrix client used to send the message.
         room_id (str): Target Matrix room ID.
-        upload_response (UploadResponse | UploadError | SimpleNamespace | None): Result from an upload operation; must provide a `content_uri` attribute on success.
+        upload_response (UploadResponse | UploadedMedia | UploadError | SimpleNamespace | None): Result from an upload operation; must provide a `content_uri` attribute on success.
         filename (str): Filename to include as the message body (defaults to "image.png").
         reply_to_event_id (str | None): Optional event ID to reply to.
 
@@ -110,11 +187,12 @@ async def send_room_image(
     """
     content_uri = getattr(upload_response, "content_uri", None)
     if content_uri:
-        content: dict[str, Any] = {
-            "msgtype": "m.image",
-            "url": content_uri,
-            "body": filename,
-        }
+        content: dict[str, Any] = {"msgtype": "m.image", "body": filename}
+        file_info = getattr(upload_response, "file_info", None)
+        if isinstance(file_info, dict) and file_info:
+            content["file"] = {**file_info, "url": content_uri}
+        else:
+            content["url"] = content_uri
         if reply_to_event_id:
             content["m.relates_to"] = {"m.in_reply_to": {"event_id": reply_to_event_id}}
         send_response = await client.room_send(
@@ -151,7 +229,7 @@ async def send_image(
     """
     Upload a Pillow Image to the Matrix content repository and send it to a room.
 
-    Uploads the provided PIL Image, stores it in the client's content repository, and sends it to the specified room as an `m.image` message using the given filename.
+    Uploads the provided PIL Image, stores it in the client's content repository, and sends it to the specified room as an `m.image` message using the given filename. Images for encrypted rooms are uploaded as encrypted attachments.
 
     Parameters:
         reply_to_event_id (str | None): Optional event ID to reply to.
@@ -159,7 +237,16 @@ async def send_image(
     Raises:
         ImageUploadError: If the upload or send operation fails.
     """
-    response = await facade.upload_image(client=client, image=image, filename=filename)
+    rooms = getattr(client, "rooms", None)
+    room = rooms.get(room_id) if isinstance(rooms, dict) else None
+    if facade.get_e2ee_status_service().is_room_encrypted(room_id, room):
+        response = await facade.upload_image(
+            client=client, image=image, filename=filename, encrypt=True
+        )
+    else:
+        response = await facade.upload_image(
+            client=client, image=image, filename=filename
+        )
     await facade.send_room_image(
         client,
         room_id,
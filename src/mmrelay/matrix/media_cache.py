@@ -0,0 +1,127 @@
+"""Content-addressed cache of images uploaded to the Matrix media repository.
+
+Plugins such as map and telemetry often render an image byte-for-byte equal
+to one they uploaded shortly before. Entries are keyed by homeserver, the
+SHA-256 of the encoded image and whether the upload was encrypted, and map to
+the ``mxc://`` URI plus, for encrypted uploads, the key material needed to
+decrypt the attachment. The cache is bounded by an LRU limit and its index is
+kept in the ``media_cache`` table so it survives restarts. That key material is
+stored in plaintext and is copied into database backups.
+"""
+
+import threading
+import time
+from collections import OrderedDict
+
+import mmrelay.matrix_utils as facade
+from mmrelay.constants.database import (
+    MEDIA_CACHE_MAX_AGE_SECS,
+    MEDIA_CACHE_MAX_ENTRIES,
+)
+from mmrelay.db_utils import MediaCacheEntry
+
+__all__ = [
+    "MediaCache",
+    "get_media_cache",
+    "reset_media_cache",
+]
+
+_CacheKey = tuple[str, str, bool]
+
+
+class MediaCache:
+    """
+    LRU map from encoded image digests to uploaded media.
+
+    Methods touch the database and are meant to run in a worker thread.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = MEDIA_CACHE_MAX_ENTRIES,
+        max_age_secs: float = MEDIA_CACHE_MAX_AGE_SECS,
+    ) -> None:
+        self._max_entries = max_entries
+        self._max_age_secs = max_age_secs
+        self._entries: OrderedDict[_CacheKey, MediaCacheEntry] = OrderedDict()
+        self._loaded = False
+        self._lock = threading.Lock()
+
+    def _load_locked(self, now: float) -> None:
+        """Fill the cache from the persisted index on first use."""
+        if self._loaded:
+            return
+        self._loaded = True
+        for entry in facade.load_media_cache(now, self._max_entries):
+            key = (entry.homeserver, entry.sha256, entry.encrypted)
+            self._entries.setdefault(key, entry)
+
+    def lookup(
+        self,
+        homeserver: str,
+        sha256: str,
+        encrypted: bool,
+        now: float | None = None,
+    ) -> MediaCacheEntry | None:
+        """
+        Return the uploaded media for an encoded image and mark it recently used.
+
+        Parameters:
+            homeserver (str): Homeserver URL the media was uploaded to.
+            sha256 (str): Hex SHA-256 of the encoded image bytes.
+            encrypted (bool): Whether an encrypted attachment is needed.
+            now (float | None): Current time in seconds since the epoch.
+
+        Returns:
+            MediaCacheEntry | None: The cached upload, or None if the image must be uploaded.
+        """
+        if now is None:
+            now = time.time()
+        key = (homeserver, sha256, encrypted)
+        with self._lock:
+            self._load_locked(now)
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if entry.last_used < now - self._max_age_secs:
+                del self._entries[key]
+                return None
+            entry = entry._replace(last_used=now)
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+        facade.save_media_cache_entry(entry, self._max_entries)
+        return entry
+
+    def store(self, entry: MediaCacheEntry) -> None:
+        """
+        Record a completed upload, evicting the least recently used entries.
+
+        Parameters:
+            entry (MediaCacheEntry): The upload to remember.
+        """
+        key = (entry.homeserver, entry.sha256, entry.encrypted)
+        with self._lock:
+            self._load_locked(entry.last_used)
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self._max_entries:
+                self._entries.popitem(last=False)
+        facade.save_media_cache_entry(entry, self._max_entries)
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._entries)
+
+
+_cache = MediaCache()
+
+
+def get_media_cache() -> MediaCache:
+    """Return the process-wide uploaded-media cache."""
+    return _cache
+
+
+def reset_media_cache() -> None:
+    """Replace the uploaded-media cache with an empty, unloaded one."""
+    global _cache
+    _cache = MediaCache()
@@ -1,4 +1,6 @@
 import re
+import string
+import threading
 from typing import Any, cast
 from urllib.parse import urlparse
 
@@ -26,6 +28,7 @@ from mmrelay.constants.formats import (
 from mmrelay.constants.messages import (
     DISPLAY_NAME_DEFAULT_LENGTH,
     MAX_TRUNCATION_LENGTH,
+    PREFIX_RENDER_CACHE_SIZE,
 )
 
 __all__ = [
@@ -39,6 +42,11 @@ __all__ = [
     "_add_truncated_vars",
     "_escape_leading_prefix_for_markdown",
     "validate_prefix_format",
+    "PrefixTemplate",
+    "_compile_prefix_template",
+    "_get_prefix_template",
+    "compile_prefix_templates",
+    "clear_prefix_template_cache",
     "get_meshtastic_prefix",
     "get_matrix_prefix",
 ]
@@ -479,13 +487,232 @@ def validate_prefix_format(
         return False, str(e)
 
 
+# Fields each prefix direction exposes, and which of them support {nameN} truncation.
+_MESHTASTIC_PREFIX_FIELDS: frozenset[str] = frozenset(
+    {"display", "user", "username", "server"}
+)
+_MESHTASTIC_TRUNCATED_FIELDS: frozenset[str] = frozenset({"display"})
+_MATRIX_PREFIX_FIELDS: frozenset[str] = frozenset({"long", "short", "mesh"})
+_MATRIX_TRUNCATED_FIELDS: frozenset[str] = frozenset({"long", "mesh"})
+
+_PREFIX_FIELD_ROOT_REGEX = re.compile(r"[.\[]")
+_PREFIX_TRUNCATED_FIELD_REGEX = re.compile(r"^([A-Za-z_]+?)(\d+)$")
+
+_prefix_formatter = string.Formatter()
+_prefix_template_cache: dict[
+    tuple[str, str], tuple["PrefixTemplate | None", str | None]
+] = {}
+
+
+class PrefixTemplate:
+    """
+    A `prefix_format` string compiled once into the fields it actually references.
+
+    Rendering computes only those fields (a `{display5}` slices the name once
+    instead of building every truncation variant) and memoizes the output per
+    combination of source values, so repeated senders cost a dict lookup.
+    """
+
+    __slots__ = ("format_string", "fields", "sources", "_rendered", "_lock")
+
+    def __init__(
+        self, format_string: str, fields: tuple[tuple[str, str, int | None], ...]
+    ) -> None:
+        """
+        Create a template from an already validated format string.
+
+        Parameters:
+            format_string (str): The validated str.format template.
+            fields (tuple): ``(field_name, source_name, length)`` triples; `length` is None for untruncated fields.
+        """
+        self.format_string = format_string
+        self.fields = fields
+        self.sources: tuple[str, ...] = tuple(
+            dict.fromkeys(source for _, source, _ in fields)
+        )
+        self._rendered: dict[tuple[Any, ...], str] = {}
+        self._lock = threading.Lock()
+
+    def render(self, values: dict[str, Any]) -> str:
+        """
+        Format the template from source values such as ``{"long": ..., "mesh": ...}``.
+
+        Truncated fields treat a None source as an empty string, matching `_add_truncated_vars`.
+
+        Raises:
+            AttributeError, IndexError, KeyError, TypeError, ValueError: If formatting fails for these values.
+        """
+        key = tuple(values.get(source) for source in self.sources)
+        try:
+            cached = self._rendered.get(key)
+        except TypeError:
+            # Unhashable source values are rendered without memoization.
+            return self._format(values)
+        if cached is not None:
+            return cached
+        result = self._format(values)
+        with self._lock:
+            if len(self._rendered) >= PREFIX_RENDER_CACHE_SIZE:
+                self._rendered.pop(next(iter(self._rendered)), None)
+            self._rendered[key] = result
+        return result
+
+    def _format(self, values: dict[str, Any]) -> str:
+        format_vars: dict[str, Any] = {}
+        for field_name, source, length in self.fields:
+            value = values.get(source)
+            format_vars[field_name] = (
+                value if length is None else (value or "")[:length]
+            )
+        return self.format_string.format_map(format_vars)
+
+
+def _compile_prefix_template(
+    format_string: str,
+    fields: frozenset[str],
+    truncated_fields: frozenset[str],
+) -> PrefixTemplate:
+    """
+    Parse and validate a prefix format string into a `PrefixTemplate`.
+
+    Parameters:
+        format_string (str): The configured `prefix_format`.
+        fields (frozenset[str]): Field names available in this direction.
+        truncated_fields (frozenset[str]): Fields that also accept a `{nameN}` form, with N from 1 to MAX_TRUNCATION_LENGTH.
+
+    Returns:
+        PrefixTemplate: The compiled template.
+
+    Raises:
+        KeyError: If the format references an unknown field.
+        IndexError: If the format uses positional fields such as `{}` or `{0}`.
+        ValueError: If the format string is malformed or a format spec is invalid.
+    """
+    referenced: dict[str, tuple[str, str, int | None]] = {}
+    for _, field_expr, _, _ in _prefix_formatter.parse(format_string):
+        if field_expr is None:
+            continue
+        field_name = _PREFIX_FIELD_ROOT_REGEX.split(field_expr, maxsplit=1)[0]
+        if not field_name or field_name.isdigit():
+            raise IndexError("positional fields are not supported in prefix_format")
+        if field_name in referenced:
+            continue
+        if field_name in fields:
+            referenced[field_name] = (field_name, field_name, None)
+            continue
+        match = _PREFIX_TRUNCATED_FIELD_REGEX.match(field_name)
+        if (
+            match is None
+            or match.group(1) not in truncated_fields
+            or not 1 <= int(match.group(2)) <= MAX_TRUNCATION_LENGTH
+        ):
+            raise KeyError(field_name)
+        referenced[field_name] = (field_name, match.group(1), int(match.group(2)))
+
+    template = PrefixTemplate(format_string, tuple(referenced.values()))
+    # Catch bad format specs and conversions now rather than on the first message.
+    template._format({source: "sample" for source in template.sources})
+    return template
+
+
+def _get_prefix_template(
+    direction: str, format_string: str
+) -> tuple[PrefixTemplate | None, str | None]:
+    """
+    Return the cached compiled template for a prefix direction, compiling it on first use.
+
+    Parameters:
+        direction (str): `CONFIG_SECTION_MESHTASTIC` for Matrix→Meshtastic prefixes or `CONFIG_SECTION_MATRIX` for Meshtastic→Matrix prefixes.
+        format_string (str): The configured `prefix_format`.
+
+    Returns:
+        tuple: `(template, error)`. `template` is None and `error` describes the problem when the format is invalid; invalid formats are logged once when first compiled.
+    """
+    cache_key = (direction, format_string)
+    cached = _prefix_template_cache.get(cache_key)
+    if cached is not None:
+        return cached
+
+    if direction == CONFIG_SECTION_MATRIX:
+        fields, truncated_fields = _MATRIX_PREFIX_FIELDS, _MATRIX_TRUNCATED_FIELDS
+    else:
+        fields, truncated_fields = (
+            _MESHTASTIC_PREFIX_FIELDS,
+            _MESHTASTIC_TRUNCATED_FIELDS,
+        )
+    try:
+        compiled: tuple[PrefixTemplate | None, str | None] = (
+            _compile_prefix_template(format_string, fields, truncated_fields),
+            None,
+        )
+    except (AttributeError, IndexError, KeyError, TypeError, ValueError) as e:
+        compiled = (None, str(e))
+        facade.logger.warning(
+            "Invalid %s prefix_format '%s': %s. Using default format.",
+            direction,
+            format_string,
+            e,
+        )
+    _prefix_template_cache[cache_key] = compiled
+    return compiled
+
+
+def _configured_prefix_format(
+    config: dict[str, Any], direction: str, default: str
+) -> str | None:
+    """
+    Return the `prefix_format` configured for a direction, or None when prefixes are disabled there.
+    """
+    section = config.get(direction)
+    if not isinstance(section, dict):
+        section = {}
+    if not section.get("prefix_enabled", True):
+        return None
+    prefix_format_value = section.get("prefix_format", default)
+    return str(prefix_format_value) if prefix_format_value is not None else default
+
+
+def compile_prefix_templates(config: dict[str, Any] | None) -> dict[str, str]:
+    """
+    Compile and validate the configured Matrix and Meshtastic prefix formats.
+
+    Called when configuration is loaded so an invalid `prefix_format` is reported at
+    startup instead of on the first relayed message.
+
+    Parameters:
+        config (dict[str, Any] | None): The loaded configuration mapping.
+
+    Returns:
+        dict[str, str]: Error messages keyed by config section (`"meshtastic"` or `"matrix"`) for each invalid format; empty when all enabled formats are valid.
+    """
+    if not isinstance(config, dict):
+        return {}
+    errors: dict[str, str] = {}
+    for direction, default in (
+        (CONFIG_SECTION_MESHTASTIC, DEFAULT_MESHTASTIC_PREFIX),
+        (CONFIG_SECTION_MATRIX, DEFAULT_MATRIX_PREFIX),
+    ):
+        prefix_format = _configured_prefix_format(config, direction, default)
+        if prefix_format is None:
+            continue
+        _, error = _get_prefix_template(direction, prefix_format)
+        if error is not None:
+            errors[direction] = error
+    return errors
+
+
+def clear_prefix_template_cache() -> None:
+    """Discard compiled prefix templates and their memoized output."""
+    _prefix_template_cache.clear()
+
+
 def get_meshtastic_prefix(
     config: dict[str, Any], display_name: str, user_id: str | None = None
 ) -> str:
     """
     Generate the Meshtastic message prefix according to configuration.
 
-    When prefixing is enabled, return a formatted prefix that may include the user's display name and parts of their Matrix ID. The format string can reference these variables: `{display}` (full display name), `{displayN}` (truncated display name where N is a positive integer), `{user}` (full MXID), `{username}` (localpart without leading `@`), and `{server}` (homeserver domain). If the configured format is invalid, a safe default prefix is returned. If prefixing is disabled in the config, return an empty string.
+    When prefixing is enabled, return a formatted prefix that may include the user's display name and parts of their Matrix ID. The format string can reference these variables: `{display}` (full display name), `{displayN}` (truncated display name where N is a positive integer), `{user}` (full MXID), `{username}` (localpart without leading `@`), and `{server}` (homeserver domain). The format is compiled once and cached (see `PrefixTemplate`), so only the referenced variables are computed. If the configured format is invalid, a safe default prefix is returned. If prefixing is disabled in the config, return an empty string.
 
     Parameters:
         user_id (str | None): Optional Matrix ID in the form `@localpart:server`; when provided, `username` and `server` variables are derived from it.
@@ -495,23 +722,13 @@ def get_meshtastic_prefix(
     """
     if not isinstance(config, dict):
         return ""
-    meshtastic_config = config.get(CONFIG_SECTION_MESHTASTIC)
-    if not isinstance(meshtastic_config, dict):
-        meshtastic_config = {}
 
-    # Check if prefixes are enabled
-    if not meshtastic_config.get("prefix_enabled", True):
-        return ""
-
-    # Get custom format or use default
-    prefix_format_value = meshtastic_config.get(
-        "prefix_format", DEFAULT_MESHTASTIC_PREFIX
-    )
-    prefix_format = (
-        str(prefix_format_value)
-        if prefix_format_value is not None
-        else DEFAULT_MESHTASTIC_PREFIX
+    # None means prefixes are disabled for this direction
+    prefix_format = _configured_prefix_format(
+        config, CONFIG_SECTION_MESHTASTIC, DEFAULT_MESHTASTIC_PREFIX
     )
+    if prefix_format is None:
+        return ""
 
     # Parse username and server from user_id if available
     username = ""
@@ -522,38 +739,37 @@ def get_meshtastic_prefix(
         username = parts[0]
         server = parts[1] if len(parts) > 1 else ""
 
-    # Available variables for formatting with variable length support
-    format_vars = {
-        "display": display_name or "",
-        "user": user_id or "",
-        "username": username,
-        "server": server,
-    }
-
-    # Add variable length display name truncation (display1, display2, display3, etc.)
-    _add_truncated_vars(format_vars, "display", display_name)
+    template, _ = _get_prefix_template(CONFIG_SECTION_MESHTASTIC, prefix_format)
+    if template is not None:
+        try:
+            result = template.render(
+                {
+                    "display": display_name or "",
+                    "user": user_id or "",
+                    "username": username,
+                    "server": server,
+                }
+            )
+            facade.logger.debug(
+                "Meshtastic prefix generated (%s): %s",
+                (
+                    "custom format"
+                    if prefix_format != DEFAULT_MESHTASTIC_PREFIX
+                    else "default format"
+                ),
+                result,
+            )
+            return result
+        except (AttributeError, IndexError, KeyError, TypeError, ValueError) as e:
+            facade.logger.warning(
+                f"Invalid prefix_format '{prefix_format}': {e}. Using default format."
+            )
 
-    try:
-        result = prefix_format.format(**format_vars)
-        facade.logger.debug(
-            "Meshtastic prefix generated (%s): %s",
-            (
-                "custom format"
-                if prefix_format != DEFAULT_MESHTASTIC_PREFIX
-                else "default format"
-            ),
-            result,
-        )
-        return result
-    except (AttributeError, IndexError, KeyError, TypeError, ValueError) as e:
-        # Fallback to default format if custom format is invalid
-        facade.logger.warning(
-            f"Invalid prefix_format '{prefix_format}': {e}. Using default format."
-        )
-        # The default format only uses 'display5', which is safe to format
-        return DEFAULT_MESHTASTIC_PREFIX.format(
-            display5=display_name[:DISPLAY_NAME_DEFAULT_LENGTH] if display_name else ""
-        )
+    # Fallback to default format if custom format is invalid.
+    # The default format only uses 'display5', which is safe to format
+    return DEFAULT_MESHTASTIC_PREFIX.format(
+        display5=display_name[:DISPLAY_NAME_DEFAULT_LENGTH] if display_name else ""
+    )
 
 
 def get_matrix_prefix(
@@ -562,7 +778,7 @@ def get_matrix_prefix(
     """
     Generates a formatted prefix string for Meshtastic messages relayed to Matrix, based on configuration settings and sender/mesh network names.
 
-    The prefix format supports variable-length truncation for the sender and mesh network names using template variables (e.g., `{long4}` for the first 4 characters of the sender name). Returns an empty string if prefixing is disabled in the configuration.
+    The prefix format supports variable-length truncation for the sender and mesh network names using template variables (e.g., `{long4}` for the first 4 characters of the sender name). The format is compiled once and the output memoized per sender and mesh network name. Returns an empty string if prefixing is disabled in the configuration.
 
     Parameters:
         longname (str): Full Meshtastic sender name.
@@ -574,52 +790,35 @@ def get_matrix_prefix(
     """
     if not isinstance(config, dict):
         return ""
-    matrix_config = config.get(CONFIG_SECTION_MATRIX)
-    if not isinstance(matrix_config, dict):
-        matrix_config = {}
-
-    # Check if prefixes are enabled for Matrix direction
-    if not matrix_config.get("prefix_enabled", True):
-        return ""
 
-    # Get custom format or use default
-    matrix_prefix_format_value = matrix_config.get(
-        "prefix_format", DEFAULT_MATRIX_PREFIX
+    # None means prefixes are disabled for the Matrix direction
+    matrix_prefix_format = _configured_prefix_format(
+        config, CONFIG_SECTION_MATRIX, DEFAULT_MATRIX_PREFIX
     )
-    matrix_prefix_format = (
-        str(matrix_prefix_format_value)
-        if matrix_prefix_format_value is not None
-        else DEFAULT_MATRIX_PREFIX
-    )
-    # Available variables for formatting with variable length support
-    format_vars = {
-        "long": longname,
-        "short": shortname,
-        "mesh": meshnet_name,
-    }
+    if matrix_prefix_format is None:
+        return ""
 
-    # Add variable length truncation for longname and mesh name
-    _add_truncated_vars(format_vars, "long", longname)
-    _add_truncated_vars(format_vars, "mesh", meshnet_name)
+    template, _ = _get_prefix_template(CONFIG_SECTION_MATRIX, matrix_prefix_format)
+    if template is not None:
+        try:
+            result = template.render(
+                {"long": longname, "short": shortname, "mesh": meshnet_name}
+            )
+            facade.logger.debug(
+                "Matrix prefix generated (%s): %s",
+                (
+                    "custom format"
+                    if matrix_prefix_format != DEFAULT_MATRIX_PREFIX
+                    else "default format"
+                ),
+                result,
+            )
+            return result
+        except (AttributeError, IndexError, KeyError, TypeError, ValueError) as e:
+            facade.logger.warning(
+                f"Invalid matrix prefix_format '{matrix_prefix_format}': {e}. Using default format."
+            )
 
-    try:
-        result = matrix_prefix_format.format(**format_vars)
-        facade.logger.debug(
-            "Matrix prefix generated (%s): %s",
-            (
-                "custom format"
-                if matrix_prefix_format != DEFAULT_MATRIX_PREFIX
-                else "default format"
-            ),
-            result,
-        )
-        return result
-    except (AttributeError, IndexError, KeyError, TypeError, ValueError) as e:
-        # Fallback to default format if custom format is invalid
-        facade.logger.warning(
-            f"Invalid matrix prefix_format '{matrix_prefix_format}': {e}. Using default format."
-        )
-        # The default format only uses 'long' and 'mesh', which are safe
-        return DEFAULT_MATRIX_PREFIX.format(
-            long=longname or "", mesh=meshnet_name or ""
-        )
+    # Fallback to default format if custom format is invalid.
+    # The default format only uses 'long' and 'mesh', which are safe
+    return DEFAULT_MATRIX_PREFIX.format(long=longname or "", mesh=meshnet_name or "")
@@ -8,14 +8,18 @@ import asyncio
 import html
 import re
 import secrets
+import time
 from typing import Any, cast
 
 from nio import RoomSendError
 
 import mmrelay.matrix_utils as facade
+from mmrelay.matrix.fanout import RelayFanout
 
 __all__ = [
     "_get_e2ee_error_message",
+    "_relay_to_room",
+    "_render_matrix_body",
     "_retry_backoff_delay",
     "_send_matrix_message_with_retry",
     "matrix_relay",
@@ -27,13 +31,17 @@ async def _get_e2ee_error_message() -> str:
     Provide a short, user-facing explanation for why End-to-End Encryption (E2EE) is not enabled.
 
     Maps the unified E2EE status to a concise, human-readable message suitable for logging or UI display.
+    The status is memoized by the E2EE status service, so only the first call probes the filesystem.
 
     Returns:
         str: A short explanation of the current E2EE problem, or an empty string if no specific issue is detected.
     """
-    e2ee_status = await asyncio.to_thread(
-        facade.get_e2ee_status, facade.config or {}, facade.config_module.config_path
-    )
+    service = facade.get_e2ee_status_service()
+    config: dict[str, Any] = facade.config or {}
+    config_path = facade.config_module.config_path
+    e2ee_status = service.peek(config, config_path)
+    if e2ee_status is None:
+        e2ee_status = await asyncio.to_thread(service.get, config, config_path)
 
     return cast(str, facade.get_e2ee_error_message(dict(e2ee_status)))
 
@@ -71,6 +79,8 @@ async def _send_matrix_message_with_retry(
 
     This function will not send to an encrypted room if the client has E2EE disabled; in that case it returns `None`. It retries on transient errors such as timeouts and network/transport exceptions.
 
+    Every attempt first waits for the homeserver's send scheduler. An `M_LIMIT_EXCEEDED` response opens the scheduler's shared backoff window using the server's `retry_after_ms`, so concurrent sends wait out the same window instead of each retrying on its own schedule.
+
     Parameters:
         matrix_client: The Matrix AsyncClient instance used to send the message.
         room_id: The Matrix room ID to send the message to.
@@ -85,6 +95,7 @@ async def _send_matrix_message_with_retry(
     """
     rng = secrets.SystemRandom()
     stable_transaction_id = transaction_id or f"mmrelay-{secrets.token_hex(16)}"
+    scheduler = facade.get_send_scheduler(matrix_client)
 
     for attempt in range(max_retries + 1):
         try:
@@ -96,8 +107,8 @@ async def _send_matrix_message_with_retry(
 
             if (
                 room
-                and getattr(room, "encrypted", False)
                 and not getattr(matrix_client, "e2ee_enabled", False)
+                and facade.get_e2ee_status_service().is_room_encrypted(room_id, room)
             ):
                 room_name = getattr(room, "display_name", room_id)
                 error_message = await _get_e2ee_error_message()
@@ -110,6 +121,7 @@ async def _send_matrix_message_with_retry(
                 )
                 return None
 
+            await scheduler.acquire()
             response = await asyncio.wait_for(
                 matrix_client.room_send(
                     room_id=room_id,
@@ -150,7 +162,28 @@ async def _send_matrix_message_with_retry(
                     f"Error sending message to Matrix room {room_id} after {max_retries + 1} attempts"
                 )
         else:
-            if isinstance(response, RoomSendError):
+            if isinstance(response, RoomSendError) and facade._is_rate_limited_response(
+                response
+            ):
+                backoff = scheduler.note_rate_limited(
+                    getattr(response, "retry_after_ms", None)
+                )
+                if attempt < max_retries:
+                    facade.logger.warning(
+                        "Rate limited by homeserver sending to Matrix room %s "
+                        "(attempt %d/%d); all sends paused for %.1fs",
+                        room_id,
+                        attempt + 1,
+                        max_retries + 1,
+                        backoff,
+                    )
+                else:
+                    facade.logger.error(
+                        "Rate limited by homeserver sending to Matrix room %s after %d attempts",
+                        room_id,
+                        max_retries + 1,
+                    )
+            elif isinstance(response, RoomSendError):
                 if attempt < max_retries:
                     delay = _retry_backoff_delay(attempt, base_delay, max_delay)
                     jitter = rng.uniform(0, delay * 0.1)
@@ -173,11 +206,66 @@ async def _send_matrix_message_with_retry(
                         getattr(response, "message", response),
                     )
             else:
+                scheduler.note_success()
                 return response
 
     return None
 
 
+def _render_matrix_body(message: str) -> tuple[str, str]:
+    """
+    Render relayed Meshtastic text into Matrix plain and HTML bodies.
+
+    Text containing markdown or HTML is converted with ``markdown`` and
+    sanitized with ``nh3``; otherwise (or when either library is missing) the
+    text is HTML-escaped with newlines turned into ``<br/>``.
+
+    Parameters:
+        message (str): Text to relay.
+
+    Returns:
+        tuple[str, str]: ``(plain_body, formatted_body)``.
+    """
+    has_html = bool(re.search(r"</?[a-zA-Z][^>]*>", message))
+    safe_message, has_prefix = facade._escape_leading_prefix_for_markdown(message)
+    has_markdown = bool(re.search(r"[*_`~]", message)) or has_prefix
+
+    if has_markdown or has_html:
+        try:
+            import markdown
+            import nh3
+
+            raw_html = markdown.markdown(safe_message)
+            formatted_body = nh3.clean(
+                raw_html,
+                tags={
+                    "b",
+                    "strong",
+                    "i",
+                    "em",
+                    "code",
+                    "pre",
+                    "br",
+                    "blockquote",
+                    "a",
+                    "ul",
+                    "ol",
+                    "li",
+                    "p",
+                },
+                attributes={"a": {"href"}},
+            )
+            plain_body = message
+        except ImportError:
+            formatted_body = html.escape(message).replace("\n", "<br/>")
+            plain_body = message
+    else:
+        formatted_body = html.escape(message).replace("\n", "<br/>")
+        plain_body = message
+
+    return plain_body, formatted_body
+
+
 async def matrix_relay(
     room_id: str,
     message: str,
@@ -191,6 +279,7 @@ async def matrix_relay(
     emote: bool = False,
     emoji: bool = False,
     reply_to_event_id: str | None = None,
+    fanout: RelayFanout | None = None,
 ) -> None:
     """
     Relay a Meshtastic-originated message into a Matrix room and optionally persist a Meshtastic↔Matrix mapping.
@@ -210,6 +299,59 @@ async def matrix_relay(
         emote (bool): If True, send as `m.emote` instead of `m.text`.
         emoji (bool): If True, include an emoji flag in the outbound metadata for downstream handling.
         reply_to_event_id (str | None): Optional Matrix event_id to reply to; if provided and the original mapping is resolvable, the outgoing event includes an `m.in_reply_to` relation and a quoted formatted body.
+        fanout (RelayFanout | None): Shared state when the same message goes to several rooms; the bodies are rendered once for all of them and delivery latency is measured from the fan-out start.
+
+    Sends to the same room run in dispatch order and at most `MATRIX_FANOUT_MAX_CONCURRENCY` room sends are in flight at once.
+    """
+    started = time.monotonic()
+    delivered = False
+    try:
+        async with facade.matrix_room_slot(room_id):
+            delivered = await _relay_to_room(
+                room_id,
+                message,
+                longname,
+                shortname,
+                meshnet_name,
+                portnum,
+                meshtastic_id=meshtastic_id,
+                meshtastic_replyId=meshtastic_replyId,
+                meshtastic_text=meshtastic_text,
+                emote=emote,
+                emoji=emoji,
+                reply_to_event_id=reply_to_event_id,
+                fanout=fanout,
+            )
+    finally:
+        if fanout is not None:
+            latency = fanout.complete(room_id, delivered)
+        else:
+            latency = time.monotonic() - started if delivered else None
+        if latency is not None:
+            facade.record_matrix_delivery_latency(room_id, latency)
+
+
+async def _relay_to_room(
+    room_id: str,
+    message: str,
+    longname: str,
+    shortname: str,
+    meshnet_name: str,
+    portnum: int,
+    meshtastic_id: int | None = None,
+    meshtastic_replyId: int | None = None,
+    meshtastic_text: str | None = None,
+    emote: bool = False,
+    emoji: bool = False,
+    reply_to_event_id: str | None = None,
+    fanout: RelayFanout | None = None,
+) -> bool:
+    """
+    Send one relayed message to one room; the body of `matrix_relay`.
+
+    Returns:
+        bool: True once the Matrix event was sent (message-map storage errors
+        do not count as failures), False otherwise.
     """
     facade.logger.debug(
         f"matrix_relay: config is {'available' if facade.config else 'None'}"
@@ -241,7 +383,7 @@ async def matrix_relay(
                     max_init_retries,
                     room_id,
                 )
-                return
+                return False
             continue
         except OSError:
             facade.logger.exception(
@@ -263,17 +405,17 @@ async def matrix_relay(
                 f"Matrix client initialization failed after {max_init_retries} attempts. "
                 f"Message to room {room_id} may be lost."
             )
-            return
+            return False
 
     if matrix_client is None:
         facade.logger.error("Matrix client is None. Cannot send message.")
-        return
+        return False
 
     if facade.config is None:
         facade.logger.error(
             "No configuration available. Cannot relay message to Matrix."
         )
-        return
+        return False
 
     interactions = facade.get_interaction_settings(facade.config)
     storage_enabled = facade.message_storage_enabled(interactions)
@@ -287,42 +429,10 @@ async def matrix_relay(
             facade.config, "meshnet_name", ""
         )
 
-        has_html = bool(re.search(r"</?[a-zA-Z][^>]*>", message))
-        safe_message, has_prefix = facade._escape_leading_prefix_for_markdown(message)
-        has_markdown = bool(re.search(r"[*_`~]", message)) or has_prefix
-
-        if has_markdown or has_html:
-            try:
-                import markdown
-                import nh3
-
-                raw_html = markdown.markdown(safe_message)
-                formatted_body = nh3.clean(
-                    raw_html,
-                    tags={
-                        "b",
-                        "strong",
-                        "i",
-                        "em",
-                        "code",
-                        "pre",
-                        "br",
-                        "blockquote",
-                        "a",
-                        "ul",
-                        "ol",
-                        "li",
-                        "p",
-                    },
-                    attributes={"a": {"href"}},
-                )
-                plain_body = message
-            except ImportError:
-                formatted_body = html.escape(message).replace("\n", "<br/>")
-                plain_body = message
+        if fanout is not None:
+            plain_body, formatted_body = fanout.render(_render_matrix_body)
         else:
-            formatted_body = html.escape(message).replace("\n", "<br/>")
-            plain_body = message
+            plain_body, formatted_body = _render_matrix_body(message)
 
         content = {
             "msgtype": "m.text" if not emote else "m.emote",
@@ -347,8 +457,8 @@ async def matrix_relay(
         if reply_to_event_id:
             content["m.relates_to"] = {"m.in_reply_to": {"event_id": reply_to_event_id}}
             try:
-                orig = await asyncio.to_thread(
-                    facade.get_message_map_by_matrix_event_id, reply_to_event_id
+                orig = await facade.async_get_message_map_by_matrix_event_id(
+                    reply_to_event_id
                 )
                 if orig:
                     _, _, original_text, original_meshnet = orig
@@ -410,7 +520,7 @@ async def matrix_relay(
                     f"Failed to send message to Matrix room {room_id} after all retry attempts. "
                     f"Message may be lost."
                 )
-                return
+                return False
 
             facade.logger.info(f"Sent inbound radio message to matrix room: {room_id}")
             event_id = getattr(response, "event_id", None)
@@ -419,7 +529,7 @@ async def matrix_relay(
 
         except facade.NIO_COMM_EXCEPTIONS:
             facade.logger.exception(f"Error sending message to Matrix room {room_id}")
-            return
+            return False
 
         if (
             storage_enabled
@@ -446,7 +556,10 @@ async def matrix_relay(
             except Exception as e:
                 facade.logger.error(f"Error storing message map: {e}")
 
+        return True
+
     except asyncio.TimeoutError:
         facade.logger.error("Timed out while waiting for Matrix response")
     except Exception:
         facade.logger.exception(f"Error sending radio message to matrix room {room_id}")
+    return False
@@ -1,4 +1,3 @@
-import asyncio
 from typing import Any, cast
 
 from nio import (
@@ -357,10 +356,7 @@ async def handle_matrix_reply(
     Returns:
         bool: `True` if a mapping was found and the reply was queued to Meshtastic, `False` otherwise.
     """
-    loop = asyncio.get_running_loop()
-    orig = await loop.run_in_executor(
-        None, facade.get_message_map_by_matrix_event_id, reply_to_event_id
-    )
+    orig = await facade.async_get_message_map_by_matrix_event_id(reply_to_event_id)
     if not orig:
         facade.logger.debug(
             f"Original message for Matrix reply not found in DB: {reply_to_event_id}"
@@ -0,0 +1,205 @@
+"""Per-homeserver pacing for Matrix room sends.
+
+Homeservers answer bursts with ``M_LIMIT_EXCEEDED`` (HTTP 429) and a
+``retry_after_ms`` hint. Retrying every failed send on its own backoff
+schedule turns one limit response into a retry storm. The scheduler
+gives all sends to one homeserver a single shared backoff window and
+paces them with a token bucket whose rate adapts to the 429s it sees.
+"""
+
+import asyncio
+import time
+from typing import Any
+
+from mmrelay.constants.network import (
+    MATRIX_ERRCODE_LIMIT_EXCEEDED,
+    MATRIX_RATE_LIMIT_DEFAULT_RETRY_MS,
+    MATRIX_RATE_LIMIT_MAX_RETRY_MS,
+    MATRIX_SEND_BURST,
+    MATRIX_SEND_RATE_AFTER_LIMIT,
+    MATRIX_SEND_RATE_INCREASE,
+    MATRIX_SEND_RATE_MAX,
+    MATRIX_SEND_RATE_MIN,
+)
+
+__all__ = [
+    "HomeserverSendScheduler",
+    "_is_rate_limited_response",
+    "get_send_scheduler",
+    "get_send_scheduler_status",
+    "reset_send_schedulers",
+    "watch_rate_limited_responses",
+]
+
+
+def _is_rate_limited_response(response: Any) -> bool:
+    """Return True if an error response is ``M_LIMIT_EXCEEDED`` (or a bare 429)."""
+    return getattr(response, "status_code", None) in (
+        MATRIX_ERRCODE_LIMIT_EXCEEDED,
+        429,
+    )
+
+
+class HomeserverSendScheduler:
+    """
+    Token bucket plus shared backoff window for one homeserver.
+
+    Sends reserve their start time in call order (a virtual-clock token
+    bucket), so waiting sends are released first-come first-served. A 429
+    moves the shared window forward; every send still waiting, including
+    ones that already reserved a slot, sleeps until the window ends.
+
+    Sends are unthrottled until the first 429. The rate then adapts:
+    halved on every further 429 (never below `min_rate`), raised by
+    `increase` per successful send, and lifted entirely once it passes
+    `max_rate`.
+
+    All methods must be called from the event loop thread.
+    """
+
+    def __init__(
+        self,
+        homeserver: str | None = None,
+        burst: int = MATRIX_SEND_BURST,
+        rate_after_limit: float = MATRIX_SEND_RATE_AFTER_LIMIT,
+        min_rate: float = MATRIX_SEND_RATE_MIN,
+        max_rate: float = MATRIX_SEND_RATE_MAX,
+        increase: float = MATRIX_SEND_RATE_INCREASE,
+    ) -> None:
+        """
+        Parameters:
+            homeserver (str | None): Homeserver URL, used for logging and status only.
+            burst (int): Sends allowed back to back once throttling is active.
+            rate_after_limit (float): Sends per second after the first 429.
+            min_rate (float): Lower bound for the learned rate.
+            max_rate (float): Learned rate above which throttling is lifted.
+            increase (float): Rate added per successful send while throttled.
+        """
+        self.homeserver = homeserver
+        self.burst = max(1, burst)
+        self.rate_after_limit = rate_after_limit
+        self.min_rate = min_rate
+        self.max_rate = max_rate
+        self.increase = increase
+        self.rate: float | None = None
+        self.rate_limited_count = 0
+        self._tat = 0.0  # Theoretical arrival time of the next send.
+        self._blocked_until = 0.0
+
+    def _reserve(self, now: float) -> float:
+        """Reserve the next send slot and return how long to wait for it."""
+        start = max(now, self._blocked_until)
+        if self.rate is not None:
+            interval = 1.0 / self.rate
+            start = max(start, self._tat - (self.burst - 1) * interval)
+            self._tat = max(self._tat, start) + interval
+        return start - now
+
+    async def acquire(self) -> None:
+        """Wait until this homeserver may receive another send."""
+        delay = self._reserve(time.monotonic())
+        while delay > 0:
+            await asyncio.sleep(delay)
+            # A 429 seen while sleeping extends the window for everyone.
+            delay = self._blocked_until - time.monotonic()
+
+    def note_rate_limited(self, retry_after_ms: Any) -> float:
+        """
+        Open (or extend) the shared backoff window after a 429.
+
+        Parameters:
+            retry_after_ms: The response's ``retry_after_ms``; missing or invalid
+                values fall back to `MATRIX_RATE_LIMIT_DEFAULT_RETRY_MS`.
+
+        Returns:
+            float: Seconds until sends resume.
+        """
+        try:
+            retry_ms = float(retry_after_ms)
+        except (TypeError, ValueError):
+            retry_ms = MATRIX_RATE_LIMIT_DEFAULT_RETRY_MS
+        if retry_ms <= 0:
+            retry_ms = MATRIX_RATE_LIMIT_DEFAULT_RETRY_MS
+        retry_secs = min(retry_ms, MATRIX_RATE_LIMIT_MAX_RETRY_MS) / 1000.0
+
+        now = time.monotonic()
+        self._blocked_until = max(self._blocked_until, now + retry_secs)
+        if self.rate is None:
+            self.rate = self.rate_after_limit
+        else:
+            self.rate = max(self.min_rate, self.rate / 2)
+        # Restart the bucket empty at the end of the window so queued sends
+        # resume at the learned rate instead of all at once.
+        self._tat = max(self._tat, self._blocked_until) + (self.burst - 1) / self.rate
+        self.rate_limited_count += 1
+        return self._blocked_until - now
+
+    def note_success(self) -> None:
+        """Let the learned rate recover after a successful send."""
+        if self.rate is None:
+            return
+        self.rate += self.increase
+        if self.rate >= self.max_rate:
+            self.rate = None
+            self._tat = 0.0
+
+    def get_status(self) -> dict[str, Any]:
+        """Return the current rate, remaining backoff and 429 count."""
+        return {
+            "homeserver": self.homeserver,
+            "rate_per_sec": self.rate,
+            "backoff_remaining_secs": max(0.0, self._blocked_until - time.monotonic()),
+            "rate_limited": self.rate_limited_count,
+        }
+
+
+_schedulers: dict[str | None, HomeserverSendScheduler] = {}
+
+
+def get_send_scheduler(matrix_client: Any) -> HomeserverSendScheduler:
+    """
+    Return the shared scheduler for the homeserver `matrix_client` talks to.
+
+    Parameters:
+        matrix_client: Matrix client; its ``homeserver`` URL selects the scheduler.
+    """
+    homeserver = getattr(matrix_client, "homeserver", None)
+    key = homeserver if isinstance(homeserver, str) else None
+    scheduler = _schedulers.get(key)
+    if scheduler is None:
+        scheduler = _schedulers[key] = HomeserverSendScheduler(key)
+    return scheduler
+
+
+def watch_rate_limited_responses(matrix_client: Any) -> None:
+    """
+    Feed every 429 the client sees into its homeserver's scheduler.
+
+    Sends through `matrix_client` open the shared window themselves, but nio
+    also meets 429s that never reach the relay: sync requests, and any request
+    it retries internally when ``max_limit_exceeded`` leaves retries to nio.
+    nio runs the response callbacks for those before it sleeps, so a callback
+    is the one place that sees them all.
+
+    Parameters:
+        matrix_client: nio ``AsyncClient`` to register the response callback on.
+    """
+
+    async def _on_response(response: Any) -> None:
+        if _is_rate_limited_response(response):
+            get_send_scheduler(matrix_client).note_rate_limited(
+                getattr(response, "retry_after_ms", None)
+            )
+
+    # Unfiltered: 429s arrive as RoomSendError, SyncError and other error types.
+    matrix_client.add_response_callback(_on_response)
+
+
+def get_send_scheduler_status() -> list[dict[str, Any]]:
+    """Return the status of every homeserver scheduler created so far."""
+    return [scheduler.get_status() for scheduler in _schedulers.values()]
+
+
+def reset_send_schedulers() -> None:
+    """Forget all learned rates and backoff windows."""
+    _schedulers.clear()
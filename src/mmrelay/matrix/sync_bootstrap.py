@@ -48,13 +48,22 @@ _NIO_PATCH_LOCK = asyncio.Lock()
 
 
 async def _perform_initial_sync(
-    client: AsyncClient, matrix_homeserver: str
+    client: AsyncClient,
+    matrix_homeserver: str,
+    sync_filter: dict[str, Any] | None = None,
+    since: str | None = None,
 ) -> Any | None:
     """
     Perform the initial Matrix sync and tolerate common homeserver quirks.
 
     Performs a full-state initial sync and, on schema validation or transport issues, retries using an invite-safe filter. If invites contain malformed invite_state payloads, a retry may ignore those invite_state events to allow the sync to succeed. When an invite-safe filter is applied, the filter is recorded on the client (mmrelay_sync_filter and mmrelay_first_sync_filter) to disable invite handling for subsequent syncs.
 
+    Parameters:
+        client (AsyncClient): Logged-in Matrix client.
+        matrix_homeserver (str): Homeserver URL, used in troubleshooting messages.
+        sync_filter (dict[str, Any] | None): Filter for the sync; the invite-safe retry extends it.
+        since (str | None): Sync token to resume from. Full state is still requested so room state is complete, but only for the rooms the filter allows.
+
     Returns:
         The sync response object when successful, or `None` if no response was obtained.
 
@@ -62,7 +71,7 @@ async def _perform_initial_sync(
         MatrixSyncTimeoutError: if the initial sync operation times out.
         MatrixSyncFailedError: if the sync ultimately fails due to communication or validation errors.
     """
-    invite_safe_filter: dict[str, Any] = {"room": {"invite": {"limit": 0}}}
+    invite_safe_filter = facade._disable_invites_in_filter(sync_filter)
     sync_response: Any | None = None
 
     max_sync_attempts = facade.MATRIX_INITIAL_SYNC_MAX_ATTEMPTS
@@ -72,7 +81,12 @@ async def _perform_initial_sync(
     while True:
         try:
             sync_response = await asyncio.wait_for(
-                client.sync(timeout=facade.MATRIX_EARLY_SYNC_TIMEOUT, full_state=True),
+                client.sync(
+                    timeout=facade.MATRIX_EARLY_SYNC_TIMEOUT,
+                    full_state=True,
+                    sync_filter=sync_filter,
+                    since=since,
+                ),
                 timeout=facade.MATRIX_SYNC_OPERATION_TIMEOUT,
             )
             break
@@ -137,6 +151,7 @@ async def _perform_initial_sync(
                         timeout=facade.MATRIX_EARLY_SYNC_TIMEOUT,
                         full_state=False,
                         sync_filter=invite_safe_filter,
+                        since=since,
                     ),
                     timeout=facade.MATRIX_SYNC_OPERATION_TIMEOUT,
                 )
@@ -214,6 +229,7 @@ async def _perform_initial_sync(
                                     timeout=facade.MATRIX_EARLY_SYNC_TIMEOUT,
                                     full_state=False,
                                     sync_filter=invite_safe_filter,
+                                    since=since,
                                 ),
                                 timeout=facade.MATRIX_SYNC_OPERATION_TIMEOUT,
                             )
@@ -522,8 +538,35 @@ async def connect_matrix(
                 await facade._maybe_upload_e2ee_keys(client)
                 await facade._ensure_own_device_cross_signed(client)
 
+            # E2EE clients resume from the token nio keeps in its own store,
+            # which stays consistent with the Olm state.
+            resume_token = None
+            if not e2ee_enabled:
+                resume_token = await asyncio.to_thread(
+                    facade.load_sync_token,
+                    local_homeserver,
+                    effective_bot_user_id,
+                    e2ee_device_id,
+                )
+            initial_filter = facade.build_sync_filter(
+                local_matrix_rooms,
+                timeline_limit=facade.MATRIX_SYNC_FIRST_TIMELINE_LIMIT,
+            )
+
             facade.logger.debug("Performing initial sync to initialize rooms...")
-            sync_response = await _perform_initial_sync(client, local_homeserver)
+            sync_response = await _perform_initial_sync(
+                client, local_homeserver, initial_filter, since=resume_token
+            )
+            if resume_token and isinstance(sync_response, SyncError):
+                facade.logger.warning(
+                    "Homeserver rejected the saved sync token (%s); "
+                    "retrying with a fresh initial sync",
+                    facade._get_detailed_matrix_error_message(sync_response),
+                )
+                await asyncio.to_thread(facade.clear_sync_token)
+                sync_response = await _perform_initial_sync(
+                    client, local_homeserver, initial_filter
+                )
             await _post_sync_setup(
                 client,
                 sync_response,
@@ -533,6 +576,21 @@ async def connect_matrix(
                 effective_bot_user_id,
                 e2ee_enabled,
             )
+
+            # Aliases are resolved now, so the sync loop can be limited to
+            # the mapped rooms even when the startup sync could not be.
+            invite_safe = isinstance(getattr(client, "mmrelay_sync_filter", None), dict)
+            loop_filter = facade.build_sync_filter(
+                local_matrix_rooms, invite_safe=invite_safe
+            )
+            cast(Any, client).mmrelay_sync_filter = loop_filter
+            cast(Any, client).mmrelay_first_sync_filter = loop_filter
+            if not e2ee_enabled:
+                recorder = facade.SyncTokenRecorder(
+                    local_homeserver, effective_bot_user_id, e2ee_device_id
+                )
+                await recorder(sync_response)
+                cast(Any, client).mmrelay_sync_token_recorder = recorder
         except BaseException:
             await facade._close_matrix_client_after_failure(
                 client, "connect_matrix setup"
@@ -801,6 +859,7 @@ async def login_matrix_bot(
 
             if store_path is not None:
                 await asyncio.to_thread(os.makedirs, store_path, exist_ok=True)
+                facade.get_e2ee_status_service().invalidate()
                 facade.logger.debug(f"Using E2EE store path: {store_path}")
         else:
             facade.logger.debug("E2EE disabled in configuration, not using store path")
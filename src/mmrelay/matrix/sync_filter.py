@@ -0,0 +1,217 @@
+"""Sync filters and persisted sync tokens for Matrix startup.
+
+The relay only needs the mapped rooms, the senders of new messages and the
+encryption state of those rooms. The filter built here drops everything
+else (presence, account data, typing/receipts, full member lists and old
+timeline events), and the sync token of the previous run lets startup
+continue where it stopped instead of starting from scratch.
+"""
+
+import asyncio
+import copy
+import json
+import os
+import time
+from typing import Any
+
+import mmrelay.matrix_utils as facade
+from mmrelay.constants.network import MATRIX_SYNC_TOKEN_SAVE_INTERVAL_SECS
+from mmrelay.paths import get_sync_token_path
+
+__all__ = [
+    "SyncTokenRecorder",
+    "_disable_invites_in_filter",
+    "_mapped_room_ids",
+    "build_sync_filter",
+    "clear_sync_token",
+    "load_sync_token",
+    "save_sync_token",
+]
+
+_EXCLUDE_ALL: dict[str, Any] = {"not_types": ["*"]}
+
+
+def _mapped_room_ids(matrix_rooms: Any) -> list[str] | None:
+    """
+    Collect the room IDs of a matrix_rooms mapping.
+
+    Returns:
+        list[str] | None: Sorted unique room IDs, or None when the mapping is
+        empty or still contains aliases or invalid entries, in which case the
+        sync must not be restricted to a room list.
+    """
+    if not isinstance(matrix_rooms, (list, dict)):
+        return None
+    room_ids: set[str] = set()
+    for alias_or_id, _setter in facade._iter_room_alias_entries(matrix_rooms):
+        if not isinstance(alias_or_id, str) or not alias_or_id.startswith("!"):
+            return None
+        room_ids.add(alias_or_id)
+    return sorted(room_ids) or None
+
+
+def _disable_invites_in_filter(sync_filter: dict[str, Any] | None) -> dict[str, Any]:
+    """
+    Return a copy of `sync_filter` that also excludes invites.
+
+    Parameters:
+        sync_filter (dict[str, Any] | None): Filter to extend; None starts from an empty filter.
+    """
+    merged = copy.deepcopy(sync_filter) if sync_filter else {}
+    merged.setdefault("room", {})["invite"] = {"limit": 0}
+    return merged
+
+
+def build_sync_filter(
+    matrix_rooms: Any,
+    *,
+    timeline_limit: int | None = None,
+    invite_safe: bool = False,
+) -> dict[str, Any]:
+    """
+    Build the sync filter the relay uses for its Matrix syncs.
+
+    The filter lazy-loads room members (only senders of returned events are
+    included), drops presence, account data and ephemeral events, and limits
+    the sync to the mapped rooms once all of them are known by room ID.
+
+    Parameters:
+        matrix_rooms (Any): The matrix_rooms configuration (list or dict form).
+        timeline_limit (int | None): Maximum timeline events per room; None keeps the server default.
+        invite_safe (bool): Also exclude invites, for homeservers that send malformed invite_state.
+
+    Returns:
+        dict[str, Any]: A filter definition usable as ``sync_filter``.
+    """
+    timeline: dict[str, Any] = {"lazy_load_members": True}
+    if timeline_limit is not None:
+        timeline["limit"] = timeline_limit
+    room_filter: dict[str, Any] = {
+        "state": {"lazy_load_members": True},
+        "timeline": timeline,
+        "ephemeral": copy.deepcopy(_EXCLUDE_ALL),
+        "account_data": copy.deepcopy(_EXCLUDE_ALL),
+    }
+    room_ids = _mapped_room_ids(matrix_rooms)
+    if room_ids is not None:
+        room_filter["rooms"] = room_ids
+
+    sync_filter: dict[str, Any] = {
+        "presence": copy.deepcopy(_EXCLUDE_ALL),
+        "account_data": copy.deepcopy(_EXCLUDE_ALL),
+        "room": room_filter,
+    }
+    if invite_safe:
+        sync_filter = _disable_invites_in_filter(sync_filter)
+    return sync_filter
+
+
+def load_sync_token(homeserver: str, user_id: str, device_id: str | None) -> str | None:
+    """
+    Load the sync token saved by a previous run for this account and device.
+
+    Returns:
+        str | None: The saved ``next_batch`` token, or None if there is none or it belongs to another session.
+    """
+    path = get_sync_token_path()
+    try:
+        with open(path, encoding="utf-8") as f:
+            data = json.load(f)
+    except FileNotFoundError:
+        return None
+    except (OSError, ValueError):
+        facade.logger.warning("Ignoring unreadable Matrix sync token file %s", path)
+        return None
+    if not isinstance(data, dict):
+        return None
+    if (
+        data.get("homeserver") != homeserver
+        or data.get("user_id") != user_id
+        or data.get("device_id") != device_id
+    ):
+        return None
+    token = data.get("next_batch")
+    return token if isinstance(token, str) and token else None
+
+
+def save_sync_token(
+    homeserver: str, user_id: str, device_id: str | None, next_batch: str
+) -> None:
+    """
+    Atomically persist `next_batch` for this account and device.
+
+    Raises:
+        OSError: If the token file cannot be written.
+    """
+    path = get_sync_token_path()
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_name(path.name + ".tmp")
+    payload = {
+        "homeserver": homeserver,
+        "user_id": user_id,
+        "device_id": device_id,
+        "next_batch": next_batch,
+    }
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(payload, f)
+    os.replace(tmp_path, path)
+
+
+def clear_sync_token() -> None:
+    """Delete the persisted sync token, if any."""
+    try:
+        get_sync_token_path().unlink()
+    except FileNotFoundError:
+        pass
+    except OSError:
+        facade.logger.warning("Could not remove Matrix sync token file", exc_info=True)
+
+
+class SyncTokenRecorder:
+    """
+    Sync response callback that persists ``next_batch`` for the next startup.
+
+    Writes are rate-limited to one per `min_interval` seconds; a token that
+    is skipped is written with the next sync that passes the limit. Losing the
+    last few seconds of progress only means those events are fetched again
+    and then dropped by the startup timestamp filter.
+    """
+
+    def __init__(
+        self,
+        homeserver: str,
+        user_id: str,
+        device_id: str | None,
+        min_interval: float = MATRIX_SYNC_TOKEN_SAVE_INTERVAL_SECS,
+    ) -> None:
+        """
+        Parameters:
+            homeserver (str): Homeserver URL the token belongs to.
+            user_id (str): Matrix user ID the token belongs to.
+            device_id (str | None): Device ID the token belongs to.
+            min_interval (float): Minimum seconds between two writes.
+        """
+        self.homeserver = homeserver
+        self.user_id = user_id
+        self.device_id = device_id
+        self.min_interval = min_interval
+        self.saved_token: str | None = None
+        self._last_save: float | None = None
+
+    async def __call__(self, response: Any) -> None:
+        """Record the ``next_batch`` token of a sync response."""
+        token = getattr(response, "next_batch", None)
+        if not isinstance(token, str) or not token or token == self.saved_token:
+            return
+        now = time.monotonic()
+        if self._last_save is not None and now - self._last_save < self.min_interval:
+            return
+        self._last_save = now
+        try:
+            await asyncio.to_thread(
+                save_sync_token, self.homeserver, self.user_id, self.device_id, token
+            )
+        except OSError:
+            facade.logger.warning("Could not save Matrix sync token", exc_info=True)
+            return
+        self.saved_token = token
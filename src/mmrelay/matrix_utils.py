@@ -97,22 +97,31 @@ from mmrelay.constants.network import (
     MATRIX_STALE_STARTUP_EVENT_DROP_MS,
     MATRIX_STARTUP_STALE_FILTER_WINDOW_MS,
     MATRIX_STARTUP_TIMESTAMP_TOLERANCE_MS,
+    MATRIX_SYNC_FIRST_TIMELINE_LIMIT,
     MATRIX_SYNC_OPERATION_TIMEOUT,
     MATRIX_SYNC_RETRY_DELAY_SECS,
     MATRIX_TO_DEVICE_TIMEOUT,
     MILLISECONDS_PER_SECOND,
 )
 from mmrelay.db_utils import (
+    async_get_message_map_by_matrix_event_id,
     async_prune_message_map,
     async_store_message_map,
     get_message_map_by_matrix_event_id,
+    load_media_cache,
+    save_media_cache_entry,
 )
 from mmrelay.log_utils import get_logger
 
 # Do not import plugin_loader here to avoid circular imports
-from mmrelay.meshtastic_utils import connect_meshtastic, send_text_reply
+from mmrelay.meshtastic_utils import (
+    connect_meshtastic,
+    select_radio_for_send,
+    send_text_reply,
+)
 
 # Import meshtastic protobuf for port numbers when needed
+from mmrelay.message_fragments import fragment_message, get_max_message_fragments
 from mmrelay.message_queue import get_message_queue, queue_message
 from mmrelay.paths import get_credentials_path
 
@@ -290,6 +299,12 @@ def get_e2ee_status(*args: Any, **kwargs: Any) -> Any:
     return _e2ee_utils.get_e2ee_status(*args, **kwargs)
 
 
+def get_e2ee_status_service(*args: Any, **kwargs: Any) -> Any:
+    from mmrelay import e2ee_utils as _e2ee_utils
+
+    return _e2ee_utils.get_e2ee_status_service(*args, **kwargs)
+
+
 def get_room_encryption_warnings(*args: Any, **kwargs: Any) -> Any:
     from mmrelay import e2ee_utils as _e2ee_utils
 
@@ -336,13 +351,18 @@ from mmrelay.matrix.room_mapping import (
     _update_room_id_in_mapping,
 )
 from mmrelay.matrix.prefixes import (
+    PrefixTemplate,
     _add_truncated_vars,
     _can_auto_create_credentials,
+    _compile_prefix_template,
     _escape_leading_prefix_for_markdown,
     _first_nonblank_str,
     _get_detailed_matrix_error_message,
     _get_msgs_to_keep_config,
+    _get_prefix_template,
     _normalize_bot_user_id,
+    clear_prefix_template_cache,
+    compile_prefix_templates,
     get_interaction_settings,
     get_matrix_prefix,
     get_meshtastic_prefix,
@@ -375,6 +395,15 @@ from mmrelay.matrix.auth import (
     _perform_matrix_login,
 )
 from mmrelay.matrix.client_config import build_matrix_client_config
+from mmrelay.matrix.sync_filter import (
+    SyncTokenRecorder,
+    _disable_invites_in_filter,
+    _mapped_room_ids,
+    build_sync_filter,
+    clear_sync_token,
+    load_sync_token,
+    save_sync_token,
+)
 from mmrelay.matrix.sync_bootstrap import (
     _perform_initial_sync,
     _post_sync_setup,
@@ -382,8 +411,26 @@ from mmrelay.matrix.sync_bootstrap import (
     join_matrix_room,
     login_matrix_bot,
 )
+from mmrelay.matrix.fanout import (
+    MatrixFanoutDispatcher,
+    RelayFanout,
+    get_matrix_fanout_stats,
+    matrix_room_slot,
+    record_matrix_delivery_latency,
+    start_matrix_fanout,
+)
+from mmrelay.matrix.send_scheduler import (
+    HomeserverSendScheduler,
+    _is_rate_limited_response,
+    get_send_scheduler,
+    get_send_scheduler_status,
+    reset_send_schedulers,
+    watch_rate_limited_responses,
+)
 from mmrelay.matrix.relay import (
     _get_e2ee_error_message,
+    _relay_to_room,
+    _render_matrix_body,
     _retry_backoff_delay,
     _send_matrix_message_with_retry,
     matrix_relay,
@@ -396,8 +443,14 @@ from mmrelay.matrix.replies import (
     strip_quoted_lines,
     truncate_message,
 )
+from mmrelay.matrix.media_cache import (
+    MediaCache,
+    get_media_cache,
+    reset_media_cache,
+)
 from mmrelay.matrix.media import (
     ImageUploadError,
+    UploadedMedia,
     send_image,
     send_room_image,
     upload_image,
@@ -405,6 +458,7 @@ from mmrelay.matrix.media import (
 from mmrelay.matrix.events import (
     on_decryption_failure,
     on_invite,
+    on_room_encryption,
     on_room_member,
     on_room_message,
 )
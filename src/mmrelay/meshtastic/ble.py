@@ -296,7 +296,8 @@ def _is_ble_discovery_error(error: Exception) -> bool:
             return all(isinstance(item, type) for item in candidate)
         return False
 
-    ble_interface = getattr(facade.meshtastic.ble_interface, "BLEInterface", None)
+    ble_interface_module = getattr(facade.meshtastic, "ble_interface", None)
+    ble_interface = getattr(ble_interface_module, "BLEInterface", None)
     ble_error_type = getattr(ble_interface, "BLEError", None)
     if (
         ble_error_type
@@ -333,9 +334,12 @@ def _sanitize_ble_address(address: str) -> str:
     """
     if not address:
         return address
-    if callable(facade.sanitize_address):
+    # Resolved lazily by the facade; None when the installed BLE interface
+    # does not provide it.
+    sanitize_address: Callable[[str], object] | None = facade.sanitize_address
+    if callable(sanitize_address):
         try:
-            sanitized = facade.sanitize_address(address)
+            sanitized = sanitize_address(address)
         except Exception:  # noqa: BLE001 - fallback keeps legacy behavior
             sanitized = None
         if isinstance(sanitized, str) and sanitized:
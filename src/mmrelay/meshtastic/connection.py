@@ -761,6 +761,15 @@ def _connect_meshtastic_impl(
                 "Using 'network' connection type (legacy). 'tcp' is now the preferred name and 'network' will be deprecated in a future version."
             )
 
+        # Import only the interface module this connection needs.
+        try:
+            facade.load_transport(connection_type)
+        except ImportError as e:
+            facade.logger.error(
+                "Meshtastic %s support could not be loaded: %s", connection_type, e
+            )
+            return None
+
     # Move retry loop outside the lock to prevent blocking other threads
     meshtastic_settings = (
         facade.config.get(CONFIG_SECTION_MESHTASTIC, {}) if facade.config else {}
@@ -1834,6 +1843,9 @@ def _connect_meshtastic_impl(
                 # Subscribe to message and connection-lost events.
                 facade.ensure_meshtastic_callbacks_subscribed()
 
+                # Serve saved NodeDB entries until the radio has streamed them.
+                facade.get_node_snapshot_cache().bind(getattr(client, "nodes", None))
+
                 facade._schedule_connect_time_calibration_probe(
                     client,
                     connection_type=connection_type,
@@ -1,4 +1,5 @@
 import contextlib
+import logging
 import threading
 from typing import Any, Iterable
 
@@ -27,6 +28,10 @@ from mmrelay.meshtastic.packet_routing import (
 )
 
 __all__ = [
+    "_flush_expired_fragments",
+    "_ingest_meshtastic_packet",
+    "_process_meshtastic_message",
+    "_schedule_fragment_flush",
     "_schedule_startup_drain_deadline_cleanup",
     "on_lost_meshtastic_connection",
     "on_meshtastic_message",
@@ -288,6 +293,8 @@ def on_lost_meshtastic_connection(
         if facade.shutting_down:
             facade.logger.debug("Shutdown in progress. Not attempting to reconnect.")
             return
+        if facade._handle_radio_connection_lost(interface):
+            return
         active_client = facade.meshtastic_client
         active_client_id = facade._relay_active_client_id
         if (
@@ -435,6 +442,105 @@ async def reconnect() -> None:
 
 
 def on_meshtastic_message(packet: dict[str, Any], interface: Any) -> None:
+    """
+    Receive a packet from the Meshtastic ``meshtastic.receive`` pubsub topic.
+
+    This runs on the Meshtastic library's reader thread. When the packet ingest
+    pool is running the packet is only enqueued, so the reader can return to
+    the radio immediately; all per-packet work, including the bookkeeping in
+    `_ingest_meshtastic_packet`, then happens on an ingest worker. Otherwise
+    the packet is handled inline.
+
+    Parameters:
+        packet (dict): Decoded Meshtastic packet.
+        interface: Meshtastic interface that received the packet.
+    """
+    if facade._submit_to_packet_ingest(packet, interface):
+        return
+    _ingest_meshtastic_packet(packet, interface)
+
+
+def _ingest_meshtastic_packet(packet: dict[str, Any], interface: Any) -> None:
+    """
+    Update per-packet state and pass complete messages on for processing.
+
+    The sender's NodeDB entry has already been updated by the library, so the
+    node metrics store is refreshed first, and name changes in NODEINFO
+    packets from the primary radio are queued for the name tables. When
+    additional radios are configured, copies of a packet already delivered by
+    another radio are dropped. When `meshtastic.reassemble_fragments` is on,
+    fragments of long messages are held by the fragment reassembler until
+    their message is complete and then processed as one packet by
+    `_process_meshtastic_message`; a timer flushes messages whose missing
+    fragments never arrive. Otherwise every packet is processed as it arrives.
+
+    Every step is keyed by sender, and the ingest pool keeps each sender on
+    one worker lane, so these steps see a sender's packets in arrival order.
+
+    Parameters:
+        packet (dict): Decoded Meshtastic packet.
+        interface: Meshtastic interface that received the packet.
+    """
+    facade.get_node_metrics_store().note_packet(packet, interface)
+    if interface is facade.meshtastic_client:
+        facade.get_node_name_feed().note_packet(packet, interface)
+    if not facade._accept_radio_packet(packet, interface):
+        return
+    if not facade.fragment_reassembly_enabled(facade.config):
+        _process_meshtastic_message(packet, interface)
+        return
+    reassembler = facade.get_fragment_reassembler()
+    for ready_packet, ready_interface in reassembler.accept(packet, interface):
+        _process_meshtastic_message(ready_packet, ready_interface)
+    if reassembler.pending_count():
+        _schedule_fragment_flush()
+
+
+def _schedule_fragment_flush() -> None:
+    """
+    Arm the timer that flushes the oldest partial long message when it times out.
+
+    Arriving packets also flush timed-out messages, but the last message
+    before the mesh goes quiet would otherwise wait for the next packet. One
+    timer is armed at a time; it re-arms itself while messages are pending.
+    """
+    deadline = facade.get_fragment_reassembler().next_deadline()
+    if deadline is None:
+        return
+    with facade._fragment_flush_lock:
+        if facade._fragment_flush_timer is not None:
+            return
+        timer = threading.Timer(
+            max(0.0, deadline - facade.time.monotonic()), _flush_expired_fragments
+        )
+        timer.daemon = True
+        facade._fragment_flush_timer = timer
+    try:
+        timer.start()
+    except RuntimeError:
+        with facade._fragment_flush_lock:
+            if facade._fragment_flush_timer is timer:
+                facade._fragment_flush_timer = None
+        facade.logger.warning(
+            "Could not start the long-message flush timer", exc_info=True
+        )
+
+
+def _flush_expired_fragments() -> None:
+    """Process partial long messages that timed out, then re-arm for the next one."""
+    with facade._fragment_flush_lock:
+        facade._fragment_flush_timer = None
+    if facade.shutting_down:
+        return
+    for packet, interface in facade.get_fragment_reassembler().flush_expired():
+        try:
+            _process_meshtastic_message(packet, interface)
+        except Exception:
+            facade.logger.exception("Error processing a timed-out long message")
+    _schedule_fragment_flush()
+
+
+def _process_meshtastic_message(packet: dict[str, Any], interface: Any) -> None:
     """
     Route an incoming Meshtastic packet to configured Matrix rooms or installed plugins based on runtime configuration.
 
@@ -487,7 +593,9 @@ def on_meshtastic_message(packet: dict[str, Any], interface: Any) -> None:
         expected_client_id = (
             active_client_id if active_client_id is not None else id(active_client)
         )
-        if id(interface) != expected_client_id:
+        if id(interface) != expected_client_id and not facade._is_pool_interface(
+            interface
+        ):
             facade.logger.debug(
                 "Ignoring packet from stale Meshtastic interface (packet_interface_id=%s active_client_id=%s)",
                 id(interface),
@@ -622,21 +730,52 @@ def on_meshtastic_message(packet: dict[str, Any], interface: Any) -> None:
         )
         return
 
+    # Fast reject: packets addressed to another node are never relayed or
+    # handed to plugins, and plugin-only packets are pointless when no loaded
+    # plugin accepts their portnum. Decide with a few lookups, then skip the
+    # rest of the pipeline (and any debug formatting unless DEBUG is enabled).
+    reject_log: tuple[Any, ...] | None = None
+    to_id = packet.get("to")
+    my_info = getattr(interface, "myInfo", None)
+    my_node_num = getattr(my_info, "my_node_num", None) if my_info else None
+    if (
+        to_id is not None
+        and to_id != BROADCAST_NUM
+        and my_node_num is not None
+        and to_id != my_node_num
+    ):
+        reject_log = (
+            "Ignoring message intended for node %s (not broadcast or relay).",
+            to_id,
+        )
+    elif action == PacketAction.PLUGIN_ONLY and not decoded.get("text"):
+        reject_portnum_name = _get_portnum_name(decoded.get("portnum"), packet)
+        if not facade._loaded_plugins_want_portnum(reject_portnum_name):
+            reject_log = (
+                "Packet %s has no interested plugins; skipping.",
+                reject_portnum_name,
+            )
+
+    debug_enabled = facade.logger.isEnabledFor(logging.DEBUG)
+
     # Full packet logging for debugging (when enabled in config)
     # Check if full packet logging is enabled - accepts boolean True or string "true"
-    debug_settings: dict[str, Any] = (
-        facade.config.get("logging", {}).get("debug", {}) if facade.config else {}
-    )
-    full_packets_setting = debug_settings.get("full_packets")
-    if full_packets_setting is True or (
-        isinstance(full_packets_setting, str) and full_packets_setting.lower() == "true"
-    ):
-        facade.logger.debug("Full packet: %s", packet)
+    if debug_enabled:
+        debug_settings: dict[str, Any] = (
+            facade.config.get("logging", {}).get("debug", {}) if facade.config else {}
+        )
+        full_packets_setting = debug_settings.get("full_packets")
+        if full_packets_setting is True or (
+            isinstance(full_packets_setting, str)
+            and full_packets_setting.lower() == "true"
+        ):
+            facade.logger.debug("Full packet: %s", packet)
 
     # Log that we received a message (without the full packet details)
     if decoded and isinstance(decoded, dict) and decoded.get("text"):
         facade.logger.info(f"Received Meshtastic message: {decoded.get('text')}")
-    else:
+    elif debug_enabled:
+        # Node display names and packet details are only needed for this line.
         portnum = (
             decoded.get("portnum") if decoded and isinstance(decoded, dict) else None
         )
@@ -681,14 +820,31 @@ def on_meshtastic_message(packet: dict[str, Any], interface: Any) -> None:
         prefix = f"[{portnum_name}] " + " ".join(details)
         facade.logger.debug(prefix)
 
+    if facade.shutting_down:
+        facade.logger.debug("Shutdown in progress. Ignoring incoming messages.")
+        return
+
+    if facade.event_loop is None:
+        facade.logger.error("Event loop is not set. Cannot process message.")
+        return
+
+    if reject_log is not None:
+        facade.logger.debug(*reject_log)
+        return
+
     # Import the configuration helpers
     from mmrelay.matrix_utils import get_interaction_settings
 
-    # Get interaction settings
-    interactions = get_interaction_settings(facade.config)
+    # Interaction settings only affect text-message reactions and replies.
+    is_text_portnum = _is_text_message_portnum(decoded.get("portnum"))
+    interactions = (
+        get_interaction_settings(facade.config)
+        if is_text_portnum
+        else {"reactions": False, "replies": False}
+    )
 
     # Filter out reactions if reactions are disabled (only for text-message portnums)
-    if _is_text_message_portnum(decoded.get("portnum")):
+    if is_text_portnum:
         if (
             not interactions["reactions"]
             and decoded.get("replyId") is not None
@@ -700,15 +856,7 @@ def on_meshtastic_message(packet: dict[str, Any], interface: Any) -> None:
             )
             return
 
-    from mmrelay.matrix_utils import matrix_relay
-
-    if facade.shutting_down:
-        facade.logger.debug("Shutdown in progress. Ignoring incoming messages.")
-        return
-
-    if facade.event_loop is None:
-        facade.logger.error("Event loop is not set. Cannot process message.")
-        return
+    from mmrelay.matrix_utils import matrix_relay, start_matrix_fanout
 
     loop = facade.event_loop
 
@@ -745,7 +893,7 @@ def on_meshtastic_message(packet: dict[str, Any], interface: Any) -> None:
     # use Matrix interaction relay.
     if (
         action == PacketAction.RELAY
-        and _is_text_message_portnum(decoded.get("portnum"))
+        and is_text_portnum
         and replyId
         and emoji_flag
         and interactions["reactions"]
@@ -809,7 +957,7 @@ def on_meshtastic_message(packet: dict[str, Any], interface: Any) -> None:
     # Only for RELAY-classified TEXT_MESSAGE_APP packets.
     if (
         action == PacketAction.RELAY
-        and _is_text_message_portnum(decoded.get("portnum"))
+        and is_text_portnum
         and replyId
         and not emoji_flag
         and interactions["replies"]
@@ -947,20 +1095,25 @@ def on_meshtastic_message(packet: dict[str, Any], interface: Any) -> None:
                 sender,
             )
 
-        if not longname or not shortname:
-            node = interface.nodes.get(sender)
-            if node:
-                user = node.get("user")
+        if (not longname or not shortname) and sender is not None:
+            # Falls back to the saved NodeDB snapshot while the radio is still
+            # streaming its NodeDB; names from the snapshot are not persisted.
+            # A packet without a sender id has nothing to look up.
+            cached = facade.lookup_node(sender, interface)
+            if cached and cached.node:
+                user = cached.node.get("user")
                 if user:
                     if not longname:
                         longname_val = user.get("longName")
-                        if longname_val and sender is not None:
-                            facade.save_longname(sender, longname_val)
+                        if longname_val:
+                            if not cached.stale:
+                                facade.save_longname(sender, longname_val)
                             longname = longname_val
                     if not shortname:
                         shortname_val = user.get("shortName")
-                        if shortname_val and sender is not None:
-                            facade.save_shortname(sender, shortname_val)
+                        if shortname_val:
+                            if not cached.stale:
+                                facade.save_shortname(sender, shortname_val)
                             shortname = shortname_val
             else:
                 facade.logger.debug(f"Node info for sender {sender} not available yet.")
@@ -1028,32 +1181,35 @@ def on_meshtastic_message(packet: dict[str, Any], interface: Any) -> None:
 
         facade.logger.info(f"Relaying Meshtastic message from {longname} to Matrix")
 
-        iterable_rooms = _get_iterable_matrix_rooms()
-        for room in iterable_rooms:
+        target_room_ids = []
+        for room in _get_iterable_matrix_rooms():
             if not isinstance(room, dict):
                 continue
-
             room_channel = facade._normalize_room_channel(room)
-            if room_channel is None:
-                continue
+            if room_channel is not None and room_channel == channel:
+                target_room_ids.append(room["id"])
 
-            if room_channel == channel:
-                try:
-                    facade._fire_and_forget(
-                        matrix_relay(
-                            room["id"],
-                            formatted_message,
-                            longname,
-                            shortname,
-                            meshnet_name,
-                            decoded.get("portnum", 0),
-                            meshtastic_id=packet.get("id"),
-                            meshtastic_text=text,
-                        ),
-                        loop=loop,
-                    )
-                except Exception:
-                    facade.logger.exception("Error relaying message to Matrix")
+        # One fan-out per packet: the Matrix body is rendered once and the
+        # per-room sends share the dispatcher's concurrency limit.
+        fanout = start_matrix_fanout(formatted_message, target_room_ids)
+        for room_id in target_room_ids:
+            try:
+                facade._fire_and_forget(
+                    matrix_relay(
+                        room_id,
+                        formatted_message,
+                        longname,
+                        shortname,
+                        meshnet_name,
+                        decoded.get("portnum", 0),
+                        meshtastic_id=packet.get("id"),
+                        meshtastic_text=text,
+                        fanout=fanout,
+                    ),
+                    loop=loop,
+                )
+            except Exception:
+                facade.logger.exception("Error relaying message to Matrix")
     else:
         # Non-text messages via plugins
         portnum = decoded.get("portnum")
@@ -1067,4 +1223,5 @@ def on_meshtastic_message(packet: dict[str, Any], interface: Any) -> None:
             use_keyword_args=True,
             log_with_portnum=True,
             portnum=portnum,
+            portnum_name=_get_portnum_name(portnum, packet),
         )
@@ -0,0 +1,346 @@
+import queue
+import threading
+import time
+from typing import Any, Callable
+
+import mmrelay.meshtastic_utils as facade
+from mmrelay.constants.config import (
+    CONFIG_KEY_INGEST_QUEUE_SIZE,
+    CONFIG_KEY_INGEST_WORKERS,
+    CONFIG_SECTION_MESHTASTIC,
+)
+from mmrelay.constants.queue import (
+    DEFAULT_INGEST_QUEUE_SIZE,
+    DEFAULT_INGEST_WORKERS,
+    INGEST_FULL_LOG_INTERVAL_SEC,
+    INGEST_STOP_TIMEOUT_SEC,
+)
+
+__all__ = [
+    "PacketIngestPool",
+    "_get_ingest_settings",
+    "_ingest_sender_key",
+    "_submit_to_packet_ingest",
+    "get_packet_ingest_status",
+    "start_packet_ingest",
+    "stop_packet_ingest",
+]
+
+_STOP = object()
+
+
+def _ingest_sender_key(packet: dict[str, Any]) -> Any:
+    """
+    Return the key used to pin a packet to a worker lane.
+
+    Packets from the same sender always share a lane and are processed in
+    arrival order. There is no ordering between senders: a reply or reaction
+    from one node may be processed before the message from another node that
+    it refers to.
+    """
+    sender = packet.get("from")
+    if sender is None:
+        sender = packet.get("fromId")
+    return sender
+
+
+class PacketIngestPool:
+    """
+    Bounded hand-off between the Meshtastic reader thread and packet processing.
+
+    `submit()` only enqueues and returns, so database access, plugin waits and
+    logging in the packet handler never delay reading the next radio frame.
+    Each worker owns one FIFO lane and packets are assigned to lanes by
+    sender, which preserves per-sender ordering while letting different
+    senders proceed in parallel; packets from different senders may be
+    processed in any order. When a lane is full the packet is dropped
+    and counted rather than blocking the reader.
+    """
+
+    def __init__(
+        self,
+        handler: Callable[[dict[str, Any], Any], None],
+        workers: int = DEFAULT_INGEST_WORKERS,
+        max_queue_size: int = DEFAULT_INGEST_QUEUE_SIZE,
+    ) -> None:
+        """
+        Create an idle pool; call `start()` to launch the worker threads.
+
+        Parameters:
+            handler (Callable[[dict, Any], None]): Called as ``handler(packet, interface)`` on a worker thread.
+            workers (int): Number of worker lanes; must be positive.
+            max_queue_size (int): Total queued packets across all lanes before new packets are dropped.
+
+        Raises:
+            ValueError: If `workers` or `max_queue_size` is not positive.
+        """
+        if workers <= 0:
+            raise ValueError("workers must be positive")
+        if max_queue_size <= 0:
+            raise ValueError("max_queue_size must be positive")
+        self._handler = handler
+        self.workers = workers
+        self.max_queue_size = max_queue_size
+        lane_capacity = max(1, -(-max_queue_size // workers))
+        self._lanes: list[queue.Queue[Any]] = [
+            queue.Queue(maxsize=lane_capacity) for _ in range(workers)
+        ]
+        self._threads: list[threading.Thread] = []
+        self._worker_idents: set[int] = set()
+        self._lock = threading.Lock()
+        self._idle = threading.Condition(self._lock)
+        self._running = False
+        self._pending = 0
+        self._received = 0
+        self._processed = 0
+        self._dropped = 0
+        self._errors = 0
+        self._max_depth = 0
+        self._max_wait_secs = 0.0
+        self._last_full_log_time: float | None = None
+
+    def start(self) -> None:
+        """Launch one daemon worker thread per lane; no-op if already running."""
+        with self._lock:
+            if self._running:
+                return
+            self._running = True
+            self._threads = [
+                threading.Thread(
+                    target=self._worker,
+                    args=(lane,),
+                    name=f"mmrelay-ingest-{index}",
+                    daemon=True,
+                )
+                for index, lane in enumerate(self._lanes)
+            ]
+        for thread in self._threads:
+            thread.start()
+
+    def stop(self, timeout: float = INGEST_STOP_TIMEOUT_SEC) -> bool:
+        """
+        Stop accepting packets and wait for workers to finish queued work.
+
+        Parameters:
+            timeout (float): Total seconds to wait for all worker threads to exit.
+
+        Returns:
+            bool: True if every worker exited within `timeout`, False otherwise.
+        """
+        with self._lock:
+            if not self._running:
+                return True
+            self._running = False
+            threads = list(self._threads)
+        deadline = time.monotonic() + timeout
+        for lane in self._lanes:
+            # Sentinels may wait behind a full lane; block briefly rather than drop them.
+            try:
+                lane.put(_STOP, timeout=max(0.0, deadline - time.monotonic()))
+            except queue.Full:
+                facade.logger.warning("Packet ingest lane did not accept stop signal")
+        current = threading.current_thread()
+        for thread in threads:
+            if thread is current:
+                continue
+            thread.join(max(0.0, deadline - time.monotonic()))
+        stopped = not any(thread.is_alive() for thread in threads)
+        if not stopped:
+            facade.logger.warning(
+                "Packet ingest workers did not stop within %.1fs", timeout
+            )
+        return stopped
+
+    def is_running(self) -> bool:
+        """Return True while the pool is accepting packets."""
+        return self._running
+
+    def is_worker_thread(self) -> bool:
+        """Return True when called from one of this pool's worker threads."""
+        return threading.get_ident() in self._worker_idents
+
+    def submit(self, packet: dict[str, Any], interface: Any) -> bool:
+        """
+        Enqueue a packet for processing without blocking.
+
+        Returns:
+            bool: True if the packet was queued, False if the pool is stopped or
+            the sender's lane is full (the packet is then counted as dropped).
+        """
+        lane_index = hash(_ingest_sender_key(packet)) % self.workers
+        lane = self._lanes[lane_index]
+        with self._lock:
+            if not self._running:
+                return False
+            self._received += 1
+            try:
+                lane.put_nowait((packet, interface, time.monotonic()))
+            except queue.Full:
+                self._dropped += 1
+                self._log_full(lane_index)
+                return False
+            self._pending += 1
+            self._max_depth = max(self._max_depth, self._pending)
+        return True
+
+    def drain(self, timeout: float | None = None) -> bool:
+        """
+        Block until every queued packet has been processed.
+
+        Returns:
+            bool: True if the pool became idle, False if `timeout` elapsed first.
+        """
+        with self._idle:
+            return self._idle.wait_for(lambda: self._pending == 0, timeout=timeout)
+
+    def get_status(self) -> dict[str, Any]:
+        """
+        Return a snapshot of pool state and overflow accounting.
+
+        Returns:
+            dict: ``running``, ``workers``, ``capacity``, ``queued``, ``lane_depths``,
+            ``received``, ``processed``, ``dropped``, ``errors``, ``max_depth``
+            and ``max_wait_secs`` (longest time a packet waited in a lane).
+        """
+        with self._lock:
+            return {
+                "running": self._running,
+                "workers": self.workers,
+                "capacity": self.max_queue_size,
+                "queued": self._pending,
+                "lane_depths": [lane.qsize() for lane in self._lanes],
+                "received": self._received,
+                "processed": self._processed,
+                "dropped": self._dropped,
+                "errors": self._errors,
+                "max_depth": self._max_depth,
+                "max_wait_secs": self._max_wait_secs,
+            }
+
+    def _log_full(self, lane_index: int) -> None:
+        now = time.monotonic()
+        if (
+            self._last_full_log_time is None
+            or now - self._last_full_log_time >= INGEST_FULL_LOG_INTERVAL_SEC
+        ):
+            facade.logger.warning(
+                "Packet ingest lane %d full; dropping inbound packets (dropped=%d)",
+                lane_index,
+                self._dropped,
+            )
+            self._last_full_log_time = now
+
+    def _worker(self, lane: "queue.Queue[Any]") -> None:
+        self._worker_idents.add(threading.get_ident())
+        while True:
+            item = lane.get()
+            if item is _STOP:
+                break
+            packet, interface, enqueued_at = item
+            wait_secs = time.monotonic() - enqueued_at
+            failed = False
+            try:
+                self._handler(packet, interface)
+            except Exception:
+                failed = True
+                facade.logger.exception(
+                    "Error processing Meshtastic packet %s", packet.get("id")
+                )
+            with self._idle:
+                self._pending -= 1
+                self._processed += 1
+                if failed:
+                    self._errors += 1
+                self._max_wait_secs = max(self._max_wait_secs, wait_secs)
+                if self._pending == 0:
+                    self._idle.notify_all()
+        self._worker_idents.discard(threading.get_ident())
+
+
+def _get_ingest_settings(passed_config: dict[str, Any] | None) -> tuple[int, int]:
+    """
+    Resolve ``(workers, queue_size)`` from the ``meshtastic`` config section.
+
+    ``ingest_workers: 0`` disables the pool so packets are processed inline on
+    the reader thread. Invalid values fall back to the defaults.
+    """
+    section = (passed_config or {}).get(CONFIG_SECTION_MESHTASTIC)
+    if not isinstance(section, dict):
+        section = {}
+    raw_workers = section.get(CONFIG_KEY_INGEST_WORKERS, DEFAULT_INGEST_WORKERS)
+    if raw_workers == 0 and not isinstance(raw_workers, bool):
+        workers = 0
+    else:
+        workers = facade._coerce_positive_int(raw_workers, DEFAULT_INGEST_WORKERS)
+    queue_size = facade._coerce_positive_int(
+        section.get(CONFIG_KEY_INGEST_QUEUE_SIZE, DEFAULT_INGEST_QUEUE_SIZE),
+        DEFAULT_INGEST_QUEUE_SIZE,
+    )
+    return workers, queue_size
+
+
+def start_packet_ingest(passed_config: dict[str, Any] | None = None) -> bool:
+    """
+    Start the global packet ingest pool used by `on_meshtastic_message`.
+
+    Parameters:
+        passed_config (dict | None): Configuration to read ``ingest_workers`` and
+            ``ingest_queue_size`` from; defaults to the facade config.
+
+    Returns:
+        bool: True if a pool is running after the call, False if ingestion is
+        disabled and packets will be processed inline.
+    """
+    workers, queue_size = _get_ingest_settings(
+        passed_config if passed_config is not None else facade.config
+    )
+    with facade._packet_ingest_lock:
+        existing = facade._packet_ingest_pool
+        if existing is not None and existing.is_running():
+            return True
+        if workers == 0:
+            facade.logger.debug("Packet ingest pool disabled; processing inline")
+            return False
+        pool = PacketIngestPool(
+            lambda packet, interface: facade._ingest_meshtastic_packet(
+                packet, interface
+            ),
+            workers=workers,
+            max_queue_size=queue_size,
+        )
+        pool.start()
+        facade._packet_ingest_pool = pool
+    facade.logger.debug(
+        "Packet ingest pool started with %d workers (capacity %d)", workers, queue_size
+    )
+    return True
+
+
+def stop_packet_ingest(timeout: float = INGEST_STOP_TIMEOUT_SEC) -> None:
+    """Stop the global packet ingest pool, letting queued packets finish within `timeout`."""
+    with facade._packet_ingest_lock:
+        pool = facade._packet_ingest_pool
+        facade._packet_ingest_pool = None
+    if pool is not None:
+        pool.stop(timeout=timeout)
+
+
+def get_packet_ingest_status() -> dict[str, Any] | None:
+    """Return the global ingest pool's status, or None when no pool is running."""
+    pool = facade._packet_ingest_pool
+    return pool.get_status() if pool is not None else None
+
+
+def _submit_to_packet_ingest(packet: dict[str, Any], interface: Any) -> bool:
+    """
+    Hand a packet to the ingest pool if one is running.
+
+    Returns:
+        bool: True if the pool took ownership of the packet (queued or counted
+        as dropped), False if the caller should process it inline.
+    """
+    pool = facade._packet_ingest_pool
+    if pool is None or not pool.is_running() or pool.is_worker_thread():
+        return False
+    # A pool stopped between the checks above cannot take the packet; process inline.
+    return pool.submit(packet, interface) or pool.is_running()
@@ -0,0 +1,619 @@
+import asyncio
+import contextlib
+import functools
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Callable
+from typing import Any
+
+import mmrelay.meshtastic_utils as facade
+from mmrelay.constants.config import (
+    CONFIG_KEY_ADDITIONAL_RADIOS,
+    CONFIG_KEY_RADIO_NAME,
+    CONFIG_SECTION_MESHTASTIC,
+)
+from mmrelay.constants.network import (
+    CONFIG_KEY_CONNECTION_TYPE,
+    CONFIG_KEY_HOST,
+    CONFIG_KEY_PORT,
+    CONFIG_KEY_SERIAL_PORT,
+    CONFIG_KEY_TIMEOUT,
+    CONNECTION_TYPE_NETWORK,
+    CONNECTION_TYPE_SERIAL,
+    CONNECTION_TYPE_TCP,
+    DEFAULT_MESHTASTIC_TIMEOUT,
+    DEFAULT_TCP_PORT,
+    PRIMARY_RADIO_NAME,
+)
+from mmrelay.constants.queue import (
+    DEFAULT_MESSAGE_DELAY,
+    RADIO_DEDUPE_MAX_ENTRIES,
+    RADIO_DEDUPE_WINDOW_SEC,
+    RADIO_RECONNECT_MAX_BACKOFF_SEC,
+)
+from mmrelay.message_queue import MessageQueue, get_message_queue
+
+__all__ = [
+    "InterfacePool",
+    "RadioSlot",
+    "_accept_radio_packet",
+    "_handle_radio_connection_lost",
+    "_is_pool_interface",
+    "close_additional_radios",
+    "connect_additional_radios",
+    "get_interface_pool_status",
+    "get_packet_source_radio",
+    "select_radio_for_send",
+]
+
+
+def _interface_node_num(interface: Any) -> int | None:
+    """Return the node number of the radio behind `interface`, if it is known."""
+    node_num = getattr(getattr(interface, "myInfo", None), "my_node_num", None)
+    if isinstance(node_num, int) and not isinstance(node_num, bool):
+        return node_num
+    return None
+
+
+def _interface_connected(interface: Any) -> bool:
+    """
+    Return whether a Meshtastic interface reports an open connection.
+
+    Interfaces without an ``isConnected`` event are assumed connected.
+    """
+    is_connected = getattr(interface, "isConnected", None)
+    is_set = getattr(is_connected, "is_set", None)
+    if callable(is_set):
+        return bool(is_set())
+    return True
+
+
+class RadioSlot:
+    """
+    One additional radio: its interface, its own send queue and its health.
+
+    `reopen` opens a fresh interface for the radio after its connection is
+    lost; radios without one stay out of rotation once lost.
+    """
+
+    __slots__ = ("healthy", "interface", "name", "queue", "reconnecting", "reopen")
+
+    def __init__(
+        self,
+        name: str,
+        interface: Any,
+        queue: MessageQueue,
+        reopen: Callable[[], Any] | None = None,
+    ) -> None:
+        self.name = name
+        self.interface = interface
+        self.queue = queue
+        self.healthy = True
+        self.reopen = reopen
+        self.reconnecting = False
+
+    def is_available(self) -> bool:
+        """Return True if the radio is healthy and its interface is connected."""
+        return self.healthy and _interface_connected(self.interface)
+
+
+class InterfacePool:
+    """
+    Additional Meshtastic radios used alongside the primary connection.
+
+    The primary radio stays managed by `connect_meshtastic`; the pool only
+    tracks the extra radios. Every radio delivers packets through the shared
+    ``meshtastic.receive`` topic, so the pool drops copies of a packet that
+    another radio already delivered within the dedupe window, as well as our
+    own transmissions overheard by another of our radios. Outbound sends go
+    to the available radio with the shortest send queue.
+    """
+
+    def __init__(
+        self,
+        dedupe_window: float = RADIO_DEDUPE_WINDOW_SEC,
+        dedupe_max_entries: int = RADIO_DEDUPE_MAX_ENTRIES,
+    ) -> None:
+        """
+        Create an empty pool.
+
+        Parameters:
+            dedupe_window (float): Seconds during which a repeated ``(from, id)`` packet is treated as a duplicate.
+            dedupe_max_entries (int): Maximum number of remembered packet keys; the oldest are forgotten first.
+        """
+        self.dedupe_window = dedupe_window
+        self.dedupe_max_entries = dedupe_max_entries
+        self._slots: list[RadioSlot] = []
+        self._by_interface_id: dict[int, RadioSlot] = {}
+        self._seen: OrderedDict[tuple[Any, Any], float] = OrderedDict()
+        self._lock = threading.Lock()
+        self._duplicates = 0
+        self._own_transmissions = 0
+
+    def __len__(self) -> int:
+        return len(self._slots)
+
+    @property
+    def slots(self) -> list[RadioSlot]:
+        """Snapshot of the pool's radios in configuration order."""
+        with self._lock:
+            return list(self._slots)
+
+    def add(
+        self,
+        name: str,
+        interface: Any,
+        queue: MessageQueue,
+        reopen: Callable[[], Any] | None = None,
+    ) -> RadioSlot:
+        """Register an opened radio, its send queue and how to reopen it."""
+        slot = RadioSlot(name, interface, queue, reopen)
+        with self._lock:
+            self._slots.append(slot)
+            self._by_interface_id[id(interface)] = slot
+        return slot
+
+    def restore(self, slot: RadioSlot, interface: Any) -> None:
+        """
+        Put a reconnected radio back into rotation behind its new `interface`.
+
+        Packets and connection events from the radio's previous interface are
+        no longer attributed to the pool.
+        """
+        with self._lock:
+            if self._by_interface_id.get(id(slot.interface)) is slot:
+                del self._by_interface_id[id(slot.interface)]
+            slot.interface = interface
+            self._by_interface_id[id(interface)] = slot
+            slot.healthy = True
+
+    def remove_all(self) -> list[RadioSlot]:
+        """Forget every radio and remembered packet key, returning the removed radios."""
+        with self._lock:
+            slots = self._slots
+            self._slots = []
+            self._by_interface_id = {}
+            self._seen.clear()
+        return slots
+
+    def get_slot(self, interface: Any) -> RadioSlot | None:
+        """Return the pool radio backed by `interface`, or None."""
+        slot = self._by_interface_id.get(id(interface))
+        if slot is not None and slot.interface is interface:
+            return slot
+        return None
+
+    def get_radio_name(self, interface: Any) -> str:
+        """Return the name of the radio behind `interface`; non-pool interfaces are the primary."""
+        slot = self.get_slot(interface)
+        return slot.name if slot is not None else PRIMARY_RADIO_NAME
+
+    def is_radio_available(self, name: str) -> bool:
+        """Return True if the pool radio called `name` can currently send."""
+        return any(slot.name == name and slot.is_available() for slot in self.slots)
+
+    def mark_unhealthy(self, interface: Any) -> RadioSlot | None:
+        """
+        Stop routing sends to the radio backed by `interface`.
+
+        Returns:
+            RadioSlot | None: The affected radio, or None if `interface` is not in the pool.
+        """
+        slot = self.get_slot(interface)
+        if slot is not None:
+            slot.healthy = False
+        return slot
+
+    def accept_packet(self, packet: dict[str, Any], interface: Any) -> bool:
+        """
+        Report whether a received packet is new to the relay.
+
+        Parameters:
+            packet (dict): Packet delivered by the Meshtastic library; not modified.
+            interface: Interface that delivered the packet; anything not in
+                the pool is treated as the primary radio.
+
+        Returns:
+            bool: False if the packet was sent by another of the relay's radios,
+            or if another radio already delivered a packet with the same
+            sender and id within the dedupe window; True otherwise.
+        """
+        sender_num = packet.get("from")
+        if (
+            sender_num is not None
+            and sender_num != _interface_node_num(interface)
+            and sender_num in self._relay_node_nums()
+        ):
+            with self._lock:
+                self._own_transmissions += 1
+            return False
+        packet_id = packet.get("id")
+        if packet_id is None:
+            return True
+        sender = sender_num if sender_num is not None else packet.get("fromId")
+        key = (sender, packet_id)
+        now = time.monotonic()
+        cutoff = now - self.dedupe_window
+        with self._lock:
+            seen = self._seen
+            while seen:
+                oldest_key, oldest_time = next(iter(seen.items()))
+                if oldest_time >= cutoff:
+                    break
+                del seen[oldest_key]
+            if key in seen:
+                self._duplicates += 1
+                return False
+            seen[key] = now
+            while len(seen) > self.dedupe_max_entries:
+                seen.popitem(last=False)
+        return True
+
+    def _relay_node_nums(self) -> set[int]:
+        """Return the node numbers of the primary radio and every pool radio."""
+        interfaces = [slot.interface for slot in self.slots]
+        interfaces.append(facade.meshtastic_client)
+        return {
+            node_num
+            for node_num in map(_interface_node_num, interfaces)
+            if node_num is not None
+        }
+
+    def select(
+        self,
+        primary_interface: Any,
+        primary_queue: MessageQueue,
+    ) -> tuple[Any, MessageQueue]:
+        """
+        Choose the radio and queue for the next outbound message.
+
+        The primary radio competes with every available pool radio and the one
+        with the fewest queued messages wins; ties go to the primary, then to
+        configuration order. While the primary is reconnecting it is skipped
+        if any pool radio is available.
+
+        Returns:
+            tuple[Any, MessageQueue]: The interface to send through and the queue to enqueue on.
+        """
+        best_interface = primary_interface
+        best_queue = primary_queue
+        best_depth: int | None = None
+        if primary_interface is not None and not facade.reconnecting:
+            best_depth = primary_queue.get_queue_size()
+        for slot in self.slots:
+            if not slot.is_available():
+                continue
+            depth = slot.queue.get_queue_size()
+            if best_depth is None or depth < best_depth:
+                best_interface, best_queue, best_depth = (
+                    slot.interface,
+                    slot.queue,
+                    depth,
+                )
+        return best_interface, best_queue
+
+    def get_status(self) -> dict[str, Any]:
+        """Return per-radio health and queue depth plus the dropped-packet counters."""
+        with self._lock:
+            slots = list(self._slots)
+            duplicates = self._duplicates
+            own_transmissions = self._own_transmissions
+            remembered = len(self._seen)
+        return {
+            "radios": [
+                {
+                    "name": slot.name,
+                    "healthy": slot.healthy,
+                    "reconnecting": slot.reconnecting,
+                    "connected": _interface_connected(slot.interface),
+                    "queue_size": slot.queue.get_queue_size(),
+                }
+                for slot in slots
+            ],
+            "duplicates_dropped": duplicates,
+            "own_transmissions_dropped": own_transmissions,
+            "remembered_packets": remembered,
+        }
+
+
+def _open_radio(radio_config: dict[str, Any], name: str, timeout: int) -> Any | None:
+    """
+    Open one additional serial or TCP radio described by `radio_config`.
+
+    Returns:
+        The connected interface, or None if the entry is unusable.
+    """
+    connection_type = radio_config.get(CONFIG_KEY_CONNECTION_TYPE)
+    if connection_type == CONNECTION_TYPE_NETWORK:
+        connection_type = CONNECTION_TYPE_TCP
+    if connection_type in (CONNECTION_TYPE_SERIAL, CONNECTION_TYPE_TCP):
+        facade.load_transport(connection_type)
+
+    if connection_type == CONNECTION_TYPE_SERIAL:
+        serial_port = radio_config.get(CONFIG_KEY_SERIAL_PORT)
+        if not serial_port:
+            facade.logger.error("Additional radio %r has no serial_port", name)
+            return None
+        if not facade.serial_port_exists(serial_port):
+            facade.logger.error(
+                "Additional radio %r: serial port %s does not exist or is not accessible",
+                name,
+                serial_port,
+            )
+            return None
+        facade.logger.info("Connecting additional radio %r to %s", name, serial_port)
+        return facade.meshtastic.serial_interface.SerialInterface(
+            serial_port, timeout=timeout
+        )
+
+    if connection_type == CONNECTION_TYPE_TCP:
+        host = radio_config.get(CONFIG_KEY_HOST)
+        if not host:
+            facade.logger.error("Additional radio %r has no host", name)
+            return None
+        port = facade._coerce_positive_int(
+            radio_config.get(CONFIG_KEY_PORT, DEFAULT_TCP_PORT), DEFAULT_TCP_PORT
+        )
+        facade.logger.info("Connecting additional radio %r to %s:%s", name, host, port)
+        return facade.meshtastic.tcp_interface.TCPInterface(
+            hostname=host, portNumber=port, timeout=timeout
+        )
+
+    facade.logger.warning(
+        "Additional radio %r: unsupported connection_type %r (serial and tcp are supported)",
+        name,
+        connection_type,
+    )
+    return None
+
+
+def connect_additional_radios(
+    passed_config: dict[str, Any] | None = None,
+    message_delay: float = DEFAULT_MESSAGE_DELAY,
+) -> int:
+    """
+    Open the radios listed under ``meshtastic.additional_radios``.
+
+    Each radio gets its own rate-limited `MessageQueue`, so airtime on one
+    radio does not hold back sends on another. Radios that fail to open are
+    logged and skipped; the primary connection is unaffected.
+
+    Parameters:
+        passed_config (dict | None): Configuration to read; defaults to the facade config.
+        message_delay (float): Inter-message delay applied to every additional radio's queue.
+
+    Returns:
+        int: Number of additional radios connected.
+    """
+    config = passed_config if passed_config is not None else facade.config
+    section = (config or {}).get(CONFIG_SECTION_MESHTASTIC)
+    if not isinstance(section, dict):
+        return 0
+    radio_configs = section.get(CONFIG_KEY_ADDITIONAL_RADIOS)
+    if not radio_configs:
+        return 0
+    if not isinstance(radio_configs, list):
+        facade.logger.warning(
+            "meshtastic.%s must be a list; ignoring", CONFIG_KEY_ADDITIONAL_RADIOS
+        )
+        return 0
+
+    timeout = facade._coerce_positive_int(
+        section.get(CONFIG_KEY_TIMEOUT, DEFAULT_MESHTASTIC_TIMEOUT),
+        DEFAULT_MESHTASTIC_TIMEOUT,
+    )
+    with facade._interface_pool_lock:
+        pool = facade._interface_pool
+        if pool is None:
+            pool = InterfacePool()
+        for index, radio_config in enumerate(radio_configs, start=1):
+            if not isinstance(radio_config, dict):
+                facade.logger.warning(
+                    "Ignoring malformed additional radio entry %r", radio_config
+                )
+                continue
+            name = str(radio_config.get(CONFIG_KEY_RADIO_NAME) or f"radio{index}")
+            if name == PRIMARY_RADIO_NAME or any(
+                slot.name == name for slot in pool.slots
+            ):
+                facade.logger.warning(
+                    "Ignoring additional radio with duplicate name %r", name
+                )
+                continue
+            reopen = functools.partial(_open_radio, radio_config, name, timeout)
+            try:
+                interface = reopen()
+            except Exception:
+                facade.logger.exception("Failed to connect additional radio %r", name)
+                continue
+            if interface is None:
+                continue
+            queue = MessageQueue(
+                connection_check=functools.partial(pool.is_radio_available, name)
+            )
+            pool.add(name, interface, queue, reopen)
+            queue.start(message_delay=message_delay)
+        if len(pool) == 0:
+            return 0
+        facade._interface_pool = pool
+        connected = len(pool)
+    facade.logger.info("Connected %d additional Meshtastic radio(s)", connected)
+    return connected
+
+
+def close_additional_radios() -> None:
+    """Stop every additional radio's queue and close its interface."""
+    with facade._interface_pool_lock:
+        pool = facade._interface_pool
+        facade._interface_pool = None
+    if pool is None:
+        return
+    for slot in pool.remove_all():
+        with contextlib.suppress(Exception):
+            slot.queue.stop()
+        try:
+            slot.interface.close()
+        except Exception:
+            facade.logger.debug(
+                "Error closing additional radio %r", slot.name, exc_info=True
+            )
+
+
+def _is_pool_interface(interface: Any) -> bool:
+    """Return True if `interface` belongs to an additional radio."""
+    pool = facade._interface_pool
+    return pool is not None and pool.get_slot(interface) is not None
+
+
+def get_packet_source_radio(interface: Any) -> str:
+    """
+    Return the name of the radio that delivered a packet through `interface`.
+
+    The name is resolved from the interface rather than stored in the packet,
+    so packets handed to plugins and Matrix stay exactly as the library
+    delivered them.
+    """
+    pool = facade._interface_pool
+    if pool is None:
+        return PRIMARY_RADIO_NAME
+    return pool.get_radio_name(interface)
+
+
+def _accept_radio_packet(packet: dict[str, Any], interface: Any) -> bool:
+    """
+    Apply multi-radio deduplication to a received packet.
+
+    Returns:
+        bool: True if the packet should be processed. Always True when no
+        additional radios are configured.
+    """
+    pool = facade._interface_pool
+    if pool is None:
+        return True
+    if isinstance(packet, dict) and not pool.accept_packet(packet, interface):
+        facade.logger.debug(
+            "Dropping packet %s from %s on radio %r: already delivered or sent by the relay",
+            packet.get("id"),
+            packet.get("fromId") or packet.get("from"),
+            pool.get_radio_name(interface),
+        )
+        return False
+    return True
+
+
+async def _reconnect_additional_radio(pool: InterfacePool, slot: RadioSlot) -> None:
+    """
+    Reopen a lost additional radio with exponential backoff.
+
+    Starts at DEFAULT_BACKOFF_TIME and doubles up to
+    RADIO_RECONNECT_MAX_BACKOFF_SEC. Gives up when the relay shuts down or the
+    pool is closed; on success the radio is put back into rotation.
+    """
+    reopen = slot.reopen
+    if reopen is None:
+        return
+    backoff_time = facade.DEFAULT_BACKOFF_TIME
+    lost_interface = slot.interface
+    try:
+        try:
+            await asyncio.to_thread(lost_interface.close)
+        except Exception:
+            facade.logger.debug(
+                "Error closing lost additional radio %r", slot.name, exc_info=True
+            )
+        while not facade.shutting_down and facade._interface_pool is pool:
+            await asyncio.sleep(backoff_time)
+            if facade.shutting_down or facade._interface_pool is not pool:
+                break
+            try:
+                interface = await asyncio.to_thread(reopen)
+            except Exception:
+                facade.logger.exception(
+                    "Reconnecting additional radio %r failed", slot.name
+                )
+                interface = None
+            if interface is not None:
+                if facade.shutting_down or facade._interface_pool is not pool:
+                    with contextlib.suppress(Exception):
+                        interface.close()
+                    break
+                pool.restore(slot, interface)
+                facade.logger.info("Reconnected additional radio %r", slot.name)
+                return
+            backoff_time = min(backoff_time * 2, RADIO_RECONNECT_MAX_BACKOFF_SEC)
+    finally:
+        slot.reconnecting = False
+
+
+def _schedule_radio_reconnect(pool: InterfacePool, slot: RadioSlot) -> None:
+    """Start reconnecting `slot` on the relay event loop unless it is already underway."""
+    if slot.reopen is None or slot.reconnecting:
+        return
+    loop = facade.event_loop
+    if loop is None or loop.is_closed():
+        facade.logger.error(
+            "Cannot reconnect additional radio %r because the event loop is unavailable",
+            slot.name,
+        )
+        return
+    slot.reconnecting = True
+    coro = _reconnect_additional_radio(pool, slot)
+    try:
+        asyncio.run_coroutine_threadsafe(coro, loop)
+    except RuntimeError:
+        coro.close()
+        slot.reconnecting = False
+        facade.logger.error(
+            "Failed to schedule reconnect for additional radio %r", slot.name
+        )
+
+
+def _handle_radio_connection_lost(interface: Any) -> bool:
+    """
+    Take an additional radio out of rotation when its connection drops.
+
+    The radio is reopened in the background and returns to rotation once
+    connected again.
+
+    Returns:
+        bool: True if `interface` was an additional radio (so the primary
+        reconnect logic must not run), False otherwise.
+    """
+    pool = facade._interface_pool
+    if pool is None or interface is None:
+        return False
+    slot = pool.mark_unhealthy(interface)
+    if slot is None:
+        return False
+    facade.logger.error(
+        "Lost connection to additional radio %r; routing sends to the remaining radios",
+        slot.name,
+    )
+    _schedule_radio_reconnect(pool, slot)
+    return True
+
+
+def select_radio_for_send(primary_interface: Any) -> tuple[Any, MessageQueue | None]:
+    """
+    Pick the radio for an outbound Matrix-to-mesh message.
+
+    Returns:
+        tuple[Any, MessageQueue | None]: The interface to send through and
+        its queue, or ``(primary_interface, None)`` when the global queue
+        should be used (always the case without additional radios).
+    """
+    pool = facade._interface_pool
+    if pool is None:
+        return primary_interface, None
+    primary_queue = get_message_queue()
+    interface, queue = pool.select(primary_interface, primary_queue)
+    if queue is primary_queue:
+        return primary_interface, None
+    return interface, queue
+
+
+def get_interface_pool_status() -> dict[str, Any] | None:
+    """Return the additional-radio pool's status, or None when none are configured."""
+    pool = facade._interface_pool
+    return pool.get_status() if pool is not None else None
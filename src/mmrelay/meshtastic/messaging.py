@@ -105,7 +105,8 @@ def _get_node_display_name(
     Get a human-readable display name for a Meshtastic node.
 
     Prioritizes short name from interface, then short name from database,
-    then long name from database, falling back to node ID if none found.
+    then long name from database, then short name from the saved NodeDB
+    snapshot, falling back to node ID if none found.
 
     Parameters:
         from_id: Meshtastic node identifier (int or str)
@@ -136,6 +137,11 @@ def _get_node_display_name(
     if long_name := get_longname(from_id_str):
         return long_name
 
+    cached = facade.lookup_node(from_id_str, interface)
+    if cached and isinstance(user := cached.node.get("user"), dict):
+        if short_name := user.get("shortName"):
+            return cast(str, short_name)
+
     return fallback if fallback is not None else from_id_str
 
 
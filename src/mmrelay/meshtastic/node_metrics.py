@@ -0,0 +1,287 @@
+"""Running node metrics for the ``!health`` and ``!nodes`` commands.
+
+The Meshtastic library updates its NodeDB (``interface.nodes``) before it
+publishes a received packet, so refreshing the sender's entry from the
+receive callback keeps these aggregates in step with the NodeDB without
+rescanning it. Rendered command responses are cached per store version.
+"""
+
+import bisect
+import threading
+import time
+from collections.abc import Callable, Mapping
+from typing import Any
+
+from mmrelay.constants.plugins import LOW_BATTERY_THRESHOLD_PERCENT
+
+__all__ = [
+    "NodeMetricsStore",
+    "RunningValues",
+    "get_node_metrics_store",
+    "reset_node_metrics_store",
+]
+
+# (batteryLevel, airUtilTx, snr) of one node; None where not reported.
+_Metrics = tuple[Any, Any, Any]
+
+
+class RunningValues:
+    """
+    Count, sum and sorted values of one metric.
+
+    The mean and the median are read in O(1); adding or removing a value is a
+    binary search plus a list shift, which is cheap for NodeDB sizes.
+    """
+
+    __slots__ = ("_sorted", "_total")
+
+    def __init__(self) -> None:
+        self._sorted: list[Any] = []
+        self._total = 0.0
+
+    def __len__(self) -> int:
+        return len(self._sorted)
+
+    def add(self, value: Any) -> None:
+        """Add one value."""
+        bisect.insort(self._sorted, value)
+        self._total += value
+
+    def remove(self, value: Any) -> None:
+        """Remove one occurrence of a value added earlier."""
+        index = bisect.bisect_left(self._sorted, value)
+        del self._sorted[index]
+        self._total -= value
+        if not self._sorted:
+            self._total = 0.0
+
+    def mean(self) -> float:
+        """Return the arithmetic mean; the store must not be empty."""
+        return self._total / len(self._sorted)
+
+    def median(self) -> float:
+        """Return the median, averaging the middle pair for an even count; the store must not be empty."""
+        values = self._sorted
+        middle = len(values) // 2
+        if len(values) % 2:
+            return float(values[middle])
+        return (values[middle - 1] + values[middle]) / 2
+
+
+def _node_metrics(info: Any) -> _Metrics:
+    """Extract the health metrics of one NodeDB entry."""
+    if not isinstance(info, dict):
+        return (None, None, None)
+    device_metrics = info.get("deviceMetrics")
+    if not isinstance(device_metrics, dict):
+        device_metrics = {}
+    return (
+        device_metrics.get("batteryLevel"),
+        device_metrics.get("airUtilTx"),
+        info.get("snr"),
+    )
+
+
+def _node_signature(info: Any) -> tuple[Any, ...]:
+    """
+    Return the fields of a NodeDB entry that the command responses show.
+
+    ``lastHeard`` is left out: it changes with every packet, and responses
+    that show it bound its staleness with a maximum cache age instead.
+    """
+    if not isinstance(info, dict):
+        return (_node_metrics(info),)
+    user = info.get("user")
+    user = user if isinstance(user, dict) else {}
+    device_metrics = info.get("deviceMetrics")
+    device_metrics = device_metrics if isinstance(device_metrics, dict) else {}
+    return (
+        _node_metrics(info),
+        device_metrics.get("voltage"),
+        user.get("shortName"),
+        user.get("longName"),
+        user.get("hwModel"),
+        info.get("hopsAway"),
+    )
+
+
+class NodeMetricsStore:
+    """
+    Incrementally maintained aggregates over one NodeDB.
+
+    The store is bound to the ``nodes`` mapping of the active interface and
+    rebuilt whenever that mapping is replaced or its size no longer matches
+    (nodes added while the configuration is downloaded arrive without a
+    receive callback). Every change to the aggregates or to a displayed
+    field bumps `version`, which invalidates cached responses.
+    """
+
+    def __init__(self) -> None:
+        self.version = 0
+        self._nodes: Mapping[Any, Any] | None = None
+        self._signatures: dict[Any, tuple[Any, ...]] = {}
+        self._battery = RunningValues()
+        self._air_util_tx = RunningValues()
+        self._snr = RunningValues()
+        self._low_battery: set[Any] = set()
+        self._render_cache: dict[str, tuple[int, float, str]] = {}
+        self._lock = threading.RLock()
+
+    def _add(self, key: Any, info: Any) -> None:
+        signature = _node_signature(info)
+        self._signatures[key] = signature
+        battery, air_util_tx, snr = signature[0]
+        if battery is not None:
+            self._battery.add(battery)
+            if battery <= LOW_BATTERY_THRESHOLD_PERCENT:
+                self._low_battery.add(key)
+        if air_util_tx is not None:
+            self._air_util_tx.add(air_util_tx)
+        if snr is not None:
+            self._snr.add(snr)
+
+    def _discard(self, key: Any) -> None:
+        signature = self._signatures.pop(key, None)
+        if signature is None:
+            return
+        battery, air_util_tx, snr = signature[0]
+        if battery is not None:
+            self._battery.remove(battery)
+            self._low_battery.discard(key)
+        if air_util_tx is not None:
+            self._air_util_tx.remove(air_util_tx)
+        if snr is not None:
+            self._snr.remove(snr)
+
+    def _rebuild(self, nodes: Mapping[Any, Any]) -> None:
+        self._nodes = nodes
+        self._signatures = {}
+        self._battery = RunningValues()
+        self._air_util_tx = RunningValues()
+        self._snr = RunningValues()
+        self._low_battery = set()
+        for key, info in list(nodes.items()):
+            self._add(key, info)
+        self.version += 1
+
+    def bind(self, nodes: Mapping[Any, Any]) -> None:
+        """
+        Track `nodes`, rebuilding the aggregates if it is not the mapping already tracked.
+
+        Parameters:
+            nodes (Mapping[Any, Any]): The interface's NodeDB, keyed by node ID.
+        """
+        with self._lock:
+            if nodes is not self._nodes or len(nodes) != len(self._signatures):
+                self._rebuild(nodes)
+
+    def refresh_node(self, key: Any) -> None:
+        """
+        Re-read one node from the tracked NodeDB.
+
+        Parameters:
+            key: NodeDB key (node ID such as ``"!a1b2c3d4"``) of the node to refresh.
+        """
+        with self._lock:
+            if self._nodes is None:
+                return
+            info = self._nodes.get(key)
+            previous = self._signatures.get(key)
+            if info is None:
+                if previous is None:
+                    return
+                self._discard(key)
+            else:
+                if previous is not None and previous == _node_signature(info):
+                    return
+                self._discard(key)
+                self._add(key, info)
+            self.version += 1
+
+    def note_packet(self, packet: Any, interface: Any) -> None:
+        """
+        Refresh the sender of a received packet if it belongs to the tracked NodeDB.
+
+        Parameters:
+            packet: Decoded Meshtastic packet.
+            interface: Interface that received the packet.
+        """
+        if self._nodes is None or getattr(interface, "nodes", None) is not self._nodes:
+            return
+        if not isinstance(packet, dict):
+            return
+        key = packet.get("fromId")
+        if not isinstance(key, str):
+            sender = packet.get("from")
+            if not isinstance(sender, int):
+                return
+            key = f"!{sender:08x}"
+        self.refresh_node(key)
+
+    def summary(self) -> dict[str, Any]:
+        """
+        Return the current aggregates.
+
+        Returns:
+            dict[str, Any]: ``nodes`` (NodeDB size), ``low_battery`` (nodes at or
+            below `LOW_BATTERY_THRESHOLD_PERCENT`), and ``battery``,
+            ``air_util_tx`` and ``snr`` as ``(mean, median)`` or None when no
+            node reports the metric.
+        """
+
+        def _stat(values: RunningValues) -> tuple[float, float] | None:
+            return (values.mean(), values.median()) if len(values) else None
+
+        with self._lock:
+            return {
+                "nodes": len(self._signatures),
+                "battery": _stat(self._battery),
+                "air_util_tx": _stat(self._air_util_tx),
+                "snr": _stat(self._snr),
+                "low_battery": len(self._low_battery),
+            }
+
+    def cached_render(
+        self, key: str, render: Callable[[], str], max_age: float | None = None
+    ) -> str:
+        """
+        Return a rendered response, rendering it again only after the store changed.
+
+        Parameters:
+            key (str): Name of the response.
+            render (Callable[[], str]): Builds the response from the current state.
+            max_age (float | None): Also re-render once the cached text is older than this many seconds.
+
+        Returns:
+            str: The cached or freshly rendered response.
+        """
+        now = time.monotonic()
+        with self._lock:
+            version = self.version
+            cached = self._render_cache.get(key)
+        if (
+            cached is not None
+            and cached[0] == version
+            and (max_age is None or now - cached[1] < max_age)
+        ):
+            return cached[2]
+        text = render()
+        with self._lock:
+            # A change during rendering leaves an entry for the old version,
+            # so the next call renders again.
+            self._render_cache[key] = (version, now, text)
+        return text
+
+
+_store = NodeMetricsStore()
+
+
+def get_node_metrics_store() -> NodeMetricsStore:
+    """Return the process-wide node metrics store."""
+    return _store
+
+
+def reset_node_metrics_store() -> None:
+    """Replace the node metrics store with an empty one."""
+    global _store
+    _store = NodeMetricsStore()
@@ -0,0 +1,204 @@
+"""Incremental node-name changes for the longname/shortname tables.
+
+NODEINFO_APP packets carry a node's user record, and the Meshtastic library
+has already applied it to the NodeDB by the time the packet is published. The
+feed compares each record with the names last written for that node and keeps
+only real changes, coalesced per node, until the refresh task writes them in
+one transaction. A periodic full reconcile against the NodeDB snapshot still
+runs to catch anything the feed missed and to prune departed nodes.
+"""
+
+import threading
+from collections.abc import Callable, Iterable, Mapping
+from typing import Any
+
+from mmrelay.constants.database import PROTO_NODE_NAME_LONG, PROTO_NODE_NAME_SHORT
+from mmrelay.constants.formats import NODEINFO_APP_PORTNUM
+from mmrelay.db_utils import NodeNameEntry
+
+__all__ = [
+    "NodeNameFeed",
+    "get_node_name_feed",
+    "reset_node_name_feed",
+]
+
+# (longName, shortName) of one node; None where not known.
+_Names = tuple[str | None, str | None]
+
+
+def _name_or_none(value: Any) -> str | None:
+    return value if isinstance(value, str) and value else None
+
+
+class NodeNameFeed:
+    """
+    Per-node name changes waiting to be written, coalesced by node ID.
+
+    `known` holds the names the tables are believed to hold, seeded by each
+    full reconcile and advanced by each successful flush, so a NODEINFO that
+    repeats the stored names costs a dict lookup and no write.
+    """
+
+    def __init__(self) -> None:
+        self._known: dict[str, _Names] = {}
+        self._pending: dict[str, _Names] = {}
+        self._flushing: dict[str, _Names] = {}
+        self._nodes: Mapping[Any, Any] | None = None
+        self._reconcile_requested = False
+        self._lock = threading.Lock()
+
+    def note_user(self, user: Any) -> bool:
+        """
+        Record the names in a Meshtastic user record if they differ from the stored ones.
+
+        A missing name leaves the stored value alone; clearing names is left to the full reconcile.
+
+        Parameters:
+            user: The ``user`` dict of a NODEINFO_APP packet or NodeDB entry.
+
+        Returns:
+            bool: True if a change was queued.
+        """
+        if not isinstance(user, dict):
+            return False
+        node_id = user.get("id")
+        if not isinstance(node_id, str) or not node_id:
+            return False
+        long_name = _name_or_none(user.get(PROTO_NODE_NAME_LONG))
+        short_name = _name_or_none(user.get(PROTO_NODE_NAME_SHORT))
+        if long_name is None and short_name is None:
+            return False
+        with self._lock:
+            current = (
+                self._pending.get(node_id)
+                or self._flushing.get(node_id)
+                or self._known.get(node_id)
+            )
+            known_long, known_short = current or (None, None)
+            names = (
+                long_name if long_name is not None else known_long,
+                short_name if short_name is not None else known_short,
+            )
+            if names == current:
+                return False
+            if node_id not in self._flushing and names == self._known.get(node_id):
+                # Changed and then changed back before a flush.
+                self._pending.pop(node_id, None)
+                return False
+            self._pending[node_id] = names
+            return True
+
+    def note_packet(self, packet: Any, interface: Any) -> None:
+        """
+        Queue the name change carried by a NODEINFO_APP packet, if any.
+
+        Also notices when the interface's NodeDB mapping was replaced (a new
+        connection downloads a fresh NodeDB without per-node packets) and asks
+        the refresh task for a full reconcile.
+
+        Parameters:
+            packet: Decoded Meshtastic packet.
+            interface: The primary interface that received the packet.
+        """
+        nodes = getattr(interface, "nodes", None)
+        if isinstance(nodes, dict) and nodes is not self._nodes:
+            with self._lock:
+                if self._nodes is not None:
+                    self._reconcile_requested = True
+                self._nodes = nodes
+        if not isinstance(packet, dict):
+            return
+        decoded = packet.get("decoded")
+        if (
+            not isinstance(decoded, dict)
+            or decoded.get("portnum") != NODEINFO_APP_PORTNUM
+        ):
+            return
+        self.note_user(decoded.get("user"))
+
+    def take_reconcile_request(self) -> bool:
+        """Return whether a full reconcile was requested, clearing the request."""
+        with self._lock:
+            requested = self._reconcile_requested
+            self._reconcile_requested = False
+            return requested
+
+    def pending_count(self) -> int:
+        """Return the number of nodes with unwritten changes."""
+        with self._lock:
+            return len(self._pending)
+
+    def reset(self, state: Iterable[Any]) -> None:
+        """
+        Replace the known names with the state a full reconcile just wrote.
+
+        Changes queued while the reconcile ran are kept if they still differ.
+
+        Parameters:
+            state (Iterable[NodeNameEntry]): Node-name state returned by `sync_name_tables_if_changed`.
+        """
+        # Read the fields rather than checking the class, so entries built by
+        # a reloaded db_utils still seed the known names.
+        known = {
+            entry.meshtastic_id: (
+                getattr(entry, "long_name", None),
+                getattr(entry, "short_name", None),
+            )
+            for entry in state
+            if isinstance(getattr(entry, "meshtastic_id", None), str)
+        }
+        with self._lock:
+            self._known = known
+            self._pending = {
+                node_id: names
+                for node_id, names in self._pending.items()
+                if known.get(node_id) != names
+            }
+
+    def flush(self, write: Callable[[list[NodeNameEntry]], bool]) -> int:
+        """
+        Write all queued changes with one call to `write`.
+
+        Parameters:
+            write (Callable[[list[NodeNameEntry]], bool]): Persists the entries in one
+                transaction and returns True on success, e.g. `upsert_node_names`.
+
+        Returns:
+            int: Number of nodes written; 0 when nothing was queued or the write failed.
+        """
+        with self._lock:
+            batch = self._pending
+            self._pending = {}
+            self._flushing = batch
+        if not batch:
+            return 0
+        entries = [
+            NodeNameEntry(node_id, long_name, short_name)
+            for node_id, (long_name, short_name) in sorted(batch.items())
+        ]
+        written = False
+        try:
+            written = write(entries)
+        finally:
+            with self._lock:
+                self._flushing = {}
+                if written:
+                    self._known.update(batch)
+                else:
+                    # Keep changes queued since the batch was taken; they are newer.
+                    self._pending = {**batch, **self._pending}
+        return len(entries) if written else 0
+
+
+_feed = NodeNameFeed()
+
+
+def get_node_name_feed() -> NodeNameFeed:
+    """Return the process-wide node-name feed."""
+    return _feed
+
+
+def reset_node_name_feed() -> None:
+    """Replace the node-name feed with an empty one."""
+    global _feed
+    _feed = NodeNameFeed()
@@ -1,10 +1,13 @@
 import asyncio
 import math
+import time
 from typing import Any
 
 import mmrelay.meshtastic_utils as facade
 from mmrelay.constants.config import (
+    CONFIG_KEY_NODEDB_RECONCILE_INTERVAL,
     CONFIG_KEY_NODEDB_REFRESH_INTERVAL,
+    DEFAULT_NODEDB_RECONCILE_INTERVAL,
     DEFAULT_NODEDB_REFRESH_INTERVAL,
 )
 from mmrelay.constants.database import PROTO_NODE_NAME_LONG, PROTO_NODE_NAME_SHORT
@@ -13,6 +16,7 @@ from mmrelay.db_utils import NodeNameState
 __all__ = [
     "_parse_refresh_interval_seconds",
     "_snapshot_node_name_rows",
+    "get_nodedb_reconcile_interval_seconds",
     "get_nodedb_refresh_interval_seconds",
     "refresh_node_name_tables",
 ]
@@ -74,6 +78,40 @@ def get_nodedb_refresh_interval_seconds(
     return DEFAULT_NODEDB_REFRESH_INTERVAL
 
 
+def get_nodedb_reconcile_interval_seconds(
+    passed_config: dict[str, Any] | None = None,
+) -> float:
+    """
+    Return the configured interval (seconds) between full NodeDB name reconciles.
+
+    Reads `meshtastic.nodedb_reconcile_interval` and falls back to
+    `DEFAULT_NODEDB_RECONCILE_INTERVAL` when missing or invalid. Between
+    reconciles, only name changes seen in NODEINFO packets are written.
+
+    Parameters:
+        passed_config (dict[str, Any] | None): Optional config to read from.
+            When omitted, uses this module's global `config`.
+    """
+    config_source = passed_config if passed_config is not None else facade.config
+    if not isinstance(config_source, dict):
+        config_source = {}
+    raw_interval = facade.get_meshtastic_config_value(
+        config_source,
+        CONFIG_KEY_NODEDB_RECONCILE_INTERVAL,
+        DEFAULT_NODEDB_RECONCILE_INTERVAL,
+    )
+    interval = _parse_refresh_interval_seconds(raw_interval)
+    if interval is not None:
+        return interval
+
+    facade.logger.warning(
+        "Invalid meshtastic.nodedb_reconcile_interval=%r; defaulting to %.1f",
+        raw_interval,
+        DEFAULT_NODEDB_RECONCILE_INTERVAL,
+    )
+    return DEFAULT_NODEDB_RECONCILE_INTERVAL
+
+
 def _snapshot_node_name_rows() -> tuple[dict[str, Any] | None, bool]:
     """
     Build a minimal node-name snapshot under meshtastic_lock.
@@ -118,13 +156,19 @@ async def refresh_node_name_tables(
     shutdown_event: asyncio.Event,
     *,
     refresh_interval_seconds: float | None = None,
+    reconcile_interval_seconds: float | None = None,
 ) -> None:
     """
-    Periodically sync longname/shortname tables from the current Meshtastic node DB.
+    Keep the longname/shortname tables in step with the Meshtastic node DB.
 
-    The first refresh attempt runs immediately. When `refresh_interval_seconds`
-    is zero, one immediate refresh is attempted and periodic refresh
-    is disabled afterward.
+    The first pass reconciles the tables against a full NodeDB snapshot. Every
+    `refresh_interval_seconds` after that, name changes queued by the node-name
+    feed from NODEINFO packets are written in one transaction; the full
+    snapshot, which holds `meshtastic_lock` while it copies the NodeDB, is only
+    taken again every `reconcile_interval_seconds`, after a reconnect replaced
+    the NodeDB, or until a reconcile has succeeded. When
+    `refresh_interval_seconds` is zero, one immediate reconcile is attempted
+    and periodic refresh is disabled afterward.
 
     Current scope: this task updates only long/short name cache tables from the
     NodeDB snapshot. Future releases may extend persistence to broader NodeDB
@@ -150,42 +194,68 @@ async def refresh_node_name_tables(
         else:
             interval = parsed
 
+    reconcile_interval = (
+        _parse_refresh_interval_seconds(reconcile_interval_seconds)
+        if reconcile_interval_seconds is not None
+        else None
+    )
+    if reconcile_interval is None:
+        reconcile_interval = get_nodedb_reconcile_interval_seconds()
+
+    feed = facade.get_node_name_feed()
     previous_state: NodeNameState | None = None
     client_unavailable_reason: str | None = None
+    last_reconcile: float | None = None
     while not shutdown_event.is_set():
         try:
-            nodes_snapshot, client_missing = await asyncio.to_thread(
-                _snapshot_node_name_rows
-            )
+            now = time.monotonic()
+            reconcile_requested = feed.take_reconcile_request()
+            if (
+                last_reconcile is not None
+                and not reconcile_requested
+                and now - last_reconcile < reconcile_interval
+            ):
+                written = await asyncio.to_thread(feed.flush, facade.upsert_node_names)
+                if written:
+                    facade.logger.debug(
+                        "Wrote NODEINFO name changes for %d nodes", written
+                    )
+            else:
+                nodes_snapshot, client_missing = await asyncio.to_thread(
+                    _snapshot_node_name_rows
+                )
 
-            if nodes_snapshot is None:
-                if client_missing:
-                    if facade.reconnecting:
-                        next_reason = "reconnecting"
-                        if client_unavailable_reason != next_reason:
-                            facade.logger.debug(
-                                "Skipping name-cache refresh from NodeDB while reconnection is in progress"
-                            )
-                        client_unavailable_reason = next_reason
+                if nodes_snapshot is None:
+                    if client_missing:
+                        if facade.reconnecting:
+                            next_reason = "reconnecting"
+                            if client_unavailable_reason != next_reason:
+                                facade.logger.debug(
+                                    "Skipping name-cache refresh from NodeDB while reconnection is in progress"
+                                )
+                            client_unavailable_reason = next_reason
+                        else:
+                            next_reason = "unavailable"
+                            if client_unavailable_reason != next_reason:
+                                facade.logger.debug(
+                                    "Skipping name-cache refresh from NodeDB because Meshtastic client is unavailable"
+                                )
+                            client_unavailable_reason = next_reason
                     else:
-                        next_reason = "unavailable"
-                        if client_unavailable_reason != next_reason:
-                            facade.logger.debug(
-                                "Skipping name-cache refresh from NodeDB because Meshtastic client is unavailable"
-                            )
-                        client_unavailable_reason = next_reason
+                        client_unavailable_reason = None
+                        facade.logger.debug(
+                            "Skipping name-cache refresh from NodeDB because client.nodes is unavailable"
+                        )
                 else:
                     client_unavailable_reason = None
-                    facade.logger.debug(
-                        "Skipping name-cache refresh from NodeDB because client.nodes is unavailable"
+                    previous_state = await asyncio.to_thread(
+                        facade.sync_name_tables_if_changed,
+                        nodes_snapshot,
+                        previous_state,
                     )
-            else:
-                client_unavailable_reason = None
-                previous_state = await asyncio.to_thread(
-                    facade.sync_name_tables_if_changed,
-                    nodes_snapshot,
-                    previous_state,
-                )
+                    if previous_state is not None:
+                        feed.reset(previous_state)
+                        last_reconcile = now
         except Exception:
             facade.logger.exception(
                 "Failed to refresh name-cache tables from NodeDB snapshot"
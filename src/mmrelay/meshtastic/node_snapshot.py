@@ -0,0 +1,319 @@
+"""Persistent NodeDB snapshot used as a read-through cache for node lookups.
+
+After a connect or reconnect the radio streams its whole NodeDB again, which
+can take tens of seconds over BLE or a busy serial link. The relay saves
+``client.nodes`` to the ``node_snapshot`` table on a schedule and on
+shutdown, loads it at startup, and answers node lookups from it while the
+live NodeDB is still filling. Live entries always win; entries served from
+the snapshot are marked stale and carry the time they were saved.
+"""
+
+import asyncio
+import threading
+import time
+from collections.abc import Mapping
+from typing import Any, NamedTuple
+
+import mmrelay.meshtastic_utils as facade
+from mmrelay.constants.config import (
+    CONFIG_KEY_NODEDB_SNAPSHOT_INTERVAL,
+    DEFAULT_NODEDB_SNAPSHOT_INTERVAL,
+)
+from mmrelay.meshtastic.node_refresh import _parse_refresh_interval_seconds
+
+__all__ = [
+    "CachedNode",
+    "NodeSnapshotCache",
+    "get_node_snapshot_cache",
+    "get_nodedb_snapshot_interval_seconds",
+    "hydrate_node_snapshot",
+    "lookup_node",
+    "persist_node_snapshot",
+    "reset_node_snapshot_cache",
+    "save_node_snapshot_now",
+]
+
+
+class CachedNode(NamedTuple):
+    """A NodeDB entry and whether it came from the saved snapshot."""
+
+    node: dict[str, Any]
+    stale: bool
+    saved_at: float | None
+
+
+_DROP = object()
+
+
+def _jsonable(value: Any) -> Any:
+    """
+    Return a JSON-serializable copy of a NodeDB value.
+
+    Protobuf ``raw`` objects, bytes and other non-JSON leaves are dropped.
+    """
+    if isinstance(value, dict):
+        result = {}
+        for key, item in list(value.items()):
+            if key == "raw" or not isinstance(key, str):
+                continue
+            converted = _jsonable(item)
+            if converted is not _DROP:
+                result[key] = converted
+        return result
+    if isinstance(value, (list, tuple)):
+        return [item for item in map(_jsonable, value) if item is not _DROP]
+    if value is None or isinstance(value, (str, int, float, bool)):
+        return value
+    return _DROP
+
+
+class NodeSnapshotCache:
+    """
+    Saved NodeDB entries plus the live NodeDB mapping they stand in for.
+
+    The cache never modifies the live mapping; `lookup` checks it first and
+    falls back to the snapshot for nodes the radio has not streamed yet.
+    """
+
+    def __init__(self) -> None:
+        self._snapshot: dict[str, dict[str, Any]] = {}
+        self._saved_at: dict[str, float] = {}
+        self._live: Mapping[str, Any] | None = None
+        self._lock = threading.Lock()
+
+    def hydrate(self, rows: Mapping[str, tuple[dict[str, Any], float]]) -> int:
+        """
+        Load saved entries, keeping any newer ones already in the cache.
+
+        Parameters:
+            rows (Mapping[str, tuple[dict[str, Any], float]]): Node ID to
+                (entry, saved_at), as returned by `load_node_snapshot`.
+
+        Returns:
+            int: Number of entries loaded.
+        """
+        loaded = 0
+        with self._lock:
+            for node_id, (node, saved_at) in rows.items():
+                if self._saved_at.get(node_id, float("-inf")) >= saved_at:
+                    continue
+                self._snapshot[node_id] = node
+                self._saved_at[node_id] = saved_at
+                loaded += 1
+        return loaded
+
+    def bind(self, nodes: Any) -> None:
+        """
+        Point the cache at a newly connected interface's NodeDB mapping.
+
+        Entries of the previously bound mapping are folded into the snapshot
+        first, so a reconnect serves the last live data while the new NodeDB
+        streams in.
+
+        Parameters:
+            nodes: The interface's ``nodes`` mapping; ignored unless it is a dict.
+        """
+        if not isinstance(nodes, dict):
+            return
+        with self._lock:
+            previous = self._live
+            self._live = nodes
+        if previous is not None and previous is not nodes:
+            self.capture(previous)
+
+    def capture(
+        self, nodes: Mapping[str, Any] | None = None
+    ) -> dict[str, dict[str, Any]]:
+        """
+        Copy live NodeDB entries into the snapshot.
+
+        Parameters:
+            nodes (Mapping[str, Any] | None): Mapping to copy; defaults to the bound live mapping.
+
+        Returns:
+            dict[str, dict[str, Any]]: The JSON-serializable entries copied, keyed by node ID.
+        """
+        if nodes is None:
+            nodes = self._live
+        if not nodes:
+            return {}
+        captured: dict[str, dict[str, Any]] = {}
+        # dict() copies the top level atomically; the library may still update
+        # a node's nested dicts while it is copied, so skip those until next time.
+        for node_id, node in dict(nodes).items():
+            if not isinstance(node_id, str) or not isinstance(node, dict):
+                continue
+            try:
+                captured[node_id] = _jsonable(node)
+            except RuntimeError:
+                continue
+        now = time.time()
+        with self._lock:
+            self._snapshot.update(captured)
+            self._saved_at.update(dict.fromkeys(captured, now))
+        return captured
+
+    def lookup(self, node_id: str) -> CachedNode | None:
+        """
+        Return the live entry for a node, or its saved entry marked stale.
+
+        Parameters:
+            node_id (str): Node ID such as ``"!a1b2c3d4"``.
+
+        Returns:
+            CachedNode | None: The entry, or None if the node is unknown.
+        """
+        live = self._live
+        if live is not None:
+            node = live.get(node_id)
+            if isinstance(node, dict):
+                return CachedNode(node, False, None)
+        with self._lock:
+            node = self._snapshot.get(node_id)
+            if node is None:
+                return None
+            return CachedNode(node, True, self._saved_at.get(node_id))
+
+    def stale_count(self) -> int:
+        """Return the number of saved nodes not yet present in the live NodeDB."""
+        live = self._live or {}
+        with self._lock:
+            return sum(1 for node_id in self._snapshot if node_id not in live)
+
+
+_cache = NodeSnapshotCache()
+
+
+def get_node_snapshot_cache() -> NodeSnapshotCache:
+    """Return the process-wide NodeDB snapshot cache."""
+    return _cache
+
+
+def reset_node_snapshot_cache() -> None:
+    """Replace the NodeDB snapshot cache with an empty one."""
+    global _cache
+    _cache = NodeSnapshotCache()
+
+
+def lookup_node(node_id: str, interface: Any = None) -> CachedNode | None:
+    """
+    Look a node up in an interface's NodeDB, falling back to the saved snapshot.
+
+    The snapshot only stands in for the primary interface's NodeDB, so other
+    radios are answered from their own NodeDB only.
+
+    Parameters:
+        node_id (str): Node ID such as ``"!a1b2c3d4"``.
+        interface: Interface whose NodeDB to check; defaults to the primary client.
+
+    Returns:
+        CachedNode | None: The entry, or None if the node is unknown.
+    """
+    if interface is None:
+        interface = facade.meshtastic_client
+    nodes = getattr(interface, "nodes", None)
+    if nodes:
+        node = nodes.get(node_id)
+        if node is not None:
+            return CachedNode(node, False, None)
+    if interface is not facade.meshtastic_client:
+        return None
+    return get_node_snapshot_cache().lookup(node_id)
+
+
+def get_nodedb_snapshot_interval_seconds(
+    passed_config: dict[str, Any] | None = None,
+) -> float:
+    """
+    Return the configured interval (seconds) between NodeDB snapshot saves.
+
+    Reads `meshtastic.nodedb_snapshot_interval` and falls back to
+    `DEFAULT_NODEDB_SNAPSHOT_INTERVAL` when missing or invalid. Zero disables
+    the snapshot.
+
+    Parameters:
+        passed_config (dict[str, Any] | None): Optional config to read from.
+            When omitted, uses the module's global `config`.
+    """
+    config_source = passed_config if passed_config is not None else facade.config
+    if not isinstance(config_source, dict):
+        config_source = {}
+    raw_interval = facade.get_meshtastic_config_value(
+        config_source,
+        CONFIG_KEY_NODEDB_SNAPSHOT_INTERVAL,
+        DEFAULT_NODEDB_SNAPSHOT_INTERVAL,
+    )
+    interval = _parse_refresh_interval_seconds(raw_interval)
+    if interval is not None:
+        return interval
+
+    facade.logger.warning(
+        "Invalid meshtastic.nodedb_snapshot_interval=%r; defaulting to %.1f",
+        raw_interval,
+        DEFAULT_NODEDB_SNAPSHOT_INTERVAL,
+    )
+    return DEFAULT_NODEDB_SNAPSHOT_INTERVAL
+
+
+def hydrate_node_snapshot(passed_config: dict[str, Any] | None = None) -> int:
+    """
+    Load the saved NodeDB snapshot into the cache.
+
+    Parameters:
+        passed_config (dict[str, Any] | None): Optional config to read the interval from.
+
+    Returns:
+        int: Number of nodes loaded (0 when the snapshot is disabled).
+    """
+    if get_nodedb_snapshot_interval_seconds(passed_config) <= 0:
+        return 0
+    loaded = get_node_snapshot_cache().hydrate(facade.load_node_snapshot(time.time()))
+    if loaded:
+        facade.logger.info("Loaded %d nodes from the saved NodeDB snapshot", loaded)
+    return loaded
+
+
+def save_node_snapshot_now() -> bool:
+    """
+    Copy the live NodeDB into the cache and save it to the database.
+
+    Returns:
+        bool: True if there was nothing to save or the save committed.
+    """
+    captured = get_node_snapshot_cache().capture()
+    if not captured:
+        return True
+    saved = facade.save_node_snapshot(captured, time.time())
+    if saved:
+        facade.logger.debug("Saved NodeDB snapshot of %d nodes", len(captured))
+    return saved
+
+
+async def persist_node_snapshot(
+    shutdown_event: asyncio.Event,
+    *,
+    interval_seconds: float | None = None,
+) -> None:
+    """
+    Save the NodeDB snapshot every `interval_seconds` and once more at shutdown.
+
+    Parameters:
+        shutdown_event (asyncio.Event): Set when the relay is shutting down.
+        interval_seconds (float | None): Save interval; defaults to the configured one.
+            Zero or less returns immediately.
+    """
+    interval = (
+        get_nodedb_snapshot_interval_seconds()
+        if interval_seconds is None
+        else interval_seconds
+    )
+    if interval <= 0:
+        return
+    while True:
+        try:
+            await asyncio.wait_for(shutdown_event.wait(), timeout=float(interval))
+        except asyncio.TimeoutError:
+            await asyncio.to_thread(facade.save_node_snapshot_now)
+            continue
+        await asyncio.to_thread(facade.save_node_snapshot_now)
+        return
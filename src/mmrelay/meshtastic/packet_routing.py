@@ -23,7 +23,10 @@ from mmrelay.log_utils import get_logger
 __all__ = [
     "CHAT_ELIGIBLE_PORTNUMS",
     "PacketAction",
+    "RoutingPolicy",
     "classify_packet",
+    "clear_routing_policy_cache",
+    "compile_routing_policy",
 ]
 
 
@@ -208,6 +211,163 @@ def _get_encrypted_action(config: Mapping[str, object] | None) -> str:
     return DEFAULT_ENCRYPTED_ACTION
 
 
+class RoutingPolicy:
+    """
+    Packet routing settings compiled from configuration.
+
+    Portnum overrides, the encrypted-packet action and the detection-sensor
+    flag are resolved once, and the action for each portnum seen is memoized,
+    so classifying a packet is a handful of dict lookups.
+    """
+
+    __slots__ = (
+        "chat_overrides",
+        "disabled_overrides",
+        "encrypted_action",
+        "detection_sensor_enabled",
+        "_actions",
+    )
+
+    def __init__(
+        self,
+        chat_overrides: frozenset[str],
+        disabled_overrides: frozenset[str],
+        encrypted_action: str,
+        detection_sensor_enabled: bool,
+    ) -> None:
+        self.chat_overrides = chat_overrides
+        self.disabled_overrides = disabled_overrides
+        self.encrypted_action = encrypted_action
+        self.detection_sensor_enabled = detection_sensor_enabled
+        self._actions: dict[tuple[type, object], tuple[str, str]] = {}
+
+    def resolve(self, portnum: object) -> tuple[str, str]:
+        """
+        Return ``(action, reason)`` for a decoded (non-encrypted) portnum.
+
+        `reason` is ``"override"`` when a ``packet_routing`` setting decided the
+        action, ``"detection_sensor"`` when the detection-sensor flag did, and
+        ``"default"`` otherwise.
+        """
+        # Key on type too so True/1 and "1"/1 do not share an entry.
+        key = (type(portnum), portnum)
+        try:
+            return self._actions[key]
+        except (KeyError, TypeError):
+            pass
+        result = self._compute(portnum)
+        try:
+            self._actions[key] = result
+        except TypeError:
+            pass
+        return result
+
+    def _compute(self, portnum: object) -> tuple[str, str]:
+        portnum_name = _get_portnum_name(portnum)
+        if portnum_name in self.disabled_overrides:
+            return PacketAction.DROP, "override"
+
+        is_detection_sensor = (
+            portnum
+            in (
+                PORTNUM_DETECTION_SENSOR_APP,
+                DETECTION_SENSOR_APP,
+            )
+            or portnum_name == DETECTION_SENSOR_APP
+        )
+        if portnum_name in self.chat_overrides:
+            if is_detection_sensor and not self.detection_sensor_enabled:
+                return PacketAction.PLUGIN_ONLY, "detection_sensor"
+            return PacketAction.RELAY, "override"
+
+        if is_detection_sensor:
+            if self.detection_sensor_enabled:
+                return PacketAction.RELAY, "default"
+            return PacketAction.PLUGIN_ONLY, "default"
+
+        is_text_message = (
+            portnum
+            in (
+                PORTNUM_TEXT_MESSAGE_APP,
+                TEXT_MESSAGE_APP,
+            )
+            or portnum_name in CHAT_ELIGIBLE_PORTNUMS
+        )
+        if is_text_message:
+            return PacketAction.RELAY, "default"
+        return PacketAction.PLUGIN_ONLY, "default"
+
+
+# (config, meshtastic section, routing section, detection_sensor value) -> policy.
+# Holding the referenced objects keeps their ids from being reused.
+_routing_policy_cache: tuple[object, object, object, object, RoutingPolicy] | None = (
+    None
+)
+
+
+def _routing_policy_key(
+    config: Mapping[str, object] | None,
+) -> tuple[object, object, object, object]:
+    meshtastic_section: object = None
+    routing_section: object = None
+    detection_sensor: object = None
+    if isinstance(config, Mapping):
+        meshtastic_section = config.get(CONFIG_SECTION_MESHTASTIC)
+        if isinstance(meshtastic_section, Mapping):
+            routing_section = meshtastic_section.get(CONFIG_KEY_PACKET_ROUTING)
+            detection_sensor = meshtastic_section.get("detection_sensor")
+    return config, meshtastic_section, routing_section, detection_sensor
+
+
+def compile_routing_policy(config: Mapping[str, object] | None) -> RoutingPolicy:
+    """
+    Return the compiled `RoutingPolicy` for `config`, reusing the cached one when unchanged.
+
+    The cache is keyed by the identity of the config, its ``meshtastic`` and
+    ``packet_routing`` sections, and the ``detection_sensor`` value, so loading
+    or replacing configuration recompiles the policy automatically. Call
+    `clear_routing_policy_cache` after mutating routing lists in place.
+    """
+    global _routing_policy_cache
+    key = _routing_policy_key(config)
+    cached = _routing_policy_cache
+    if (
+        cached is not None
+        and cached[0] is key[0]
+        and cached[1] is key[1]
+        and cached[2] is key[2]
+        and cached[3] == key[3]
+    ):
+        return cached[4]
+
+    chat_overrides, disabled_overrides = _get_packet_routing_overrides(config)
+    detection_sensor_enabled = bool(
+        get_meshtastic_config_value(
+            (
+                config
+                if isinstance(config, dict)
+                else (dict(config) if isinstance(config, Mapping) else {})
+            ),
+            "detection_sensor",
+            DEFAULT_DETECTION_SENSOR,
+        )
+    )
+    policy = RoutingPolicy(
+        chat_overrides,
+        disabled_overrides,
+        _get_encrypted_action(config),
+        detection_sensor_enabled,
+    )
+    _routing_policy_cache = (*key, policy)
+    return policy
+
+
+def clear_routing_policy_cache() -> None:
+    """Discard the compiled routing policy so the next lookup recompiles it."""
+    global _routing_policy_cache
+    _routing_policy_cache = None
+
+
 def classify_packet(
     portnum: object,
     config: Mapping[str, object] | None,
@@ -222,8 +382,9 @@ def classify_packet(
     Encrypted packets are handled by a dedicated policy (encrypted_action)
     separate from portnum overrides, because the actual portnum is unknown.
     """
+    policy = compile_routing_policy(config)
     if _is_encrypted_packet(packet):
-        action = _get_encrypted_action(config)
+        action = policy.encrypted_action
         if action == PacketAction.DROP:
             logger.debug(
                 "Encrypted packet classified as %s via encrypted_action policy.",
@@ -231,78 +392,18 @@ def classify_packet(
             )
         return action
 
-    portnum_name = _get_portnum_name(portnum, packet)
-
-    chat_overrides, disabled_overrides = _get_packet_routing_overrides(config)
-
-    if portnum_name in disabled_overrides:
+    action, reason = policy.resolve(portnum)
+    if reason == "override":
         logger.debug(
             "Packet %s classified as %s via config override.",
-            portnum_name,
-            PacketAction.DROP,
-        )
-        return PacketAction.DROP
-
-    is_detection_sensor = (
-        portnum
-        in (
-            PORTNUM_DETECTION_SENSOR_APP,
-            DETECTION_SENSOR_APP,
-        )
-        or portnum_name == DETECTION_SENSOR_APP
-    )
-
-    is_text_message = (
-        portnum
-        in (
-            PORTNUM_TEXT_MESSAGE_APP,
-            TEXT_MESSAGE_APP,
+            _get_portnum_name(portnum, packet),
+            action,
         )
-        or portnum_name in CHAT_ELIGIBLE_PORTNUMS
-    )
-
-    if portnum_name in chat_overrides:
-        if is_detection_sensor:
-            detection_sensor_enabled = get_meshtastic_config_value(
-                (
-                    config
-                    if isinstance(config, dict)
-                    else (dict(config) if isinstance(config, Mapping) else {})
-                ),
-                "detection_sensor",
-                DEFAULT_DETECTION_SENSOR,
-            )
-            if not detection_sensor_enabled:
-                logger.debug(
-                    "Packet %s in chat_portnums but detection_sensor is disabled; "
-                    "classifying as %s.",
-                    portnum_name,
-                    PacketAction.PLUGIN_ONLY,
-                )
-                return PacketAction.PLUGIN_ONLY
+    elif reason == "detection_sensor":
         logger.debug(
-            "Packet %s classified as %s via config override.",
-            portnum_name,
-            PacketAction.RELAY,
-        )
-        return PacketAction.RELAY
-
-    if is_detection_sensor:
-        detection_sensor_enabled = get_meshtastic_config_value(
-            (
-                config
-                if isinstance(config, dict)
-                else (dict(config) if isinstance(config, Mapping) else {})
-            ),
-            "detection_sensor",
-            DEFAULT_DETECTION_SENSOR,
+            "Packet %s in chat_portnums but detection_sensor is disabled; "
+            "classifying as %s.",
+            _get_portnum_name(portnum, packet),
+            PacketAction.PLUGIN_ONLY,
         )
-        if detection_sensor_enabled:
-            return PacketAction.RELAY
-
-        return PacketAction.PLUGIN_ONLY
-
-    if is_text_message:
-        return PacketAction.RELAY
-
-    return PacketAction.PLUGIN_ONLY
+    return action
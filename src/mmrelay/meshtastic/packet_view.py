@@ -0,0 +1,149 @@
+import base64
+import contextlib
+import json
+from typing import Any, Iterator, Mapping
+
+from mmrelay.constants.formats import DEFAULT_TEXT_ENCODING
+
+__all__ = [
+    "PacketView",
+    "_strip_raw_copy",
+    "get_packet_view",
+    "packet_view_scope",
+]
+
+_MISSING = object()
+
+# Views for packets currently being dispatched to plugins, keyed by id(packet).
+_active_packet_views: dict[int, "PacketView"] = {}
+
+
+def _strip_raw_copy(data: Any) -> Any:
+    """
+    Return a copy of a nested dict/list structure with every ``"raw"`` key removed.
+
+    Unlike `BasePlugin.strip_raw`, the input is never modified: containers are
+    rebuilt and leaf values are shared.
+    """
+    if isinstance(data, dict):
+        return {
+            key: _strip_raw_copy(value) for key, value in data.items() if key != "raw"
+        }
+    if isinstance(data, list):
+        return [_strip_raw_copy(item) for item in data]
+    return data
+
+
+class PacketView:
+    """
+    Read-only, lazily normalized view of one received Meshtastic packet.
+
+    One view is shared by every plugin that handles the packet, so the
+    raw-stripped copy, the transport form (binary ``decoded.payload`` as
+    base64) and its JSON serialization are each built at most once. The
+    original packet dict is never modified. The returned structures are shared
+    between plugins and must be treated as read-only.
+    """
+
+    __slots__ = ("_packet", "_stripped", "_transport", "_json")
+
+    def __init__(self, packet: Mapping[str, Any]) -> None:
+        """
+        Wrap a packet without copying it; normalization happens on first access.
+
+        Parameters:
+            packet (Mapping[str, Any]): The packet as delivered by the Meshtastic library.
+        """
+        self._packet = packet
+        self._stripped: Any = _MISSING
+        self._transport: Any = _MISSING
+        self._json: Any = _MISSING
+
+    @property
+    def packet(self) -> Mapping[str, Any]:
+        """The original, unmodified packet."""
+        return self._packet
+
+    @property
+    def stripped(self) -> dict[str, Any]:
+        """The packet with all ``"raw"`` protobuf fields removed, suitable for logging."""
+        if self._stripped is _MISSING:
+            packet = self._packet
+            self._stripped = _strip_raw_copy(
+                packet if isinstance(packet, dict) else dict(packet)
+            )
+        return self._stripped
+
+    @property
+    def transport(self) -> dict[str, Any]:
+        """
+        The stripped packet with a bytes ``decoded.payload`` replaced by its base64 text.
+
+        Shares every other value with `stripped`.
+        """
+        if self._transport is _MISSING:
+            stripped = self.stripped
+            decoded = stripped.get("decoded")
+            transport = stripped
+            if isinstance(decoded, dict) and isinstance(decoded.get("payload"), bytes):
+                transport = dict(stripped)
+                transport["decoded"] = {
+                    **decoded,
+                    "payload": base64.b64encode(decoded["payload"]).decode(
+                        DEFAULT_TEXT_ENCODING
+                    ),
+                }
+            self._transport = transport
+        return self._transport
+
+    @property
+    def json(self) -> str:
+        """
+        JSON serialization of `transport`, computed once.
+
+        Raises:
+            TypeError: If the packet contains values JSON cannot encode.
+        """
+        if self._json is _MISSING:
+            self._json = json.dumps(self.transport)
+        return self._json
+
+
+def get_packet_view(packet: Mapping[str, Any]) -> PacketView:
+    """
+    Return the shared view for a packet being dispatched, or a new private view.
+
+    Parameters:
+        packet (Mapping[str, Any]): The packet dict passed to a plugin handler.
+
+    Returns:
+        PacketView: The view registered by `packet_view_scope` for this exact
+        object, otherwise a fresh view (for example in tests or when a plugin
+        outlives its dispatch timeout).
+    """
+    view = _active_packet_views.get(id(packet))
+    if view is not None and view.packet is packet:
+        return view
+    return PacketView(packet)
+
+
+@contextlib.contextmanager
+def packet_view_scope(packet: Mapping[str, Any]) -> Iterator[PacketView]:
+    """
+    Register a shared `PacketView` for `packet` while plugins handle it.
+
+    The view holds a reference to the packet, so its ``id()`` cannot be reused
+    by another object while registered.
+    """
+    key = id(packet)
+    existing = _active_packet_views.get(key)
+    if existing is not None and existing.packet is packet:
+        yield existing
+        return
+    view = PacketView(packet)
+    _active_packet_views[key] = view
+    try:
+        yield view
+    finally:
+        if _active_packet_views.get(key) is view:
+            del _active_packet_views[key]
@@ -6,14 +6,82 @@ from typing import Any
 
 import mmrelay.meshtastic_utils as facade
 from mmrelay.constants.network import DEFAULT_PLUGIN_TIMEOUT_SECS
+from mmrelay.meshtastic.packet_routing import _get_portnum_name
+from mmrelay.meshtastic.packet_view import packet_view_scope
 
 __all__ = [
+    "_loaded_plugins_want_portnum",
+    "_plugin_wants_portnum",
     "_resolve_plugin_result",
     "_resolve_plugin_timeout",
     "_run_meshtastic_plugins",
 ]
 
 
+_Interest = frozenset[str] | None
+
+# (plugin list, length, each plugin's declared interest, union of the
+# interests or None for "everything").
+_plugin_interest_cache: (
+    tuple[list[Any], int, tuple[_Interest, ...], _Interest] | None
+) = None
+
+
+def _plugin_portnum_interest(plugin: Any) -> frozenset[str] | None:
+    """
+    Return the portnum names a plugin declared via ``meshtastic_portnums``, or None for all.
+    """
+    declared = getattr(plugin, "meshtastic_portnums", None)
+    if not isinstance(declared, (frozenset, set, tuple, list)):
+        return None
+    return frozenset(_get_portnum_name(portnum) for portnum in declared)
+
+
+def _plugin_wants_portnum(plugin: Any, portnum_name: str | None) -> bool:
+    """Return True unless the plugin declared interests that exclude `portnum_name`."""
+    if portnum_name is None:
+        return True
+    interest = _plugin_portnum_interest(plugin)
+    return interest is None or portnum_name in interest
+
+
+def _plugin_interests(plugins: list[Any]) -> tuple[tuple[_Interest, ...], _Interest]:
+    """
+    Return each plugin's declared portnum interest and the union of them.
+
+    Both are computed once per plugin list, i.e. each time the loader builds a
+    new one, rather than per packet.
+
+    Returns:
+        tuple: The interests in plugin order, and their union or None when some
+        plugin wants every portnum.
+    """
+    global _plugin_interest_cache
+    cached = _plugin_interest_cache
+    if cached is None or cached[0] is not plugins or cached[1] != len(plugins):
+        interests = tuple(_plugin_portnum_interest(plugin) for plugin in plugins)
+        union: _Interest = None
+        if all(interest is not None for interest in interests):
+            union = frozenset().union(*(i for i in interests if i is not None))
+        cached = (plugins, len(plugins), interests, union)
+        _plugin_interest_cache = cached
+    return cached[2], cached[3]
+
+
+def _loaded_plugins_want_portnum(portnum_name: str) -> bool:
+    """
+    Return True if any loaded plugin may act on a non-text packet with `portnum_name`.
+
+    Before plugins are loaded this conservatively returns True.
+    """
+    import mmrelay.plugin_loader as plugin_loader
+
+    if not plugin_loader.plugins_loaded:
+        return True
+    _interests, union = _plugin_interests(plugin_loader.sorted_active_plugins)
+    return union is None or portnum_name in union
+
+
 def _resolve_plugin_timeout(
     cfg: dict[str, Any] | None, default: float = DEFAULT_PLUGIN_TIMEOUT_SECS
 ) -> float:
@@ -99,9 +167,14 @@ def _run_meshtastic_plugins(
     use_keyword_args: bool = False,
     log_with_portnum: bool = False,
     portnum: Any | None = None,
+    portnum_name: str | None = None,
 ) -> bool:
     """
     Invoke Meshtastic plugins and return True when a plugin handles the message.
+
+    When `portnum_name` is given, plugins whose ``meshtastic_portnums`` exclude
+    it are skipped without being called. A shared `PacketView` is registered
+    for the packet while plugins run, so `get_packet_view()` normalizes it once.
     """
     from mmrelay.plugin_loader import load_plugins
 
@@ -110,45 +183,55 @@ def _run_meshtastic_plugins(
         cfg, default=DEFAULT_PLUGIN_TIMEOUT_SECS
     )
 
-    found_matching_plugin = False
-    for plugin in plugins:
-        if not found_matching_plugin:
-            try:
-                if use_keyword_args:
-                    handler_result = plugin.handle_meshtastic_message(
-                        packet,
-                        formatted_message=formatted_message,
-                        longname=longname,
-                        meshnet_name=meshnet_name,
-                    )
-                else:
-                    handler_result = plugin.handle_meshtastic_message(
-                        packet,
-                        formatted_message,
-                        longname,
-                        meshnet_name,
-                    )
+    interests, _union = _plugin_interests(plugins)
 
-                found_matching_plugin = facade._resolve_plugin_result(
-                    handler_result,
-                    plugin,
-                    plugin_timeout,
-                    loop,
-                )
-
-                if found_matching_plugin:
-                    if log_with_portnum:
-                        facade.logger.debug(
-                            "Processed %s with plugin %s",
-                            portnum,
-                            plugin.plugin_name,
+    found_matching_plugin = False
+    # Plugins share one lazily normalized view of the packet (see PacketView).
+    with packet_view_scope(packet):
+        for plugin, interest in zip(plugins, interests):
+            if not found_matching_plugin:
+                if (
+                    portnum_name is not None
+                    and interest is not None
+                    and portnum_name not in interest
+                ):
+                    continue
+                try:
+                    if use_keyword_args:
+                        handler_result = plugin.handle_meshtastic_message(
+                            packet,
+                            formatted_message=formatted_message,
+                            longname=longname,
+                            meshnet_name=meshnet_name,
                         )
                     else:
-                        facade.logger.debug(
-                            "Processed by plugin %s", plugin.plugin_name
+                        handler_result = plugin.handle_meshtastic_message(
+                            packet,
+                            formatted_message,
+                            longname,
+                            meshnet_name,
                         )
-            except Exception:
-                facade.logger.exception("Plugin %s failed", plugin.plugin_name)
-                # Continue processing other plugins
+
+                    found_matching_plugin = facade._resolve_plugin_result(
+                        handler_result,
+                        plugin,
+                        plugin_timeout,
+                        loop,
+                    )
+
+                    if found_matching_plugin:
+                        if log_with_portnum:
+                            facade.logger.debug(
+                                "Processed %s with plugin %s",
+                                portnum,
+                                plugin.plugin_name,
+                            )
+                        else:
+                            facade.logger.debug(
+                                "Processed by plugin %s", plugin.plugin_name
+                            )
+                except Exception:
+                    facade.logger.exception("Plugin %s failed", plugin.plugin_name)
+                    # Continue processing other plugins
 
     return found_matching_plugin
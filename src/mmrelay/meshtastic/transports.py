@@ -0,0 +1,134 @@
+"""On-demand imports of the Meshtastic transport modules.
+
+Importing ``meshtastic.ble_interface`` pulls in bleak and its D-Bus stack,
+which serial and TCP users never need, so each interface module is imported
+only when a connection of that type is made. Importing a submodule binds it
+on the ``meshtastic`` package, so ``meshtastic.tcp_interface.TCPInterface``
+style access keeps working once the transport is loaded.
+
+The facade resolves its BLE-only names (bleak exceptions, optional BLE error
+types of the mtjk fork and its connection-gate reset hook) through
+`_load_ble_support` the first time one of them is read.
+"""
+
+import importlib
+from types import ModuleType
+from typing import Any
+
+import mmrelay.meshtastic_utils as facade
+from mmrelay.constants.network import (
+    CONNECTION_TYPE_BLE,
+    CONNECTION_TYPE_NETWORK,
+    CONNECTION_TYPE_SERIAL,
+    CONNECTION_TYPE_TCP,
+    MESHTASTIC_BLE_GATE_RESET_FUNC,
+    MESHTASTIC_BLE_GATING_MODULE_PATH,
+)
+
+__all__ = [
+    "BLE_LAZY_NAMES",
+    "TRANSPORT_MODULES",
+    "_load_ble_support",
+    "load_transport",
+]
+
+# Interface module of each connection type.
+TRANSPORT_MODULES: dict[str, str] = {
+    CONNECTION_TYPE_SERIAL: "meshtastic.serial_interface",
+    CONNECTION_TYPE_TCP: "meshtastic.tcp_interface",
+    CONNECTION_TYPE_NETWORK: "meshtastic.tcp_interface",
+    CONNECTION_TYPE_BLE: "meshtastic.ble_interface",
+}
+
+# Optional exception types and helpers exported by the mtjk BLE interface.
+_BLE_INTERFACE_NAMES = (
+    "MeshtasticBLEError",
+    "BLEDiscoveryError",
+    "BLEDeviceNotFoundError",
+    "BLEConnectionTimeoutError",
+    "BLEConnectionSuppressedError",
+    "BLEAddressMismatchError",
+    "BLEDBusTransportError",
+    "sanitize_address",
+)
+
+# Facade attributes that are resolved by `_load_ble_support` on first access.
+BLE_LAZY_NAMES: frozenset[str] = frozenset(
+    {
+        "BleakDBusError",
+        "BleakError",
+        "_ble_interface_module",
+        "_ble_gating_module",
+        "_ble_gate_reset_callable",
+        *_BLE_INTERFACE_NAMES,
+    }
+)
+
+
+def load_transport(connection_type: str) -> ModuleType | None:
+    """
+    Import the Meshtastic interface module for a connection type.
+
+    Parameters:
+        connection_type (str): Configured ``connection_type`` (serial, tcp, network or ble).
+
+    Returns:
+        ModuleType | None: The interface module, or None for an unknown connection type.
+
+    Raises:
+        ImportError: If the transport's dependencies are not installed.
+    """
+    if not isinstance(connection_type, str):
+        return None
+    module_name = TRANSPORT_MODULES.get(connection_type)
+    if module_name is None:
+        return None
+    return importlib.import_module(module_name)
+
+
+def _load_ble_support() -> None:
+    """
+    Resolve the facade's BLE-only names.
+
+    Missing pieces degrade the same way an eager import used to: bleak
+    exceptions fall back to ``Exception``, optional BLE error types to None.
+    """
+    values: dict[str, Any] = {}
+    try:
+        from bleak.exc import BleakDBusError, BleakError
+    except ImportError:
+        values["BleakDBusError"] = Exception
+        values["BleakError"] = Exception
+    else:
+        values["BleakDBusError"] = BleakDBusError
+        values["BleakError"] = BleakError
+
+    try:
+        ble_interface_module = importlib.import_module("meshtastic.ble_interface")
+    except Exception:  # noqa: BLE001 - optional mtjk capabilities vary by install
+        ble_interface_module = None
+    values["_ble_interface_module"] = ble_interface_module
+    for name in _BLE_INTERFACE_NAMES:
+        values[name] = getattr(ble_interface_module, name, None)
+
+    # The legacy/official Meshtastic BLE implementation has no connection gate.
+    gate_reset: Any = None
+    try:
+        gating_module = importlib.import_module(MESHTASTIC_BLE_GATING_MODULE_PATH)
+    except ModuleNotFoundError:
+        gating_module = None
+    except (
+        Exception
+    ):  # noqa: BLE001 - defensive import of optional fork-specific feature
+        gating_module = None
+    else:
+        clear_all_registries = getattr(
+            gating_module, MESHTASTIC_BLE_GATE_RESET_FUNC, None
+        )
+        if callable(clear_all_registries):
+            gate_reset = clear_all_registries
+    values["_ble_gating_module"] = gating_module
+    values["_ble_gate_reset_callable"] = gate_reset
+
+    for name, value in values.items():
+        setattr(facade, name, value)
@@ -22,10 +22,8 @@ from concurrent.futures import TimeoutError as FuturesTimeoutError
 from typing import Any, Awaitable, Callable, Coroutine, cast
 
 # meshtastic is not marked py.typed; keep import-untyped for strict mypy.
+# The interface submodules are imported on demand by meshtastic.transports.
 import meshtastic
-import meshtastic.ble_interface
-import meshtastic.serial_interface
-import meshtastic.tcp_interface
 import serial  # For serial port exceptions
 import serial.tools.list_ports  # Import serial tools for port listing
 from meshtastic.protobuf import admin_pb2, mesh_pb2, portnums_pb2
@@ -116,11 +114,20 @@ from mmrelay.db_utils import (
     get_longname,
     get_message_map_by_meshtastic_id,
     get_shortname,
+    load_node_snapshot,
     save_longname,
+    save_node_snapshot,
     save_shortname,
     sync_name_tables_if_changed,
+    upsert_node_names,
 )
 from mmrelay.log_utils import get_logger
+from mmrelay.message_fragments import (
+    FragmentReassembler,
+    fragment_reassembly_enabled,
+    get_fragment_reassembler,
+    reset_fragment_reassembler,
+)
 from mmrelay.runtime_utils import is_running_as_service
 
 # ---------------------------------------------------------------------------
@@ -135,50 +142,27 @@ except ValueError:
     BLE_AVAILABLE = "bleak" in sys.modules
 
 
-# Import BLE exceptions conditionally
-try:
-    from bleak.exc import BleakDBusError, BleakError
-except ImportError:
-    BleakDBusError = Exception  # type: ignore[misc,assignment]
-    BleakError = Exception  # type: ignore[misc,assignment]
-
-MeshtasticBLEError = None
-BLEDiscoveryError = None
-BLEDeviceNotFoundError = None
-BLEConnectionTimeoutError = None
-BLEConnectionSuppressedError = None
-BLEAddressMismatchError = None
-BLEDBusTransportError = None
-sanitize_address = None
-try:
-    _ble_interface_module = importlib.import_module("meshtastic.ble_interface")
-except Exception:  # noqa: BLE001 - optional mtjk capabilities vary by install
-    _ble_interface_module = None  # type: ignore[assignment]
-if _ble_interface_module is not None:
-    MeshtasticBLEError = getattr(_ble_interface_module, "MeshtasticBLEError", None)
-    BLEDiscoveryError = getattr(_ble_interface_module, "BLEDiscoveryError", None)
-    BLEDeviceNotFoundError = getattr(
-        _ble_interface_module,
-        "BLEDeviceNotFoundError",
-        None,
-    )
-    BLEConnectionTimeoutError = getattr(
-        _ble_interface_module,
-        "BLEConnectionTimeoutError",
-        None,
-    )
-    BLEConnectionSuppressedError = getattr(
-        _ble_interface_module,
-        "BLEConnectionSuppressedError",
-        None,
-    )
-    BLEAddressMismatchError = getattr(
-        _ble_interface_module,
-        "BLEAddressMismatchError",
-        None,
-    )
-    BLEDBusTransportError = getattr(_ble_interface_module, "BLEDBusTransportError", None)
-    sanitize_address = getattr(_ble_interface_module, "sanitize_address", None)
+# BLE-only names (bleak exceptions, optional BLE error types of the mtjk
+# fork, sanitize_address and the connection-gate reset hook) are resolved on
+# first access by meshtastic.transports._load_ble_support, so serial and TCP
+# users never import bleak.
+def __getattr__(name: str) -> Any:
+    """
+    Resolve BLE-only module attributes on first access.
+
+    Parameters:
+        name (str): The attribute name being requested.
+
+    Returns:
+        Any: The resolved attribute value.
+
+    Raises:
+        AttributeError: If the module does not expose the requested attribute.
+    """
+    if name in BLE_LAZY_NAMES:
+        _load_ble_support()
+        return globals()[name]
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 
 class BleExecutorDegradedError(Exception):
@@ -198,23 +182,6 @@ matrix_rooms: list[dict[str, Any]] = []
 # Initialize logger for Meshtastic
 logger = get_logger(name="Meshtastic")
 
-# Detect optional BLE connection-gate reset support once at startup.
-# The legacy/official Meshtastic BLE implementation does not provide this.
-_ble_gate_reset_callable: Callable[[], None] | None = None
-_ble_gating_module: Any | None = None
-try:
-    _ble_gating_module = importlib.import_module(MESHTASTIC_BLE_GATING_MODULE_PATH)
-except ModuleNotFoundError:
-    _ble_gating_module = None
-except Exception:  # noqa: BLE001 - defensive import of optional fork-specific feature
-    _ble_gating_module = None
-else:
-    clear_all_registries = getattr(
-        _ble_gating_module, MESHTASTIC_BLE_GATE_RESET_FUNC, None
-    )
-    if callable(clear_all_registries):
-        _ble_gate_reset_callable = cast(Callable[[], None], clear_all_registries)
-
 # Meshtastic text payloads are UTF-8 on the wire.
 MESHTASTIC_TEXT_ENCODING = "utf-8"
 
@@ -235,6 +202,9 @@ _relay_startup_drain_deadline_monotonic_secs: float | None = None
 _relay_startup_drain_expiry_timer: threading.Timer | None = None
 # Tracks the pending delayed connect-time metadata probe timer for cancellation on disconnect/rollback.
 _pending_connect_time_probe_timer: threading.Timer | None = None
+# Timer that flushes timed-out partial long messages when no packet arrives to do it.
+_fragment_flush_timer: threading.Timer | None = None
+_fragment_flush_lock = threading.Lock()
 # Signals whether startup drain has completed for readiness publication.
 _relay_startup_drain_complete_event = threading.Event()
 _relay_startup_drain_complete_event.set()
@@ -294,6 +264,14 @@ subscribed_to_connection_lost = False
 # Guard for brief in-flight callback windows during explicit unsubscribe.
 _callbacks_tearing_down = False
 
+# Inbound packet ingest pool (see meshtastic.ingest); None processes packets inline.
+_packet_ingest_pool: Any = None
+_packet_ingest_lock = threading.Lock()
+
+# Additional radios (see meshtastic.interface_pool); None when only one radio is configured.
+_interface_pool: Any = None
+_interface_pool_lock = threading.Lock()
+
 
 # Subscription lifecycle — implemented in meshtastic.subscriptions, re-exported here
 # for backward-compatible patch targets (tests patch mmrelay.meshtastic_utils.*).
@@ -399,6 +377,10 @@ from mmrelay.meshtastic.connection import (
     serial_port_exists,
 )
 from mmrelay.meshtastic.events import (
+    _flush_expired_fragments,
+    _ingest_meshtastic_packet,
+    _process_meshtastic_message,
+    _schedule_fragment_flush,
     _schedule_startup_drain_deadline_cleanup,
     on_lost_meshtastic_connection,
     on_meshtastic_message,
@@ -420,6 +402,43 @@ from mmrelay.meshtastic.executors import (
     reset_executor_degraded_state,
     shutdown_shared_executors,
 )
+from mmrelay.meshtastic.ingest import (
+    PacketIngestPool,
+    _get_ingest_settings,
+    _ingest_sender_key,
+    _submit_to_packet_ingest,
+    get_packet_ingest_status,
+    start_packet_ingest,
+    stop_packet_ingest,
+)
+from mmrelay.meshtastic.interface_pool import (
+    InterfacePool,
+    RadioSlot,
+    _accept_radio_packet,
+    _handle_radio_connection_lost,
+    _is_pool_interface,
+    close_additional_radios,
+    connect_additional_radios,
+    get_interface_pool_status,
+    get_packet_source_radio,
+    select_radio_for_send,
+)
+from mmrelay.meshtastic.node_metrics import (
+    NodeMetricsStore,
+    get_node_metrics_store,
+    reset_node_metrics_store,
+)
+from mmrelay.meshtastic.node_name_feed import (
+    NodeNameFeed,
+    get_node_name_feed,
+    reset_node_name_feed,
+)
+from mmrelay.meshtastic.packet_view import (
+    PacketView,
+    _strip_raw_copy,
+    get_packet_view,
+    packet_view_scope,
+)
 from mmrelay.meshtastic.health import (
     _claim_health_probe_response_and_maybe_calibrate,
     _extract_packet_request_id,
@@ -462,10 +481,24 @@ from mmrelay.meshtastic.metadata import (
 from mmrelay.meshtastic.node_refresh import (
     _parse_refresh_interval_seconds,
     _snapshot_node_name_rows,
+    get_nodedb_reconcile_interval_seconds,
     get_nodedb_refresh_interval_seconds,
     refresh_node_name_tables,
 )
+from mmrelay.meshtastic.node_snapshot import (
+    CachedNode,
+    NodeSnapshotCache,
+    get_node_snapshot_cache,
+    get_nodedb_snapshot_interval_seconds,
+    hydrate_node_snapshot,
+    lookup_node,
+    persist_node_snapshot,
+    reset_node_snapshot_cache,
+    save_node_snapshot_now,
+)
 from mmrelay.meshtastic.plugins import (
+    _loaded_plugins_want_portnum,
+    _plugin_wants_portnum,
     _resolve_plugin_result,
     _resolve_plugin_timeout,
     _run_meshtastic_plugins,
@@ -474,6 +507,17 @@ from mmrelay.meshtastic.subscriptions import (
     ensure_meshtastic_callbacks_subscribed,
     unsubscribe_meshtastic_callbacks,
 )
+from mmrelay.meshtastic.transports import (
+    BLE_LAZY_NAMES,
+    TRANSPORT_MODULES,
+    _load_ble_support,
+    load_transport,
+)
+
+# Drop BLE values left by a previous import so a reload resolves them again.
+for _lazy_name in BLE_LAZY_NAMES:
+    globals().pop(_lazy_name, None)
+del _lazy_name
 
 
 atexit.register(shutdown_shared_executors)
@@ -0,0 +1,413 @@
+"""
+Byte-aware fragmentation of long Matrix messages and reassembly on the mesh.
+
+A Meshtastic text packet carries at most ``DEFAULT_MESSAGE_TRUNCATE_BYTES`` of
+UTF-8. `fragment_message` splits a prefixed message into up to
+``max_message_fragments`` packets (1 by default, which truncates instead) on
+character boundaries, preferring whitespace, and starts each with a compact
+``"[a7 1/3] "`` marker. Only the first fragment carries the sender prefix, so
+joining the fragment bodies gives back the original ``prefix + text``.
+
+`FragmentReassembler` recognises those markers in text packets heard on the
+mesh, whether sent by this relay or another one, and joins them into a
+single packet so Matrix receives one event per message. Fragments may
+arrive in any order; a message still missing fragments after
+``FRAGMENT_REASSEMBLY_TIMEOUT_SECS`` is relayed with a gap marker in place
+of each lost fragment.
+"""
+
+import itertools
+import random
+import re
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, NamedTuple
+
+from mmrelay.config import get_meshtastic_config_value
+from mmrelay.constants.config import (
+    CONFIG_KEY_MAX_MESSAGE_FRAGMENTS,
+    CONFIG_KEY_REASSEMBLE_FRAGMENTS,
+    DEFAULT_MAX_MESSAGE_FRAGMENTS,
+    DEFAULT_REASSEMBLE_FRAGMENTS,
+)
+from mmrelay.constants.formats import DEFAULT_TEXT_ENCODING, TEXT_MESSAGE_APP
+from mmrelay.constants.messages import (
+    DEFAULT_MESSAGE_TRUNCATE_BYTES,
+    FRAGMENT_GAP_MARKER,
+    FRAGMENT_MARKER_BYTES,
+    FRAGMENT_MARKER_FORMAT,
+    FRAGMENT_MARKER_REGEX,
+    FRAGMENT_REASSEMBLY_MAX_PENDING,
+    FRAGMENT_REASSEMBLY_TIMEOUT_SECS,
+    MAX_MESSAGE_FRAGMENTS,
+    PORTNUM_TEXT_MESSAGE_APP,
+)
+
+__all__ = [
+    "Fragment",
+    "FragmentReassembler",
+    "fragment_message",
+    "fragment_reassembly_enabled",
+    "get_fragment_reassembler",
+    "get_max_message_fragments",
+    "parse_fragment",
+    "reset_fragment_reassembler",
+]
+
+# Longest UTF-8 encoding of a single character.
+_MAX_CHAR_BYTES = 4
+
+_MARKER_PATTERN = re.compile(FRAGMENT_MARKER_REGEX)
+
+# Tags start at a random value so a restarted relay does not reuse the tags
+# of messages other relays may still be reassembling.
+_tags = itertools.count(random.randrange(256))
+
+
+class Fragment(NamedTuple):
+    """A parsed fragment marker and the text that follows it."""
+
+    tag: int
+    part: int
+    total: int
+    body: str
+
+
+def _fit_chars(text: str, max_bytes: int) -> int:
+    """
+    Return how many leading characters of `text` fit in `max_bytes` of UTF-8.
+
+    Parameters:
+        text (str): Text to measure.
+        max_bytes (int): Byte budget for the encoded prefix.
+
+    Returns:
+        int: Number of characters; the cut never falls inside a character.
+    """
+    encoded = text.encode(DEFAULT_TEXT_ENCODING)
+    if len(encoded) <= max_bytes:
+        return len(text)
+    end = max_bytes
+    # Back up over continuation bytes (10xxxxxx) to a character boundary.
+    while end > 0 and encoded[end] & 0xC0 == 0x80:
+        end -= 1
+    return len(encoded[:end].decode(DEFAULT_TEXT_ENCODING))
+
+
+def _split_point(text: str, max_bytes: int) -> int:
+    """
+    Return where to end a fragment of `text` that must fit in `max_bytes`.
+
+    Prefers the last space in the second half of the fragment so words are
+    not split; the space stays with the earlier fragment.
+    """
+    end = _fit_chars(text, max_bytes)
+    if end >= len(text):
+        return end
+    space = max(text.rfind(" ", 0, end), text.rfind("\n", 0, end))
+    if space >= end // 2:
+        return space + 1
+    return end
+
+
+def get_max_message_fragments(config: dict[str, Any] | None) -> int:
+    """
+    Return the configured maximum number of packets per Matrix message.
+
+    Reads `meshtastic.max_message_fragments` and falls back to
+    `DEFAULT_MAX_MESSAGE_FRAGMENTS` when it is missing or not an integer from
+    1 to `MAX_MESSAGE_FRAGMENTS`.
+
+    Parameters:
+        config (dict[str, Any] | None): Relay configuration.
+
+    Returns:
+        int: Maximum number of fragments; 1 disables fragmentation.
+    """
+    value = get_meshtastic_config_value(
+        config or {}, CONFIG_KEY_MAX_MESSAGE_FRAGMENTS, DEFAULT_MAX_MESSAGE_FRAGMENTS
+    )
+    if isinstance(value, bool) or not isinstance(value, int):
+        return DEFAULT_MAX_MESSAGE_FRAGMENTS
+    if not 1 <= value <= MAX_MESSAGE_FRAGMENTS:
+        return DEFAULT_MAX_MESSAGE_FRAGMENTS
+    return value
+
+
+def fragment_reassembly_enabled(config: dict[str, Any] | None) -> bool:
+    """
+    Return whether inbound marked packets should be joined into one message.
+
+    Reads `meshtastic.reassemble_fragments`; anything other than a boolean
+    falls back to `DEFAULT_REASSEMBLE_FRAGMENTS`.
+
+    Parameters:
+        config (dict[str, Any] | None): Relay configuration.
+
+    Returns:
+        bool: True if packets go through the fragment reassembler.
+    """
+    value = get_meshtastic_config_value(
+        config or {}, CONFIG_KEY_REASSEMBLE_FRAGMENTS, DEFAULT_REASSEMBLE_FRAGMENTS
+    )
+    if not isinstance(value, bool):
+        return DEFAULT_REASSEMBLE_FRAGMENTS
+    return value
+
+
+def fragment_message(
+    text: str,
+    prefix: str = "",
+    *,
+    max_bytes: int = DEFAULT_MESSAGE_TRUNCATE_BYTES,
+    max_fragments: int = DEFAULT_MAX_MESSAGE_FRAGMENTS,
+) -> list[str]:
+    """
+    Split a prefixed message into mesh packets of at most `max_bytes` UTF-8 bytes.
+
+    A message that fits in one packet is returned unchanged and unmarked. Longer
+    messages are split into marked fragments; text that does not fit in
+    `max_fragments` fragments is cut from the last one. With `max_fragments`
+    of 1, or a prefix too long to leave room for a marker, the message is
+    truncated to a single packet as before.
+
+    Parameters:
+        text (str): Message body.
+        prefix (str): Sender prefix; it is sent once, at the start of the first fragment.
+        max_bytes (int): Payload budget of one packet in bytes.
+        max_fragments (int): Maximum number of packets, capped at `MAX_MESSAGE_FRAGMENTS`.
+
+    Returns:
+        list[str]: Packet texts in send order; never empty.
+    """
+    full_message = f"{prefix}{text}"
+    if len(full_message.encode(DEFAULT_TEXT_ENCODING)) <= max_bytes:
+        return [full_message]
+
+    max_fragments = min(max_fragments, MAX_MESSAGE_FRAGMENTS)
+    prefix_bytes = len(prefix.encode(DEFAULT_TEXT_ENCODING))
+    first_budget = max_bytes - FRAGMENT_MARKER_BYTES - prefix_bytes
+    if max_fragments <= 1 or first_budget < _MAX_CHAR_BYTES:
+        return [full_message[: _fit_chars(full_message, max_bytes)]]
+
+    chunks: list[str] = []
+    remaining = text
+    while remaining:
+        budget = first_budget if not chunks else max_bytes - FRAGMENT_MARKER_BYTES
+        if len(chunks) == max_fragments - 1:
+            chunks.append(remaining[: _fit_chars(remaining, budget)])
+            break
+        end = _split_point(remaining, budget)
+        chunks.append(remaining[:end])
+        remaining = remaining[end:]
+
+    tag = next(_tags) % 256
+    total = len(chunks)
+    return [
+        FRAGMENT_MARKER_FORMAT.format(tag=tag, part=part, total=total)
+        + (prefix if part == 1 else "")
+        + chunk
+        for part, chunk in enumerate(chunks, start=1)
+    ]
+
+
+def parse_fragment(text: str) -> Fragment | None:
+    """
+    Parse the fragment marker at the start of a packet's text.
+
+    Parameters:
+        text (str): Packet text.
+
+    Returns:
+        Fragment | None: The marker fields and body, or None if `text` is not a fragment.
+    """
+    match = _MARKER_PATTERN.match(text)
+    if match is None:
+        return None
+    part, total = int(match[2]), int(match[3])
+    if total < 2 or part > total:
+        return None
+    return Fragment(int(match[1], 16), part, total, text[match.end() :])
+
+
+class _PendingMessage:
+    """Fragments received so far for one message."""
+
+    __slots__ = ("base_part", "interface", "packet", "parts", "started", "total")
+
+    def __init__(self, total: int, started: float) -> None:
+        self.total = total
+        self.started = started
+        self.parts: dict[int, str] = {}
+        self.packet: dict[str, Any] = {}
+        self.interface: Any = None
+        self.base_part = total + 1
+
+    def add(self, fragment: Fragment, packet: dict[str, Any], interface: Any) -> None:
+        self.parts[fragment.part] = fragment.body
+        # The lowest-numbered fragment's packet stands for the whole message,
+        # so Meshtastic replies to the start of the message map to its event.
+        if fragment.part < self.base_part:
+            self.base_part = fragment.part
+            self.packet = packet
+            self.interface = interface
+
+    def joined(self) -> tuple[dict[str, Any], Any]:
+        text = "".join(
+            self.parts.get(part, FRAGMENT_GAP_MARKER)
+            for part in range(1, self.total + 1)
+        )
+        decoded = {**self.packet["decoded"], "text": text}
+        return {**self.packet, "decoded": decoded}, self.interface
+
+
+def _packet_fragment(packet: Any) -> Fragment | None:
+    """Return the fragment carried by a text-message packet, if any."""
+    if not isinstance(packet, dict):
+        return None
+    decoded = packet.get("decoded")
+    if not isinstance(decoded, dict):
+        return None
+    if decoded.get("portnum") not in (TEXT_MESSAGE_APP, PORTNUM_TEXT_MESSAGE_APP):
+        return None
+    text = decoded.get("text")
+    if not isinstance(text, str):
+        return None
+    return parse_fragment(text)
+
+
+class FragmentReassembler:
+    """
+    Join fragmented text packets back into whole messages.
+
+    Messages are keyed by sender, channel, tag and fragment count. Expired
+    partial messages are flushed whenever another packet arrives and by
+    `flush_expired`, which the relay calls from a timer armed for
+    `next_deadline` so a quiet mesh does not hold them back.
+    """
+
+    def __init__(
+        self,
+        timeout_secs: float = FRAGMENT_REASSEMBLY_TIMEOUT_SECS,
+        max_pending: int = FRAGMENT_REASSEMBLY_MAX_PENDING,
+    ) -> None:
+        self._timeout_secs = timeout_secs
+        self._max_pending = max_pending
+        self._pending: OrderedDict[tuple[Any, ...], _PendingMessage] = OrderedDict()
+        # Recently completed messages, so late duplicates are not re-relayed.
+        self._completed: OrderedDict[tuple[Any, ...], float] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def accept(
+        self, packet: dict[str, Any], interface: Any, now: float | None = None
+    ) -> list[tuple[dict[str, Any], Any]]:
+        """
+        Take a received packet and return the packets ready for processing.
+
+        Packets that are not fragments are returned as they are. A fragment is
+        held until its message is complete, then one packet carrying the
+        joined text is returned in its place.
+
+        Parameters:
+            packet (dict): Decoded Meshtastic packet.
+            interface: Meshtastic interface that received the packet.
+            now (float | None): Monotonic time; defaults to `time.monotonic()`.
+
+        Returns:
+            list[tuple[dict, Any]]: (packet, interface) pairs in processing order,
+            including any expired partial messages.
+        """
+        if now is None:
+            now = time.monotonic()
+        ready: list[tuple[dict[str, Any], Any]] = []
+        fragment = _packet_fragment(packet)
+        with self._lock:
+            if self._pending or self._completed:
+                ready.extend(self._expire(now))
+            if fragment is None:
+                ready.append((packet, interface))
+                return ready
+
+            key = (
+                packet.get("fromId") or packet.get("from"),
+                packet.get("channel"),
+                fragment.tag,
+                fragment.total,
+            )
+            if key in self._completed:
+                return ready
+            pending = self._pending.get(key)
+            if pending is None:
+                if len(self._pending) >= self._max_pending:
+                    _key, oldest = self._pending.popitem(last=False)
+                    ready.append(oldest.joined())
+                pending = self._pending[key] = _PendingMessage(fragment.total, now)
+            pending.add(fragment, packet, interface)
+            if len(pending.parts) == pending.total:
+                del self._pending[key]
+                self._completed[key] = now
+                if len(self._completed) > self._max_pending:
+                    self._completed.popitem(last=False)
+                ready.append(pending.joined())
+        return ready
+
+    def _expire(self, now: float) -> list[tuple[dict[str, Any], Any]]:
+        """Drop stale completed keys and flush partial messages that timed out."""
+        deadline = now - self._timeout_secs
+        while self._completed:
+            key, completed_at = next(iter(self._completed.items()))
+            if completed_at > deadline:
+                break
+            del self._completed[key]
+        flushed = []
+        while self._pending:
+            key, pending = next(iter(self._pending.items()))
+            if pending.started > deadline:
+                break
+            del self._pending[key]
+            flushed.append(pending.joined())
+        return flushed
+
+    def next_deadline(self) -> float | None:
+        """Return the monotonic time the oldest partial message expires, or None if none are pending."""
+        with self._lock:
+            if not self._pending:
+                return None
+            return next(iter(self._pending.values())).started + self._timeout_secs
+
+    def flush_expired(
+        self, now: float | None = None
+    ) -> list[tuple[dict[str, Any], Any]]:
+        """
+        Return the partial messages that have timed out, joined with gap markers.
+
+        Parameters:
+            now (float | None): Monotonic time; defaults to `time.monotonic()`.
+
+        Returns:
+            list[tuple[dict, Any]]: (packet, interface) pairs in the order the messages started.
+        """
+        if now is None:
+            now = time.monotonic()
+        with self._lock:
+            return self._expire(now)
+
+    def pending_count(self) -> int:
+        """Return the number of partially received messages."""
+        with self._lock:
+            return len(self._pending)
+
+
+_reassembler = FragmentReassembler()
+
+
+def get_fragment_reassembler() -> FragmentReassembler:
+    """Return the process-wide fragment reassembler."""
+    return _reassembler
+
+
+def reset_fragment_reassembler() -> None:
+    """Replace the fragment reassembler with an empty one."""
+    global _reassembler
+    _reassembler = FragmentReassembler()
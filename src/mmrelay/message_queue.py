@@ -59,12 +59,15 @@ class MessageQueue:
     pauses during reconnections.
     """
 
-    def __init__(self) -> None:
+    def __init__(self, connection_check: Optional[Callable[[], bool]] = None) -> None:
         """
         Initialize the MessageQueue's internal structures and default runtime state.
 
         Sets up the unbounded FIFO queue with explicit size checks, timing/state variables for rate limiting and delivery tracking, a thread lock for state transitions, and counters/placeholders for the processor task and executor.
 
+        Parameters:
+            connection_check (Callable[[], bool] | None): Optional predicate deciding whether the queue may send. Queues that feed a radio other than the global Meshtastic client supply their own; when omitted the global client's state is checked.
+
         Note: The queue is intentionally unbounded (no maxlen) to ensure all message drops are
         explicitly logged. Size enforcement is handled in enqueue() with proper logging when
         messages are dropped, rather than silent eviction by deque's maxlen.
@@ -91,6 +94,7 @@ class MessageQueue:
         self._last_queue_full_log_time: float | None = None
         self._stop_failed = False
         self._stop_logged = False
+        self._connection_check = connection_check
 
     def _clear_failed_stop_state_if_recovered_locked(self) -> bool:
         """
@@ -849,11 +853,18 @@ class MessageQueue:
         """
         Determine whether the queue may send a Meshtastic message.
 
-        Performs runtime checks: ensures the global reconnecting flag is false, a Meshtastic client object exists, and—if the client exposes a connectivity indicator—that indicator reports connected. If importing Meshtastic utilities fails, triggers an asynchronous stop of the queue.
+        Uses the queue's `connection_check` when one was supplied. Otherwise performs runtime checks: ensures the global reconnecting flag is false, a Meshtastic client object exists, and—if the client exposes a connectivity indicator—that indicator reports connected. If importing Meshtastic utilities fails, triggers an asynchronous stop of the queue.
 
         Returns:
             `True` if not reconnecting, a Meshtastic client exists, and the client is connected when checkable; `False` otherwise.
         """
+        if self._connection_check is not None:
+            try:
+                return bool(self._connection_check())
+            except Exception:
+                logger.exception("Message queue connection check failed")
+                return False
+
         # Import here to avoid circular imports
         try:
             from mmrelay.meshtastic_utils import meshtastic_client, reconnecting
@@ -38,6 +38,7 @@ from mmrelay.constants.app import (
     PLUGIN_DATA_DIRNAME,
     PLUGINS_DIRNAME,
     STORE_DIRNAME,
+    SYNC_TOKEN_FILENAME,
     WINDOWS_INSTALLER_DIR_NAME,
     WINDOWS_PLATFORM,
 )
@@ -501,6 +502,16 @@ def get_matrix_dir() -> Path:
     return get_home_dir() / MATRIX_DIRNAME
 
 
+def get_sync_token_path() -> Path:
+    """
+    Get the path of the persisted Matrix sync token.
+
+    Returns:
+        Path: Path to sync_token.json inside the Matrix directory.
+    """
+    return get_matrix_dir() / SYNC_TOKEN_FILENAME
+
+
 def get_database_dir() -> Path:
     """
     Get the application's database directory.
@@ -0,0 +1,203 @@
+"""
+Versioned encoding of values stored in the ``plugin_data`` table.
+
+Rows written before this module existed hold JSON text, and small or
+irregular values are still stored that way. Larger values are stored as a
+BLOB whose first byte names the format:
+
+- `FORMAT_JSON_ZLIB`: compact JSON, zlib-compressed.
+- `FORMAT_RECORDS`: a list of dicts that share the same keys and hold only
+  ints, floats or None per key (telemetry history, for example), stored
+  column by column as packed int64/float64 arrays with a null bitmap.
+
+`decode_plugin_data` accepts every format, so existing databases keep
+working and rows are upgraded as plugins rewrite them.
+"""
+
+import json
+import struct
+import zlib
+from typing import Any
+
+from mmrelay.constants.database import (
+    PLUGIN_DATA_COMPRESS_MIN_BYTES,
+    PLUGIN_DATA_RECORDS_MIN_ROWS,
+)
+
+__all__ = [
+    "FORMAT_JSON_ZLIB",
+    "FORMAT_RECORDS",
+    "PluginDataCodecError",
+    "decode_plugin_data",
+    "encode_plugin_data",
+    "plugin_data_to_json",
+]
+
+FORMAT_JSON_ZLIB = 0x01
+FORMAT_RECORDS = 0x02
+
+_COLUMN_INT = ord("q")
+_COLUMN_FLOAT = ord("d")
+_INT64_MIN = -(2**63)
+_INT64_MAX = 2**63 - 1
+_RECORDS_HEADER = struct.Struct("<BIB")
+_COLUMN_HEADER = struct.Struct("<BB?")
+
+
+class PluginDataCodecError(ValueError):
+    """Raised when a stored plugin_data value cannot be decoded."""
+
+
+def _column_type(values: list[Any]) -> int | None:
+    """Return the packed type for a column, or None if it cannot be packed exactly."""
+    kinds = {type(value) for value in values if value is not None}
+    if not kinds or kinds == {int}:
+        if all(
+            _INT64_MIN <= value <= _INT64_MAX for value in values if value is not None
+        ):
+            return _COLUMN_INT
+        return None
+    if kinds == {float}:
+        return _COLUMN_FLOAT
+    return None
+
+
+def _encode_records(data: list[Any]) -> bytes | None:
+    """
+    Pack a list of same-shaped numeric dicts column by column.
+
+    Returns:
+        bytes | None: The encoded value, or None if `data` does not fit the records format.
+    """
+    first = data[0]
+    if not isinstance(first, dict):
+        return None
+    keys = tuple(first)
+    if not keys or len(keys) > 255 or not all(isinstance(key, str) for key in keys):
+        return None
+    for record in data:
+        if not isinstance(record, dict) or tuple(record) != keys:
+            return None
+
+    count = len(data)
+    parts = [_RECORDS_HEADER.pack(FORMAT_RECORDS, count, len(keys))]
+    for key in keys:
+        values = [record[key] for record in data]
+        column_type = _column_type(values)
+        name = key.encode("utf-8")
+        if column_type is None or len(name) > 255:
+            return None
+        has_nulls = any(value is None for value in values)
+        parts.append(_COLUMN_HEADER.pack(len(name), column_type, has_nulls))
+        parts.append(name)
+        if has_nulls:
+            bitmap = bytearray((count + 7) // 8)
+            for index, value in enumerate(values):
+                if value is None:
+                    bitmap[index >> 3] |= 1 << (index & 7)
+            parts.append(bytes(bitmap))
+            values = [0 if value is None else value for value in values]
+        parts.append(struct.pack(f"<{count}{chr(column_type)}", *values))
+    return b"".join(parts)
+
+
+def _decode_records(blob: bytes) -> list[dict[str, Any]]:
+    try:
+        _format, count, column_count = _RECORDS_HEADER.unpack_from(blob, 0)
+        offset = _RECORDS_HEADER.size
+        names = []
+        columns = []
+        for _ in range(column_count):
+            name_length, column_type, has_nulls = _COLUMN_HEADER.unpack_from(
+                blob, offset
+            )
+            offset += _COLUMN_HEADER.size
+            names.append(blob[offset : offset + name_length].decode("utf-8"))
+            offset += name_length
+            bitmap = b""
+            if has_nulls:
+                bitmap = blob[offset : offset + (count + 7) // 8]
+                offset += len(bitmap)
+            if column_type not in (_COLUMN_INT, _COLUMN_FLOAT):
+                raise PluginDataCodecError(f"Unknown column type {column_type}")
+            layout = f"<{count}{chr(column_type)}"
+            values = list(struct.unpack_from(layout, blob, offset))
+            offset += struct.calcsize(layout)
+            if has_nulls:
+                for index in range(count):
+                    if bitmap[index >> 3] & (1 << (index & 7)):
+                        values[index] = None
+            columns.append(values)
+    except (struct.error, IndexError, UnicodeDecodeError) as exc:
+        raise PluginDataCodecError("Truncated or corrupt records value") from exc
+    if offset != len(blob):
+        raise PluginDataCodecError("Trailing bytes after records value")
+    return [dict(zip(names, row, strict=True)) for row in zip(*columns, strict=True)]
+
+
+def encode_plugin_data(data: Any) -> str | bytes:
+    """
+    Encode a JSON-serializable value for the ``plugin_data.data`` column.
+
+    Parameters:
+        data (Any): The value to store.
+
+    Returns:
+        str | bytes: JSON text for small or irregular values; otherwise a BLOB in the
+        records or compressed-JSON format.
+
+    Raises:
+        TypeError, ValueError: If `data` is not JSON-serializable.
+    """
+    if isinstance(data, list) and len(data) >= PLUGIN_DATA_RECORDS_MIN_ROWS:
+        records = _encode_records(data)
+        if records is not None:
+            return records
+    text = json.dumps(data)
+    if len(text) < PLUGIN_DATA_COMPRESS_MIN_BYTES:
+        return text
+    compact = json.dumps(data, separators=(",", ":")).encode("utf-8")
+    return bytes((FORMAT_JSON_ZLIB,)) + zlib.compress(compact)
+
+
+def decode_plugin_data(value: str | bytes) -> Any:
+    """
+    Decode a ``plugin_data.data`` value written in any supported format.
+
+    Parameters:
+        value (str | bytes): The stored column value.
+
+    Returns:
+        Any: The decoded value.
+
+    Raises:
+        json.JSONDecodeError: If a JSON value is malformed.
+        PluginDataCodecError: If a BLOB has an unknown format or is corrupt.
+        TypeError: If `value` is neither text nor bytes.
+    """
+    if isinstance(value, str):
+        return json.loads(value)
+    if not isinstance(value, (bytes, bytearray, memoryview)):
+        raise TypeError(f"Unsupported plugin_data value type: {type(value)}")
+    blob = bytes(value)
+    if not blob:
+        raise PluginDataCodecError("Empty plugin_data value")
+    if blob[0] == FORMAT_RECORDS:
+        return _decode_records(blob)
+    if blob[0] == FORMAT_JSON_ZLIB:
+        try:
+            return json.loads(zlib.decompress(blob[1:]))
+        except zlib.error as exc:
+            raise PluginDataCodecError("Corrupt compressed value") from exc
+    raise PluginDataCodecError(f"Unknown plugin_data format 0x{blob[0]:02x}")
+
+
+def plugin_data_to_json(value: str | bytes) -> str:
+    """
+    Return a stored value as JSON text, decoding BLOB formats as needed.
+
+    Used where plugins receive raw rows and parse them with ``json.loads``.
+    """
+    if isinstance(value, str):
+        return value
+    return json.dumps(decode_plugin_data(value))
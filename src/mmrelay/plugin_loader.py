@@ -1,4 +1,5 @@
 # trunk-ignore-all(bandit)
+import asyncio
 import fnmatch
 import hashlib
 import importlib
@@ -15,6 +16,7 @@ import sysconfig
 import tempfile
 import threading
 import time
+from concurrent.futures import ThreadPoolExecutor
 from contextlib import contextmanager, suppress
 from datetime import datetime, timedelta, timezone
 from types import ModuleType
@@ -22,6 +24,7 @@ from typing import Any, Final, Iterator, NamedTuple, NoReturn, Sequence, cast
 from urllib.parse import parse_qsl, urlencode, urlparse, urlsplit, urlunsplit
 
 import mmrelay.paths as paths_module
+from mmrelay.async_scheduler import AsyncScheduler, JobBuilder
 from mmrelay.config import (
     get_app_path,
 )
@@ -34,6 +37,7 @@ from mmrelay.constants.config import (
 from mmrelay.constants.formats import DEFAULT_TEXT_ENCODING
 from mmrelay.constants.plugins import (
     COMMIT_HASH_PATTERN,
+    COMMUNITY_PLUGIN_SYNC_MAX_WORKERS,
     DEFAULT_ALLOWED_COMMUNITY_HOSTS,
     DEFAULT_BRANCHES,
     DEFAULT_PLUGIN_PRIORITY,
@@ -107,6 +111,9 @@ class ValidationResult(NamedTuple):
 # Global scheduler management
 _global_scheduler_thread: threading.Thread | None = None
 _global_scheduler_stop_event: threading.Event | None = None
+# Event loop that runs plugin jobs; while unset, jobs use the schedule thread.
+_scheduler_loop: asyncio.AbstractEventLoop | None = None
+_async_scheduler: AsyncScheduler | None = None
 
 
 # Plugin dependency directory (may not be set if base dir can't be resolved)
@@ -129,8 +136,15 @@ PLUGIN_STATE_LAST_REQUIREMENTS_INSTALLED_AT: Final[str] = (
 PLUGIN_REQUIREMENTS_INSTALL_MARKER_PREFIX: Final[str] = (
     ".mmrelay-requirements-installed"
 )
+PLUGIN_SYNC_MANIFEST_FILENAME: Final[str] = ".mmrelay-sync-manifest.json"
+PLUGIN_SYNC_MANIFEST_COMMIT: Final[str] = "commit"
+PLUGIN_SYNC_MANIFEST_REF: Final[str] = "ref"
+PLUGIN_SYNC_MANIFEST_REPOSITORY: Final[str] = "repository"
 COMMUNITY_PLUGIN_UPDATE_CHECK_INTERVAL: Final[timedelta] = timedelta(hours=24)
 _community_dep_install_warning_logged = False
+# Serializes writes to the shared dependency environment; community plugins
+# are synced in parallel, but pip must not modify one environment twice at once.
+_dependency_install_lock = threading.Lock()
 
 
 class EffectiveRequirements(NamedTuple):
@@ -147,6 +161,28 @@ class RequirementsInstallTarget(NamedTuple):
     marker_dir: str | None
 
 
+class CommunityPluginJob(NamedTuple):
+    """A validated community plugin to clone or update before loading."""
+
+    plugin_name: str
+    repo_url: str
+    ref: dict[str, str]
+    repo_name: str
+    repo_path: str
+    install_requirements: bool
+    has_explicit_ref: bool
+
+
+class CommunityPluginSyncResult(NamedTuple):
+    """Outcome and timing of syncing one community plugin."""
+
+    plugin_name: str
+    ready: bool
+    fetch_skipped: bool
+    fetch_seconds: float
+    install_seconds: float
+
+
 def _is_safe_plugin_name(name: str) -> bool:
     """
     Validate a short plugin name to ensure it contains no path traversal, path separators, or absolute-path references.
@@ -1284,7 +1320,8 @@ def _install_requirements_for_repo(
                     with _temporary_requirements_file(safe_requirements) as temp_path:
                         cmd.extend(["-r", temp_path])
                         _run(cmd, timeout=PIP_INSTALL_TIMEOUT_SECONDS)
-                    _merge_staged_dependency_target(staged_dir, target_dir)
+                    with _dependency_install_lock:
+                        _merge_staged_dependency_target(staged_dir, target_dir)
                     installed_packages = True
                     handled_requirements = True
                 finally:
@@ -1311,7 +1348,8 @@ def _install_requirements_for_repo(
                         "--requirement",
                         temp_path,
                     ]
-                    _run(cmd, timeout=PIP_INSTALL_TIMEOUT_SECONDS)
+                    with _dependency_install_lock:
+                        _run(cmd, timeout=PIP_INSTALL_TIMEOUT_SECONDS)
                     installed_packages = True
                     handled_requirements = True
             else:
@@ -1353,13 +1391,15 @@ def _install_requirements_for_repo(
 
                 with _temporary_requirements_file(safe_requirements) as temp_path:
                     cmd.extend(["-r", temp_path])
-                    _run(cmd, timeout=PIP_INSTALL_TIMEOUT_SECONDS)
+                    with _dependency_install_lock:
+                        _run(cmd, timeout=PIP_INSTALL_TIMEOUT_SECONDS)
                     installed_packages = True
                     handled_requirements = True
 
         if installed_packages:
             logger.info("Successfully installed requirements for plugin %s", repo_name)
-            _refresh_dependency_paths()
+            with _dependency_install_lock:
+                _refresh_dependency_paths()
         else:
             logger.info("No dependency installation run for plugin %s", repo_name)
         if handled_requirements:
@@ -1594,59 +1634,58 @@ def _is_full_commit_sha(value: str) -> bool:
     return bool(re.fullmatch(r"[0-9a-fA-F]{40}", (value or "").strip()))
 
 
-def _load_plugin_state(repo_path: str) -> dict[str, Any]:
+def _read_json_object(path: str) -> dict[str, Any]:
     """
-    Load persisted community plugin state from disk.
+    Read a JSON object from disk.
 
     Parameters:
-        repo_path (str): Filesystem path to the plugin repository.
+        path (str): File to read.
 
     Returns:
-        dict[str, Any]: Parsed state object, or an empty dict if unavailable.
+        dict[str, Any]: Parsed object, or an empty dict if unavailable or not an object.
     """
-    state_path = _state_file_path(repo_path)
     try:
-        with open(state_path, encoding=DEFAULT_TEXT_ENCODING) as handle:
-            loaded_state = json.load(handle)
+        with open(path, encoding=DEFAULT_TEXT_ENCODING) as handle:
+            loaded = json.load(handle)
     except FileNotFoundError:
         return {}
     except (OSError, ValueError, TypeError, json.JSONDecodeError) as exc:
-        logger.debug("Failed to read plugin state file %s: %s", state_path, exc)
+        logger.debug("Failed to read plugin state file %s: %s", path, exc)
         return {}
 
-    if isinstance(loaded_state, dict):
-        return cast(dict[str, Any], loaded_state)
+    if isinstance(loaded, dict):
+        return cast(dict[str, Any], loaded)
 
-    logger.debug("Ignoring invalid plugin state in %s: expected object", state_path)
+    logger.debug("Ignoring invalid plugin state in %s: expected object", path)
     return {}
 
 
-def _save_plugin_state(repo_path: str, state: dict[str, Any]) -> None:
+def _write_json_object(directory: str, path: str, data: dict[str, Any]) -> None:
     """
-    Persist community plugin state to disk using an atomic replace.
+    Write a JSON object to disk using an atomic replace.
 
     Parameters:
-        repo_path (str): Filesystem path to the plugin repository.
-        state (dict[str, Any]): Serializable state mapping to persist.
+        directory (str): Directory holding `path`; the temporary file is created here.
+        path (str): File to write.
+        data (dict[str, Any]): Serializable mapping to persist.
     """
-    state_path = _state_file_path(repo_path)
     tmp_path: str | None = None
     try:
-        os.makedirs(repo_path, exist_ok=True)
+        os.makedirs(directory, exist_ok=True)
         with tempfile.NamedTemporaryFile(
             mode="w",
             encoding=DEFAULT_TEXT_ENCODING,
             delete=False,
-            dir=repo_path,
+            dir=directory,
         ) as temp_handle:
-            json.dump(state, temp_handle, indent=2, sort_keys=True)
+            json.dump(data, temp_handle, indent=2, sort_keys=True)
             temp_handle.write("\n")
             temp_handle.flush()
             os.fsync(temp_handle.fileno())
             tmp_path = temp_handle.name
-        os.replace(tmp_path, state_path)
+        os.replace(tmp_path, path)
     except (OSError, TypeError, ValueError) as exc:
-        logger.debug("Failed to write plugin state file %s: %s", state_path, exc)
+        logger.debug("Failed to write plugin state file %s: %s", path, exc)
     finally:
         if tmp_path and os.path.exists(tmp_path):
             try:
@@ -1655,6 +1694,30 @@ def _save_plugin_state(repo_path: str, state: dict[str, Any]) -> None:
                 pass
 
 
+def _load_plugin_state(repo_path: str) -> dict[str, Any]:
+    """
+    Load persisted community plugin state from disk.
+
+    Parameters:
+        repo_path (str): Filesystem path to the plugin repository.
+
+    Returns:
+        dict[str, Any]: Parsed state object, or an empty dict if unavailable.
+    """
+    return _read_json_object(_state_file_path(repo_path))
+
+
+def _save_plugin_state(repo_path: str, state: dict[str, Any]) -> None:
+    """
+    Persist community plugin state to disk using an atomic replace.
+
+    Parameters:
+        repo_path (str): Filesystem path to the plugin repository.
+        state (dict[str, Any]): Serializable state mapping to persist.
+    """
+    _write_json_object(repo_path, _state_file_path(repo_path), state)
+
+
 def _parse_state_timestamp(value: Any) -> datetime | None:
     """
     Parse an ISO timestamp from plugin state.
@@ -2899,6 +2962,347 @@ def clone_or_update_repo(repo_url: str, ref: dict[str, str], plugins_dir: str) -
     )
 
 
+def _sync_ref_key(ref: dict[str, str]) -> str:
+    """Return the manifest representation of a ref, e.g. ``"tag:v1.2.0"``."""
+    return f"{ref.get('type', '')}:{ref.get('value', '')}"
+
+
+def _resolve_remote_tag_commit(repo_path: str, tag_name: str) -> str | None:
+    """
+    Resolve the commit a tag on origin points to, peeling annotated tags.
+
+    Parameters:
+        repo_path (str): Filesystem path to the plugin repository.
+        tag_name (str): Tag name to resolve.
+
+    Returns:
+        str | None: Commit SHA for the tag, or None.
+    """
+    tag_ref = f"refs/tags/{tag_name}"
+    try:
+        result = _run_git(
+            [
+                "git",
+                "-C",
+                repo_path,
+                "ls-remote",
+                GIT_REMOTE_ORIGIN,
+                tag_ref,
+                f"{tag_ref}^{{}}",
+            ],
+            timeout=GIT_COMMAND_TIMEOUT_SECONDS,
+            capture_output=True,
+        )
+    except (subprocess.CalledProcessError, subprocess.TimeoutExpired, OSError) as exc:
+        logger.debug(
+            "Unable to resolve remote tag for %s (%s): %s", repo_path, tag_name, exc
+        )
+        return None
+
+    refs: dict[str, str] = {}
+    for line in result.stdout.splitlines():
+        sha, _, name = line.strip().partition("\t")
+        refs[name.strip()] = sha.strip()
+    # An annotated tag is listed twice; the peeled "^{}" entry is the commit.
+    remote_sha = refs.get(f"{tag_ref}^{{}}") or refs.get(tag_ref, "")
+    return remote_sha if _is_full_commit_sha(remote_sha) else None
+
+
+def _community_plugin_is_current(job: CommunityPluginJob) -> bool:
+    """
+    Check whether a community plugin checkout can be used without fetching.
+
+    The sync manifest in the repository directory records the repository, ref
+    and commit of the last successful sync. The checkout is current when HEAD is
+    still that commit and the ref still resolves to it: commit pins resolve
+    locally, branches and tags with a single ``git ls-remote``.
+
+    Parameters:
+        job (CommunityPluginJob): The plugin to check.
+
+    Returns:
+        bool: `True` if the clone/update step can be skipped, `False` otherwise.
+    """
+    if not os.path.isdir(os.path.join(job.repo_path, ".git")):
+        return False
+    manifest = _read_json_object(
+        os.path.join(job.repo_path, PLUGIN_SYNC_MANIFEST_FILENAME)
+    )
+    synced_commit = manifest.get(PLUGIN_SYNC_MANIFEST_COMMIT)
+    if (
+        manifest.get(PLUGIN_SYNC_MANIFEST_REPOSITORY) != _redact_url(job.repo_url)
+        or manifest.get(PLUGIN_SYNC_MANIFEST_REF) != _sync_ref_key(job.ref)
+        or not isinstance(synced_commit, str)
+        or not _is_full_commit_sha(synced_commit)
+    ):
+        return False
+    synced_commit = synced_commit.lower()
+    if _resolve_local_head_commit(job.repo_path) != synced_commit:
+        return False
+
+    ref_type = job.ref.get("type")
+    ref_value = job.ref.get("value", "")
+    if ref_type == "commit":
+        return synced_commit.startswith(ref_value.lower())
+    if ref_type == "tag":
+        remote_commit = _resolve_remote_tag_commit(job.repo_path, ref_value)
+    else:
+        remote_commit = _resolve_remote_branch_head_commit(job.repo_path, ref_value)
+    return remote_commit is not None and remote_commit.lower() == synced_commit
+
+
+def _record_community_plugin_sync(job: CommunityPluginJob) -> None:
+    """
+    Record the checked-out commit of a freshly synced community plugin in its manifest.
+
+    Parameters:
+        job (CommunityPluginJob): The plugin that was cloned or updated.
+    """
+    if not os.path.isdir(os.path.join(job.repo_path, ".git")):
+        return
+    head_commit = _resolve_local_head_commit(job.repo_path)
+    if head_commit is None:
+        return
+    _write_json_object(
+        job.repo_path,
+        os.path.join(job.repo_path, PLUGIN_SYNC_MANIFEST_FILENAME),
+        {
+            PLUGIN_SYNC_MANIFEST_REPOSITORY: _redact_url(job.repo_url),
+            PLUGIN_SYNC_MANIFEST_REF: _sync_ref_key(job.ref),
+            PLUGIN_SYNC_MANIFEST_COMMIT: head_commit.lower(),
+        },
+    )
+
+
+def _ensure_community_plugin_requirements(job: CommunityPluginJob) -> None:
+    """
+    Install a community plugin's requirements unless they are already installed for its checked-out commit.
+
+    Only plugins pinned to an explicit ref are eligible; commit pins must use a full SHA.
+
+    Parameters:
+        job (CommunityPluginJob): A plugin with ``install_requirements`` enabled.
+    """
+    ref_value = str(job.ref.get("value", "")).strip()
+    ref_type = str(job.ref.get("type", "")).strip()
+    if not job.has_explicit_ref:
+        logger.warning(
+            "Skipping dependency install for community plugin '%s': "
+            "install_requirements requires an explicit ref; "
+            "implicit default-branch refs are not eligible.",
+            job.plugin_name,
+        )
+        return
+    if ref_type == "commit" and not _is_full_commit_sha(ref_value):
+        logger.warning(
+            "Skipping dependency install for community plugin '%s': "
+            "commit refs for install_requirements must use a full "
+            "40-character SHA.",
+            job.plugin_name,
+        )
+        return
+    if ref_type == "branch":
+        logger.warning(
+            "Community plugin '%s' uses install_requirements with an "
+            "explicit branch ref; installs will follow moving upstream "
+            "commits.",
+            job.plugin_name,
+        )
+    elif ref_type == "tag":
+        logger.warning(
+            "Community plugin '%s' uses install_requirements with an "
+            "explicit tag ref; tags can be retargeted.",
+            job.plugin_name,
+        )
+    pinned_sha = _resolve_local_head_commit(job.repo_path)
+    if pinned_sha is None:
+        logger.warning(
+            "Skipping dependency install for community plugin '%s': unable to resolve checked-out commit.",
+            job.plugin_name,
+        )
+        return
+    requirements_path = os.path.join(job.repo_path, PLUGIN_REQUIREMENTS_FILENAME)
+    if not os.path.isfile(requirements_path):
+        logger.debug(
+            "Skipping requirements install for community plugin %s; no %s found",
+            job.plugin_name,
+            PLUGIN_REQUIREMENTS_FILENAME,
+        )
+        return
+    state = _load_plugin_state(job.repo_path)
+    effective_requirements = _effective_requirements_for_repo(
+        job.repo_path, job.repo_name
+    )
+    requirements_hash = _requirements_hash(effective_requirements.allowed)
+    requirements_target = _requirements_install_target_identity()
+    last_installed_commit = state.get(PLUGIN_STATE_LAST_INSTALLED_REQUIREMENTS_COMMIT)
+    last_installed_hash = state.get(PLUGIN_STATE_LAST_INSTALLED_REQUIREMENTS_HASH)
+    last_installed_target = state.get(PLUGIN_STATE_LAST_INSTALLED_REQUIREMENTS_TARGET)
+    state_matches_requirements = (
+        isinstance(last_installed_commit, str)
+        and last_installed_commit == pinned_sha
+        and isinstance(last_installed_hash, str)
+        and last_installed_hash == requirements_hash
+        and isinstance(last_installed_target, str)
+        and last_installed_target == requirements_target
+    )
+    if state_matches_requirements:
+        if _requirements_install_target_valid(
+            job.repo_path,
+            job.repo_name,
+            requirements_hash,
+            requirements_target,
+        ):
+            logger.debug(
+                "Skipping requirements install for community plugin %s; already installed for commit %s, requirements hash %s, target %s",
+                job.plugin_name,
+                pinned_sha,
+                requirements_hash,
+                requirements_target,
+            )
+            return
+        logger.debug(
+            "Reinstalling requirements for community plugin %s; install state matches but marker validation failed for target %s",
+            job.plugin_name,
+            requirements_target,
+        )
+    if _install_requirements_for_repo(
+        job.repo_path,
+        job.repo_name,
+        plugin_type=PLUGIN_TYPE_COMMUNITY,
+        requirements_target=requirements_target,
+    ):
+        state[PLUGIN_STATE_LAST_INSTALLED_REQUIREMENTS_COMMIT] = pinned_sha
+        state[PLUGIN_STATE_LAST_INSTALLED_REQUIREMENTS_HASH] = requirements_hash
+        state[PLUGIN_STATE_LAST_INSTALLED_REQUIREMENTS_TARGET] = requirements_target
+        state[PLUGIN_STATE_LAST_REQUIREMENTS_INSTALLED_AT] = datetime.now(
+            timezone.utc
+        ).isoformat()
+        _save_plugin_state(job.repo_path, state)
+
+
+def _sync_community_plugin(
+    job: CommunityPluginJob, plugins_dir: str
+) -> CommunityPluginSyncResult:
+    """
+    Clone or update one community plugin and install its requirements if configured.
+
+    Parameters:
+        job (CommunityPluginJob): The plugin to sync.
+        plugins_dir (str): Community plugin directory the repository lives in.
+
+    Returns:
+        CommunityPluginSyncResult: Whether the plugin is ready to load, and how long each step took.
+    """
+    started = time.monotonic()
+    fetch_skipped = _community_plugin_is_current(job)
+    if fetch_skipped:
+        logger.info(
+            "Community plugin %s is already at its synced commit; skipping fetch",
+            job.plugin_name,
+        )
+    else:
+        # Call public helper so tests and integrations can patch this seam.
+        if not clone_or_update_repo(job.repo_url, job.ref, plugins_dir):
+            logger.warning(f"Failed to clone/update plugin {job.plugin_name}, skipping")
+            return CommunityPluginSyncResult(
+                job.plugin_name, False, False, time.monotonic() - started, 0.0
+            )
+        _record_community_plugin_sync(job)
+    if job.ref["type"] == "commit":
+        _check_commit_pin_for_upstream_updates(
+            job.plugin_name,
+            job.repo_url,
+            job.repo_path,
+        )
+    fetched = time.monotonic()
+    if job.install_requirements:
+        _ensure_community_plugin_requirements(job)
+    return CommunityPluginSyncResult(
+        job.plugin_name,
+        True,
+        fetch_skipped,
+        fetched - started,
+        time.monotonic() - fetched,
+    )
+
+
+def _sync_community_plugin_group(
+    jobs: Sequence[CommunityPluginJob], plugins_dir: str
+) -> list[CommunityPluginSyncResult]:
+    """Sync plugins that share one repository checkout, one after another."""
+    return [_sync_community_plugin(job, plugins_dir) for job in jobs]
+
+
+def _sync_community_plugins(
+    jobs: Sequence[CommunityPluginJob],
+    plugins_dir: str,
+    max_workers: int = COMMUNITY_PLUGIN_SYNC_MAX_WORKERS,
+) -> list[CommunityPluginSyncResult]:
+    """
+    Clone/update community plugins and install their requirements in parallel.
+
+    Plugins are synced on a bounded thread pool. Plugins that share a
+    repository checkout are synced in sequence on the same worker, so git
+    never operates on one working tree twice at once.
+
+    Parameters:
+        jobs (Sequence[CommunityPluginJob]): Plugins to sync, in configuration order.
+        plugins_dir (str): Community plugin directory the repositories live in.
+        max_workers (int): Maximum number of plugins synced at the same time.
+
+    Returns:
+        list[CommunityPluginSyncResult]: One result per job, in the order of `jobs`.
+    """
+    groups: dict[str, list[CommunityPluginJob]] = {}
+    for job in jobs:
+        groups.setdefault(job.repo_path, []).append(job)
+
+    started = time.monotonic()
+    workers = max(1, min(max_workers, len(groups)))
+    results_by_job: dict[int, CommunityPluginSyncResult] = {}
+    with ThreadPoolExecutor(
+        max_workers=workers, thread_name_prefix="mmrelay-plugin-sync"
+    ) as executor:
+        futures = {
+            executor.submit(_sync_community_plugin_group, group, plugins_dir): group
+            for group in groups.values()
+        }
+        for future, group in futures.items():
+            try:
+                group_results = future.result()
+            except Exception:
+                logger.exception(
+                    "Unexpected error syncing community plugins: %s",
+                    ", ".join(job.plugin_name for job in group),
+                )
+                group_results = [
+                    CommunityPluginSyncResult(job.plugin_name, False, False, 0.0, 0.0)
+                    for job in group
+                ]
+            for job, result in zip(group, group_results, strict=True):
+                results_by_job[id(job)] = result
+
+    results = [results_by_job[id(job)] for job in jobs]
+    for result in results:
+        logger.info(
+            "Community plugin %s %s in %.2fs (fetch %.2fs%s, dependencies %.2fs)",
+            result.plugin_name,
+            "synced" if result.ready else "failed to sync",
+            result.fetch_seconds + result.install_seconds,
+            result.fetch_seconds,
+            ", cached" if result.fetch_skipped else "",
+            result.install_seconds,
+        )
+    logger.debug(
+        "Synced %d community plugin(s) with %d worker(s) in %.2fs",
+        len(results),
+        workers,
+        time.monotonic() - started,
+    )
+    return results
+
+
 def _should_ignore_plugin_file(filename: str) -> bool:
     return filename.startswith(".") or any(
         fnmatch.fnmatch(filename, pattern) for pattern in PLUGIN_IGNORED_FILE_PATTERNS
@@ -3118,17 +3522,54 @@ def load_plugins_from_directory(
     return plugins
 
 
+def set_scheduler_event_loop(loop: asyncio.AbstractEventLoop | None) -> None:
+    """
+    Run plugin background jobs on `loop` instead of the polling scheduler thread.
+
+    Called by the relay before plugins are loaded. Passing None reverts to the
+    ``schedule``-library thread; `stop_global_scheduler` does so on shutdown.
+
+    Parameters:
+        loop (asyncio.AbstractEventLoop | None): The relay's event loop.
+    """
+    global _scheduler_loop
+    _scheduler_loop = loop
+
+
+def _get_async_scheduler() -> AsyncScheduler | None:
+    """
+    Return the asyncio plugin scheduler, creating it on first use.
+
+    Returns:
+        AsyncScheduler | None: The scheduler, or None when no usable event loop was registered.
+    """
+    global _async_scheduler
+    if _scheduler_loop is None or _scheduler_loop.is_closed():
+        return None
+    if _async_scheduler is None:
+        _async_scheduler = AsyncScheduler()
+    return _async_scheduler
+
+
 def schedule_job(plugin_name: str, interval: int = 1) -> Any:
     """
     Create and tag a scheduled job for a plugin at the given interval.
 
+    With a registered event loop the job is defined through a `JobBuilder`
+    for the asyncio scheduler; otherwise through the ``schedule`` library.
+    Both take the same ``.<unit>[.at(...)].do(func)`` chain.
+
     Parameters:
         plugin_name (str): Plugin name used to tag the scheduled job.
         interval (int): Interval value for the schedule; the time unit is selected when configuring the job (e.g., `job.seconds`, `job.minutes`).
 
     Returns:
-        job: The scheduled job object tagged with `plugin_name`, or `None` if the scheduling library is unavailable.
+        job: The job builder tagged with `plugin_name`, or `None` if no scheduler is available.
     """
+    async_scheduler = _get_async_scheduler()
+    if async_scheduler is not None:
+        return JobBuilder(async_scheduler, interval, tag=plugin_name)
+
     if schedule is None:
         return None
 
@@ -3144,20 +3585,31 @@ def clear_plugin_jobs(plugin_name: str) -> None:
     Parameters:
         plugin_name (str): The tag used when scheduling jobs for the plugin; all jobs with this tag will be cleared.
     """
+    if _async_scheduler is not None:
+        _async_scheduler.cancel_tag(plugin_name)
     if schedule is not None:
         schedule.clear(plugin_name)
 
 
 def start_global_scheduler() -> None:
     """
-    Start a single global scheduler thread to execute all plugin scheduled jobs.
+    Start running plugin scheduled jobs.
 
-    Creates and starts one daemon thread that periodically calls schedule.run_pending()
-    to run pending jobs for all plugins. If the schedule library is unavailable or a
-    global scheduler is already running, the function does nothing.
+    With a registered event loop the asyncio scheduler is started on it.
+    Otherwise one daemon thread is started that periodically calls
+    schedule.run_pending() to run pending jobs for all plugins. If the schedule
+    library is unavailable or a global scheduler is already running, the
+    function does nothing.
     """
     global _global_scheduler_thread, _global_scheduler_stop_event
 
+    async_scheduler = _get_async_scheduler()
+    if async_scheduler is not None and _scheduler_loop is not None:
+        if not async_scheduler.running:
+            async_scheduler.start(_scheduler_loop)
+            logger.info("Global plugin scheduler started")
+        return
+
     if schedule is None:
         logger.warning(
             "Schedule library not available, plugin background jobs disabled"
@@ -3196,9 +3648,16 @@ def stop_global_scheduler() -> None:
     """
     Stop the global scheduler thread.
 
-    Signals the scheduler loop to stop, waits up to ``SCHEDULER_SHUTDOWN_TIMEOUT_SECONDS`` for the thread to terminate, clears all scheduled jobs, and resets the scheduler state.
+    Signals the scheduler loop to stop, waits up to ``SCHEDULER_SHUTDOWN_TIMEOUT_SECONDS`` for the thread to terminate, clears all scheduled jobs, and resets the scheduler state. The asyncio scheduler, if used, cancels its jobs and the runs in progress, and the registered event loop is forgotten so a closed loop is never reused.
     """
-    global _global_scheduler_thread, _global_scheduler_stop_event
+    global _global_scheduler_thread, _global_scheduler_stop_event, _async_scheduler
+    global _scheduler_loop
+
+    _scheduler_loop = None
+    if _async_scheduler is not None:
+        async_scheduler, _async_scheduler = _async_scheduler, None
+        async_scheduler.close(timeout=SCHEDULER_SHUTDOWN_TIMEOUT_SECONDS)
+        logger.info("Global plugin scheduler stopped")
 
     if _global_scheduler_thread is None:
         return
@@ -3396,7 +3855,8 @@ def load_plugins(passed_config: Any = None) -> list[Any]:
     active_community_plugins = _active_plugin_names(
         CONFIG_SECTION_COMMUNITY_PLUGINS, community_plugins_config
     )
-    ready_community_plugins = []
+    ready_community_plugins: list[str] = []
+    community_plugin_jobs: list[CommunityPluginJob] = []
     tag_ref_warning_logged = False
 
     if active_community_plugins:
@@ -3578,141 +4038,31 @@ def load_plugins(passed_config: Any = None) -> list[Any]:
                 )
                 continue
 
-            # Call public helper so tests and integrations can patch this seam.
-            success = clone_or_update_repo(
-                validation_result.repo_url,
-                ref,
-                community_plugins_dir,
-            )
-            if not success:
-                logger.warning(f"Failed to clone/update plugin {plugin_name}, skipping")
-                continue
-            if ref["type"] == "commit":
-                _check_commit_pin_for_upstream_updates(
-                    plugin_name,
-                    validation_result.repo_url,
-                    repo_path,
+            community_plugin_jobs.append(
+                CommunityPluginJob(
+                    plugin_name=plugin_name,
+                    repo_url=validation_result.repo_url,
+                    ref=ref,
+                    repo_name=repo_name,
+                    repo_path=repo_path,
+                    install_requirements=install_requirements,
+                    has_explicit_ref=has_explicit_ref,
                 )
-            if install_requirements:
-                ref_value = str(ref.get("value", "")).strip()
-                ref_type = str(ref.get("type", "")).strip()
-                if not has_explicit_ref:
-                    logger.warning(
-                        "Skipping dependency install for community plugin '%s': "
-                        "install_requirements requires an explicit ref; "
-                        "implicit default-branch refs are not eligible.",
-                        plugin_name,
-                    )
-                elif ref_type == "commit" and not _is_full_commit_sha(ref_value):
-                    logger.warning(
-                        "Skipping dependency install for community plugin '%s': "
-                        "commit refs for install_requirements must use a full "
-                        "40-character SHA.",
-                        plugin_name,
-                    )
-                else:
-                    if ref_type == "branch":
-                        logger.warning(
-                            "Community plugin '%s' uses install_requirements with an "
-                            "explicit branch ref; installs will follow moving upstream "
-                            "commits.",
-                            plugin_name,
-                        )
-                    elif ref_type == "tag":
-                        logger.warning(
-                            "Community plugin '%s' uses install_requirements with an "
-                            "explicit tag ref; tags can be retargeted.",
-                            plugin_name,
-                        )
-                    pinned_sha = _resolve_local_head_commit(repo_path)
-                    if pinned_sha is None:
-                        logger.warning(
-                            "Skipping dependency install for community plugin '%s': unable to resolve checked-out commit.",
-                            plugin_name,
-                        )
-                    else:
-                        requirements_path = os.path.join(
-                            repo_path, PLUGIN_REQUIREMENTS_FILENAME
-                        )
-                        if not os.path.isfile(requirements_path):
-                            logger.debug(
-                                "Skipping requirements install for community plugin %s; no %s found",
-                                plugin_name,
-                                PLUGIN_REQUIREMENTS_FILENAME,
-                            )
-                            ready_community_plugins.append(plugin_name)
-                            continue
-                        state = _load_plugin_state(repo_path)
-                        effective_requirements = _effective_requirements_for_repo(
-                            repo_path, repo_name
-                        )
-                        requirements_hash = _requirements_hash(
-                            effective_requirements.allowed
-                        )
-                        requirements_target = _requirements_install_target_identity()
-                        last_installed_commit = state.get(
-                            PLUGIN_STATE_LAST_INSTALLED_REQUIREMENTS_COMMIT
-                        )
-                        last_installed_hash = state.get(
-                            PLUGIN_STATE_LAST_INSTALLED_REQUIREMENTS_HASH
-                        )
-                        last_installed_target = state.get(
-                            PLUGIN_STATE_LAST_INSTALLED_REQUIREMENTS_TARGET
-                        )
-                        state_matches_requirements = (
-                            isinstance(last_installed_commit, str)
-                            and last_installed_commit == pinned_sha
-                            and isinstance(last_installed_hash, str)
-                            and last_installed_hash == requirements_hash
-                            and isinstance(last_installed_target, str)
-                            and last_installed_target == requirements_target
-                        )
-                        if state_matches_requirements:
-                            if _requirements_install_target_valid(
-                                repo_path,
-                                repo_name,
-                                requirements_hash,
-                                requirements_target,
-                            ):
-                                logger.debug(
-                                    "Skipping requirements install for community plugin %s; already installed for commit %s, requirements hash %s, target %s",
-                                    plugin_name,
-                                    pinned_sha,
-                                    requirements_hash,
-                                    requirements_target,
-                                )
-                                ready_community_plugins.append(plugin_name)
-                                continue
-                            logger.debug(
-                                "Reinstalling requirements for community plugin %s; install state matches but marker validation failed for target %s",
-                                plugin_name,
-                                requirements_target,
-                            )
-                        if _install_requirements_for_repo(
-                            repo_path,
-                            repo_name,
-                            plugin_type=PLUGIN_TYPE_COMMUNITY,
-                            requirements_target=requirements_target,
-                        ):
-                            state[PLUGIN_STATE_LAST_INSTALLED_REQUIREMENTS_COMMIT] = (
-                                pinned_sha
-                            )
-                            state[PLUGIN_STATE_LAST_INSTALLED_REQUIREMENTS_HASH] = (
-                                requirements_hash
-                            )
-                            state[PLUGIN_STATE_LAST_INSTALLED_REQUIREMENTS_TARGET] = (
-                                requirements_target
-                            )
-                            state[PLUGIN_STATE_LAST_REQUIREMENTS_INSTALLED_AT] = (
-                                datetime.now(timezone.utc).isoformat()
-                            )
-                            _save_plugin_state(repo_path, state)
-            ready_community_plugins.append(plugin_name)
+            )
         else:
             logger.error("Repository URL not specified for a community plugin")
             logger.error("Please specify the repository URL in config.yaml")
             continue
 
+    if community_plugin_jobs and community_plugins_dir is not None:
+        ready_community_plugins = [
+            result.plugin_name
+            for result in _sync_community_plugins(
+                community_plugin_jobs, community_plugins_dir
+            )
+            if result.ready
+        ]
+
     # Only load community plugins that were successfully synced
     for plugin_name in ready_community_plugins:
         plugin_info = community_plugins_config[plugin_name]
@@ -17,6 +17,8 @@ from nio import (
     RoomSendResponse,
 )
 
+from mmrelay.async_scheduler import JobBuilder
+
 # Provide a patchable module attribute for tests while avoiding name confusion.
 from mmrelay.config import get_plugin_data_dir as resolve_plugin_data_dir
 from mmrelay.constants.config import (
@@ -39,15 +41,22 @@ from mmrelay.constants.plugins import (
     PLUGIN_TYPE_COMMUNITY,
     PLUGIN_TYPE_CORE,
     PLUGIN_TYPE_CUSTOM,
+    SCHEDULE_MISSED_RUNS_POLICIES,
 )
 from mmrelay.constants.queue import DEFAULT_MESSAGE_DELAY, MINIMUM_MESSAGE_DELAY
 from mmrelay.db_utils import (
     delete_plugin_data,
+    delete_plugin_series,
     get_plugin_data,
     get_plugin_data_for_node,
+    get_plugin_series,
+    prune_plugin_data,
+    prune_plugin_series,
     store_plugin_data,
+    store_plugin_series,
 )
 from mmrelay.log_utils import get_logger
+from mmrelay.meshtastic.packet_view import PacketView, get_packet_view
 from mmrelay.message_queue import queue_message
 from mmrelay.plugin_loader import (
     clear_plugin_jobs,
@@ -114,6 +123,10 @@ class BasePlugin(ABC):
             (default: DEFAULT_MAX_DATA_ROWS_PER_NODE_BASE)
         priority (int): Plugin execution priority (lower = higher priority,
             default: DEFAULT_PLUGIN_PRIORITY)
+        meshtastic_portnums (frozenset[str] | None): Portnum names this plugin's
+            handle_meshtastic_message() can act on for non-text packets. None
+            (the default) means every packet; an empty set means none, which
+            lets the relay skip the plugin for position/telemetry noise.
 
     Subclasses must:
     - Set plugin_name as a class attribute
@@ -142,6 +155,7 @@ class BasePlugin(ABC):
     is_core_plugin: bool | None = None
     max_data_rows_per_node = DEFAULT_MAX_DATA_ROWS_PER_NODE_BASE
     priority = DEFAULT_PLUGIN_PRIORITY
+    meshtastic_portnums: frozenset[str] | None = None
 
     @property
     def description(self) -> str:
@@ -418,7 +432,7 @@ class BasePlugin(ABC):
         """
         Starts the plugin and configures scheduled background tasks based on plugin settings.
 
-        If scheduling options are present in plugin configuration, sets up periodic execution of `background_job` method using the global scheduler. If no scheduling is configured, the plugin starts without background tasks.
+        If scheduling options are present in plugin configuration, sets up periodic execution of `background_job` method using the global scheduler. `background_job` may be a coroutine function when the relay's asyncio scheduler is in use, which also honours the ``jitter``, ``timeout`` and ``missed_runs`` schedule options. If no scheduling is configured, the plugin starts without background tasks.
         """
         schedule_config: dict[str, Any] = self.config.get("schedule") or {}
         if not isinstance(schedule_config, dict):
@@ -449,30 +463,31 @@ class BasePlugin(ABC):
         # Schedule background job based on configuration
         job = None
         try:
+            job_obj = None
             if "at" in schedule_config and "hours" in schedule_config:
                 job_obj = schedule_job(self.plugin_name, schedule_config["hours"])
                 if job_obj is not None:
-                    job = job_obj.hours.at(schedule_config["at"]).do(
-                        self.background_job
-                    )
+                    job_obj = job_obj.hours.at(schedule_config["at"])
             elif "at" in schedule_config and "minutes" in schedule_config:
                 job_obj = schedule_job(self.plugin_name, schedule_config["minutes"])
                 if job_obj is not None:
-                    job = job_obj.minutes.at(schedule_config["at"]).do(
-                        self.background_job
-                    )
+                    job_obj = job_obj.minutes.at(schedule_config["at"])
             elif "hours" in schedule_config:
                 job_obj = schedule_job(self.plugin_name, schedule_config["hours"])
                 if job_obj is not None:
-                    job = job_obj.hours.do(self.background_job)
+                    job_obj = job_obj.hours
             elif "minutes" in schedule_config:
                 job_obj = schedule_job(self.plugin_name, schedule_config["minutes"])
                 if job_obj is not None:
-                    job = job_obj.minutes.do(self.background_job)
+                    job_obj = job_obj.minutes
             elif "seconds" in schedule_config:
                 job_obj = schedule_job(self.plugin_name, schedule_config["seconds"])
                 if job_obj is not None:
-                    job = job_obj.seconds.do(self.background_job)
+                    job_obj = job_obj.seconds
+            if isinstance(job_obj, JobBuilder):
+                job_obj = job_obj.options(**self._schedule_options(schedule_config))
+            if job_obj is not None:
+                job = job_obj.do(self.background_job)
         except (ValueError, TypeError) as e:
             self.logger.warning(
                 "Invalid schedule configuration for plugin '%s': %s. Starting without background job.",
@@ -491,6 +506,52 @@ class BasePlugin(ABC):
 
         self.logger.debug(f"Scheduled with priority={self.priority}")
 
+    def _schedule_options(self, schedule_config: dict[str, Any]) -> dict[str, Any]:
+        """
+        Read the asyncio scheduler options from a plugin's ``schedule`` config.
+
+        ``jitter`` and ``timeout`` are seconds; ``missed_runs`` is ``"skip"``,
+        ``"run_once"`` (default) or ``"catch_up"``. Invalid values are logged
+        and replaced by their defaults.
+
+        Parameters:
+            schedule_config (dict[str, Any]): The plugin's ``schedule`` mapping.
+
+        Returns:
+            dict[str, Any]: Keyword arguments for `JobBuilder.options`.
+        """
+        options: dict[str, Any] = {}
+        for key, minimum_exclusive in (("jitter", False), ("timeout", True)):
+            value = schedule_config.get(key)
+            if value is None:
+                continue
+            if (
+                isinstance(value, bool)
+                or not isinstance(value, (int, float))
+                or value < 0
+                or (minimum_exclusive and value == 0)
+            ):
+                self.logger.warning(
+                    "Ignoring invalid schedule %s %r for plugin '%s'",
+                    key,
+                    value,
+                    self.plugin_name,
+                )
+                continue
+            options[key] = float(value)
+        missed_runs = schedule_config.get("missed_runs")
+        if missed_runs is not None:
+            if missed_runs in SCHEDULE_MISSED_RUNS_POLICIES:
+                options["missed_runs"] = missed_runs
+            else:
+                self.logger.warning(
+                    "Ignoring invalid schedule missed_runs %r for plugin '%s'; expected one of %s",
+                    missed_runs,
+                    self.plugin_name,
+                    ", ".join(sorted(SCHEDULE_MISSED_RUNS_POLICIES)),
+                )
+        return options
+
     def stop(self) -> None:
         """
         Stop scheduled background work and run the plugin's cleanup hook.
@@ -549,6 +610,22 @@ class BasePlugin(ABC):
                 data[idx] = self.strip_raw(item)
         return data
 
+    def get_packet_view(self, packet: dict[str, Any]) -> PacketView:
+        """
+        Return the shared, lazily normalized view of a received Meshtastic packet.
+
+        Prefer this over `strip_raw` in `handle_meshtastic_message`: the view never
+        mutates `packet`, and the raw-stripped copy, base64 payload and JSON form
+        are computed once and reused by every plugin handling the same packet.
+
+        Parameters:
+            packet (dict[str, Any]): The packet passed to `handle_meshtastic_message`.
+
+        Returns:
+            PacketView: The view for this packet; its `stripped`, `transport` and `json` attributes are shared and must not be modified.
+        """
+        return get_packet_view(packet)
+
     def get_response_delay(self) -> float:
         """
         Get the configured Meshtastic response delay in seconds.
@@ -887,6 +964,20 @@ class BasePlugin(ABC):
         plugin_name = self._require_plugin_name()
         delete_plugin_data(plugin_name, meshtastic_id)
 
+    def prune_node_data(self, key_prefix: str, keep: int) -> int:
+        """
+        Delete this plugin's oldest stored entries whose key starts with `key_prefix`.
+
+        Parameters:
+            key_prefix (str): Prefix of the keys to consider, e.g. a cache namespace.
+            keep (int): Number of most recently added matching entries to keep.
+
+        Returns:
+            int: Number of entries deleted.
+        """
+        plugin_name = self._require_plugin_name()
+        return prune_plugin_data(plugin_name, key_prefix, keep)
+
     def get_node_data(self, meshtastic_id: str) -> Any:
         """
         Retrieve the plugin-specific data stored for a Meshtastic node.
@@ -910,6 +1001,72 @@ class BasePlugin(ABC):
         plugin_name = self._require_plugin_name()
         return get_plugin_data(plugin_name)
 
+    def store_node_series(
+        self,
+        meshtastic_id: str,
+        timestamp: float,
+        values: dict[str, float | int | None],
+    ) -> None:
+        """
+        Record numeric samples for a node in the typed series table.
+
+        An opt-in alternative to `store_node_data` for time series such as telemetry: each
+        metric is stored as its own row, so appending a sample or reading a time range does
+        not decode and rewrite the node's whole history.
+
+        Parameters:
+            meshtastic_id (str): Identifier of the Meshtastic node.
+            timestamp (float): Sample time in seconds since the epoch.
+            values (dict[str, float | int | None]): Metric name to value.
+        """
+        plugin_name = self._require_plugin_name()
+        store_plugin_series(plugin_name, meshtastic_id, timestamp, values)
+
+    def get_series(
+        self,
+        metric: str,
+        meshtastic_id: str | None = None,
+        since: float | None = None,
+    ) -> list[tuple[str, float, float | None]]:
+        """
+        Read one metric recorded with `store_node_series`, oldest sample first.
+
+        Parameters:
+            metric (str): Metric name.
+            meshtastic_id (str | None): Limit to one node; all nodes when None.
+            since (float | None): Only return samples at or after this timestamp.
+
+        Returns:
+            list[tuple[str, float, float | None]]: (meshtastic_id, timestamp, value) rows.
+        """
+        plugin_name = self._require_plugin_name()
+        return get_plugin_series(
+            plugin_name, metric, meshtastic_id=meshtastic_id, since=since
+        )
+
+    def delete_node_series(self, meshtastic_id: str) -> None:
+        """
+        Remove every series sample this plugin stored for a node.
+
+        Parameters:
+            meshtastic_id (str): Identifier of the Meshtastic node.
+        """
+        plugin_name = self._require_plugin_name()
+        delete_plugin_series(plugin_name, meshtastic_id)
+
+    def prune_series(self, older_than: float) -> int:
+        """
+        Delete this plugin's series samples recorded before a timestamp.
+
+        Parameters:
+            older_than (float): Cut-off time in seconds since the epoch.
+
+        Returns:
+            int: Number of samples deleted.
+        """
+        plugin_name = self._require_plugin_name()
+        return prune_plugin_series(plugin_name, older_than)
+
     def get_plugin_data_dir(self, subdir: str | None = None) -> str:
         """
         Get the absolute filesystem path for this plugin's data directory, optionally for a named subdirectory; the directory is created if missing and resolution respects the plugin's configured type.
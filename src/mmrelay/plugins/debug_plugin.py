@@ -17,8 +17,8 @@ class Plugin(BasePlugin):
     """Debug plugin for logging packet information.
 
     A low-priority plugin that logs all received meshtastic packets
-    for debugging and development purposes. Strips raw binary data
-    before logging to keep output readable.
+    for debugging and development purposes. Logs a raw-stripped view
+    of each packet to keep output readable without mutating it.
 
     Configuration:
         priority: Configured via the DEBUG_PLUGIN_PRIORITY constant (runs first, before other plugins)
@@ -41,19 +41,17 @@ class Plugin(BasePlugin):
         """
         Log a Meshtastic packet after removing raw binary fields.
 
-        Strips raw binary fields from `packet` for readability and logs the sanitized packet at debug level. The other parameters are accepted for compatibility but are not used. This plugin does not intercept the message.
+        Logs the shared raw-stripped view of `packet` at debug level without modifying the packet itself. The other parameters are accepted for compatibility but are not used. This plugin does not intercept the message.
 
         Parameters:
-            packet: The received Meshtastic packet; raw binary fields will be removed before logging.
+            packet: The received Meshtastic packet; raw binary fields are omitted from the logged copy.
 
         Returns:
             `True` if the message is intercepted, `False` otherwise.
         """
         # Keep parameter names for compatibility with keyword calls in tests.
         _ = formatted_message, longname, meshnet_name
-        packet = self.strip_raw(packet)
-
-        self.logger.debug("Packet received: %s", packet)
+        self.logger.debug("Packet received: %s", self.get_packet_view(packet).stripped)
         return False
 
     async def handle_room_message(
@@ -10,11 +10,12 @@ from nio import (
     RoomMessageText,
 )
 
-from mmrelay.constants.database import DEFAULT_DISTANCE_KM_FALLBACK, DEFAULT_RADIUS_KM
+from mmrelay.constants.database import DEFAULT_RADIUS_KM
 from mmrelay.constants.formats import TEXT_MESSAGE_APP
 from mmrelay.constants.plugins import SPECIAL_NODE_MESSAGES
 from mmrelay.meshtastic_utils import connect_meshtastic
 from mmrelay.plugins.base_plugin import BasePlugin
+from mmrelay.spatial_index import GeohashIndex
 
 if TYPE_CHECKING:
     from meshtastic.mesh_interface import MeshInterface
@@ -25,8 +26,14 @@ class Plugin(BasePlugin):
     is_core_plugin = True
     special_node = SPECIAL_NODE_MESSAGES
 
-    # No __init__ method needed with the simplified plugin system
-    # The BasePlugin will automatically use the class-level plugin_name
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        super().__init__(*args, **kwargs)
+        # Stored drops, loaded once and then kept in step with every write this
+        # plugin makes. Keys are increasing ids, so iteration follows storage order.
+        self._drops: dict[int, dict[str, Any]] = {}
+        self._drops_loaded = False
+        self._drop_index: GeohashIndex[int] = GeohashIndex()
+        self._next_drop_id = 0
 
     def get_position(
         self, meshtastic_client: "MeshInterface", node_id: str
@@ -34,6 +41,9 @@ class Plugin(BasePlugin):
         """
         Retrieve the geographic position for a Meshtastic node by its node ID.
 
+        The node database is keyed by node ID, so the node is looked up
+        directly; the list is only scanned when the key does not match.
+
         Parameters:
             meshtastic_client (MeshInterface): Connected Meshtastic client containing node information.
             node_id (str): The node's user ID to look up.
@@ -41,15 +51,56 @@ class Plugin(BasePlugin):
         Returns:
             position (dict[str, Any] | None): The node's `position` dictionary (typically containing latitude and longitude) if the node is found and has position data; `None` if the node is not found or has no `position`.
         """
-        if meshtastic_client.nodes:
-            for _node, info in meshtastic_client.nodes.items():
-                if info["user"]["id"] == node_id:
-                    if "position" in info:
-                        pos: dict[str, Any] = info["position"]
-                        return pos
-                    else:
-                        return None
-        return None
+        nodes = meshtastic_client.nodes
+        if not nodes:
+            return None
+        info = nodes.get(node_id)
+        if not isinstance(info, dict) or info.get("user", {}).get("id") != node_id:
+            info = next(
+                (
+                    candidate
+                    for candidate in nodes.values()
+                    if candidate["user"]["id"] == node_id
+                ),
+                None,
+            )
+        if info is None or "position" not in info:
+            return None
+        pos: dict[str, Any] = info["position"]
+        return pos
+
+    def _load_drops(self) -> dict[int, dict[str, Any]]:
+        """
+        Return the drops, reading them from storage and indexing them on first use.
+
+        This plugin is the only writer of the drop list, so after the first load
+        the in-memory drops are the source of truth and storage is only written
+        when a drop is added or picked up.
+        """
+        if not self._drops_loaded:
+            data = self.get_node_data(self.special_node)
+            messages = data if isinstance(data, list) else [data] if data else []
+            self._drops_loaded = True
+            for message in messages:
+                self._track_drop(message)
+        return self._drops
+
+    def _track_drop(self, message: dict[str, Any]) -> None:
+        """Add a drop and index its location; drops without a valid location are kept but never delivered."""
+        drop_id = self._next_drop_id
+        self._next_drop_id += 1
+        self._drops[drop_id] = message
+        location = message.get("location") if isinstance(message, dict) else None
+        if not isinstance(location, (list, tuple)) or len(location) != 2:
+            return
+        latitude, longitude = location
+        # Storage round-trips locations as lists; keep them as tuples in memory.
+        message["location"] = (latitude, longitude)
+        self._drop_index.add(drop_id, latitude, longitude)
+
+    def _forget_drop(self, drop_id: int) -> None:
+        self._drops.pop(drop_id, None)
+        self._drop_index.discard(drop_id)
 
     async def handle_meshtastic_message(
         self,
@@ -87,38 +138,36 @@ class Plugin(BasePlugin):
                 )
 
                 self.logger.debug(f"Packet originates from: {packet_location}")
-                data = self.get_node_data(self.special_node)
-                messages: list[dict[str, Any]] = (
-                    data if isinstance(data, list) else [data] if data else []
+                drops = self._load_drops()
+                radius_km = self.config.get("radius_km", DEFAULT_RADIUS_KM)
+                nearby = self._drop_index.query_radius(
+                    packet_location[0],
+                    packet_location[1],
+                    radius_km,
+                    distance=haversine,
                 )
-                unsent_messages: list[dict[str, Any]] = []
-                for message in messages:
+                picked_up = False
+                for drop_id, _distance_km in sorted(nearby):
+                    message = drops[drop_id]
                     # You cannot pickup what you dropped
-                    if "originator" in message and message["originator"] == from_id:
-                        unsent_messages.append(message)
+                    if message.get("originator") == from_id:
                         continue
-
-                    try:
-                        distance_km = haversine(
-                            (packet_location[0], packet_location[1]),
-                            message["location"],
+                    target_node = from_id
+                    self.logger.debug(f"Sending dropped message to {target_node}")
+                    self.send_message(
+                        text=message["text"],
+                        destination_id=target_node,
+                    )
+                    self._forget_drop(drop_id)
+                    picked_up = True
+                if picked_up:
+                    unsent_messages = list(drops.values())
+                    self.set_node_data(self.special_node, unsent_messages)
+                    total_unsent_messages = len(unsent_messages)
+                    if total_unsent_messages > 0:
+                        self.logger.debug(
+                            f"{total_unsent_messages} message(s) remaining"
                         )
-                    except (ValueError, TypeError):
-                        distance_km = DEFAULT_DISTANCE_KM_FALLBACK
-                    radius_km = self.config.get("radius_km", DEFAULT_RADIUS_KM)
-                    if distance_km <= radius_km:
-                        target_node = from_id
-                        self.logger.debug(f"Sending dropped message to {target_node}")
-                        self.send_message(
-                            text=message["text"],
-                            destination_id=target_node,
-                        )
-                    else:
-                        unsent_messages.append(message)
-                self.set_node_data(self.special_node, unsent_messages)
-                total_unsent_messages = len(unsent_messages)
-                if total_unsent_messages > 0:
-                    self.logger.debug(f"{total_unsent_messages} message(s) remaining")
 
         # Attempt to drop a message
         if (
@@ -153,14 +202,17 @@ class Plugin(BasePlugin):
                 )
                 return True
 
-            self.store_node_data(
-                self.special_node,
-                {
-                    "location": (position["latitude"], position["longitude"]),
-                    "text": drop_message,
-                    "originator": dropping_from_id,
-                },
-            )
+            drop = {
+                "location": (position["latitude"], position["longitude"]),
+                "text": drop_message,
+                "originator": dropping_from_id,
+            }
+            self.store_node_data(self.special_node, drop)
+            if self._drops_loaded:
+                self._track_drop(drop)
+                # Mirror the trimming store_node_data applies to the stored list.
+                while len(self._drops) > self.max_data_rows_per_node:
+                    self._forget_drop(next(iter(self._drops)))
             self.logger.debug(f"Dropped a message: {drop_message}")
             return True
 
@@ -1,5 +1,4 @@
 import asyncio
-import statistics
 from typing import TYPE_CHECKING, Any
 
 # matrix-nio is not marked py.typed; keep import-untyped for strict mypy.
@@ -23,6 +22,7 @@ if TYPE_CHECKING:
 
 class Plugin(BasePlugin):
     plugin_name = "health"
+    meshtastic_portnums: frozenset[str] = frozenset()
     is_core_plugin = True
 
     @property
@@ -53,62 +53,63 @@ class Plugin(BasePlugin):
                 - "No nodes discovered yet." if the client has no discovered nodes.
                 - "Nodes: <count>\nNo nodes with health metrics found." if nodes exist but none report any tracked metrics.
         """
-        from mmrelay.meshtastic_utils import connect_meshtastic
+        from mmrelay.meshtastic_utils import (
+            connect_meshtastic,
+            get_node_metrics_store,
+        )
 
         meshtastic_client: MeshInterface | None = connect_meshtastic()
         if meshtastic_client is None:
             logger.warning("Failed to connect to Meshtastic device for health check")
             return "Unable to connect to Meshtastic device."
-        battery_levels = []
-        air_util_tx = []
-        snr = []
 
         if not meshtastic_client.nodes:
             return "No nodes discovered yet."
 
-        for _node, info in meshtastic_client.nodes.items():
-            if "deviceMetrics" in info:
-                if "batteryLevel" in info["deviceMetrics"]:
-                    battery_levels.append(info["deviceMetrics"]["batteryLevel"])
-                if "airUtilTx" in info["deviceMetrics"]:
-                    air_util_tx.append(info["deviceMetrics"]["airUtilTx"])
-            if "snr" in info:
-                snr.append(info["snr"])
+        # The store keeps the aggregates up to date as packets arrive, so a
+        # repeated command is answered from the cached text.
+        store = get_node_metrics_store()
+        store.bind(meshtastic_client.nodes)
+        return store.cached_render(
+            self.plugin_name, lambda: self._format_summary(store.summary())
+        )
+
+    @staticmethod
+    def _format_summary(summary: dict[str, Any]) -> str:
+        """
+        Format node metrics aggregates as the health response.
+
+        Parameters:
+            summary (dict[str, Any]): Aggregates as returned by `NodeMetricsStore.summary`.
 
-        # filter out None values from metrics just in case
-        battery_levels = [value for value in battery_levels if value is not None]
-        air_util_tx = [value for value in air_util_tx if value is not None]
-        snr = [value for value in snr if value is not None]
+        Returns:
+            str: The multi-line health summary described in `generate_response`.
+        """
+        radios = summary["nodes"]
+        battery = summary["battery"]
+        air_util_tx = summary["air_util_tx"]
+        snr = summary["snr"]
 
         # Check if any health metrics are available
-        if not battery_levels and not air_util_tx and not snr:
-            radios = len(meshtastic_client.nodes)
+        if battery is None and air_util_tx is None and snr is None:
             return f"Nodes: {radios}\nNo nodes with health metrics found."
 
-        low_battery = len(
-            [n for n in battery_levels if n <= LOW_BATTERY_THRESHOLD_PERCENT]
-        )
-        radios = len(meshtastic_client.nodes)
-        avg_battery = statistics.mean(battery_levels) if battery_levels else 0
-        mdn_battery = statistics.median(battery_levels) if battery_levels else 0
-        avg_air = statistics.mean(air_util_tx) if air_util_tx else 0
-        mdn_air = statistics.median(air_util_tx) if air_util_tx else 0
-        avg_snr = statistics.mean(snr) if snr else 0
-        mdn_snr = statistics.median(snr) if snr else 0
-
         # Format metrics conditionally
-        if air_util_tx:
+        if air_util_tx is not None:
+            avg_air, mdn_air = air_util_tx
             air_util_line = f"Air Util: {avg_air:.2f} / {mdn_air:.2f} (avg / median)"
         else:
             air_util_line = "Air Util: N/A"
 
-        if snr:
+        if snr is not None:
+            avg_snr, mdn_snr = snr
             snr_line = f"SNR: {avg_snr:.2f} / {mdn_snr:.2f} (avg / median)"
         else:
             snr_line = "SNR: N/A"
 
         # Format battery conditionally
-        if battery_levels:
+        if battery is not None:
+            avg_battery, mdn_battery = battery
             battery_line = (
                 f"Battery: {avg_battery:.1f}% / {mdn_battery:.1f}% (avg / median)"
             )
@@ -117,7 +118,7 @@ class Plugin(BasePlugin):
 
         return f"""Nodes: {radios}
  {battery_line}
- Nodes with Low Battery (<= {LOW_BATTERY_THRESHOLD_PERCENT}%): {low_battery}
+ Nodes with Low Battery (<= {LOW_BATTERY_THRESHOLD_PERCENT}%): {summary["low_battery"]}
  {air_util_line}
  {snr_line}"""
 
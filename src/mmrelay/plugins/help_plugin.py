@@ -34,6 +34,7 @@ class Plugin(BasePlugin):
 
     is_core_plugin = True
     plugin_name = "help"
+    meshtastic_portnums: frozenset[str] = frozenset()
 
     @property
     def description(self) -> str:
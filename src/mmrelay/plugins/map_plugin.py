@@ -421,6 +421,7 @@ class Plugin(BasePlugin):
 
     is_core_plugin = True
     plugin_name = "map"
+    meshtastic_portnums: frozenset[str] = frozenset()
 
     def __init__(self) -> None:
         """
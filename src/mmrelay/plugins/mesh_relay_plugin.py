@@ -26,6 +26,7 @@ from mmrelay.constants.formats import (
     MATRIX_SUPPRESS_KEY,
 )
 from mmrelay.constants.plugins import MESH_PACKET_DEFAULT_ID, PROCESSED_PACKET_REGEX
+from mmrelay.meshtastic.packet_view import PacketView
 from mmrelay.plugins.base_plugin import BasePlugin, config
 
 
@@ -139,7 +140,7 @@ class Plugin(BasePlugin):
         """
         Relay a Meshtastic packet to the configured Matrix room for its channel.
 
-        Normalizes and prepares the incoming Meshtastic packet and, if the packet's channel is mapped in the plugin configuration, sends a Matrix message that contains a JSON-serialized `meshtastic_packet` and a marker (`mmrelay_suppress`) identifying it as a bridged packet.
+        Uses the shared `PacketView` (raw fields stripped, binary payload base64-encoded, JSON cached) for dict packets, normalizing other inputs first, and, if the packet's channel is mapped in the plugin configuration, sends a Matrix message that contains a JSON-serialized `meshtastic_packet` and a marker (`mmrelay_suppress`) identifying it as a bridged packet.
 
         Parameters:
             packet: Raw Meshtastic packet (dict, JSON string, or other) to be normalized and relayed.
@@ -160,7 +161,14 @@ class Plugin(BasePlugin):
             self.logger.error("Matrix client is None; skipping mesh relay to Matrix")
             return False
 
-        packet = self.process(packet)
+        # Reuse the shared view so the packet is stripped and serialized once and
+        # the caller's dict is left untouched; other inputs are normalized first.
+        packet_view = (
+            self.get_packet_view(packet)
+            if isinstance(packet, dict)
+            else PacketView(self.process(packet))
+        )
+        packet = packet_view.transport
         decoded = packet.get("decoded", {})
         packet_type = decoded.get("portnum")
         if packet_type is None:
@@ -192,7 +200,7 @@ class Plugin(BasePlugin):
             content={
                 "msgtype": "m.text",
                 MATRIX_SUPPRESS_KEY: True,
-                MATRIX_PACKET_KEY: json.dumps(packet),
+                MATRIX_PACKET_KEY: packet_view.json,
                 "body": FORMAT_PROCESSED_PACKET.format(packet_type=packet_type),
             },
         )
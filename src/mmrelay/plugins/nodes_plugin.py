@@ -19,6 +19,7 @@ from mmrelay.constants.domain import (
     UNKNOWN_NODE_VALUE,
 )
 from mmrelay.constants.formats import DATE_FORMAT_LONG, SNR_UNIT_SUFFIX
+from mmrelay.constants.plugins import NODES_RESPONSE_MAX_AGE_SECS
 from mmrelay.log_utils import get_logger
 from mmrelay.plugins.base_plugin import BasePlugin
 
@@ -75,6 +76,7 @@ def get_relative_time(timestamp: float) -> str:
 
 class Plugin(BasePlugin):
     plugin_name = "nodes"
+    meshtastic_portnums: frozenset[str] = frozenset()
     is_core_plugin = True
 
     @property
@@ -101,16 +103,41 @@ $shortname $longname / $devicemodel / $battery $voltage / $snr / $hops / $lastse
         Returns:
             response (str): The multi-line nodes summary or an error message when no Meshtastic client is available.
         """
-        from mmrelay.meshtastic_utils import connect_meshtastic
+        from mmrelay.meshtastic_utils import (
+            connect_meshtastic,
+            get_node_metrics_store,
+        )
 
         meshtastic_client = connect_meshtastic()
         if meshtastic_client is None:
             return "Unable to connect to Meshtastic device."
 
+        # Served from the cache until a shown field changes; the age limit
+        # keeps the relative last-heard times reasonably fresh.
+        nodes = meshtastic_client.nodes
+        store = get_node_metrics_store()
+        store.bind(nodes)
+        return store.cached_render(
+            self.plugin_name,
+            lambda: self._format_nodes(nodes),
+            max_age=NODES_RESPONSE_MAX_AGE_SECS,
+        )
+
+    @staticmethod
+    def _format_nodes(nodes: dict[str, Any]) -> str:
+        """
+        Format the nodes response for a NodeDB.
+
+        Parameters:
+            nodes (dict[str, Any]): The interface's NodeDB.
+
+        Returns:
+            str: The multi-line nodes summary described in `generate_response`.
+        """
         node_lines: list[str] = []
         valid_node_count = 0
 
-        for _node, info in meshtastic_client.nodes.items():
+        for _node, info in nodes.items():
             if not isinstance(info, dict):
                 continue
 
@@ -59,6 +59,7 @@ def match_case(source: str, target: str) -> str:
 
 class Plugin(BasePlugin):
     plugin_name = "ping"
+    meshtastic_portnums = frozenset({TEXT_MESSAGE_APP})
     is_core_plugin = True
     _invalid_mimic_mode_warned: bool = False
 
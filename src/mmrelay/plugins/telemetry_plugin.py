@@ -32,6 +32,7 @@ from mmrelay.plugins.base_plugin import BasePlugin
 
 class Plugin(BasePlugin):
     plugin_name = "telemetry"
+    meshtastic_portnums = frozenset({TELEMETRY_APP_PORTNUM})
     is_core_plugin = True
     max_data_rows_per_node = TELEMETRY_MAX_DATA_ROWS
 
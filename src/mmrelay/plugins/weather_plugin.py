@@ -1,6 +1,7 @@
 import asyncio
 import math
 import re
+import time
 from datetime import datetime
 from typing import Any
 
@@ -42,14 +43,20 @@ from mmrelay.constants.plugins import (
     OPEN_METEO_HOURLY_FIELDS,
     OPEN_METEO_TIMEZONE_AUTO,
     WEATHER_API_TIMEOUT_SECONDS,
+    WEATHER_CACHE_COORD_DECIMALS,
+    WEATHER_CACHE_TTL_SECONDS,
     WEATHER_CODE_TEXT_MAPPING,
     WEATHER_COMMANDS,
+    WEATHER_GEOCODE_CACHE_KEY_PREFIX,
+    WEATHER_GEOCODE_CACHE_MAX_AGE_SECONDS,
+    WEATHER_GEOCODE_CACHE_MAX_ENTRIES,
     WEATHER_MODE_CURRENT,
     WEATHER_MODE_DAILY,
     WEATHER_SLOT_NOW,
     WEATHER_UNITS_IMPERIAL,
     WEATHER_UNITS_METRIC,
 )
+from mmrelay.http_client import CachedHttpClient
 from mmrelay.plugins.base_plugin import BasePlugin
 
 CANONICAL_WEATHER_MODE = WEATHER_MODE_CURRENT
@@ -57,6 +64,7 @@ CANONICAL_WEATHER_MODE = WEATHER_MODE_CURRENT
 
 class Plugin(BasePlugin):
     plugin_name = "weather"
+    meshtastic_portnums = frozenset({TEXT_MESSAGE_APP})
     is_core_plugin = True
     mesh_commands = WEATHER_COMMANDS
 
@@ -64,6 +72,9 @@ class Plugin(BasePlugin):
         super().__init__(*args, **kwargs)
         self._command_aliases: dict[str, str] = {}
         self._load_command_aliases()
+        self._http = CachedHttpClient(
+            ttl=WEATHER_CACHE_TTL_SECONDS, timeout=WEATHER_API_TIMEOUT_SECONDS
+        )
 
     def _load_command_aliases(self) -> None:
         """Load and validate command aliases from plugin config."""
@@ -107,6 +118,19 @@ class Plugin(BasePlugin):
             return cmd
         return CANONICAL_WEATHER_MODE
 
+    @staticmethod
+    def _cache_coords(latitude: float, longitude: float) -> tuple[float, float]:
+        """
+        Round coordinates for use in a response cache key.
+
+        Requests from nearby positions share a cache entry, so a burst of
+        commands from one area results in a single upstream call.
+        """
+        return (
+            round(latitude, WEATHER_CACHE_COORD_DECIMALS),
+            round(longitude, WEATHER_CACHE_COORD_DECIMALS),
+        )
+
     def generate_marine_forecast(
         self,
         latitude: float,
@@ -179,9 +203,15 @@ class Plugin(BasePlugin):
                     f"timezone=auto&length_unit={units}"
                 )
 
-            response = requests.get(url, timeout=WEATHER_API_TIMEOUT_SECONDS)
-            response.raise_for_status()
-            data = response.json()
+            data = self._http.get_json(
+                url,
+                cache_key=(
+                    "marine",
+                    *self._cache_coords(latitude, longitude),
+                    mode_key,
+                    units,
+                ),
+            )
 
             if mode_key == WEATHER_MODE_DAILY:
                 return self._format_daily_marine(data, units)
@@ -391,15 +421,22 @@ class Plugin(BasePlugin):
         )
 
         try:
-            response = requests.get(url, timeout=WEATHER_API_TIMEOUT_SECONDS)
-            response.raise_for_status()
+            data = self._http.get_json(
+                url,
+                cache_key=(
+                    "forecast",
+                    *self._cache_coords(latitude, longitude),
+                    daily_days,
+                ),
+            )
+        except ValueError:
+            self.logger.exception("Malformed weather data")
+            return "Error parsing weather data."
         except requests.exceptions.RequestException:
             self.logger.exception("Error fetching weather data")
             return "Error fetching weather data."
 
         try:
-            data = response.json()
-
             # Daily fast-path - check before parsing current/hourly data
             if mode_key == WEATHER_MODE_DAILY:
                 terrestrial_forecast = self._build_daily_forecast(
@@ -784,7 +821,7 @@ class Plugin(BasePlugin):
             "channel", DEFAULT_CHANNEL
         )  # Default to channel 0 if not provided
 
-        from mmrelay.meshtastic_utils import connect_meshtastic
+        from mmrelay.meshtastic_utils import connect_meshtastic, lookup_node
 
         meshtastic_client = await asyncio.to_thread(connect_meshtastic)
         if meshtastic_client is None:
@@ -825,14 +862,16 @@ class Plugin(BasePlugin):
         )
 
         fromId = packet.get("fromId")
-        if not fromId or fromId not in meshtastic_client.nodes:
+        # The saved NodeDB snapshot answers for nodes not yet streamed after a reconnect.
+        cached_node = lookup_node(fromId, meshtastic_client) if fromId else None
+        if cached_node is None:
             self.logger.debug("Ignoring weather request from unknown node: %s", fromId)
             return True  # Unknown node, treat as handled without responding
 
         coords = await self._resolve_location_from_args(arg_text)
 
         if coords is None:
-            requesting_node = meshtastic_client.nodes.get(fromId)
+            requesting_node = cached_node.node
             if (
                 requesting_node
                 and "position" in requesting_node
@@ -1120,7 +1159,10 @@ class Plugin(BasePlugin):
         """
         Resolve a free-form location string to geographic coordinates using the Open-Meteo geocoding API.
 
-        Queries the Open-Meteo geocoding endpoint and returns the first result's latitude and longitude as floats.
+        Successful lookups are kept in the plugin's database, so each place name
+        is only sent to the geocoding endpoint once per
+        `WEATHER_GEOCODE_CACHE_MAX_AGE_SECONDS`; past
+        `WEATHER_GEOCODE_CACHE_MAX_ENTRIES` stored names the oldest are pruned.
 
         Returns:
             tuple[float, float] | None: A (latitude, longitude) pair as floats if a result is found, `None` otherwise.
@@ -1128,34 +1170,78 @@ class Plugin(BasePlugin):
         if not query:
             return None
 
+        cache_key = WEATHER_GEOCODE_CACHE_KEY_PREFIX + " ".join(query.lower().split())
+        cached = self._get_cached_geocode(cache_key)
+        if cached is not None:
+            return cached
+
         url = OPEN_METEO_GEOCODING_API_URL
         try:
-            response = requests.get(
+            payload = self._http.get_json(
                 url,
                 params={
                     "name": query,
                     "count": str(GEOCODING_RESULT_COUNT),
                     "format": "json",
                 },
-                timeout=WEATHER_API_TIMEOUT_SECONDS,
+                cache_key=cache_key,
             )
-            response.raise_for_status()
+        except ValueError:
+            self.logger.exception("Malformed geocoding response")
+            return None
         except requests.exceptions.RequestException:
             self.logger.exception("Error geocoding location")
             return None
 
         try:
-            payload = response.json()
             results = payload.get("results") or []
             if not results:
                 return None
             first = results[0]
             lat = first.get("latitude")
             lon = first.get("longitude")
-        except (ValueError, TypeError, KeyError):
+        except (ValueError, TypeError, KeyError, AttributeError):
             self.logger.exception("Malformed geocoding response")
             return None
         else:
             if isinstance(lat, (int, float)) and isinstance(lon, (int, float)):
-                return float(lat), float(lon)
+                coords = (float(lat), float(lon))
+                self.set_node_data(
+                    cache_key,
+                    {
+                        "latitude": coords[0],
+                        "longitude": coords[1],
+                        "cached_at": time.time(),
+                    },
+                )
+                self.prune_node_data(
+                    WEATHER_GEOCODE_CACHE_KEY_PREFIX, WEATHER_GEOCODE_CACHE_MAX_ENTRIES
+                )
+                return coords
+            return None
+
+    def _get_cached_geocode(self, cache_key: str) -> tuple[float, float] | None:
+        """
+        Look up a previously stored geocoding result.
+
+        Parameters:
+            cache_key (str): Normalized query key, as built by `_geocode_location`.
+
+        Returns:
+            tuple[float, float] | None: The stored (latitude, longitude), or None if the query has not been resolved within `WEATHER_GEOCODE_CACHE_MAX_AGE_SECONDS`.
+        """
+        stored = self.get_node_data(cache_key)
+        entry = stored[-1] if isinstance(stored, list) and stored else stored
+        if not isinstance(entry, dict):
+            return None
+        cached_at = entry.get("cached_at")
+        if (
+            not isinstance(cached_at, (int, float))
+            or time.time() - cached_at > WEATHER_GEOCODE_CACHE_MAX_AGE_SECONDS
+        ):
             return None
+        lat = entry.get("latitude")
+        lon = entry.get("longitude")
+        if isinstance(lat, (int, float)) and isinstance(lon, (int, float)):
+            return float(lat), float(lon)
+        return None
@@ -0,0 +1,639 @@
+"""
+Record, generate, and replay Meshtastic traffic for load testing.
+
+Recordings are compact JSON Lines files (optionally gzip-compressed) holding
+sanitized packets as emitted on the ``meshtastic.receive`` pubsub topic, each
+tagged with its offset from the start of the capture. Synthetic traffic can be
+generated across any number of virtual nodes. Replays drive the real
+``on_meshtastic_message`` handler, plugins, message queue, and database
+against an in-process fake radio and stub Matrix homeserver, then report
+throughput and drop counters.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import base64
+import contextlib
+import copy
+import gzip
+import json
+import random
+import threading
+import time
+from collections import Counter
+from collections.abc import Iterable, Iterator, Mapping
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import IO, TYPE_CHECKING, Any, Literal, NamedTuple
+
+from meshtastic import BROADCAST_NUM
+
+from mmrelay.constants.config import (
+    CONFIG_KEY_MESHNET_NAME,
+    CONFIG_SECTION_DATABASE,
+    CONFIG_SECTION_MATRIX_ROOMS,
+    CONFIG_SECTION_MESHTASTIC,
+)
+from mmrelay.constants.replay import (
+    DEFAULT_REPLAY_DRAIN_TIMEOUT_SECS,
+    DEFAULT_REPLAY_SPEED,
+    DEFAULT_SYNTHETIC_INTERVAL_SECS,
+    DEFAULT_SYNTHETIC_NODE_COUNT,
+    DEFAULT_SYNTHETIC_PACKET_COUNT,
+    DEFAULT_SYNTHETIC_TRAFFIC_MIX,
+    REPLAY_BYTES_MARKER,
+    REPLAY_FORMAT_NAME,
+    REPLAY_FORMAT_VERSION,
+    REPLAY_GZIP_SUFFIX,
+    REPLAY_SPEED_UNTHROTTLED,
+    SYNTHETIC_MATRIX_ROOM_ID,
+    SYNTHETIC_MESHNET_NAME,
+    SYNTHETIC_NODE_NUM_BASE,
+    SYNTHETIC_TRAFFIC_KINDS,
+)
+from mmrelay.log_utils import get_logger
+
+if TYPE_CHECKING:
+    from mmrelay.testing import FakeMeshtasticInterface, StubMatrixClient
+
+__all__ = [
+    "PacketRecorder",
+    "RecordedPacket",
+    "ReplayFormatError",
+    "ReplayStats",
+    "generate_synthetic_traffic",
+    "load_recording",
+    "run_replay",
+    "sanitize_packet",
+    "write_recording",
+]
+
+logger = get_logger(name="Replay")
+
+
+class ReplayFormatError(ValueError):
+    """Raised when a recording file is missing its header or is malformed."""
+
+
+class RecordedPacket(NamedTuple):
+    """A sanitized packet and its offset (seconds) from the start of a capture."""
+
+    offset: float
+    packet: dict[str, Any]
+
+
+# ---------------------------------------------------------------------- #
+# Sanitization and file format
+# ---------------------------------------------------------------------- #
+
+
+def _sanitize_value(value: Any) -> Any:
+    if isinstance(value, Mapping):
+        return {
+            str(key): _sanitize_value(item)
+            for key, item in value.items()
+            if key != "raw"
+        }
+    if isinstance(value, (list, tuple)):
+        return [_sanitize_value(item) for item in value]
+    if isinstance(value, (bytes, bytearray, memoryview)):
+        return {REPLAY_BYTES_MARKER: base64.b64encode(bytes(value)).decode("ascii")}
+    if value is None or isinstance(value, (str, int, float, bool)):
+        return value
+    # Protobuf messages and other library objects are not replayable.
+    return str(value)
+
+
+def _restore_value(value: Any) -> Any:
+    if isinstance(value, dict):
+        if len(value) == 1 and REPLAY_BYTES_MARKER in value:
+            return base64.b64decode(value[REPLAY_BYTES_MARKER])
+        return {key: _restore_value(item) for key, item in value.items()}
+    if isinstance(value, list):
+        return [_restore_value(item) for item in value]
+    return value
+
+
+def sanitize_packet(packet: Mapping[str, Any]) -> dict[str, Any]:
+    """
+    Return a JSON-serializable copy of a Meshtastic packet suitable for recording.
+
+    Protobuf ``raw`` entries are dropped, bytes are base64-wrapped so they can
+    be restored on load, and any other non-JSON object is stringified. The
+    input packet is never mutated.
+    """
+    return _sanitize_value(packet)  # type: ignore[no-any-return]
+
+
+def _open_recording(path: str, mode: Literal["r", "w"]) -> IO[str]:
+    if path.endswith(REPLAY_GZIP_SUFFIX):
+        if mode == "w":
+            return gzip.open(path, "wt", encoding="utf-8")
+        return gzip.open(path, "rt", encoding="utf-8")
+    return open(path, mode, encoding="utf-8")
+
+
+def _encode_record(record: RecordedPacket) -> str:
+    return json.dumps(
+        [round(record.offset, 6), sanitize_packet(record.packet)],
+        separators=(",", ":"),
+    )
+
+
+def write_recording(path: str, packets: Iterable[RecordedPacket]) -> int:
+    """
+    Write packets to a recording file, gzip-compressed when `path` ends in ``.gz``.
+
+    Returns:
+        int: Number of packets written.
+    """
+    count = 0
+    with _open_recording(path, "w") as handle:
+        handle.write(
+            json.dumps({"format": REPLAY_FORMAT_NAME, "version": REPLAY_FORMAT_VERSION})
+            + "\n"
+        )
+        for record in packets:
+            handle.write(_encode_record(record) + "\n")
+            count += 1
+    return count
+
+
+def iter_recording(path: str) -> Iterator[RecordedPacket]:
+    """
+    Lazily yield packets from a recording file written by `write_recording` or `PacketRecorder`.
+
+    Raises:
+        ReplayFormatError: If the header is missing or a line cannot be decoded.
+    """
+    with _open_recording(path, "r") as handle:
+        header_line = handle.readline()
+        try:
+            header = json.loads(header_line) if header_line.strip() else None
+        except json.JSONDecodeError as exc:
+            raise ReplayFormatError(f"Invalid recording header in {path}") from exc
+        if not isinstance(header, dict) or header.get("format") != REPLAY_FORMAT_NAME:
+            raise ReplayFormatError(f"{path} is not an {REPLAY_FORMAT_NAME} file")
+        if header.get("version") != REPLAY_FORMAT_VERSION:
+            raise ReplayFormatError(
+                f"Unsupported recording version {header.get('version')!r} in {path}"
+            )
+        for line_number, line in enumerate(handle, start=2):
+            if not line.strip():
+                continue
+            try:
+                offset, packet = json.loads(line)
+                yield RecordedPacket(float(offset), _restore_value(packet))
+            except (json.JSONDecodeError, TypeError, ValueError) as exc:
+                raise ReplayFormatError(
+                    f"Malformed record on line {line_number} of {path}"
+                ) from exc
+
+
+def load_recording(path: str) -> list[RecordedPacket]:
+    """Load every packet from a recording file into memory."""
+    return list(iter_recording(path))
+
+
+class PacketRecorder:
+    """
+    Capture sanitized packets from the ``meshtastic.receive`` pubsub topic to a recording file.
+
+    The recorder subscribes its own listener, so it can run alongside the
+    relay's normal receive callback without affecting it.
+    """
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        self.packet_count = 0
+        self._lock = threading.Lock()
+        self._handle: IO[str] | None = None
+        self._started_monotonic = 0.0
+
+    def start(self) -> None:
+        """Open the output file, write the header, and subscribe to received packets."""
+        from pubsub import pub
+
+        with self._lock:
+            if self._handle is not None:
+                return
+            self._handle = _open_recording(self.path, "w")
+            self._handle.write(
+                json.dumps(
+                    {"format": REPLAY_FORMAT_NAME, "version": REPLAY_FORMAT_VERSION}
+                )
+                + "\n"
+            )
+            self._started_monotonic = time.monotonic()
+        pub.subscribe(self.on_receive, "meshtastic.receive")
+
+    def on_receive(self, packet: dict[str, Any], interface: Any = None) -> None:
+        """Pubsub listener: append one packet with its capture offset."""
+        del interface
+        if not isinstance(packet, Mapping):
+            return
+        with self._lock:
+            if self._handle is None:
+                return
+            offset = time.monotonic() - self._started_monotonic
+            self._handle.write(_encode_record(RecordedPacket(offset, dict(packet))))
+            self._handle.write("\n")
+            self.packet_count += 1
+
+    def stop(self) -> None:
+        """Unsubscribe from the topic and close the output file."""
+        from pubsub import pub
+
+        with contextlib.suppress(Exception):
+            pub.unsubscribe(self.on_receive, "meshtastic.receive")
+        with self._lock:
+            if self._handle is not None:
+                self._handle.close()
+                self._handle = None
+
+
+# ---------------------------------------------------------------------- #
+# Synthetic traffic
+# ---------------------------------------------------------------------- #
+
+
+def _node_id(node_num: int) -> str:
+    return f"!{node_num:08x}"
+
+
+def _synthetic_user(index: int, node_num: int) -> dict[str, Any]:
+    return {
+        "id": _node_id(node_num),
+        "longName": f"Replay Node {index:04d}",
+        "shortName": f"R{index % 1000:03d}",
+        "hwModel": "TBEAM",
+    }
+
+
+def _build_synthetic_packet(
+    kind: str, index: int, node_num: int, packet_id: int, rng: random.Random
+) -> dict[str, Any]:
+    packet: dict[str, Any] = {
+        "from": node_num,
+        "fromId": _node_id(node_num),
+        "to": BROADCAST_NUM,
+        "toId": "^all",
+        "id": packet_id,
+        "channel": 0,
+        "hopLimit": rng.randint(1, 3),
+        "rxSnr": round(rng.uniform(-15.0, 10.0), 2),
+        "rxRssi": rng.randint(-120, -40),
+    }
+    if kind == "text":
+        text = f"replay message {packet_id} from node {index}"
+        packet["decoded"] = {
+            "portnum": "TEXT_MESSAGE_APP",
+            "payload": text.encode("utf-8"),
+            "text": text,
+        }
+    elif kind == "telemetry":
+        packet["decoded"] = {
+            "portnum": "TELEMETRY_APP",
+            "telemetry": {
+                "time": int(time.time()),
+                "deviceMetrics": {
+                    "batteryLevel": rng.randint(5, 101),
+                    "voltage": round(rng.uniform(3.3, 4.2), 3),
+                    "channelUtilization": round(rng.uniform(0.0, 40.0), 2),
+                    "airUtilTx": round(rng.uniform(0.0, 10.0), 2),
+                },
+            },
+        }
+    elif kind == "position":
+        packet["decoded"] = {
+            "portnum": "POSITION_APP",
+            "position": {
+                "latitude": round(rng.uniform(-60.0, 60.0), 6),
+                "longitude": round(rng.uniform(-179.0, 179.0), 6),
+                "altitude": rng.randint(0, 2000),
+                "time": int(time.time()),
+            },
+        }
+    elif kind == "nodeinfo":
+        packet["decoded"] = {
+            "portnum": "NODEINFO_APP",
+            "user": _synthetic_user(index, node_num),
+        }
+    elif kind == "encrypted":
+        packet["encrypted"] = rng.randbytes(32)
+    else:
+        raise ValueError(f"Unknown synthetic traffic kind: {kind!r}")
+    return packet
+
+
+def generate_synthetic_traffic(
+    *,
+    node_count: int = DEFAULT_SYNTHETIC_NODE_COUNT,
+    packet_count: int = DEFAULT_SYNTHETIC_PACKET_COUNT,
+    mix: Mapping[str, float] | None = None,
+    interval_secs: float = DEFAULT_SYNTHETIC_INTERVAL_SECS,
+    seed: int | None = None,
+) -> list[RecordedPacket]:
+    """
+    Generate a reproducible mix of mesh traffic from `node_count` virtual nodes.
+
+    Parameters:
+        node_count (int): Number of distinct virtual sender nodes.
+        packet_count (int): Total number of packets to generate.
+        mix (Mapping[str, float] | None): Relative weights per traffic kind
+            (text, telemetry, position, nodeinfo, encrypted). Defaults to
+            DEFAULT_SYNTHETIC_TRAFFIC_MIX.
+        interval_secs (float): Mean spacing between packets; actual gaps are
+            exponentially distributed to mimic bursty traffic.
+        seed (int | None): Seed for deterministic output.
+
+    Returns:
+        list[RecordedPacket]: Packets ordered by offset.
+
+    Raises:
+        ValueError: If counts are not positive or the mix names an unknown kind.
+    """
+    if node_count < 1:
+        raise ValueError("node_count must be at least 1")
+    if packet_count < 0:
+        raise ValueError("packet_count must not be negative")
+    weights = dict(mix if mix is not None else DEFAULT_SYNTHETIC_TRAFFIC_MIX)
+    unknown_kinds = set(weights) - set(SYNTHETIC_TRAFFIC_KINDS)
+    if unknown_kinds:
+        raise ValueError(f"Unknown traffic kinds in mix: {sorted(unknown_kinds)}")
+    kinds = [kind for kind, weight in weights.items() if weight > 0]
+    if not kinds:
+        raise ValueError("Traffic mix must contain at least one positive weight")
+
+    rng = random.Random(seed)
+    kind_weights = [weights[kind] for kind in kinds]
+    offset = 0.0
+    packets: list[RecordedPacket] = []
+    for sequence in range(packet_count):
+        index = rng.randrange(node_count)
+        kind = rng.choices(kinds, weights=kind_weights)[0]
+        packet = _build_synthetic_packet(
+            kind,
+            index,
+            SYNTHETIC_NODE_NUM_BASE + index,
+            packet_id=sequence + 1,
+            rng=rng,
+        )
+        packets.append(RecordedPacket(offset, packet))
+        if interval_secs > 0:
+            offset += rng.expovariate(1.0 / interval_secs)
+    return packets
+
+
+# ---------------------------------------------------------------------- #
+# Replay driver
+# ---------------------------------------------------------------------- #
+
+
+@dataclass
+class ReplayStats:
+    """Throughput and drop counters collected during a replay run."""
+
+    packets_total: int = 0
+    packets_dispatched: int = 0
+    handler_errors: int = 0
+    matrix_sends: int = 0
+    mesh_sends: int = 0
+    queue_dropped: int = 0
+    routing: Counter[str] = field(default_factory=Counter)
+    portnums: Counter[str] = field(default_factory=Counter)
+    elapsed_secs: float = 0.0
+    drained: bool = True
+
+    @property
+    def packets_per_second(self) -> float:
+        if self.elapsed_secs <= 0:
+            return 0.0
+        return self.packets_dispatched / self.elapsed_secs
+
+    def as_dict(self) -> dict[str, Any]:
+        return {
+            "packets_total": self.packets_total,
+            "packets_dispatched": self.packets_dispatched,
+            "handler_errors": self.handler_errors,
+            "matrix_sends": self.matrix_sends,
+            "mesh_sends": self.mesh_sends,
+            "queue_dropped": self.queue_dropped,
+            "routing": dict(self.routing),
+            "portnums": dict(self.portnums),
+            "elapsed_secs": round(self.elapsed_secs, 3),
+            "packets_per_second": round(self.packets_per_second, 1),
+            "drained": self.drained,
+        }
+
+
+def build_replay_config(
+    base_config: Mapping[str, Any] | None = None,
+    *,
+    database_path: str | None = None,
+) -> dict[str, Any]:
+    """
+    Derive a replay-safe configuration from `base_config`.
+
+    Ensures a meshtastic section with a meshnet name and at least one
+    channel-0 room mapping exist, and points the database at `database_path`
+    when given so replays never write into the live relay database.
+    """
+    config: dict[str, Any] = copy.deepcopy(dict(base_config or {}))
+    meshtastic_section = config.setdefault(CONFIG_SECTION_MESHTASTIC, {})
+    meshtastic_section.setdefault(CONFIG_KEY_MESHNET_NAME, SYNTHETIC_MESHNET_NAME)
+    if not config.get(CONFIG_SECTION_MATRIX_ROOMS):
+        config[CONFIG_SECTION_MATRIX_ROOMS] = [
+            {"id": SYNTHETIC_MATRIX_ROOM_ID, "meshtastic_channel": 0}
+        ]
+    if database_path is not None:
+        database_section = config.setdefault(CONFIG_SECTION_DATABASE, {})
+        database_section["path"] = database_path
+    return config
+
+
+def _room_ids_from_config(config: Mapping[str, Any]) -> list[str]:
+    rooms = config.get(CONFIG_SECTION_MATRIX_ROOMS) or []
+    if isinstance(rooms, Mapping):
+        rooms = list(rooms.values())
+    return [
+        str(room["id"]) for room in rooms if isinstance(room, Mapping) and "id" in room
+    ]
+
+
+@contextlib.contextmanager
+def _replay_runtime(
+    config: dict[str, Any],
+    interface: FakeMeshtasticInterface,
+    matrix_client: StubMatrixClient,
+    loop: asyncio.AbstractEventLoop,
+) -> Iterator[None]:
+    """Install replay state on the relay facades and restore it afterwards."""
+    from mmrelay import db_utils, matrix_utils, meshtastic_utils, plugin_loader
+
+    replay_mesh = {
+        "config": config,
+        "matrix_rooms": config[CONFIG_SECTION_MATRIX_ROOMS],
+        "meshtastic_client": interface,
+        "_relay_active_client_id": id(interface),
+        "event_loop": loop,
+        # rxTime has whole-second resolution; truncate so same-second packets pass.
+        "RELAY_START_TIME": float(int(time.time())),
+        "_relay_rx_time_clock_skew_secs": None,
+    }
+    replay_matrix = {
+        "config": config,
+        "matrix_rooms": config[CONFIG_SECTION_MATRIX_ROOMS],
+        "matrix_client": matrix_client,
+        "bot_user_id": matrix_client.user_id,
+    }
+    overrides = [
+        (meshtastic_utils, replay_mesh),
+        (matrix_utils, replay_matrix),
+        (db_utils, {"config": config}),
+        (plugin_loader, {"config": config}),
+    ]
+    # The facade globals are declared as None, so swap them through setattr.
+    saved = [
+        (module, {name: getattr(module, name) for name in values})
+        for module, values in overrides
+    ]
+    for module, values in overrides:
+        for name, value in values.items():
+            setattr(module, name, value)
+    db_utils.clear_db_path_cache()
+    try:
+        yield
+    finally:
+        db_utils._reset_db_manager()
+        for module, values in saved:
+            for name, value in values.items():
+                setattr(module, name, value)
+        db_utils.clear_db_path_cache()
+
+
+async def _wait_for_pending_tasks(
+    loop: asyncio.AbstractEventLoop, baseline: set[asyncio.Task[Any]], timeout: float
+) -> bool:
+    deadline = time.monotonic() + timeout
+    current = asyncio.current_task()
+    while True:
+        pending = [
+            task
+            for task in asyncio.all_tasks(loop)
+            if task is not current and task not in baseline and not task.done()
+        ]
+        if not pending:
+            return True
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            return False
+        await asyncio.wait(pending, timeout=remaining)
+
+
+async def run_replay(
+    packets: Iterable[RecordedPacket],
+    *,
+    config: Mapping[str, Any] | None = None,
+    speed: float = DEFAULT_REPLAY_SPEED,
+    interface: FakeMeshtasticInterface | None = None,
+    matrix_client: StubMatrixClient | None = None,
+    drain_timeout: float = DEFAULT_REPLAY_DRAIN_TIMEOUT_SECS,
+) -> ReplayStats:
+    """
+    Replay packets through the real receive pipeline and collect counters.
+
+    Each packet is handed to ``on_meshtastic_message`` on a dedicated worker
+    thread, mirroring the Meshtastic reader thread, with ``rxTime`` rewritten
+    to the current time so session-start filtering does not discard it.
+
+    Parameters:
+        packets (Iterable[RecordedPacket]): Packets to replay, in offset order.
+        config (Mapping[str, Any] | None): Relay configuration; see
+            `build_replay_config` for the defaults applied.
+        speed (float): Playback speed multiplier; 1.0 preserves recorded
+            timing, larger values accelerate, and 0 replays as fast as possible.
+        interface (FakeMeshtasticInterface | None): Fake radio to use.
+        matrix_client (StubMatrixClient | None): Stub homeserver client to use.
+        drain_timeout (float): Seconds to wait for in-flight Matrix relays and
+            queued mesh sends after the last packet is dispatched.
+
+    Returns:
+        ReplayStats: Throughput, routing, and drop counters for the run.
+    """
+    from mmrelay.db_utils import initialize_database
+    from mmrelay.meshtastic.packet_routing import _get_portnum_name, classify_packet
+    from mmrelay.meshtastic_utils import on_meshtastic_message
+    from mmrelay.message_queue import get_message_queue, start_message_queue
+    from mmrelay.plugin_loader import load_plugins
+    from mmrelay.testing import FakeMeshtasticInterface, StubMatrixClient
+
+    if speed < 0:
+        raise ValueError("speed must not be negative")
+
+    replay_config = build_replay_config(config)
+    fake_interface = interface or FakeMeshtasticInterface()
+    stub_client = matrix_client or StubMatrixClient(
+        _room_ids_from_config(replay_config)
+    )
+    loop = asyncio.get_running_loop()
+    stats = ReplayStats()
+    sends_before = len(stub_client.sent_events)
+    mesh_sends_before = len(fake_interface.sent_messages)
+
+    def _dispatch(packet: dict[str, Any]) -> bool:
+        try:
+            on_meshtastic_message(packet, fake_interface)
+        except Exception:
+            logger.exception("Replay handler raised for packet %s", packet.get("id"))
+            return False
+        return True
+
+    reader = ThreadPoolExecutor(max_workers=1, thread_name_prefix="mmrelay-replay")
+    with _replay_runtime(replay_config, fake_interface, stub_client, loop):
+        await asyncio.to_thread(initialize_database)
+        await loop.run_in_executor(reader, load_plugins, replay_config)
+        queue = get_message_queue()
+        queue_started_here = not queue.is_running() and start_message_queue(
+            message_delay=0.0
+        )
+        dropped_before = queue.get_status().get("dropped_messages", 0)
+        # Snapshot after the queue processor starts so only relay work is awaited.
+        baseline_tasks = set(asyncio.all_tasks(loop))
+        started = time.monotonic()
+        try:
+            for record in packets:
+                stats.packets_total += 1
+                if speed != REPLAY_SPEED_UNTHROTTLED:
+                    delay = started + record.offset / speed - time.monotonic()
+                    if delay > 0:
+                        await asyncio.sleep(delay)
+                packet = copy.deepcopy(record.packet)
+                packet["rxTime"] = int(time.time())
+                decoded = packet.get("decoded")
+                portnum = decoded.get("portnum") if isinstance(decoded, dict) else None
+                stats.portnums[_get_portnum_name(portnum, packet)] += 1
+                stats.routing[classify_packet(portnum, replay_config, packet)] += 1
+                if await loop.run_in_executor(reader, _dispatch, packet):
+                    stats.packets_dispatched += 1
+                else:
+                    stats.handler_errors += 1
+            stats.drained = await _wait_for_pending_tasks(
+                loop, baseline_tasks, drain_timeout
+            )
+            if queue.is_running():
+                stats.drained = (
+                    await queue.drain(timeout=drain_timeout) and stats.drained
+                )
+            stats.elapsed_secs = time.monotonic() - started
+        finally:
+            stats.queue_dropped = (
+                queue.get_status().get("dropped_messages", 0) - dropped_before
+            )
+            if queue_started_here:
+                queue.stop()
+            reader.shutdown(wait=True)
+    stats.matrix_sends = len(stub_client.sent_events) - sends_before
+    stats.mesh_sends = len(fake_interface.sent_messages) - mesh_sends_before
+    return stats
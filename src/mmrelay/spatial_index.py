@@ -0,0 +1,246 @@
+"""
+Geohash-bucketed spatial index for radius queries on stored positions.
+
+Points are grouped into geohash cells of a fixed precision. A radius query
+visits only the cells that overlap the query circle's bounding box and then
+refines the candidates with the exact haversine distance, so its cost
+depends on the number of points near the query rather than on the total.
+"""
+
+import math
+from collections.abc import Callable, Hashable, Iterator
+from typing import Any, Generic, TypeVar
+
+from mmrelay.constants.database import (
+    EARTH_MEAN_RADIUS_KM,
+    SPATIAL_INDEX_GEOHASH_PRECISION,
+)
+
+__all__ = ["GeohashIndex", "geohash_encode", "haversine_km"]
+
+_GEOHASH_ALPHABET = "0123456789bcdefghjkmnpqrstuvwxyz"
+
+Point = tuple[float, float]
+K = TypeVar("K", bound=Hashable)
+
+
+def haversine_km(point1: Point, point2: Point) -> float:
+    """
+    Return the great-circle distance between two (latitude, longitude) points.
+
+    Parameters:
+        point1 (tuple[float, float]): First point in decimal degrees.
+        point2 (tuple[float, float]): Second point in decimal degrees.
+
+    Returns:
+        float: Distance in kilometers.
+    """
+    lat1, lon1 = math.radians(point1[0]), math.radians(point1[1])
+    lat2, lon2 = math.radians(point2[0]), math.radians(point2[1])
+    a = (
+        math.sin((lat2 - lat1) / 2) ** 2
+        + math.cos(lat1) * math.cos(lat2) * math.sin((lon2 - lon1) / 2) ** 2
+    )
+    return 2 * EARTH_MEAN_RADIUS_KM * math.asin(min(1.0, math.sqrt(a)))
+
+
+def _bit_counts(precision: int) -> tuple[int, int]:
+    """Return the (latitude, longitude) bit counts of a geohash of `precision` characters."""
+    bits = 5 * precision
+    return bits // 2, (bits + 1) // 2
+
+
+def _cell_index(value: float, low: float, span: float, cells: int) -> int:
+    return min(cells - 1, max(0, int((value - low) / span * cells)))
+
+
+def _geohash_from_cell(lat_index: int, lon_index: int, precision: int) -> str:
+    """Interleave the cell indices (longitude first) into a base32 geohash."""
+    lat_bits, lon_bits = _bit_counts(precision)
+    code = 0
+    for position in range(5 * precision):
+        if position % 2 == 0:
+            lon_bits -= 1
+            bit = (lon_index >> lon_bits) & 1
+        else:
+            lat_bits -= 1
+            bit = (lat_index >> lat_bits) & 1
+        code = (code << 1) | bit
+    return "".join(
+        _GEOHASH_ALPHABET[(code >> shift) & 0x1F]
+        for shift in range(5 * (precision - 1), -1, -5)
+    )
+
+
+def geohash_encode(
+    latitude: float, longitude: float, precision: int = SPATIAL_INDEX_GEOHASH_PRECISION
+) -> str:
+    """
+    Encode a position as a geohash.
+
+    Parameters:
+        latitude (float): Latitude in decimal degrees.
+        longitude (float): Longitude in decimal degrees.
+        precision (int): Number of geohash characters.
+
+    Returns:
+        str: The geohash of the cell containing the position.
+    """
+    lat_bits, lon_bits = _bit_counts(precision)
+    return _geohash_from_cell(
+        _cell_index(latitude, -90.0, 180.0, 1 << lat_bits),
+        _cell_index(longitude, -180.0, 360.0, 1 << lon_bits),
+        precision,
+    )
+
+
+class GeohashIndex(Generic[K]):
+    """
+    Map of keys of type `K` to positions that answers radius queries.
+
+    Keys are added and removed one at a time, so the index can be kept in
+    step with the collection it describes. Not thread-safe.
+    """
+
+    def __init__(self, precision: int = SPATIAL_INDEX_GEOHASH_PRECISION) -> None:
+        """
+        Parameters:
+            precision (int): Geohash length of the buckets; pick cells about the size of typical query radii.
+        """
+        self.precision = precision
+        self._lat_cells = 1 << _bit_counts(precision)[0]
+        self._lon_cells = 1 << _bit_counts(precision)[1]
+        self._buckets: dict[str, dict[K, Point]] = {}
+        self._cells: dict[K, str] = {}
+
+    def __len__(self) -> int:
+        return len(self._cells)
+
+    def __contains__(self, key: object) -> bool:
+        return key in self._cells
+
+    def add(self, key: K, latitude: Any, longitude: Any) -> bool:
+        """
+        Add or move `key` to a position.
+
+        Parameters:
+            key (K): Identifier of the point.
+            latitude (Any): Latitude in decimal degrees.
+            longitude (Any): Longitude in decimal degrees.
+
+        Returns:
+            bool: `True` if the point was indexed, `False` if the coordinates are not a valid position (any previous position of `key` is removed either way).
+        """
+        self.discard(key)
+        try:
+            lat = float(latitude)
+            lon = float(longitude)
+        except (TypeError, ValueError):
+            return False
+        if not (-90.0 <= lat <= 90.0 and -180.0 <= lon <= 180.0):
+            return False
+        cell = _geohash_from_cell(
+            _cell_index(lat, -90.0, 180.0, self._lat_cells),
+            _cell_index(lon, -180.0, 360.0, self._lon_cells),
+            self.precision,
+        )
+        self._buckets.setdefault(cell, {})[key] = (lat, lon)
+        self._cells[key] = cell
+        return True
+
+    def discard(self, key: K) -> None:
+        """Remove `key` from the index if present."""
+        cell = self._cells.pop(key, None)
+        if cell is None:
+            return
+        bucket = self._buckets[cell]
+        del bucket[key]
+        if not bucket:
+            del self._buckets[cell]
+
+    def clear(self) -> None:
+        """Remove all points."""
+        self._buckets.clear()
+        self._cells.clear()
+
+    def _cells_near(self, lat: float, lon: float, radius_km: float) -> list[str] | None:
+        """
+        List the cells overlapping the bounding box of a query circle.
+
+        Returns:
+            list[str] | None: Geohashes to visit, or None when scanning every bucket is cheaper.
+        """
+        angular = radius_km / EARTH_MEAN_RADIUS_KM
+        lat_lo = math.degrees(math.radians(lat) - angular)
+        lat_hi = math.degrees(math.radians(lat) + angular)
+        lat_range = range(
+            _cell_index(lat_lo, -90.0, 180.0, self._lat_cells),
+            _cell_index(lat_hi, -90.0, 180.0, self._lat_cells) + 1,
+        )
+
+        # Exact longitude extent of the circle; it covers every longitude
+        # once the circle reaches a pole.
+        cos_lat = math.cos(math.radians(lat))
+        if lat_lo <= -90.0 or lat_hi >= 90.0 or math.sin(angular) >= cos_lat:
+            lon_indices: range | list[int] = range(self._lon_cells)
+        else:
+            delta = math.degrees(math.asin(math.sin(angular) / cos_lat))
+            first = math.floor((lon - delta + 180.0) / 360.0 * self._lon_cells)
+            last = math.floor((lon + delta + 180.0) / 360.0 * self._lon_cells)
+            if last - first + 1 >= self._lon_cells:
+                lon_indices = range(self._lon_cells)
+            else:
+                lon_indices = [
+                    index % self._lon_cells for index in range(first, last + 1)
+                ]
+
+        if len(lat_range) * len(lon_indices) > len(self._buckets):
+            return None
+        return [
+            _geohash_from_cell(lat_index, lon_index, self.precision)
+            for lat_index in lat_range
+            for lon_index in lon_indices
+        ]
+
+    def candidates(
+        self, latitude: float, longitude: float, radius_km: float
+    ) -> Iterator[tuple[K, Point]]:
+        """
+        Yield the points in cells that may lie within `radius_km` of a position.
+
+        The result is a superset of the matches; use `query_radius` for exact results.
+        """
+        cells = self._cells_near(latitude, longitude, radius_km)
+        if cells is None:
+            buckets = list(self._buckets.values())
+        else:
+            buckets = [self._buckets[cell] for cell in cells if cell in self._buckets]
+        for bucket in buckets:
+            yield from bucket.items()
+
+    def query_radius(
+        self,
+        latitude: float,
+        longitude: float,
+        radius_km: float,
+        distance: Callable[[Point, Point], float] = haversine_km,
+    ) -> list[tuple[K, float]]:
+        """
+        Find the points within `radius_km` of a position.
+
+        Parameters:
+            latitude (float): Query latitude in decimal degrees.
+            longitude (float): Query longitude in decimal degrees.
+            radius_km (float): Search radius in kilometers.
+            distance (Callable[[Point, Point], float]): Great-circle distance function used for the refine step.
+
+        Returns:
+            list[tuple[K, float]]: ``(key, distance_km)`` for every matching point, in no particular order.
+        """
+        origin = (latitude, longitude)
+        matches: list[tuple[K, float]] = []
+        for key, point in self.candidates(latitude, longitude, radius_km):
+            distance_km = distance(origin, point)
+            if distance_km <= radius_km:
+                matches.append((key, distance_km))
+        return matches
@@ -0,0 +1,144 @@
+"""
+In-process fakes of a Meshtastic radio and a Matrix homeserver.
+
+These drive ``mmrelay replay run`` without hardware or network access and are
+also used by the test suite. Nothing in the relay runtime imports this module.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import threading
+import time
+from collections import Counter
+from collections.abc import Iterable
+from types import SimpleNamespace
+from typing import Any, NamedTuple
+
+from mmrelay.constants.replay import (
+    DEFAULT_SYNTHETIC_NODE_COUNT,
+    SYNTHETIC_MATRIX_USER_ID,
+    SYNTHETIC_NODE_NUM_BASE,
+    SYNTHETIC_RELAY_NODE_NUM,
+)
+from mmrelay.replay import _node_id, _synthetic_user
+
+__all__ = [
+    "FakeMeshtasticInterface",
+    "StubMatrixClient",
+]
+
+
+class FakeMeshtasticInterface:
+    """
+    Minimal stand-in for a Meshtastic interface used as the replay target.
+
+    Provides ``myInfo``, a ``nodes`` NodeDB for `node_count` virtual nodes, and
+    a ``sendText`` that records outbound messages instead of transmitting.
+    """
+
+    def __init__(
+        self,
+        node_count: int = DEFAULT_SYNTHETIC_NODE_COUNT,
+        *,
+        my_node_num: int = SYNTHETIC_RELAY_NODE_NUM,
+    ) -> None:
+        self.myInfo = SimpleNamespace(my_node_num=my_node_num)
+        self.localNode = SimpleNamespace(nodeNum=my_node_num)
+        self.nodes: dict[str, dict[str, Any]] = {}
+        for index in range(node_count):
+            node_num = SYNTHETIC_NODE_NUM_BASE + index
+            self.nodes[_node_id(node_num)] = {
+                "num": node_num,
+                "user": _synthetic_user(index, node_num),
+                "lastHeard": int(time.time()),
+            }
+        self.sent_messages: list[dict[str, Any]] = []
+        self._send_lock = threading.Lock()
+        self._next_packet_id = 1
+
+    def sendText(self, text: str, *args: Any, **kwargs: Any) -> SimpleNamespace:
+        """Record an outbound text send and return a packet-like object with an id."""
+        with self._send_lock:
+            packet_id = self._next_packet_id
+            self._next_packet_id += 1
+            self.sent_messages.append(
+                {"id": packet_id, "text": text, "args": args, "kwargs": kwargs}
+            )
+        return SimpleNamespace(id=packet_id)
+
+    def sendData(self, data: Any, *args: Any, **kwargs: Any) -> SimpleNamespace:
+        """Record an outbound data send and return a packet-like object with an id."""
+        return self.sendText(repr(data), *args, **kwargs)
+
+    def getMyNodeInfo(self) -> dict[str, Any]:
+        return {"num": self.myInfo.my_node_num}
+
+    def close(self) -> None:
+        return None
+
+
+class _StubSendResponse(NamedTuple):
+    event_id: str
+    room_id: str
+
+
+class StubMatrixClient:
+    """
+    In-process stand-in for a Matrix homeserver connection.
+
+    Accepts ``room_send`` calls for any known room, assigns sequential event
+    IDs, and tracks per-room delivery counts and send latency.
+    """
+
+    def __init__(
+        self,
+        room_ids: Iterable[str],
+        *,
+        user_id: str = SYNTHETIC_MATRIX_USER_ID,
+        send_latency_secs: float = 0.0,
+    ) -> None:
+        self.user_id = user_id
+        self.e2ee_enabled = False
+        self.rooms: dict[str, SimpleNamespace] = {
+            room_id: SimpleNamespace(
+                room_id=room_id, display_name=room_id, encrypted=False
+            )
+            for room_id in room_ids
+        }
+        self.send_latency_secs = send_latency_secs
+        self.sent_events: list[dict[str, Any]] = []
+        self.sends_by_room: Counter[str] = Counter()
+
+    async def room_send(
+        self,
+        room_id: str,
+        message_type: str,
+        content: dict[str, Any],
+        tx_id: str | None = None,
+        ignore_unverified_devices: bool = False,
+    ) -> _StubSendResponse:
+        del tx_id, ignore_unverified_devices
+        if self.send_latency_secs > 0:
+            await asyncio.sleep(self.send_latency_secs)
+        event_id = f"$replay{len(self.sent_events) + 1}"
+        self.sent_events.append(
+            {
+                "room_id": room_id,
+                "type": message_type,
+                "content": content,
+                "event_id": event_id,
+            }
+        )
+        self.sends_by_room[room_id] += 1
+        return _StubSendResponse(event_id=event_id, room_id=room_id)
+
+    async def join(self, room_id: str) -> SimpleNamespace:
+        self.rooms.setdefault(
+            room_id,
+            SimpleNamespace(room_id=room_id, display_name=room_id, encrypted=False),
+        )
+        return SimpleNamespace(room_id=room_id)
+
+    async def close(self) -> None:
+        return None
@@ -563,6 +563,7 @@ def reset_meshtastic_globals():
         "_pending_connect_time_probe_timer": getattr(
             mu, "_pending_connect_time_probe_timer", None
         ),
+        "_fragment_flush_timer": getattr(mu, "_fragment_flush_timer", None),
         "_relay_startup_drain_complete_event": getattr(
             mu, "_relay_startup_drain_complete_event", None
         ),
@@ -640,6 +641,8 @@ def reset_meshtastic_globals():
     pending_connect_probe_timer = getattr(mu, "_pending_connect_time_probe_timer", None)
     _cancel_and_join_timer_like(pending_connect_probe_timer, timeout=0.2)
     mu._pending_connect_time_probe_timer = None
+    _cancel_and_join_timer_like(getattr(mu, "_fragment_flush_timer", None), timeout=0.2)
+    mu._fragment_flush_timer = None
     startup_drain_complete_event = getattr(
         mu, "_relay_startup_drain_complete_event", None
     )
@@ -701,6 +704,10 @@ def reset_meshtastic_globals():
         )
         _cancel_and_join_timer_like(pending_connect_probe_timer, timeout=0.2)
         mu._pending_connect_time_probe_timer = None
+        _cancel_and_join_timer_like(
+            getattr(mu, "_fragment_flush_timer", None), timeout=0.2
+        )
+        mu._fragment_flush_timer = None
         mu.reconnect_task = None
         mu.reconnect_task_future = None
         mu._metadata_future = None
@@ -7,7 +7,9 @@ Intended to be imported by tests/conftest.py (which re-exports symbols).
 """
 
 import sys
-from types import ModuleType
+import threading
+from types import ModuleType, SimpleNamespace
+from typing import Any
 from unittest.mock import MagicMock
 
 
@@ -227,6 +229,13 @@ class MockSyncError(Exception):
         self.soft_logout = soft_logout
 
 
+class MockUploadResponse:
+    """Mock UploadResponse carrying the uploaded media's ``mxc://`` URI."""
+
+    def __init__(self, content_uri: str) -> None:
+        self.content_uri = content_uri
+
+
 nio_mock.AsyncClientConfig = MagicMock()
 nio_mock.MatrixRoom = MockMatrixRoom
 nio_mock.ReactionEvent = MockReactionEvent
@@ -235,7 +244,7 @@ nio_mock.RoomMessageNotice = MockRoomMessageNotice
 nio_mock.RoomMessageText = MockRoomMessageText
 nio_mock.RoomEncryptionEvent = MockRoomEncryptionEvent
 nio_mock.MegolmEvent = MockMegolmEvent
-nio_mock.UploadResponse = MagicMock()
+nio_mock.UploadResponse = MockUploadResponse
 nio_mock.WhoamiError = MockWhoamiError
 nio_mock.SyncError = MockSyncError
 
@@ -291,6 +300,35 @@ nio_mock.RoomMemberEvent = MockRoomMemberEvent
 sys.modules["nio.events.room_events"].RoomMemberEvent = MockRoomMemberEvent
 
 
+# ── Meshtastic interface mock ─────────────────────────────────────────
+
+
+class MockMeshtasticInterface:
+    """
+    Fake Meshtastic radio with a node number, a connection flag and recorded sends.
+
+    ``isConnected`` is a real ``threading.Event`` like the library's, so tests
+    can drop and restore the connection with ``clear()`` and ``set()``.
+    """
+
+    def __init__(self, my_node_num: int = 0x12345678, connected: bool = True) -> None:
+        self.myInfo = SimpleNamespace(my_node_num=my_node_num)
+        self.nodes: dict[str, dict[str, Any]] = {}
+        self.isConnected = threading.Event()
+        if connected:
+            self.isConnected.set()
+        self.sent_texts: list[str] = []
+        self.closed = False
+
+    def sendText(self, text: str, *args: object, **kwargs: object) -> SimpleNamespace:
+        self.sent_texts.append(text)
+        return SimpleNamespace(id=len(self.sent_texts))
+
+    def close(self) -> None:
+        self.closed = True
+        self.isConnected.clear()
+
+
 # ── PIL mock ──────────────────────────────────────────────────────────
 
 
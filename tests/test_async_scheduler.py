@@ -0,0 +1,337 @@
+"""Tests for the asyncio plugin scheduler, driven by a fake clock."""
+
+import asyncio
+import logging
+import random
+from unittest.mock import patch
+
+import pytest
+
+import mmrelay.plugin_loader as pl
+from mmrelay.async_scheduler import AsyncScheduler, JobBuilder, TimerWheel
+from mmrelay.constants.plugins import (
+    SCHEDULE_MISSED_RUNS_CATCH_UP,
+    SCHEDULE_MISSED_RUNS_SKIP,
+    SCHEDULER_MAX_CATCH_UP_RUNS,
+)
+from mmrelay.plugins.base_plugin import BasePlugin
+
+TICK = 0.1
+
+
+class FakeClock:
+    """Monotonic clock that only moves when a test advances it."""
+
+    def __init__(self, now: float = 1000.0) -> None:
+        self.now = now
+
+    def __call__(self) -> float:
+        return self.now
+
+    def advance(self, seconds: float) -> None:
+        self.now += seconds
+
+
+@pytest.fixture
+def clock():
+    return FakeClock()
+
+
+@pytest.fixture
+def scheduler(clock):
+    return AsyncScheduler(clock=clock, tick_seconds=TICK, rng=random.Random(7))
+
+
+async def _step(scheduler, clock, seconds):
+    """Advance the fake clock, start due jobs and let them run to completion."""
+    clock.advance(seconds)
+    started = scheduler.run_due()
+    for _ in range(5):
+        await asyncio.sleep(0)
+    return started
+
+
+def test_timer_wheel_matches_sorted_deadlines():
+    rng = random.Random(3)
+    wheel = TimerWheel(slots=8, levels=3)
+    deadlines = {key: rng.randrange(1, 2000) for key in range(300)}
+    for key, deadline in deadlines.items():
+        wheel.add(key, deadline)
+
+    fired = []
+    for tick in range(0, 2100, 37):
+        for key in wheel.advance(tick):
+            assert deadlines[key] <= tick
+            fired.append(key)
+
+    assert sorted(fired) == sorted(deadlines)
+    assert [deadlines[key] for key in fired] == sorted(deadlines.values())
+    assert len(wheel) == 0
+
+
+async def test_jobs_fire_within_one_tick_and_stay_on_grid(scheduler, clock):
+    fired_at = []
+    start = clock.now
+
+    async def job():
+        fired_at.append(clock.now)
+
+    scheduler.schedule(job, 2.5)
+    # 1/16 s steps add up exactly, so the bounds below are not blurred by rounding.
+    for _ in range(170):
+        await _step(scheduler, clock, 0.0625)
+
+    assert len(fired_at) == 4
+    for run, when in enumerate(fired_at, start=1):
+        assert start + run * 2.5 <= when < start + run * 2.5 + TICK
+    assert scheduler.next_run_delay() == pytest.approx(12.5 - 10.625, abs=TICK)
+
+
+async def test_sync_jobs_run_in_a_worker_thread(scheduler, clock):
+    calls = []
+    job = scheduler.schedule(lambda: calls.append("ran"), 1)
+
+    await _step(scheduler, clock, 1)
+    await job.task
+
+    assert calls == ["ran"]
+    assert job.runs == 1
+
+
+async def test_jitter_delays_runs_within_bounds(scheduler, clock):
+    start = clock.now
+    jobs = [scheduler.schedule(lambda: None, 10, jitter=3) for _ in range(20)]
+
+    offsets = [job.next_run - (start + 10) for job in jobs]
+    assert all(0 <= offset <= 3 for offset in offsets)
+    assert len(set(offsets)) > 1
+
+    await _step(scheduler, clock, 10)
+    assert all(job.runs == 0 for job in jobs if job.next_run > clock.now)
+    # Jitter never moves the interval grid itself.
+    await _step(scheduler, clock, 3.1)
+    assert all(job.due == start + 20 for job in jobs)
+
+
+@pytest.mark.parametrize(
+    ("policy", "expected_runs", "expected_skipped"),
+    [
+        (SCHEDULE_MISSED_RUNS_SKIP, 0, 3),
+        ("run_once", 1, 0),
+        (SCHEDULE_MISSED_RUNS_CATCH_UP, 3, 0),
+    ],
+)
+async def test_missed_run_policies(
+    scheduler, clock, policy, expected_runs, expected_skipped
+):
+    start = clock.now
+    job = scheduler.schedule(lambda: None, 5, missed_runs=policy)
+
+    # The loop was blocked (or the host suspended) through three run slots.
+    clock.advance(19.5)
+    scheduler.run_due()
+    if job.task is not None:
+        await job.task
+
+    assert job.runs == expected_runs
+    assert job.skipped_runs == expected_skipped
+    assert job.due == start + 20
+
+
+async def test_catch_up_is_capped(scheduler, clock):
+    job = scheduler.schedule(lambda: None, 1, missed_runs=SCHEDULE_MISSED_RUNS_CATCH_UP)
+
+    clock.advance(SCHEDULER_MAX_CATCH_UP_RUNS + 5)
+    scheduler.run_due()
+    await job.task
+
+    assert job.runs == SCHEDULER_MAX_CATCH_UP_RUNS
+    assert job.skipped_runs == 5
+
+
+async def test_slow_job_times_out_and_never_overlaps(scheduler, clock, caplog):
+    release = asyncio.Event()
+    started = []
+
+    async def slow():
+        started.append(clock.now)
+        await release.wait()
+
+    job = scheduler.schedule(slow, 1, tag="slow", timeout=0.01)
+    await _step(scheduler, clock, 1)
+    await _step(scheduler, clock, 1)
+    assert len(started) == 1
+    assert job.skipped_runs == 1
+
+    with caplog.at_level(logging.WARNING, logger="Scheduler"):
+        await job.task
+
+    assert "Scheduled job slow timed out" in caplog.text
+    assert job.runs == 1
+    await _step(scheduler, clock, 1)
+    assert len(started) == 2
+    release.set()
+
+
+async def test_failing_job_is_logged_and_rescheduled(scheduler, clock, caplog):
+    async def broken():
+        raise RuntimeError("boom")
+
+    job = scheduler.schedule(broken, 1, tag="broken")
+    with caplog.at_level(logging.ERROR, logger="Scheduler"):
+        await _step(scheduler, clock, 1)
+        await _step(scheduler, clock, 1)
+
+    assert job.runs == 2
+    assert caplog.text.count("Scheduled job broken failed") == 2
+
+
+def test_schedule_rejects_invalid_arguments(scheduler):
+    for kwargs in (
+        {"interval": 0},
+        {"interval": True},
+        {"interval": 1, "jitter": -1},
+        {"interval": 1, "timeout": 0},
+        {"interval": 1, "missed_runs": "later"},
+    ):
+        with pytest.raises(ValueError):
+            scheduler.schedule(lambda: None, **kwargs)
+    assert scheduler.jobs() == []
+
+
+async def test_cancel_tag_and_shutdown_cancel_running_jobs(scheduler, clock):
+    cancelled = []
+
+    async def forever():
+        try:
+            await asyncio.Event().wait()
+        except asyncio.CancelledError:
+            cancelled.append(True)
+            raise
+
+    scheduler.start()
+    scheduler.schedule(forever, 1, tag="a")
+    scheduler.schedule(forever, 1, tag="b")
+    await _step(scheduler, clock, 1)
+
+    assert scheduler.cancel_tag("a") == 1
+    await asyncio.sleep(0)
+    assert cancelled == [True]
+    assert [job.tag for job in scheduler.jobs()] == ["b"]
+
+    await scheduler.shutdown()
+
+    assert cancelled == [True, True]
+    assert scheduler.jobs() == []
+    assert not scheduler.running
+
+
+async def test_driver_runs_jobs_on_the_real_clock():
+    scheduler = AsyncScheduler(tick_seconds=0.01)
+    fired = asyncio.Event()
+
+    async def job():
+        fired.set()
+
+    scheduler.start()
+    scheduler.schedule(job, 0.02)
+    await asyncio.wait_for(fired.wait(), 2)
+    await scheduler.shutdown()
+
+
+def test_job_builder_at_aligns_to_wall_clock(scheduler, clock):
+    # 12:34:50 local time, 10 seconds before the next ":35"-style slot.
+    with patch("mmrelay.async_scheduler.time.time", return_value=50.0):
+        with patch(
+            "mmrelay.async_scheduler.time.localtime",
+            return_value=type("T", (), {"tm_min": 34, "tm_sec": 50})(),
+        ):
+            job = JobBuilder(scheduler, 1).hours.at("35:00").do(lambda: None)
+            minutely = JobBuilder(scheduler, 1).minutes.at(":20").do(lambda: None)
+
+    assert job.due == pytest.approx(clock.now + 10)
+    assert job.interval == 3600
+    assert minutely.due == pytest.approx(clock.now + 30)
+
+    for spec in ("25", "61:00", ":60", "10:30:00"):
+        with pytest.raises(ValueError):
+            JobBuilder(scheduler, 1).hours.at(spec)
+    with pytest.raises(ValueError):
+        JobBuilder(scheduler, 1).seconds.at(":10")
+    with pytest.raises(ValueError):
+        JobBuilder(scheduler, 0)
+
+
+class ScheduledPlugin(BasePlugin):
+    plugin_name = "scheduled_test_plugin"
+    is_core_plugin = False
+
+    async def background_job(self):
+        self.runs.append(self.generation)
+
+    async def handle_meshtastic_message(
+        self, packet, formatted_message, longname, meshnet_name
+    ) -> bool:
+        return False
+
+    async def handle_room_message(self, room, event, full_message) -> bool:
+        return False
+
+
+async def test_plugin_reload_does_not_leak_jobs(monkeypatch):
+    monkeypatch.setattr(
+        pl,
+        "config",
+        {
+            "plugins": {
+                "scheduled_test_plugin": {
+                    "active": True,
+                    "schedule": {
+                        "seconds": 30,
+                        "jitter": 1,
+                        "timeout": 5,
+                        "missed_runs": "skip",
+                    },
+                }
+            }
+        },
+    )
+    monkeypatch.setattr(pl, "_async_scheduler", None)
+    pl.set_scheduler_event_loop(asyncio.get_running_loop())
+    try:
+        plugins = []
+        for generation in range(3):
+            with patch("mmrelay.plugins.base_plugin.config", pl.config):
+                plugin = ScheduledPlugin()
+            plugin.generation = generation
+            plugin.runs = []
+            plugin.start()
+            plugins.append(plugin)
+
+        jobs = pl._async_scheduler.jobs("scheduled_test_plugin")
+        assert len(jobs) == 1
+        assert jobs[0].func == plugins[-1].background_job
+        assert (jobs[0].jitter, jobs[0].timeout, jobs[0].missed_runs) == (
+            1.0,
+            5.0,
+            "skip",
+        )
+
+        pl.start_global_scheduler()
+        await asyncio.sleep(0)
+        assert pl._async_scheduler.running
+
+        scheduler = pl._async_scheduler
+        pl.stop_global_scheduler()
+        # On the loop thread the shutdown is started and its task kept.
+        shutdown_task = scheduler._shutdown_task
+        assert shutdown_task is not None
+        await shutdown_task
+        assert scheduler.jobs() == []
+        assert not scheduler.running
+        assert scheduler._loop is None
+        assert pl._async_scheduler is None
+        assert pl._scheduler_loop is None
+        assert pl._get_async_scheduler() is None
+    finally:
+        pl.set_scheduler_event_loop(None)
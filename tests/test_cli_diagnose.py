@@ -10,6 +10,8 @@ import sys
 import unittest
 from unittest.mock import MagicMock, patch
 
+import pytest
+
 # Add src to path for imports
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
 
@@ -52,9 +54,16 @@ class TestHandleConfigDiagnose(unittest.TestCase):
             any("Diagnostics complete!" in str(msg) for msg in printed_messages)
         )
 
+    @pytest.fixture(autouse=True)
+    def _use_tmp_path(self, tmp_path):
+        """Give each test a temporary directory for paths the diagnostics may create."""
+        self.tmp_path = tmp_path
+
     @patch("builtins.print")
     def test_handle_config_diagnose_windows_with_warnings(self, mock_print):
         """Test config diagnose on Windows with warnings."""
+        # The Windows checks create the config directory, so keep it out of the cwd.
+        self.mock_args.config = str(self.tmp_path / "config.yaml")
         # Execute with minimal mocking - just test that it runs without crashing
         with patch("sys.platform", "win32"):
             result = handle_config_diagnose(self.mock_args)
@@ -0,0 +1,222 @@
+"""Tests for online database backups, scheduled snapshots and the db CLI."""
+
+import asyncio
+import contextlib
+import os
+import sqlite3
+import sys
+import threading
+import time
+from unittest.mock import patch
+
+import pytest
+
+from mmrelay.db_backup import (
+    BackupError,
+    SnapshotSettings,
+    backup_database,
+    create_snapshot,
+    get_snapshot_dir,
+    get_snapshot_settings,
+    list_snapshots,
+    restore_database,
+    run_scheduled_snapshots,
+)
+from mmrelay.db_runtime import DatabaseManager
+
+
+def _seed(manager: DatabaseManager, rows: int) -> None:
+    with manager.write() as cursor:
+        cursor.execute(
+            "CREATE TABLE IF NOT EXISTS samples (id INTEGER PRIMARY KEY, payload BLOB)"
+        )
+        cursor.executemany(
+            "INSERT INTO samples (payload) VALUES (?)",
+            [(os.urandom(512),) for _ in range(rows)],
+        )
+
+
+def _count(path) -> int:
+    with contextlib.closing(sqlite3.connect(path)) as conn:
+        return conn.execute("SELECT count(*) FROM samples").fetchone()[0]
+
+
+@pytest.mark.performance
+def test_backup_during_write_load_is_consistent_and_keeps_writers_moving(tmp_path):
+    db_path = str(tmp_path / "meshtastic.sqlite")
+    manager = DatabaseManager(db_path)
+    _seed(manager, 20_000)
+    latencies: list[float] = []
+    stop = threading.Event()
+
+    def writer() -> None:
+        while not stop.is_set():
+            started = time.perf_counter()
+            with manager.write() as cursor:
+                cursor.execute(
+                    "INSERT INTO samples (payload) VALUES (?)", (os.urandom(512),)
+                )
+            latencies.append(time.perf_counter() - started)
+
+    writers = [threading.Thread(target=writer) for _ in range(2)]
+    try:
+        for thread in writers:
+            thread.start()
+        time.sleep(0.05)
+        rows_before = _count(db_path)
+        result = backup_database(
+            db_path, str(tmp_path / "snapshot.sqlite"), pages_per_step=32
+        )
+        rows_at_end = _count(db_path)
+    finally:
+        stop.set()
+        for thread in writers:
+            thread.join()
+        manager.close()
+
+    with contextlib.closing(sqlite3.connect(result.path)) as snapshot:
+        assert snapshot.execute("PRAGMA integrity_check").fetchone() == ("ok",)
+        assert snapshot.execute("PRAGMA journal_mode").fetchone() == ("delete",)
+    assert rows_before <= _count(result.path) <= rows_at_end
+    # The pinned WAL snapshot means concurrent commits never restart the copy.
+    assert result.steps == -(-result.pages // 32)
+    assert not os.path.exists(result.path + ".partial")
+
+    assert len(latencies) > 100
+    latencies.sort()
+    assert latencies[int(len(latencies) * 0.99)] < 0.1
+    assert latencies[-1] < 1.0
+
+
+def test_backup_of_rollback_journal_database(tmp_path):
+    db_path = str(tmp_path / "meshtastic.sqlite")
+    manager = DatabaseManager(db_path, enable_wal=False)
+    _seed(manager, 500)
+    manager.close()
+
+    result = backup_database(db_path, str(tmp_path / "out" / "copy.sqlite"))
+
+    assert _count(result.path) == 500
+    assert result.pages > 0
+
+
+def test_backup_rejects_missing_source_and_self_target(tmp_path):
+    with pytest.raises(BackupError):
+        backup_database(str(tmp_path / "missing.sqlite"), str(tmp_path / "x.sqlite"))
+
+    db_path = tmp_path / "meshtastic.sqlite"
+    sqlite3.connect(db_path).close()
+    with pytest.raises(BackupError):
+        backup_database(str(db_path), str(db_path))
+
+
+def test_snapshots_are_listed_oldest_first_and_pruned(tmp_path):
+    db_path = str(tmp_path / "meshtastic.sqlite")
+    manager = DatabaseManager(db_path)
+    _seed(manager, 10)
+    manager.close()
+    snapshot_dir = get_snapshot_dir(db_path)
+    os.makedirs(snapshot_dir)
+    (tmp_path / "backups" / "notes.txt").write_text("keep me", encoding="utf-8")
+
+    created = [create_snapshot(db_path, snapshot_dir, keep=3).path for _ in range(5)]
+
+    assert snapshot_dir == str(tmp_path / "backups")
+    assert list_snapshots(db_path, snapshot_dir) == created[-3:]
+    assert (tmp_path / "backups" / "notes.txt").exists()
+
+
+def test_restore_replaces_contents_and_saves_previous_database(tmp_path):
+    db_path = str(tmp_path / "meshtastic.sqlite")
+    manager = DatabaseManager(db_path)
+    _seed(manager, 10)
+    snapshot = backup_database(db_path, str(tmp_path / "snapshot.sqlite")).path
+    _seed(manager, 5)
+    manager.close()
+
+    pre_restore, _result = restore_database(snapshot, db_path)
+
+    assert _count(db_path) == 10
+    assert pre_restore is not None and _count(pre_restore.path) == 15
+
+    corrupt = tmp_path / "corrupt.sqlite"
+    corrupt.write_bytes(b"not a database" * 100)
+    with pytest.raises(BackupError):
+        restore_database(str(corrupt), db_path)
+    assert _count(db_path) == 10
+
+
+def test_snapshot_settings_defaults_and_invalid_values():
+    assert get_snapshot_settings({}) == SnapshotSettings(False, 86400.0, 7, None)
+
+    settings = get_snapshot_settings(
+        {
+            "database": {
+                "backup": {
+                    "enabled": True,
+                    "interval_hours": 0.5,
+                    "keep": 2,
+                    "directory": "/srv/snapshots",
+                }
+            }
+        }
+    )
+    assert settings == SnapshotSettings(True, 1800.0, 2, "/srv/snapshots")
+
+    invalid = get_snapshot_settings(
+        {"database": {"backup": {"enabled": "yes", "interval_hours": 0, "keep": -1}}}
+    )
+    assert invalid == SnapshotSettings(False, 86400.0, 7, None)
+
+
+async def test_scheduled_snapshots_run_until_shutdown(tmp_path):
+    db_path = str(tmp_path / "meshtastic.sqlite")
+    manager = DatabaseManager(db_path)
+    _seed(manager, 10)
+    manager.close()
+    shutdown_event = asyncio.Event()
+    settings = SnapshotSettings(True, 0.05, 2, str(tmp_path / "snapshots"))
+
+    task = asyncio.create_task(
+        run_scheduled_snapshots(shutdown_event, db_path, settings)
+    )
+    for _ in range(200):
+        if len(list_snapshots(db_path, settings.directory)) == 2:
+            break
+        await asyncio.sleep(0.02)
+    shutdown_event.set()
+    await asyncio.wait_for(task, 5)
+
+    assert len(list_snapshots(db_path, settings.directory)) == 2
+
+
+def test_db_cli_backup_and_restore(tmp_path, capsys):
+    from mmrelay.cli import handle_subcommand, parse_arguments
+
+    db_path = str(tmp_path / "meshtastic.sqlite")
+    manager = DatabaseManager(db_path)
+    _seed(manager, 10)
+    manager.close()
+
+    def run(*argv: str) -> int:
+        with (
+            patch.object(sys, "argv", ["mmrelay", *argv]),
+            patch("mmrelay.config.load_config", return_value={}),
+            patch("mmrelay.migrate._is_mmrelay_running", return_value=False),
+        ):
+            return handle_subcommand(parse_arguments())
+
+    assert run("db", "backup", "--database", db_path) == 0
+    [snapshot] = list_snapshots(db_path, str(tmp_path / "backups"))
+    assert snapshot in capsys.readouterr().out
+
+    with contextlib.closing(sqlite3.connect(db_path)) as conn, conn:
+        conn.execute("DELETE FROM samples")
+    assert run("db", "restore", "--database", db_path) == 0
+    assert _count(db_path) == 10
+    assert "Previous database saved to" in capsys.readouterr().out
+
+    assert (
+        run("db", "restore", str(tmp_path / "missing.sqlite"), "--database", db_path)
+        == 1
+    )
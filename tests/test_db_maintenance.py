@@ -0,0 +1,360 @@
+"""Tests for WAL checkpointing, incremental vacuum and database metrics."""
+
+import asyncio
+import contextlib
+import os
+import sqlite3
+import sys
+from unittest.mock import patch
+
+import pytest
+
+from mmrelay import db_utils
+from mmrelay.constants.database import DEFAULT_DB_MAINTENANCE_INTERVAL_SECONDS
+from mmrelay.db_maintenance import (
+    CHECKPOINT_PASSIVE,
+    CHECKPOINT_TRUNCATE,
+    DatabaseMaintenance,
+    MaintenanceSettings,
+    get_maintenance_settings,
+    run_database_maintenance,
+)
+from mmrelay.db_runtime import DatabaseManager
+
+FIVE_MINUTES = 300.0
+
+
+class FakeClock:
+    """Monotonic clock that only moves when a test advances it."""
+
+    def __init__(self, now: float = 1000.0) -> None:
+        self.now = now
+
+    def __call__(self) -> float:
+        return self.now
+
+    def advance(self, seconds: float) -> None:
+        self.now += seconds
+
+
+def _message_map_manager(db_path: str, **kwargs) -> DatabaseManager:
+    manager = DatabaseManager(db_path, **kwargs)
+    manager.run_sync(
+        lambda cursor: cursor.execute(db_utils._CREATE_TABLE_MESSAGE_MAP_SQL),
+        write=True,
+    )
+    return manager
+
+
+def _relay_interval(
+    manager: DatabaseManager, start: int, count: int, keep: int = 2000
+) -> None:
+    """Store `count` relayed messages and prune the map to `keep` rows."""
+
+    def _store(cursor: sqlite3.Cursor) -> None:
+        for index in range(start, start + count):
+            db_utils._store_message_map_core(
+                cursor,
+                str(index),
+                f"$event{index}",
+                "!room:example.org",
+                f"message {index} " + "x" * 400,
+                "meshnet",
+            )
+        db_utils._prune_message_map_core(cursor, keep)
+
+    manager.run_sync(_store, write=True)
+
+
+@pytest.mark.performance
+def test_week_of_churn_keeps_file_size_bounded(tmp_path):
+    """Simulate a week of 5-minute intervals, with one burst day, on a fake clock."""
+    clock = FakeClock()
+    maintained_path = str(tmp_path / "maintained.sqlite")
+    unmaintained_path = str(tmp_path / "unmaintained.sqlite")
+    maintained = _message_map_manager(maintained_path)
+    unmaintained = _message_map_manager(unmaintained_path)
+    maintenance = DatabaseMaintenance(
+        maintained,
+        maintained_path,
+        settings=MaintenanceSettings(
+            interval_seconds=3600.0,
+            wal_passive_bytes=256 * 1024,
+            wal_truncate_bytes=1024 * 1024,
+        ),
+        clock=clock,
+    )
+    sizes = []
+    reports = []
+    counts: list[int] = []
+    next_id = 0
+    try:
+        for interval in range(7 * 24 * 12):
+            # Day three is a burst: ten times the usual traffic. The map keeps
+            # one day of messages, so it swells for a day and then shrinks.
+            count = 100 if 2 * 288 <= interval < 3 * 288 else 10
+            counts.append(count)
+            keep = sum(counts[-288:])
+            for manager in (maintained, unmaintained):
+                _relay_interval(manager, next_id, count, keep)
+            next_id += count
+            clock.advance(FIVE_MINUTES)
+            report = maintenance.tick()
+            if report is not None:
+                reports.append(report)
+                sizes.append(report.metrics.total_bytes)
+        final = maintenance.metrics()
+        unmaintained_metrics = DatabaseMaintenance(
+            unmaintained, unmaintained_path
+        ).metrics()
+    finally:
+        maintained.close()
+        unmaintained.close()
+
+    assert len(reports) == 7 * 24
+    assert final.auto_vacuum == "incremental"
+    steady = sizes[47]
+    peak = max(sizes)
+    assert peak > 5 * steady
+    # Once the burst ages out, freed pages go back to the filesystem and the
+    # file returns to its pre-burst size; without maintenance it stays at peak.
+    assert final.total_bytes < 1.5 * steady
+    assert final.freelist_pages <= MaintenanceSettings().freelist_reserve_pages
+    assert unmaintained_metrics.file_bytes > 0.8 * peak
+    assert unmaintained_metrics.freelist_pages > 10 * final.freelist_pages
+    assert any(report.checkpoint == CHECKPOINT_TRUNCATE for report in reports)
+    assert sum(report.vacuumed_pages for report in reports) > 0
+
+
+def test_checkpoint_mode_follows_wal_size(tmp_path):
+    db_path = str(tmp_path / "meshtastic.sqlite")
+    manager = _message_map_manager(db_path, extra_pragmas={"wal_autocheckpoint": 0})
+    maintenance = DatabaseMaintenance(
+        manager,
+        db_path,
+        settings=MaintenanceSettings(
+            wal_passive_bytes=64 * 1024, wal_truncate_bytes=1024 * 1024
+        ),
+    )
+    try:
+        assert maintenance.run_once().checkpoint is None
+
+        _relay_interval(manager, 0, 200)
+        wal_bytes = maintenance.metrics().wal_bytes
+        assert 64 * 1024 <= wal_bytes < 1024 * 1024
+        report = maintenance.run_once()
+        assert report.checkpoint == CHECKPOINT_PASSIVE
+        # PASSIVE copies frames back but leaves the -wal file at its size.
+        assert report.metrics.wal_bytes == wal_bytes
+
+        _relay_interval(manager, 200, 3000)
+        report = maintenance.run_once()
+        assert report.checkpoint == CHECKPOINT_TRUNCATE
+        assert not report.checkpoint_busy
+        assert report.metrics.wal_bytes == 0
+
+        with pytest.raises(ValueError):
+            maintenance.checkpoint("FULL; DROP TABLE message_map")
+    finally:
+        manager.close()
+
+
+def _legacy_database(db_path: str) -> None:
+    """Create a database without auto-vacuum that holds free pages."""
+    with contextlib.closing(sqlite3.connect(db_path)) as conn, conn:
+        conn.execute("CREATE TABLE legacy (id INTEGER PRIMARY KEY, payload BLOB)")
+        conn.executemany(
+            "INSERT INTO legacy (payload) VALUES (?)",
+            [(os.urandom(1024),) for _ in range(500)],
+        )
+        conn.execute("DELETE FROM legacy")
+
+
+def test_existing_database_is_left_for_the_vacuum_command(tmp_path):
+    db_path = str(tmp_path / "legacy.sqlite")
+    _legacy_database(db_path)
+    manager = DatabaseManager(db_path)
+    maintenance = DatabaseMaintenance(
+        manager, db_path, settings=MaintenanceSettings(freelist_reserve_pages=0)
+    )
+    try:
+        free_before = maintenance.metrics().freelist_pages
+        assert free_before > 0
+
+        with patch("mmrelay.db_maintenance.logger") as mock_logger:
+            report = maintenance.run_once()
+            maintenance.run_once()
+
+        # No full VACUUM on the write lane; the pass only points at the command.
+        assert report.metrics.auto_vacuum == "none"
+        assert report.metrics.freelist_pages == free_before
+        assert report.vacuumed_pages == 0
+        mock_logger.info.assert_called_once()
+        assert "mmrelay db vacuum" in mock_logger.info.call_args.args[0]
+    finally:
+        manager.close()
+
+
+def test_incremental_vacuum_stops_at_reserve_and_time_slice(tmp_path):
+    clock = FakeClock()
+    db_path = str(tmp_path / "meshtastic.sqlite")
+    manager = _message_map_manager(db_path)
+    settings = MaintenanceSettings(
+        freelist_reserve_pages=10, vacuum_pages_per_step=16, vacuum_slice_seconds=1.0
+    )
+    maintenance = DatabaseMaintenance(manager, db_path, settings=settings, clock=clock)
+    try:
+        _relay_interval(manager, 0, 2000)
+        manager.run_sync(
+            lambda cursor: cursor.execute("DELETE FROM message_map"), write=True
+        )
+        free_before = maintenance.metrics().freelist_pages
+        assert free_before > 64
+
+        # Each step costs 0.4 fake seconds, so the slice ends after three steps.
+        original_run_sync = manager.run_sync
+
+        def slow_run_sync(func, *, write=False):
+            clock.advance(0.4)
+            return original_run_sync(func, write=write)
+
+        with patch.object(manager, "run_sync", side_effect=slow_run_sync):
+            assert maintenance.incremental_vacuum() == 48
+
+        assert maintenance.incremental_vacuum() == free_before - 48 - 10
+        assert maintenance.metrics().freelist_pages == 10
+        assert maintenance.incremental_vacuum() == 0
+    finally:
+        manager.close()
+
+
+def test_tick_waits_for_interval(tmp_path):
+    clock = FakeClock()
+    db_path = str(tmp_path / "meshtastic.sqlite")
+    manager = _message_map_manager(db_path)
+    maintenance = DatabaseMaintenance(
+        manager,
+        db_path,
+        settings=MaintenanceSettings(interval_seconds=60.0),
+        clock=clock,
+    )
+    try:
+        assert maintenance.tick() is not None
+        clock.advance(59)
+        assert maintenance.tick() is None
+        clock.advance(1)
+        assert maintenance.tick() is not None
+    finally:
+        manager.close()
+
+
+def test_manager_applies_cache_and_mmap_sizes(tmp_path):
+    db_path = str(tmp_path / "meshtastic.sqlite")
+    manager = DatabaseManager(db_path, cache_size_kib=4096, mmap_size_bytes=0)
+    overridden = DatabaseManager(
+        str(tmp_path / "other.sqlite"), extra_pragmas={"cache_size": -1024}
+    )
+    try:
+        with manager.read() as cursor:
+            assert cursor.execute("PRAGMA cache_size").fetchone()[0] == -4096
+            assert cursor.execute("PRAGMA mmap_size").fetchone()[0] == 0
+            assert cursor.execute("PRAGMA auto_vacuum").fetchone()[0] == 2
+        with overridden.read() as cursor:
+            assert cursor.execute("PRAGMA cache_size").fetchone()[0] == -1024
+    finally:
+        manager.close()
+        overridden.close()
+
+
+def test_maintenance_settings_defaults_and_invalid_values():
+    assert get_maintenance_settings({}) == MaintenanceSettings()
+    assert get_maintenance_settings(
+        {"database": {"maintenance": {"enabled": False, "interval_seconds": 60}}}
+    ) == MaintenanceSettings(enabled=False, interval_seconds=60.0)
+    assert (
+        get_maintenance_settings(
+            {"database": {"maintenance": {"interval_seconds": "often"}}}
+        ).interval_seconds
+        == DEFAULT_DB_MAINTENANCE_INTERVAL_SECONDS
+    )
+
+
+async def test_background_maintenance_runs_until_shutdown(tmp_path):
+    db_path = str(tmp_path / "meshtastic.sqlite")
+    manager = _message_map_manager(db_path)
+    shutdown_event = asyncio.Event()
+    passes = []
+    original_run_once = DatabaseMaintenance.run_once
+
+    def counting_run_once(self):
+        passes.append(self.db_path)
+        return original_run_once(self)
+
+    try:
+        with (
+            patch("mmrelay.db_utils._get_db_manager", return_value=manager),
+            patch("mmrelay.db_utils.get_db_path", return_value=db_path),
+            patch.object(DatabaseMaintenance, "run_once", counting_run_once),
+        ):
+            task = asyncio.create_task(
+                run_database_maintenance(
+                    shutdown_event, MaintenanceSettings(interval_seconds=0.02)
+                )
+            )
+            for _ in range(200):
+                if len(passes) >= 2:
+                    break
+                await asyncio.sleep(0.02)
+            shutdown_event.set()
+            await asyncio.wait_for(task, 5)
+    finally:
+        manager.close()
+
+    assert passes[:2] == [db_path, db_path]
+
+
+def test_db_cli_stats(tmp_path, capsys):
+    from mmrelay.cli import handle_subcommand, parse_arguments
+
+    db_path = str(tmp_path / "meshtastic.sqlite")
+    _message_map_manager(db_path).close()
+
+    def run(*argv: str) -> int:
+        with (
+            patch.object(sys, "argv", ["mmrelay", *argv]),
+            patch("mmrelay.config.load_config", return_value={}),
+        ):
+            return handle_subcommand(parse_arguments())
+
+    assert run("db", "stats", "--database", db_path) == 0
+    output = capsys.readouterr().out
+    assert db_path in output
+    assert "Auto-vacuum: incremental" in output
+
+    assert run("db", "stats", "--database", str(tmp_path / "missing.sqlite")) == 1
+
+
+def test_db_cli_vacuum_enables_incremental_auto_vacuum(tmp_path, capsys):
+    from mmrelay.cli import handle_subcommand, parse_arguments
+
+    db_path = str(tmp_path / "legacy.sqlite")
+    _legacy_database(db_path)
+
+    def run(*argv: str, running: bool = False) -> int:
+        with (
+            patch.object(sys, "argv", ["mmrelay", *argv]),
+            patch("mmrelay.config.load_config", return_value={}),
+            patch("mmrelay.migrate._is_mmrelay_running", return_value=running),
+        ):
+            return handle_subcommand(parse_arguments())
+
+    assert run("db", "vacuum", "--database", db_path, running=True) == 1
+    assert "Stop it before vacuuming" in capsys.readouterr().out
+
+    assert run("db", "vacuum", "--database", db_path) == 0
+    assert "auto-vacuum incremental" in capsys.readouterr().out
+    with contextlib.closing(sqlite3.connect(db_path)) as conn:
+        assert conn.execute("PRAGMA auto_vacuum").fetchone()[0] == 2
+        assert conn.execute("PRAGMA freelist_count").fetchone()[0] == 0
+
+    assert run("db", "vacuum", "--database", str(tmp_path / "missing.sqlite")) == 1
@@ -0,0 +1,160 @@
+"""Tests for the DatabaseManager read pool and its effect on lookup latency."""
+
+import asyncio
+import sqlite3
+import threading
+
+import pytest
+
+from mmrelay.constants.database import DB_READ_POOL_THREAD_PREFIX
+from mmrelay.db_runtime import DatabaseManager
+
+
+def _seed(manager: DatabaseManager, rows: int) -> None:
+    with manager.write() as cursor:
+        cursor.execute(
+            "CREATE TABLE plugin_data (id INTEGER PRIMARY KEY, plugin_name TEXT, data TEXT)"
+        )
+        cursor.executemany(
+            "INSERT INTO plugin_data (plugin_name, data) VALUES (?, ?)",
+            [("telemetry", f'{{"n": {n}, "pad": "{"x" * 200}"}}') for n in range(rows)],
+        )
+
+
+def _scan(cursor: sqlite3.Cursor) -> int:
+    # Telemetry-graph style scan: touches every row and matches none.
+    return cursor.execute(
+        "SELECT count(*) FROM plugin_data WHERE data LIKE '%missing%'"
+    ).fetchone()[0]
+
+
+def _lookup(row_id: int):
+    def _fetch(cursor: sqlite3.Cursor):
+        return cursor.execute(
+            "SELECT data FROM plugin_data WHERE id = ?", (row_id,)
+        ).fetchone()
+
+    return _fetch
+
+
+def _held_scan(release: threading.Event):
+    def _fetch(cursor: sqlite3.Cursor) -> int:
+        # Stands in for a long telemetry scan that holds its worker.
+        release.wait(5)
+        return _scan(cursor)
+
+    return _fetch
+
+
+async def _lookup_behind_held_scans(manager: DatabaseManager) -> bool:
+    """Return whether a point lookup finished while two scans held their workers."""
+    release = threading.Event()
+    scans = [
+        asyncio.ensure_future(manager.run_async(_held_scan(release))) for _ in range(2)
+    ]
+    lookup = asyncio.ensure_future(manager.run_async(_lookup(1)))
+    try:
+        done, _pending = await asyncio.wait({lookup}, timeout=0.5)
+        finished_first = lookup in done and not any(scan.done() for scan in scans)
+    finally:
+        release.set()
+        await asyncio.gather(*scans)
+    assert await lookup is not None
+    return finished_first
+
+
+@pytest.mark.performance
+async def test_point_lookups_are_not_queued_behind_scans(tmp_path):
+    db_path = str(tmp_path / "meshtastic.sqlite")
+    seed = DatabaseManager(db_path)
+    _seed(seed, 10_000)
+    seed.close()
+
+    single_lane = DatabaseManager(db_path, read_pool_size=0)
+    pooled = DatabaseManager(db_path)
+    try:
+        # On one lane a lookup waits for the scans ahead of it; with the pool it
+        # only waits for a free worker.
+        assert not await _lookup_behind_held_scans(single_lane)
+        assert await _lookup_behind_held_scans(pooled)
+    finally:
+        single_lane.close()
+        pooled.close()
+
+
+async def test_async_reads_use_query_only_pool_connections(tmp_path):
+    manager = DatabaseManager(str(tmp_path / "meshtastic.sqlite"))
+    try:
+        _seed(manager, 10)
+
+        def _describe(cursor: sqlite3.Cursor):
+            query_only = cursor.execute("PRAGMA query_only").fetchone()[0]
+            return threading.current_thread().name, query_only
+
+        thread_name, query_only = await manager.run_async(_describe)
+        assert thread_name.startswith(DB_READ_POOL_THREAD_PREFIX)
+        assert query_only == 1
+        _writer_thread, writer_query_only = await manager.run_async(
+            _describe, write=True
+        )
+        assert writer_query_only == 0
+
+        with pytest.raises(sqlite3.OperationalError):
+            await manager.run_async(
+                lambda cursor: cursor.execute("DELETE FROM plugin_data")
+            )
+        assert (
+            await manager.run_async(
+                lambda cursor: cursor.execute(
+                    "SELECT count(*) FROM plugin_data"
+                ).fetchone()[0]
+            )
+            == 10
+        )
+    finally:
+        manager.close()
+
+
+async def test_reads_see_writes_that_completed_before_them(tmp_path):
+    manager = DatabaseManager(str(tmp_path / "meshtastic.sqlite"))
+    try:
+        _seed(manager, 0)
+        for n in range(50):
+            await manager.run_async(
+                lambda cursor, n=n: cursor.execute(
+                    "INSERT INTO plugin_data (plugin_name, data) VALUES ('p', ?)",
+                    (str(n),),
+                ),
+                write=True,
+            )
+            count = await manager.run_async(
+                lambda cursor: cursor.execute(
+                    "SELECT count(*) FROM plugin_data"
+                ).fetchone()[0]
+            )
+            assert count == n + 1
+    finally:
+        manager.close()
+
+
+@pytest.mark.parametrize(
+    ("path", "kwargs"),
+    [
+        (":memory:", {}),
+        ("meshtastic.sqlite", {"enable_wal": False}),
+        ("meshtastic.sqlite", {"read_pool_size": 0}),
+    ],
+)
+async def test_reads_share_the_writer_lane_without_a_pool(tmp_path, path, kwargs):
+    if path != ":memory:":
+        path = str(tmp_path / path)
+    manager = DatabaseManager(path, **kwargs)
+    try:
+        assert manager._read_executor is None
+        threads = {
+            await manager.run_async(lambda _cursor: threading.get_ident()),
+            await manager.run_async(lambda _cursor: threading.get_ident(), write=True),
+        }
+        assert len(threads) == 1
+    finally:
+        manager.close()
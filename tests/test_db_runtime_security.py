@@ -1105,7 +1105,7 @@ async def test_run_async_cancelled_read_cancels_worker_future(
     worker_future.done.return_value = False
 
     with patch.object(
-        temp_db_manager._async_executor, "submit", return_value=worker_future
+        temp_db_manager._read_executor, "submit", return_value=worker_future
     ):
         task = asyncio.create_task(
             temp_db_manager.run_async(lambda _cursor: None, write=False)
@@ -1219,7 +1219,7 @@ async def test_run_async_cancelled_read_does_not_cancel_finished_future(
     worker_future.done.return_value = True
     with (
         patch.object(
-            temp_db_manager._async_executor, "submit", return_value=worker_future
+            temp_db_manager._read_executor, "submit", return_value=worker_future
         ),
         patch.object(
             temp_db_manager,
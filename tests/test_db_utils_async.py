@@ -15,11 +15,13 @@ import re
 import shutil
 import sqlite3
 import tempfile
+import threading
 import unittest
 from unittest.mock import AsyncMock, MagicMock, patch
 
 import mmrelay.db_utils
 from mmrelay.constants.database import (
+    DB_READ_POOL_THREAD_PREFIX,
     DEFAULT_BUSY_TIMEOUT_MS,
     DEFAULT_DB_FILENAME,
     MESSAGE_MAP_TABLE,
@@ -35,6 +37,7 @@ from mmrelay.db_utils import (
     _parse_int,
     _reset_db_manager,
     _resolve_database_options,
+    async_get_message_map_by_matrix_event_id,
     async_prune_message_map,
     async_store_message_map,
     clear_db_path_cache,
@@ -1314,6 +1317,38 @@ class TestIntegrationWithRealDatabase(unittest.TestCase):
         self.assertEqual(meshtastic_text, "Test message")
         self.assertEqual(meshtastic_meshnet, "testnet")
 
+    def test_async_get_message_map_by_matrix_event_id_uses_read_pool(self):
+        """Test the async Matrix event lookup runs on the database read pool."""
+        initialize_database()
+        store_message_map(
+            meshtastic_id=123,
+            matrix_event_id="$event123",
+            matrix_room_id="!room123",
+            meshtastic_text="Test message",
+            meshtastic_meshnet="testnet",
+        )
+        fetch = mmrelay.db_utils._fetch_message_map_by_matrix_event_id
+        threads = []
+
+        def _recording_fetch(cursor, matrix_event_id):
+            threads.append(threading.current_thread().name)
+            return fetch(cursor, matrix_event_id)
+
+        with patch.object(
+            mmrelay.db_utils,
+            "_fetch_message_map_by_matrix_event_id",
+            side_effect=_recording_fetch,
+        ):
+            result = asyncio.run(async_get_message_map_by_matrix_event_id("$event123"))
+            missing = asyncio.run(async_get_message_map_by_matrix_event_id("$missing"))
+
+        self.assertEqual(result, ("123", "!room123", "Test message", "testnet"))
+        self.assertIsNone(missing)
+        self.assertEqual(len(threads), 2)
+        self.assertTrue(
+            all(name.startswith(DB_READ_POOL_THREAD_PREFIX) for name in threads)
+        )
+
     def test_wipe_and_prune_message_map_with_manager(self):
         """Test wipe and prune functions work with DatabaseManager."""
         # Initialize database
@@ -13,7 +13,7 @@ import asyncio
 import os
 import sys
 import unittest
-from unittest.mock import MagicMock, patch
+from unittest.mock import MagicMock
 
 # Add src to path for imports
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
@@ -51,21 +51,16 @@ class TestDebugPlugin(unittest.TestCase):
         description = self.plugin.description
         self.assertEqual(description, "")
 
-    @patch.object(Plugin, "strip_raw")
-    def test_handle_meshtastic_message_logs_packet(self, mock_strip_raw):
+    def test_handle_meshtastic_message_logs_packet(self):
         """
-        Verify that handle_meshtastic_message logs the cleaned packet after stripping raw data and returns False.
+        Verify that handle_meshtastic_message logs a raw-stripped copy of the packet and returns False.
 
-        This test mocks the strip_raw method to ensure the cleaned packet is logged and confirms that the message handler does not intercept messages.
+        The original packet must be left untouched so later plugins and the relay still see its raw fields.
         """
-        # Mock the strip_raw method to return a cleaned packet
-        cleaned_packet = {"decoded": {"text": "test message"}, "fromId": "!12345678"}
-        mock_strip_raw.return_value = cleaned_packet
-
-        # Test packet
         original_packet = {
             "decoded": {"text": "test message", "raw": b"binary_data"},
             "fromId": "!12345678",
+            "raw": object(),
         }
 
         async def run_test():
@@ -76,14 +71,16 @@ class TestDebugPlugin(unittest.TestCase):
                 original_packet, "formatted_message", "TestNode", "TestMesh"
             )
 
-            # Should call strip_raw with the original packet
-            mock_strip_raw.assert_called_once_with(original_packet)
-
             # Should log the cleaned packet
             self.plugin.logger.debug.assert_called_once_with(
-                "Packet received: %s", cleaned_packet
+                "Packet received: %s",
+                {"decoded": {"text": "test message"}, "fromId": "!12345678"},
             )
 
+            # Should not strip the shared packet in place
+            self.assertIn("raw", original_packet)
+            self.assertIn("raw", original_packet["decoded"])
+
             # Should return False (never intercepts messages)
             self.assertFalse(result)
 
@@ -11,8 +11,11 @@ Tests the message drop and pickup functionality including:
 """
 
 import asyncio
+import json
 import os
+import random
 import sys
+import time
 import unittest
 from unittest.mock import MagicMock, patch
 
@@ -25,6 +28,7 @@ sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
 
 from mmrelay.constants.formats import TEXT_MESSAGE_APP
 from mmrelay.plugins.drop_plugin import Plugin
+from mmrelay.spatial_index import haversine_km
 
 
 @pytest.mark.asyncio
@@ -119,6 +123,22 @@ class TestDropPlugin(unittest.TestCase):
 
         self.assertIsNone(position)
 
+    def test_get_position_uses_node_id_key(self):
+        """
+        Test that get_position finds a node keyed by its ID without consulting other entries.
+        """
+        self.mock_meshtastic_client.nodes = {
+            "!broken00": {},  # Would raise KeyError if scanned
+            "!abcdef01": {
+                "user": {"id": "!abcdef01"},
+                "position": {"latitude": 1.0, "longitude": 2.0},
+            },
+        }
+
+        position = self.plugin.get_position(self.mock_meshtastic_client, "!abcdef01")
+
+        self.assertEqual(position, {"latitude": 1.0, "longitude": 2.0})
+
     @patch("mmrelay.plugins.drop_plugin.connect_meshtastic")
     def test_handle_meshtastic_message_drop_valid(self, mock_connect):
         """
@@ -361,10 +381,8 @@ class TestDropPlugin(unittest.TestCase):
 
             self.plugin.send_message.assert_not_called()
 
-            # Should keep the message in storage
-            self.plugin.set_node_data.assert_called_once_with(
-                "!NODE_MSGS!", stored_messages
-            )
+            # Nothing was picked up, so storage is left alone
+            self.plugin.set_node_data.assert_not_called()
 
         asyncio.run(run_test())
 
@@ -410,10 +428,8 @@ class TestDropPlugin(unittest.TestCase):
 
             self.plugin.send_message.assert_not_called()
 
-            # Should keep the message in storage (can't pick up own messages)
-            self.plugin.set_node_data.assert_called_once_with(
-                "!NODE_MSGS!", stored_messages
-            )
+            # Nothing was picked up (can't pick up own messages), so storage is left alone
+            self.plugin.set_node_data.assert_not_called()
 
         asyncio.run(run_test())
 
@@ -458,10 +474,125 @@ class TestDropPlugin(unittest.TestCase):
 
             self.plugin.send_message.assert_not_called()
 
-            # Should keep the message in storage
-            self.plugin.set_node_data.assert_called_once_with(
-                "!NODE_MSGS!", stored_messages
+            # Nothing was picked up, so storage is left alone
+            self.plugin.set_node_data.assert_not_called()
+
+        asyncio.run(run_test())
+
+    def _back_storage_with_list(self, initial):
+        """
+        Make the mocked node-data methods read and write one JSON round-tripped list, like the database.
+        """
+        storage = {"drops": json.loads(json.dumps(initial))}
+
+        def store(_node_id, item):
+            storage["drops"] = storage["drops"] + json.loads(json.dumps([item]))
+
+        def replace(_node_id, items):
+            storage["drops"] = json.loads(json.dumps(items))
+
+        self.plugin.get_node_data.side_effect = lambda _node_id: storage["drops"]
+        self.plugin.store_node_data.side_effect = store
+        self.plugin.set_node_data.side_effect = replace
+        return storage
+
+    @patch("mmrelay.plugins.drop_plugin.haversine", haversine_km)
+    @patch("mmrelay.plugins.drop_plugin.connect_meshtastic")
+    def test_spatial_index_tracks_drops_and_pickups(self, mock_connect):
+        """
+        Test that drops stored after the index is built are found, and that picked-up drops are not delivered twice.
+        """
+        mock_connect.return_value = self.mock_meshtastic_client
+        self.plugin.config = {"radius_km": 10}
+        far_away = {
+            "location": [41.0, -75.0],
+            "text": "Too far",
+            "originator": "!99999999",
+        }
+        storage = self._back_storage_with_list([far_away])
+
+        async def run_test():
+            """
+            Load the stored drops, drop a message from node2, then deliver it to node1 about 5 km away.
+            """
+            position_packet = {"fromId": "!12345678", "decoded": {"portnum": 3}}
+            with patch.object(
+                self.plugin, "_track_drop", wraps=self.plugin._track_drop
+            ) as track_drop:
+                await self.plugin.handle_meshtastic_message(
+                    position_packet, "formatted_message", "longname", "meshnet_name"
+                )
+                await self.plugin.handle_meshtastic_message(
+                    {
+                        "fromId": "!87654321",
+                        "decoded": {"portnum": TEXT_MESSAGE_APP, "text": "!drop hi"},
+                    },
+                    "formatted_message",
+                    "longname",
+                    "meshnet_name",
+                )
+                await self.plugin.handle_meshtastic_message(
+                    position_packet, "formatted_message", "longname", "meshnet_name"
+                )
+                await self.plugin.handle_meshtastic_message(
+                    position_packet, "formatted_message", "longname", "meshnet_name"
+                )
+
+            self.plugin.send_message.assert_called_once_with(
+                text="hi", destination_id="!12345678"
             )
+            # The index is built once; the new drop is added to it, not reloaded.
+            self.assertEqual(track_drop.call_count, 2)
+            self.assertEqual(storage["drops"], [far_away])
+
+        asyncio.run(run_test())
+
+    @patch("mmrelay.plugins.drop_plugin.haversine", haversine_km)
+    @patch("mmrelay.plugins.drop_plugin.connect_meshtastic")
+    def test_position_packets_read_storage_once_and_write_only_on_pickup(
+        self, mock_connect
+    ):
+        """
+        Test that storage is read on the first position packet only and written only when a drop is picked up.
+        """
+        mock_connect.return_value = self.mock_meshtastic_client
+        self.plugin.config = {"radius_km": 1}
+        nearby = {
+            "location": [TEST_LAT_NYC, TEST_LON_NYC],
+            "text": "Pick me up",
+            "originator": "!99999999",
+        }
+        far_away = {
+            "location": [41.0, -75.0],
+            "text": "Too far",
+            "originator": "!99999999",
+        }
+        storage = self._back_storage_with_list([far_away, nearby])
+
+        async def run_test():
+            """
+            Send position packets away from the drops, then one at the drop site.
+            """
+            away_packet = {"fromId": "!87654321", "decoded": {"portnum": 3}}
+            for _ in range(3):
+                await self.plugin.handle_meshtastic_message(
+                    away_packet, "formatted_message", "longname", "meshnet_name"
+                )
+            self.plugin.set_node_data.assert_not_called()
+
+            await self.plugin.handle_meshtastic_message(
+                {"fromId": "!12345678", "decoded": {"portnum": 3}},
+                "formatted_message",
+                "longname",
+                "meshnet_name",
+            )
+
+            self.plugin.send_message.assert_called_once_with(
+                text="Pick me up", destination_id="!12345678"
+            )
+            self.assertEqual(self.plugin.get_node_data.call_count, 1)
+            self.plugin.set_node_data.assert_called_once()
+            self.assertEqual(storage["drops"], [far_away])
 
         asyncio.run(run_test())
 
@@ -597,5 +728,82 @@ class TestDropPlugin(unittest.TestCase):
         asyncio.run(run_test())
 
 
+@pytest.mark.performance
+def test_position_packets_against_10k_drops_use_the_index(capsys):
+    """Time 200 position packets through the plugin with 10,000 stored drops."""
+    rng = random.Random(42)
+    # Drops scattered over a ~300 km square, as a busy regional mesh might collect.
+    stored = [
+        {
+            "location": [rng.uniform(40.0, 42.7), rng.uniform(-75.5, -72.0)],
+            "text": f"drop {n}",
+            "originator": "!99999999",
+        }
+        for n in range(10_000)
+    ]
+    positions = [
+        (rng.uniform(40.0, 42.7), rng.uniform(-75.5, -72.0)) for _ in range(200)
+    ]
+    radius_km = 5
+
+    # What the plugin did before the index: every drop against every packet.
+    started = time.perf_counter()
+    remaining = list(stored)
+    expected = []
+    for latitude, longitude in positions:
+        keep = []
+        for drop in remaining:
+            if haversine_km((latitude, longitude), drop["location"]) <= radius_km:
+                expected.append(drop["text"])
+            else:
+                keep.append(drop)
+        remaining = keep
+    linear_secs = time.perf_counter() - started
+
+    plugin = Plugin()
+    plugin.config = {"radius_km": radius_km}
+    plugin.logger = MagicMock()
+    plugin.get_node_data = MagicMock(return_value=json.loads(json.dumps(stored)))
+    plugin.set_node_data = MagicMock()
+    plugin.send_message = MagicMock()
+    client = MagicMock()
+    client.getMyNodeInfo.return_value = {"user": {"id": "!relay123"}}
+    walker = {"user": {"id": "!walker00"}, "position": {}}
+    client.nodes = {"!walker00": walker}
+    packet = {"fromId": "!walker00", "decoded": {"portnum": 3}}
+    distance = MagicMock(side_effect=haversine_km)
+
+    async def run_packets() -> None:
+        for latitude, longitude in positions:
+            walker["position"] = {"latitude": latitude, "longitude": longitude}
+            await plugin.handle_meshtastic_message(
+                packet, "formatted_message", "longname", "meshnet_name"
+            )
+
+    with (
+        patch("mmrelay.plugins.drop_plugin.connect_meshtastic", return_value=client),
+        patch("mmrelay.plugins.drop_plugin.haversine", distance),
+    ):
+        started = time.perf_counter()
+        asyncio.run(run_packets())
+        plugin_secs = time.perf_counter() - started
+
+    delivered = [call.kwargs["text"] for call in plugin.send_message.call_args_list]
+    with capsys.disabled():
+        print(
+            f"\n{len(positions)} position packets against {len(stored)} drops: "
+            f"linear scan {linear_secs * 1000:.0f} ms, "
+            f"plugin with geohash index {plugin_secs * 1000:.0f} ms, "
+            f"{distance.call_count} distance checks, "
+            f"{plugin.set_node_data.call_count} writes for {len(delivered)} pickups"
+        )
+
+    assert sorted(delivered) == sorted(expected)
+    # Storage is read once; it is written only by packets that picked something up.
+    plugin.get_node_data.assert_called_once()
+    assert plugin.set_node_data.call_count <= len(delivered)
+    assert distance.call_count * 100 < len(stored) * len(positions)
+
+
 if __name__ == "__main__":
     unittest.main()
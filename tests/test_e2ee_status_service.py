@@ -0,0 +1,122 @@
+"""Tests for the memoized E2EE status service and the per-room encryption cache."""
+
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+import mmrelay.matrix_utils  # noqa: F401  (resolves the matrix package imports)
+from mmrelay import e2ee_utils
+from mmrelay.config import load_config, save_credentials
+from mmrelay.e2ee_utils import get_e2ee_status, get_e2ee_status_service
+from mmrelay.matrix.events import on_room_encryption
+from mmrelay.matrix.relay import matrix_relay
+
+ROOM_ID = "!secret:matrix.org"
+
+
+@pytest.fixture
+def service():
+    status_service = get_e2ee_status_service()
+    status_service.reset()
+    yield status_service
+    status_service.reset()
+
+
+def _config(enabled: bool = True) -> dict:
+    return {
+        "matrix": {"e2ee": {"enabled": enabled}},
+        "meshtastic": {"meshnet_name": "TestMesh"},
+        "matrix_rooms": [{"id": ROOM_ID, "meshtastic_channel": 0}],
+    }
+
+
+def test_status_is_computed_once_per_configuration(service, tmp_path):
+    config = _config()
+    config_path = str(tmp_path / "config.yaml")
+
+    with patch("mmrelay.e2ee_utils.get_e2ee_status", wraps=get_e2ee_status) as compute:
+        assert service.peek(config, config_path) is None
+        first = service.get(config, config_path)
+        first["issues"].append("caller mutation")
+        assert service.get(config, config_path) == get_e2ee_status(config, config_path)
+        assert compute.call_count == 1
+
+        # Toggling E2EE, reloading the config or saving credentials recomputes;
+        # an equal config in a new object does not.
+        config["matrix"]["e2ee"]["enabled"] = False
+        assert service.get(config, config_path)["enabled"] is False
+        service.get(_config(enabled=False), config_path)
+        assert compute.call_count == 2
+
+        config_file = tmp_path / "config.yaml"
+        config_file.write_text("matrix:\n  e2ee:\n    enabled: true\n")
+        with (
+            patch("mmrelay.config.relay_config", {}),
+            patch("mmrelay.config.config_path", None),
+        ):
+            reloaded = load_config(str(config_file))
+        service.get(reloaded, config_path)
+        assert compute.call_count == 3
+        e2ee_utils.invalidate_e2ee_status()
+        service.get(reloaded, config_path)
+        assert compute.call_count == 4
+
+
+def test_saving_credentials_invalidates_status(service, tmp_path):
+    config = _config()
+    config_path = str(tmp_path / "config.yaml")
+    assert service.get(config, config_path)["credentials_available"] is False
+
+    save_credentials(
+        {"homeserver": "https://matrix.org", "access_token": "t"},
+        str(tmp_path / "credentials.json"),
+    )
+
+    assert service.get(config, config_path)["credentials_available"] is True
+
+
+async def test_room_encryption_events_mark_rooms_encrypted(service):
+    room = MagicMock(room_id=ROOM_ID, encrypted=False)
+    assert service.is_room_encrypted(ROOM_ID, room) is False
+
+    await on_room_encryption(room, MagicMock())
+
+    assert service.is_room_encrypted(ROOM_ID, room) is True
+    assert service.is_room_encrypted("!other:matrix.org", room) is False
+    assert service.is_room_encrypted("!other:matrix.org", None) is False
+
+
+@pytest.mark.performance
+async def test_relays_into_encrypted_room_probe_filesystem_once(
+    service, tmp_path, capsys
+):
+    """Count credentials probes across 1,000 blocked relays into an encrypted room."""
+    config = _config()
+    config_path = str(tmp_path / "config.yaml")
+    client = MagicMock(e2ee_enabled=False)
+    client.rooms = {ROOM_ID: MagicMock(encrypted=True, display_name="Secret")}
+    client.room_send = AsyncMock()
+
+    # Count the credentials search itself: os.path.exists is process-wide and
+    # also sees unrelated path lookups.
+    with (
+        patch("mmrelay.matrix_utils.config", config),
+        patch("mmrelay.config.config_path", config_path),
+        patch("mmrelay.matrix_utils.connect_matrix", AsyncMock(return_value=client)),
+        patch("mmrelay.matrix_utils.logger"),
+        patch(
+            "mmrelay.e2ee_utils._check_credentials_available",
+            wraps=e2ee_utils._check_credentials_available,
+        ) as probe,
+    ):
+        for index in range(1000):
+            await matrix_relay(ROOM_ID, f"message {index}", "Long", "L", "TestMesh", 1)
+
+    with capsys.disabled():
+        print(
+            f"\ne2ee status, 1000 relays into an encrypted room: "
+            f"{probe.call_count} credentials searches (uncached: 1000)"
+        )
+
+    client.room_send.assert_not_called()
+    probe.assert_called_once()
@@ -0,0 +1,167 @@
+"""Tests for import-time profiling and the lazily imported Meshtastic transports."""
+
+import json
+import os
+import subprocess
+import sys
+import textwrap
+from unittest.mock import patch
+
+import pytest
+
+from mmrelay.constants.app import IMPORT_PROFILE_FILENAME
+from mmrelay.import_profile import (
+    format_import_report,
+    parse_importtime,
+    total_import_time_us,
+)
+
+# Runs in a clean interpreter: the test suite's mocks replace meshtastic and bleak.
+_LOADED_MODULES_SCRIPT = textwrap.dedent("""
+    import json
+    import sys
+
+    sys.argv = ["mmrelay", *sys.argv[1:]]
+    from mmrelay.cli import main
+
+    code = main()
+    heavy = sorted(
+        name
+        for name in sys.modules
+        if name.split(".")[0] in ("bleak", "matplotlib")
+    )
+    print("LOADED:" + json.dumps({"code": code, "heavy": heavy}))
+    """)
+
+_VALID_CONFIG = textwrap.dedent("""
+    matrix:
+      homeserver: https://matrix.example.org
+      access_token: syt_example_token
+      bot_user_id: "@relay:example.org"
+    matrix_rooms:
+      - id: "#mesh:example.org"
+        meshtastic_channel: 0
+    meshtastic:
+      connection_type: tcp
+      host: meshtastic.local
+    """)
+
+
+def _run_isolated(script: str, *args: str, home) -> dict:
+    env = dict(os.environ, MMRELAY_HOME=str(home))
+    completed = subprocess.run(
+        [sys.executable, "-c", script, *args],
+        capture_output=True,
+        text=True,
+        env=env,
+        timeout=120,
+        check=False,
+    )
+    marker = [
+        line for line in completed.stdout.splitlines() if line.startswith("LOADED:")
+    ]
+    assert marker, completed.stdout + completed.stderr
+    return json.loads(marker[-1][len("LOADED:") :])
+
+
+def test_parse_importtime_reads_depth_and_keeps_other_lines():
+    stderr = [
+        "import time: self [us] | cumulative | imported package",
+        "import time:       120 |        120 |   _io",
+        "import time:        80 |        200 | io",
+        "import time:        50 |         50 |     json.decoder",
+        "import time:        30 |         80 |   json",
+        "Traceback (most recent call last):",
+    ]
+
+    timings, other = parse_importtime(stderr)
+
+    assert [(t.module, t.depth) for t in timings] == [
+        ("_io", 1),
+        ("io", 0),
+        ("json.decoder", 2),
+        ("json", 1),
+    ]
+    assert other == ["Traceback (most recent call last):"]
+    assert total_import_time_us(timings) == 200
+
+    report = format_import_report(timings, "title", limit=2)
+    assert report.splitlines()[:3] == [
+        "title",
+        "Modules imported: 4",
+        "Total import time: 0.2 ms",
+    ]
+    assert report.splitlines()[-1].endswith("  _io")
+
+
+def test_config_check_never_imports_bleak_or_matplotlib(tmp_path):
+    config_path = tmp_path / "config.yaml"
+    config_path.write_text(_VALID_CONFIG, encoding="utf-8")
+
+    loaded = _run_isolated(
+        _LOADED_MODULES_SCRIPT,
+        "--config",
+        str(config_path),
+        "config",
+        "check",
+        home=tmp_path,
+    )
+
+    assert loaded["code"] == 0
+    assert loaded["heavy"] == []
+
+
+def test_meshtastic_utils_import_defers_ble_transport(tmp_path):
+    script = textwrap.dedent("""
+        import json
+        import sys
+
+        import mmrelay.meshtastic_utils as mu
+
+        before = "bleak" in sys.modules
+        tcp_loaded = mu.load_transport("tcp") is not None
+        print("LOADED:" + json.dumps({
+            "bleak_at_import": before,
+            "tcp_loaded": tcp_loaded,
+            "bleak_after_tcp": "bleak" in sys.modules,
+        }))
+        """)
+
+    loaded = _run_isolated(script, home=tmp_path)
+
+    assert loaded == {
+        "bleak_at_import": False,
+        "tcp_loaded": True,
+        "bleak_after_tcp": False,
+    }
+
+
+@pytest.mark.parametrize("connection_type", ["bluetooth", None, 3])
+def test_load_transport_ignores_unknown_connection_types(connection_type):
+    from mmrelay.meshtastic_utils import load_transport
+
+    assert load_transport(connection_type) is None
+
+
+def test_profile_imports_flag_reruns_command_and_writes_report(tmp_path, capsys):
+    from mmrelay.cli import handle_profile_imports, parse_arguments
+    from mmrelay.import_profile import ImportTiming
+
+    argv = ["mmrelay", "--profile-imports", "config", "check"]
+    timings = [ImportTiming("mmrelay.cli", 10, 900, 0)]
+    with (
+        patch.object(sys, "argv", argv),
+        patch(
+            "mmrelay.import_profile.run_with_importtime",
+            return_value=(0, timings, []),
+        ) as run,
+        patch("mmrelay.paths.get_logs_dir", return_value=tmp_path),
+    ):
+        args = parse_arguments()
+        assert handle_profile_imports(args) == 0
+
+    run.assert_called_once_with(["-m", "mmrelay", "config", "check"])
+    report = (tmp_path / IMPORT_PROFILE_FILENAME).read_text(encoding="utf-8")
+    assert "mmrelay config check" in report
+    assert report.splitlines()[-1].split() == ["0.9", "0.0", "mmrelay.cli"]
+    assert "mmrelay.cli" in capsys.readouterr().out
@@ -496,6 +496,7 @@ plugins:
             with patch("mmrelay.matrix_utils.AsyncClient") as mock_client_class:
                 mock_client = AsyncMock()
                 mock_client.rooms = {}
+                mock_client.add_response_callback = MagicMock()
                 # Mock whoami to return a WhoamiError (this is what connect_matrix actually calls)
                 from nio import WhoamiError
 
@@ -0,0 +1,133 @@
+"""Tests for the bounded Matrix room fan-out used by matrix_relay."""
+
+import asyncio
+import time
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from mmrelay.matrix.fanout import MatrixFanoutDispatcher, RelayFanout
+from mmrelay.matrix_utils import matrix_relay, start_matrix_fanout
+
+pytestmark = pytest.mark.asyncio
+
+STUB_SEND_LATENCY = 0.02
+
+
+class StubHomeserver:
+    """In-process stand-in for a homeserver: each room_send takes a fixed time."""
+
+    def __init__(self, latency: float = STUB_SEND_LATENCY) -> None:
+        self.latency = latency
+        self.rooms: dict = {}
+        self.sent: list[tuple[str, str]] = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    async def room_send(self, room_id, message_type, content, **_kwargs):
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            await asyncio.sleep(self.latency)
+        finally:
+            self.in_flight -= 1
+        self.sent.append((room_id, content["body"]))
+        return MagicMock(event_id=f"${len(self.sent)}")
+
+
+async def _relay_to_rooms(
+    client: StubHomeserver, message: str, room_ids: list[str]
+) -> RelayFanout:
+    config = {"meshtastic": {"meshnet_name": "TestMesh"}}
+    fanout = start_matrix_fanout(message, room_ids)
+    with (
+        patch("mmrelay.matrix_utils.config", config),
+        patch("mmrelay.matrix_utils.connect_matrix", return_value=client),
+        patch("mmrelay.matrix_utils.join_matrix_room"),
+        patch(
+            "mmrelay.matrix_utils.get_interaction_settings",
+            return_value={"reactions": False, "replies": False},
+        ),
+        patch("mmrelay.matrix_utils.message_storage_enabled", return_value=False),
+    ):
+        await asyncio.gather(
+            *(
+                matrix_relay(
+                    room_id, message, "Alice", "A", "TestMesh", 1, fanout=fanout
+                )
+                for room_id in room_ids
+            )
+        )
+    return fanout
+
+
+async def test_fanout_renders_body_once_for_all_rooms():
+    client = StubHomeserver(latency=0)
+    room_ids = [f"!room{index}:test" for index in range(5)]
+
+    with patch(
+        "mmrelay.matrix.relay._render_matrix_body", return_value=("hi", "<b>hi</b>")
+    ) as render:
+        fanout = await _relay_to_rooms(client, "**hi**", room_ids)
+
+    render.assert_called_once_with("**hi**")
+    assert sorted(room for room, _body in client.sent) == sorted(room_ids)
+    assert set(fanout.latencies) == set(room_ids)
+
+
+async def test_dispatcher_bounds_concurrency_and_keeps_room_order():
+    dispatcher = MatrixFanoutDispatcher(max_concurrency=2)
+    in_flight = 0
+    max_in_flight = 0
+    delivered: dict[str, list[int]] = {}
+
+    async def send(room_id: str, sequence: int) -> None:
+        nonlocal in_flight, max_in_flight
+        async with dispatcher.room_slot(room_id):
+            in_flight += 1
+            max_in_flight = max(max_in_flight, in_flight)
+            await asyncio.sleep(0.001 * (5 - sequence))
+            delivered.setdefault(room_id, []).append(sequence)
+            in_flight -= 1
+
+    await asyncio.gather(
+        *(send(room, sequence) for sequence in range(5) for room in ("!a", "!b", "!c"))
+    )
+
+    assert max_in_flight == 2
+    assert delivered == {room: list(range(5)) for room in ("!a", "!b", "!c")}
+
+
+async def test_dispatcher_records_per_room_latency():
+    dispatcher = MatrixFanoutDispatcher()
+    dispatcher.record_latency("!a", 0.010)
+    dispatcher.record_latency("!a", 0.030)
+
+    stats = dispatcher.get_stats()["!a"]
+
+    assert stats["count"] == 2
+    assert stats["last_ms"] == pytest.approx(30)
+    assert stats["avg_ms"] == pytest.approx(20)
+    assert stats["max_ms"] == pytest.approx(30)
+
+
+@pytest.mark.performance
+@pytest.mark.parametrize("room_count", [1, 10, 50])
+async def test_fanout_time_to_last_room_delivered(room_count):
+    client = StubHomeserver()
+    room_ids = [f"!room{index}:test" for index in range(room_count)]
+
+    started = time.monotonic()
+    fanout = await _relay_to_rooms(client, "hello mesh", room_ids)
+    elapsed = time.monotonic() - started
+
+    last_delivery = max(fanout.latencies.values())
+    print(
+        f"\n{room_count} rooms: last room delivered after {last_delivery * 1000:.1f} ms "
+        f"(max {client.max_in_flight} sends in flight)"
+    )
+    assert len(client.sent) == room_count
+    assert client.max_in_flight <= 8
+    # Sends run in parallel up to the concurrency limit rather than one by one.
+    batches = -(-room_count // client.max_in_flight)
+    assert elapsed < (batches + 2) * STUB_SEND_LATENCY + 0.5
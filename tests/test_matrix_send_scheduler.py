@@ -0,0 +1,245 @@
+"""Tests for the per-homeserver Matrix send scheduler."""
+
+import asyncio
+import importlib
+import sys
+import time
+from unittest.mock import patch
+
+import pytest
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+
+from mmrelay.constants.network import MATRIX_ERRCODE_LIMIT_EXCEEDED
+from mmrelay.matrix.send_scheduler import HomeserverSendScheduler
+from mmrelay.matrix_utils import (
+    _initialize_matrix_client,
+    get_send_scheduler,
+    matrix_relay,
+    reset_send_schedulers,
+    start_matrix_fanout,
+    watch_rate_limited_responses,
+)
+
+pytestmark = pytest.mark.asyncio
+
+RETRY_AFTER_MS = 200
+ROOMS = ("!a:test", "!b:test")
+
+
+def _import_installed_nio():
+    """Import the installed nio package past the sys.modules mock from tests/mocks.py."""
+
+    def is_nio(name: str) -> bool:
+        return name == "nio" or name.startswith("nio.")
+
+    mocked = {name: module for name, module in sys.modules.items() if is_nio(name)}
+    for name in mocked:
+        del sys.modules[name]
+    try:
+        return importlib.import_module("nio")
+    finally:
+        for name in [name for name in sys.modules if is_nio(name)]:
+            del sys.modules[name]
+        sys.modules.update(mocked)
+
+
+real_nio = _import_installed_nio()
+
+
+@pytest.fixture(autouse=True)
+def fresh_schedulers():
+    reset_send_schedulers()
+    yield
+    reset_send_schedulers()
+
+
+class ScriptedHomeserver:
+    """aiohttp stub of the Matrix send endpoint that answers 429 to scripted requests."""
+
+    def __init__(self, limited_requests: set[int]) -> None:
+        self.limited_requests = limited_requests
+        self.requests: list[tuple[float, str, str, int]] = []
+        self.delivered: list[tuple[str, str]] = []
+        self.app = web.Application()
+        self.app.router.add_put(
+            "/_matrix/client/v3/rooms/{room_id}/send/{event_type}/{txn_id}",
+            self.handle_send,
+        )
+
+    async def handle_send(self, request: web.Request) -> web.Response:
+        body = (await request.json())["body"]
+        room_id = request.match_info["room_id"]
+        number = len(self.requests)
+        if number in self.limited_requests:
+            self.requests.append((time.monotonic(), room_id, body, 429))
+            return web.json_response(
+                {
+                    "errcode": MATRIX_ERRCODE_LIMIT_EXCEEDED,
+                    "error": "Too Many Requests",
+                    "retry_after_ms": RETRY_AFTER_MS,
+                },
+                status=429,
+            )
+        self.requests.append((time.monotonic(), room_id, body, 200))
+        self.delivered.append((room_id, body))
+        return web.json_response({"event_id": f"$event{number}"})
+
+    def assert_delivered_in_room_order(self, messages: list[tuple[str, str]]) -> None:
+        assert sorted(self.delivered) == sorted(messages)
+        for room_id in ROOMS:
+            assert [body for room, body in self.delivered if room == room_id] == [
+                body for room, body in messages if room == room_id
+            ]
+
+    def assert_quiet_during_window(self) -> None:
+        """No request reaches the server inside the window opened by the first 429."""
+        first_limit = next(t for t, *_rest, status in self.requests if status == 429)
+        window_end = first_limit + RETRY_AFTER_MS / 1000
+        late_requests = [t for t, *_rest in self.requests if t > first_limit + 0.02]
+        assert all(t >= window_end - 0.02 for t in late_requests)
+
+
+def _messages(per_room: int) -> list[tuple[str, str]]:
+    return [
+        (room_id, f"{room_id}-{sequence}")
+        for sequence in range(per_room)
+        for room_id in ROOMS
+    ]
+
+
+async def _relay_all(client, messages: list[tuple[str, str]]) -> None:
+    config = {"meshtastic": {"meshnet_name": "TestMesh"}}
+    with (
+        patch("mmrelay.matrix_utils.config", config),
+        patch("mmrelay.matrix_utils.connect_matrix", return_value=client),
+        patch("mmrelay.matrix_utils.join_matrix_room"),
+        patch(
+            "mmrelay.matrix_utils.get_interaction_settings",
+            return_value={"reactions": False, "replies": False},
+        ),
+        patch("mmrelay.matrix_utils.message_storage_enabled", return_value=False),
+        patch("mmrelay.matrix.relay.RoomSendError", real_nio.RoomSendError),
+    ):
+        await asyncio.gather(
+            *(
+                matrix_relay(
+                    room_id,
+                    body,
+                    "Alice",
+                    "A",
+                    "TestMesh",
+                    1,
+                    fanout=start_matrix_fanout(body, [room_id]),
+                )
+                for room_id, body in messages
+            )
+        )
+
+
+def _log_in(client) -> None:
+    client.user_id = "@relay:test"
+    client.access_token = "token"
+
+
+async def test_runtime_client_429s_share_one_backoff_window_and_keep_room_order():
+    homeserver = ScriptedHomeserver(limited_requests={0, 1})
+    server = TestServer(homeserver.app)
+    await server.start_server()
+    messages = _messages(per_room=3)
+    try:
+        # Built exactly as connect_matrix builds the relay's client.
+        with (
+            patch("mmrelay.matrix_utils.AsyncClient", real_nio.AsyncClient),
+            patch(
+                "mmrelay.matrix.client_config.AsyncClientConfig",
+                real_nio.AsyncClientConfig,
+            ),
+        ):
+            client = _initialize_matrix_client(
+                str(server.make_url("")).rstrip("/"),
+                "@relay:test",
+                None,
+                False,
+                None,
+                None,
+            )
+        _log_in(client)
+        # Keep the paced phase after the window short for the test.
+        get_send_scheduler(client).rate_after_limit = 10.0
+        try:
+            await _relay_all(client, messages)
+        finally:
+            await client.close()
+    finally:
+        await server.close()
+
+    homeserver.assert_delivered_in_room_order(messages)
+    homeserver.assert_quiet_during_window()
+
+    # nio hands each 429 back to the relay once; the response callback does
+    # not count the same 429 a second time.
+    status = get_send_scheduler(client).get_status()
+    assert status["rate_limited"] == 2
+    assert status["rate_per_sec"] is not None
+
+
+async def test_429s_retried_inside_nio_still_open_the_shared_window():
+    homeserver = ScriptedHomeserver(limited_requests={0})
+    server = TestServer(homeserver.app)
+    await server.start_server()
+    messages = _messages(per_room=2)
+    try:
+        # nio's default config retries 429s itself and never returns them.
+        client = real_nio.AsyncClient(str(server.make_url("")).rstrip("/"))
+        watch_rate_limited_responses(client)
+        _log_in(client)
+        get_send_scheduler(client).rate_after_limit = 10.0
+        try:
+            await _relay_all(client, messages)
+        finally:
+            await client.close()
+    finally:
+        await server.close()
+
+    homeserver.assert_delivered_in_room_order(messages)
+    homeserver.assert_quiet_during_window()
+    assert get_send_scheduler(client).get_status()["rate_limited"] == 1
+
+
+class TestHomeserverSendScheduler:
+    async def test_unthrottled_until_first_limit(self):
+        scheduler = HomeserverSendScheduler()
+        with patch("mmrelay.matrix.send_scheduler.asyncio.sleep") as mock_sleep:
+            for _ in range(20):
+                await scheduler.acquire()
+        mock_sleep.assert_not_called()
+
+    async def test_rate_adapts_to_limits_and_recovers(self):
+        scheduler = HomeserverSendScheduler(
+            rate_after_limit=1.0, min_rate=0.25, max_rate=2.0, increase=0.5
+        )
+
+        assert scheduler.note_rate_limited(500) == pytest.approx(0.5, abs=0.05)
+        assert scheduler.rate == 1.0
+        scheduler.note_rate_limited(None)
+        scheduler.note_rate_limited("bogus")
+        assert scheduler.rate == 0.25
+
+        for _ in range(3):
+            scheduler.note_success()
+        assert scheduler.rate == 1.75
+        scheduler.note_success()
+        assert scheduler.rate is None
+
+    async def test_limit_extends_wait_of_already_waiting_sends(self):
+        scheduler = HomeserverSendScheduler()
+        scheduler.note_rate_limited(50)
+
+        started = time.monotonic()
+        waiter = asyncio.ensure_future(scheduler.acquire())
+        await asyncio.sleep(0.01)
+        scheduler.note_rate_limited(150)
+        await waiter
+
+        assert time.monotonic() - started >= 0.15
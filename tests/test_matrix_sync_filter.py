@@ -0,0 +1,333 @@
+"""Tests for the Matrix sync filter and persisted sync token resume."""
+
+import json
+import time
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from aiohttp import ClientSession, web
+from aiohttp.test_utils import TestServer
+from nio import SyncError
+
+from mmrelay.constants.network import MATRIX_SYNC_FIRST_TIMELINE_LIMIT
+from mmrelay.matrix_utils import (
+    SyncTokenRecorder,
+    _perform_initial_sync,
+    build_sync_filter,
+    connect_matrix,
+    load_sync_token,
+    save_sync_token,
+)
+
+HOMESERVER = "https://example.org"
+BOT_USER_ID = "@bot:example.org"
+
+
+@pytest.fixture
+def token_path(tmp_path, monkeypatch):
+    path = tmp_path / "matrix" / "sync_token.json"
+    monkeypatch.setattr("mmrelay.matrix.sync_filter.get_sync_token_path", lambda: path)
+    return path
+
+
+class TestBuildSyncFilter:
+    def test_limits_sync_to_mapped_room_ids(self):
+        sync_filter = build_sync_filter(
+            [{"id": "!b:test"}, "!a:test", {"id": "!a:test"}], timeline_limit=1
+        )
+
+        assert sync_filter["presence"] == {"not_types": ["*"]}
+        assert sync_filter["account_data"] == {"not_types": ["*"]}
+        room = sync_filter["room"]
+        assert room["rooms"] == ["!a:test", "!b:test"]
+        assert room["state"] == {"lazy_load_members": True}
+        assert room["timeline"] == {"lazy_load_members": True, "limit": 1}
+        assert room["ephemeral"] == {"not_types": ["*"]}
+        assert "invite" not in room
+
+    def test_unresolved_alias_keeps_all_rooms(self):
+        sync_filter = build_sync_filter({"one": "!a:test", "two": "#alias:test"})
+
+        assert "rooms" not in sync_filter["room"]
+        assert "limit" not in sync_filter["room"]["timeline"]
+
+    def test_invite_safe_filter_excludes_invites(self):
+        sync_filter = build_sync_filter(["!a:test"], invite_safe=True)
+
+        assert sync_filter["room"]["invite"] == {"limit": 0}
+        assert sync_filter["room"]["rooms"] == ["!a:test"]
+
+
+class TestSyncTokenPersistence:
+    async def test_round_trip_is_scoped_to_session(self, token_path):
+        save_sync_token(HOMESERVER, BOT_USER_ID, "DEVICE", "s42")
+
+        assert load_sync_token(HOMESERVER, BOT_USER_ID, "DEVICE") == "s42"
+        assert load_sync_token(HOMESERVER, BOT_USER_ID, "OTHER") is None
+        assert load_sync_token(HOMESERVER, "@other:example.org", "DEVICE") is None
+
+        token_path.write_text("not json", encoding="utf-8")
+        assert load_sync_token(HOMESERVER, BOT_USER_ID, "DEVICE") is None
+
+    async def test_recorder_rate_limits_writes(self, token_path):
+        recorder = SyncTokenRecorder(HOMESERVER, BOT_USER_ID, None, min_interval=60)
+
+        await recorder(SimpleNamespace(next_batch="s1"))
+        await recorder(SimpleNamespace(next_batch="s2"))
+        await recorder(SimpleNamespace(next_batch=None))
+
+        assert json.loads(token_path.read_text(encoding="utf-8"))["next_batch"] == "s1"
+        recorder.min_interval = 0
+        await recorder(SimpleNamespace(next_batch="s3"))
+        assert load_sync_token(HOMESERVER, BOT_USER_ID, None) == "s3"
+
+
+async def test_connect_matrix_resumes_and_drops_rejected_token(token_path, monkeypatch):
+    save_sync_token(HOMESERVER, BOT_USER_ID, None, "stale")
+    mock_client = MagicMock()
+    mock_client.rooms = {}
+    # SyncError is an exception class in the test mocks, so return it rather
+    # than letting AsyncMock raise it.
+    responses = iter([SyncError("unknown since"), SimpleNamespace(next_batch="s2")])
+    mock_client.sync = AsyncMock(side_effect=lambda **_kwargs: next(responses))
+    mock_client.close = AsyncMock()
+    mock_client.should_upload_keys = False
+    mock_client.get_displayname = AsyncMock(
+        return_value=SimpleNamespace(displayname="Bot")
+    )
+
+    monkeypatch.setattr(
+        "mmrelay.matrix_utils.AsyncClient", lambda *_a, **_k: mock_client
+    )
+    monkeypatch.setattr(
+        "mmrelay.matrix_utils._create_ssl_context", lambda: MagicMock(), raising=False
+    )
+    monkeypatch.setattr(
+        "mmrelay.matrix_utils.config",
+        {
+            "matrix": {
+                "homeserver": HOMESERVER,
+                "access_token": "token",
+                "bot_user_id": BOT_USER_ID,
+            },
+            "matrix_rooms": [{"id": "!room:example", "meshtastic_channel": 0}],
+        },
+        raising=False,
+    )
+    monkeypatch.setattr("mmrelay.matrix_utils.matrix_client", None, raising=False)
+
+    client = await connect_matrix()
+
+    assert client is mock_client
+    first, retry = mock_client.sync.await_args_list
+    assert first.kwargs["since"] == "stale"
+    assert first.kwargs["sync_filter"]["room"]["rooms"] == ["!room:example"]
+    assert retry.kwargs["since"] is None
+    assert load_sync_token(HOMESERVER, BOT_USER_ID, None) == "s2"
+    assert client.mmrelay_sync_filter["room"]["rooms"] == ["!room:example"]
+    assert "limit" not in client.mmrelay_sync_filter["room"]["timeline"]
+    assert isinstance(client.mmrelay_sync_token_recorder, SyncTokenRecorder)
+
+
+# A synthetic account shaped like a recorded large one: the bot sits in many
+# busy rooms, only a couple of which are mapped to Meshtastic channels.
+LARGE_ACCOUNT_ROOMS = 200
+LARGE_ACCOUNT_MEMBERS = 60
+LARGE_ACCOUNT_TIMELINE = 30
+MAPPED_ROOMS = ["!room0:test", "!room1:test"]
+
+
+def _large_account_fixture() -> dict:
+    rooms = {}
+    for index in range(LARGE_ACCOUNT_ROOMS):
+        room_id = f"!room{index}:test"
+        members = [
+            f"@user{index}_{member}:test" for member in range(LARGE_ACCOUNT_MEMBERS)
+        ]
+        state = [
+            {
+                "type": "m.room.create",
+                "state_key": "",
+                "content": {"creator": members[0]},
+            },
+            {
+                "type": "m.room.name",
+                "state_key": "",
+                "content": {"name": f"Room {index}"},
+            },
+            {"type": "m.room.topic", "state_key": "", "content": {"topic": "x" * 200}},
+        ] + [
+            {
+                "type": "m.room.member",
+                "state_key": member,
+                "sender": member,
+                "content": {"membership": "join", "displayname": member[1:12]},
+            }
+            for member in members
+        ]
+        timeline = [
+            {
+                "type": "m.room.message",
+                "sender": members[event % LARGE_ACCOUNT_MEMBERS],
+                "event_id": f"$e{index}_{event}",
+                "origin_server_ts": 1_700_000_000_000 + event,
+                "content": {"msgtype": "m.text", "body": f"message {event} " * 10},
+            }
+            for event in range(LARGE_ACCOUNT_TIMELINE)
+        ]
+        rooms[room_id] = {
+            "state": state,
+            "timeline": timeline,
+            "ephemeral": [{"type": "m.typing", "content": {"user_ids": members[:3]}}],
+            "account_data": [{"type": "m.tag", "content": {"tags": {}}}],
+        }
+    return {
+        "rooms": rooms,
+        "presence": [
+            {
+                "type": "m.presence",
+                "sender": f"@user0_{member}:test",
+                "content": {"presence": "online"},
+            }
+            for member in range(LARGE_ACCOUNT_MEMBERS)
+        ],
+        "account_data": [
+            {"type": "m.push_rules", "content": {"global": {"x": "y" * 2000}}}
+        ],
+    }
+
+
+def _excluded(section_filter: dict) -> bool:
+    return "*" in section_filter.get("not_types", [])
+
+
+class FixtureHomeserver:
+    """aiohttp homeserver that serves the large-account fixture and applies sync filters."""
+
+    def __init__(self) -> None:
+        self.fixture = _large_account_fixture()
+        self.sync_queries: list[dict] = []
+        self.app = web.Application()
+        self.app.router.add_get("/_matrix/client/v3/sync", self.handle_sync)
+
+    async def handle_sync(self, request: web.Request) -> web.Response:
+        query = dict(request.query)
+        self.sync_queries.append(query)
+        sync_filter = json.loads(query.get("filter", "{}"))
+        room_filter = sync_filter.get("room", {})
+        allowed = room_filter.get("rooms")
+        timeline_limit = room_filter.get("timeline", {}).get("limit", 10)
+        lazy = room_filter.get("state", {}).get("lazy_load_members", False)
+
+        joined = {}
+        for room_id, room in self.fixture["rooms"].items():
+            if allowed is not None and room_id not in allowed:
+                continue
+            timeline = room["timeline"][-timeline_limit:] if timeline_limit else []
+            state = room["state"]
+            if lazy:
+                senders = {event["sender"] for event in timeline}
+                state = [
+                    event
+                    for event in state
+                    if event["type"] != "m.room.member" or event["state_key"] in senders
+                ]
+            joined[room_id] = {
+                "state": {"events": state},
+                "timeline": {"events": timeline, "limited": True},
+                "ephemeral": {
+                    "events": (
+                        []
+                        if _excluded(room_filter.get("ephemeral", {}))
+                        else room["ephemeral"]
+                    )
+                },
+                "account_data": {
+                    "events": (
+                        []
+                        if _excluded(room_filter.get("account_data", {}))
+                        else room["account_data"]
+                    )
+                },
+            }
+        body = {
+            "next_batch": "s_fixture",
+            "rooms": {"join": joined},
+            "presence": {
+                "events": (
+                    []
+                    if _excluded(sync_filter.get("presence", {}))
+                    else self.fixture["presence"]
+                )
+            },
+            "account_data": {
+                "events": (
+                    []
+                    if _excluded(sync_filter.get("account_data", {}))
+                    else self.fixture["account_data"]
+                )
+            },
+        }
+        return web.json_response(body)
+
+
+class FixtureSyncClient:
+    """Client whose sync() issues the real HTTP request and counts bytes received."""
+
+    def __init__(self, homeserver: str, session: ClientSession) -> None:
+        self.homeserver = homeserver
+        self.bytes_received = 0
+        self._session = session
+
+    async def sync(self, timeout=None, sync_filter=None, since=None, full_state=None):
+        params = {"timeout": str(timeout or 0)}
+        if sync_filter is not None:
+            params["filter"] = json.dumps(sync_filter)
+        if since is not None:
+            params["since"] = since
+        if full_state:
+            params["full_state"] = "true"
+        async with self._session.get(
+            f"{self.homeserver}/_matrix/client/v3/sync", params=params
+        ) as response:
+            raw = await response.read()
+        self.bytes_received += len(raw)
+        return SimpleNamespace(next_batch=json.loads(raw)["next_batch"])
+
+
+async def _time_to_first_sync(homeserver_url, session, **kwargs) -> tuple[float, int]:
+    client = FixtureSyncClient(homeserver_url, session)
+    started = time.monotonic()
+    response = await _perform_initial_sync(client, homeserver_url, **kwargs)
+    elapsed = time.monotonic() - started
+    assert response.next_batch == "s_fixture"
+    return elapsed, client.bytes_received
+
+
+@pytest.mark.performance
+async def test_filtered_resume_sync_on_large_account():
+    homeserver = FixtureHomeserver()
+    server = TestServer(homeserver.app)
+    await server.start_server()
+    try:
+        async with ClientSession() as session:
+            url = str(server.make_url("")).rstrip("/")
+            legacy_secs, legacy_bytes = await _time_to_first_sync(url, session)
+            filtered_secs, filtered_bytes = await _time_to_first_sync(
+                url,
+                session,
+                sync_filter=build_sync_filter(
+                    MAPPED_ROOMS, timeline_limit=MATRIX_SYNC_FIRST_TIMELINE_LIMIT
+                ),
+                since="s_previous",
+            )
+    finally:
+        await server.close()
+
+    print(
+        f"\nunfiltered startup sync: {legacy_bytes / 1024:.0f} KiB in {legacy_secs * 1000:.0f} ms; "
+        f"filtered resume: {filtered_bytes / 1024:.1f} KiB in {filtered_secs * 1000:.0f} ms"
+    )
+    assert homeserver.sync_queries[-1]["since"] == "s_previous"
+    assert filtered_bytes * 100 < legacy_bytes
@@ -5,17 +5,22 @@ import pytest
 
 from mmrelay.constants.database import DEFAULT_MSGS_TO_KEEP
 from mmrelay.matrix_utils import (
+    PrefixTemplate,
     _add_truncated_vars,
     _can_auto_create_credentials,
+    _compile_prefix_template,
     _create_mapping_info,
     _escape_leading_prefix_for_markdown,
     _extract_localpart_from_mxid,
     _get_msgs_to_keep_config,
+    _get_prefix_template,
     _get_valid_device_id,
     _is_room_alias,
     _iter_room_alias_entries,
     _normalize_bot_user_id,
     _update_room_id_in_mapping,
+    clear_prefix_template_cache,
+    compile_prefix_templates,
     format_reply_message,
     get_interaction_settings,
     get_matrix_prefix,
@@ -403,6 +408,71 @@ def test_get_matrix_prefix_default_format():
     assert result == "[Alice/TestMesh]: "  # Default format
 
 
+def test_compile_prefix_template_only_references_used_fields():
+    """A compiled template computes only the fields its format string mentions."""
+    template = _compile_prefix_template(
+        "[{long4}/{mesh}]: ", frozenset({"long", "short", "mesh"}), frozenset({"long"})
+    )
+
+    assert template.fields == (("long4", "long", 4), ("mesh", "mesh", None))
+    assert template.sources == ("long", "mesh")
+    assert template.render({"long": "Alice", "mesh": "Mesh"}) == "[Alic/Mesh]: "
+
+
+@pytest.mark.parametrize(
+    "format_string, error_type",
+    [
+        pytest.param("{display21}", KeyError, id="truncation_too_long"),
+        pytest.param("{display0}", KeyError, id="truncation_zero"),
+        pytest.param("{user3}", KeyError, id="field_without_truncation"),
+        pytest.param("{}", IndexError, id="positional"),
+        pytest.param("{display", ValueError, id="unbalanced"),
+        pytest.param("{display:d}", ValueError, id="bad_format_spec"),
+    ],
+)
+def test_compile_prefix_template_rejects_invalid_formats(format_string, error_type):
+    with pytest.raises(error_type):
+        _compile_prefix_template(
+            format_string,
+            frozenset({"display", "user"}),
+            frozenset({"display"}),
+        )
+
+
+def test_prefix_template_memoizes_rendered_output():
+    clear_prefix_template_cache()
+    config = {"matrix": {"prefix_format": "[{short}|{mesh6}]: "}}
+
+    first = get_matrix_prefix(config, "Alice", "A", "TestMesh")
+    template, error = _get_prefix_template("matrix", "[{short}|{mesh6}]: ")
+    assert error is None
+    assert template is not None
+
+    with patch.object(PrefixTemplate, "_format") as mock_format:
+        second = get_matrix_prefix(config, "Alice Other", "A", "TestMesh")
+
+    assert first == second == "[A|TestMe]: "
+    mock_format.assert_not_called()
+    clear_prefix_template_cache()
+
+
+def test_compile_prefix_templates_reports_invalid_formats_once():
+    clear_prefix_template_cache()
+    config = {
+        "meshtastic": {"prefix_format": "{nickname}: "},
+        "matrix": {"prefix_enabled": False, "prefix_format": "{bogus}"},
+    }
+
+    with patch("mmrelay.matrix_utils.logger") as mock_logger:
+        errors = compile_prefix_templates(config)
+        assert get_meshtastic_prefix(config, "Alice") == "Alice[M]: "
+
+    assert set(errors) == {"meshtastic"}
+    assert "nickname" in errors["meshtastic"]
+    mock_logger.warning.assert_called_once()
+    clear_prefix_template_cache()
+
+
 def test_truncate_message_under_limit():
     """
     Tests that a message shorter than the specified byte limit is not truncated by the truncate_message function.
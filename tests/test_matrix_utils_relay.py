@@ -456,7 +456,8 @@ async def test_matrix_relay_reply_formatting(
     with (
         patch("mmrelay.matrix_utils.config", config),
         patch(
-            "mmrelay.matrix_utils.get_message_map_by_matrix_event_id",
+            "mmrelay.matrix_utils.async_get_message_map_by_matrix_event_id",
+            new_callable=AsyncMock,
             return_value=("mesh_id", "!room:matrix.org", "original", "TestMesh"),
         ),
     ):
@@ -503,7 +504,8 @@ async def test_matrix_relay_reply_plain_text_not_html_escaped(
     with (
         patch("mmrelay.matrix_utils.config", config),
         patch(
-            "mmrelay.matrix_utils.get_message_map_by_matrix_event_id",
+            "mmrelay.matrix_utils.async_get_message_map_by_matrix_event_id",
+            new_callable=AsyncMock,
             return_value=(
                 "mesh_id",
                 "!room:matrix.org",
@@ -686,7 +688,8 @@ async def test_matrix_relay_reply_missing_mapping_logs_warning(
     with (
         patch("mmrelay.matrix_utils.config", config),
         patch(
-            "mmrelay.matrix_utils.get_message_map_by_matrix_event_id",
+            "mmrelay.matrix_utils.async_get_message_map_by_matrix_event_id",
+            new_callable=AsyncMock,
             return_value=None,
         ),
     ):
@@ -1303,7 +1306,8 @@ async def test_on_room_message_reaction_enabled(mock_room, test_config):
         patch("mmrelay.plugin_loader.load_plugins", return_value=[]),
         patch("mmrelay.matrix_utils.get_user_display_name", return_value="MockUser"),
         patch(
-            "mmrelay.matrix_utils.get_message_map_by_matrix_event_id",
+            "mmrelay.matrix_utils.async_get_message_map_by_matrix_event_id",
+            new_callable=AsyncMock,
             return_value=(
                 "12345",
                 TEST_ROOM_ID,
@@ -1391,7 +1395,8 @@ async def test_on_room_message_reaction_non_numeric_meshtastic_id(
         patch("mmrelay.plugin_loader.load_plugins", return_value=[]),
         patch("mmrelay.matrix_utils.get_user_display_name", return_value="MockUser"),
         patch(
-            "mmrelay.matrix_utils.get_message_map_by_matrix_event_id",
+            "mmrelay.matrix_utils.async_get_message_map_by_matrix_event_id",
+            new_callable=AsyncMock,
             return_value=(
                 "mesh_id",
                 TEST_ROOM_ID,
@@ -1478,7 +1483,8 @@ async def test_on_room_message_reaction_mapped_int_id(mock_room, test_config):
         patch("mmrelay.plugin_loader.load_plugins", return_value=[]),
         patch("mmrelay.matrix_utils.get_user_display_name", return_value="MockUser"),
         patch(
-            "mmrelay.matrix_utils.get_message_map_by_matrix_event_id",
+            "mmrelay.matrix_utils.async_get_message_map_by_matrix_event_id",
+            new_callable=AsyncMock,
             return_value=(12345, TEST_ROOM_ID, "original_text", "test_mesh"),
         ),
         patch(
@@ -1560,7 +1566,8 @@ async def test_on_room_message_reaction_unexpected_type_logs_warning(
         patch("mmrelay.plugin_loader.load_plugins", return_value=[]),
         patch("mmrelay.matrix_utils.get_user_display_name", return_value="MockUser"),
         patch(
-            "mmrelay.matrix_utils.get_message_map_by_matrix_event_id",
+            "mmrelay.matrix_utils.async_get_message_map_by_matrix_event_id",
+            new_callable=AsyncMock,
             return_value=(12.5, TEST_ROOM_ID, "original_text", "test_mesh"),
         ),
         patch(
@@ -2114,7 +2121,8 @@ async def test_on_room_message_reaction_missing_mapping_logs_debug(
     with (
         patch("mmrelay.plugin_loader.load_plugins", return_value=[]),
         patch(
-            "mmrelay.matrix_utils.get_message_map_by_matrix_event_id",
+            "mmrelay.matrix_utils.async_get_message_map_by_matrix_event_id",
+            new_callable=AsyncMock,
             return_value=None,
         ),
         patch("mmrelay.matrix_utils.logger") as mock_logger,
@@ -2175,7 +2183,8 @@ async def test_on_room_message_local_reaction_queue_failure_logs(
     with (
         patch("mmrelay.plugin_loader.load_plugins", return_value=[]),
         patch(
-            "mmrelay.matrix_utils.get_message_map_by_matrix_event_id",
+            "mmrelay.matrix_utils.async_get_message_map_by_matrix_event_id",
+            new_callable=AsyncMock,
             return_value=("12345", mock_room.room_id, "text", "meshnet"),
         ),
         patch(
@@ -2634,9 +2643,9 @@ async def test_on_room_message_emote_reaction_uses_original_event_id(monkeypatch
     )
 
     mapping = ("mesh_id", room_id, "text", "meshnet")
-    get_map_mock = MagicMock(return_value=mapping)
+    get_map_mock = AsyncMock(return_value=mapping)
     monkeypatch.setattr(
-        "mmrelay.matrix_utils.get_message_map_by_matrix_event_id",
+        "mmrelay.matrix_utils.async_get_message_map_by_matrix_event_id",
         get_map_mock,
         raising=False,
     )
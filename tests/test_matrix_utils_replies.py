@@ -40,7 +40,8 @@ async def test_handle_matrix_reply_returns_false_on_send_failure():
             return_value=InlineExecutorLoop(loop),
         ),
         patch(
-            "mmrelay.matrix_utils.get_message_map_by_matrix_event_id",
+            "mmrelay.matrix_utils.async_get_message_map_by_matrix_event_id",
+            new_callable=AsyncMock,
             return_value=(123, "!room", "text", "local"),
         ),
         patch(
@@ -100,7 +101,8 @@ async def test_handle_matrix_reply_success():
             return_value=InlineExecutorLoop(loop),
         ),
         patch(
-            "mmrelay.matrix_utils.get_message_map_by_matrix_event_id"
+            "mmrelay.matrix_utils.async_get_message_map_by_matrix_event_id",
+            new_callable=AsyncMock,
         ) as mock_db_lookup,
         patch(
             "mmrelay.matrix_utils.send_reply_to_meshtastic",
@@ -153,7 +155,8 @@ async def test_handle_matrix_reply_numeric_string_reply_id():
             return_value=InlineExecutorLoop(loop),
         ),
         patch(
-            "mmrelay.matrix_utils.get_message_map_by_matrix_event_id"
+            "mmrelay.matrix_utils.async_get_message_map_by_matrix_event_id",
+            new_callable=AsyncMock,
         ) as mock_db_lookup,
         patch(
             "mmrelay.matrix_utils.send_reply_to_meshtastic",
@@ -199,7 +202,8 @@ async def test_handle_matrix_reply_unexpected_id_type_broadcasts():
             return_value=InlineExecutorLoop(loop),
         ),
         patch(
-            "mmrelay.matrix_utils.get_message_map_by_matrix_event_id"
+            "mmrelay.matrix_utils.async_get_message_map_by_matrix_event_id",
+            new_callable=AsyncMock,
         ) as mock_db_lookup,
         patch(
             "mmrelay.matrix_utils.send_reply_to_meshtastic",
@@ -247,7 +251,8 @@ async def test_handle_matrix_reply_integer_id():
             return_value=InlineExecutorLoop(loop),
         ),
         patch(
-            "mmrelay.matrix_utils.get_message_map_by_matrix_event_id"
+            "mmrelay.matrix_utils.async_get_message_map_by_matrix_event_id",
+            new_callable=AsyncMock,
         ) as mock_db_lookup,
         patch(
             "mmrelay.matrix_utils.send_reply_to_meshtastic",
@@ -294,7 +299,8 @@ async def test_handle_matrix_reply_original_not_found():
             return_value=InlineExecutorLoop(loop),
         ),
         patch(
-            "mmrelay.matrix_utils.get_message_map_by_matrix_event_id"
+            "mmrelay.matrix_utils.async_get_message_map_by_matrix_event_id",
+            new_callable=AsyncMock,
         ) as mock_db_lookup,
         patch("mmrelay.matrix_utils.logger") as mock_logger,
     ):
@@ -632,7 +638,8 @@ async def test_handle_matrix_reply_local_user_not_treated_as_remote():
             return_value=InlineExecutorLoop(loop),
         ),
         patch(
-            "mmrelay.matrix_utils.get_message_map_by_matrix_event_id"
+            "mmrelay.matrix_utils.async_get_message_map_by_matrix_event_id",
+            new_callable=AsyncMock,
         ) as mock_db_lookup,
         patch(
             "mmrelay.matrix_utils.send_reply_to_meshtastic",
@@ -0,0 +1,182 @@
+"""Tests for the content-addressed cache of uploaded Matrix images."""
+
+import time
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, patch
+
+import pytest
+from nio import UploadResponse
+
+import mmrelay.matrix_utils as mx
+from mmrelay import db_utils
+from mmrelay.constants.database import MEDIA_CACHE_MAX_AGE_SECS
+from mmrelay.db_runtime import DatabaseManager
+from mmrelay.db_utils import MediaCacheEntry
+from mmrelay.matrix.media_cache import MediaCache
+
+ROOM_ID = "!maps:stub"
+SECRET_ROOM_ID = "!secret:stub"
+
+
+class _StubHomeserver:
+    """Matrix client whose media repository counts uploads."""
+
+    homeserver = "https://stub"
+
+    def __init__(self) -> None:
+        self.rooms: dict = {}
+        self.uploads: list[dict] = []
+        self.room_send = AsyncMock()
+
+    async def upload(self, data, content_type, filename, filesize, encrypt=False):
+        self.uploads.append({"filename": filename, "encrypt": encrypt})
+        uri = f"mxc://stub/{len(self.uploads)}"
+        decryption_info = (
+            {"key": {"k": f"key-{len(self.uploads)}"}, "iv": "iv", "v": "v2"}
+            if encrypt
+            else None
+        )
+        return SimpleNamespace(content_uri=uri), decryption_info
+
+    def sent_content(self) -> list[dict]:
+        return [call.kwargs["content"] for call in self.room_send.call_args_list]
+
+
+class _Render:
+    """Stand-in for a rendered Pillow image; PIL is mocked in the test suite."""
+
+    def __init__(self, color: str) -> None:
+        self.color = color
+
+    def save(self, buffer, format) -> None:
+        buffer.write(f"{format}:{self.color}".encode() * 64)
+
+
+def _render(color: str = "red") -> _Render:
+    return _Render(color)
+
+
+@pytest.fixture
+def manager(tmp_path):
+    db_manager = DatabaseManager(str(tmp_path / "meshtastic.sqlite"))
+    with (
+        patch("mmrelay.db_utils._get_db_manager", return_value=db_manager),
+        patch("mmrelay.db_utils.get_db_path", return_value=db_manager._path),
+    ):
+        db_utils.initialize_database()
+        yield db_manager
+    db_manager.close()
+
+
+@pytest.fixture
+def cache(manager):
+    mx.reset_media_cache()
+    status_service = mx.get_e2ee_status_service()
+    status_service.reset()
+    yield mx.get_media_cache()
+    mx.reset_media_cache()
+    status_service.reset()
+
+
+async def test_repeat_renders_upload_once(cache):
+    client = _StubHomeserver()
+
+    for _ in range(20):
+        await mx.send_image(client, ROOM_ID, _render(), "map.png")
+
+    assert len(client.uploads) == 1
+    assert [c["url"] for c in client.sent_content()] == ["mxc://stub/1"] * 20
+
+    # A changed render, or the same render as JPEG, is new content.
+    await mx.send_image(client, ROOM_ID, _render("blue"), "map.png")
+    await mx.send_image(client, ROOM_ID, _render(), "map.jpg")
+    await mx.send_image(client, ROOM_ID, _render("blue"), "map.png")
+    assert len(client.uploads) == 3
+
+
+async def test_cached_plain_upload_returns_upload_response(cache):
+    client = _StubHomeserver()
+
+    await mx.upload_image(client, _render(), "map.png")
+    cached = await mx.upload_image(client, _render(), "map.png")
+    encrypted = await mx.upload_image(client, _render(), "map.png", encrypt=True)
+    cached_encrypted = await mx.upload_image(client, _render(), "map.png", encrypt=True)
+
+    assert len(client.uploads) == 2
+    assert type(cached) is UploadResponse
+    assert cached.content_uri == "mxc://stub/1"
+    assert cached_encrypted == encrypted
+    assert cached_encrypted.file_info["key"] == {"k": "key-2"}
+
+
+async def test_encrypted_rooms_reuse_encrypted_uploads(cache):
+    client = _StubHomeserver()
+    mx.get_e2ee_status_service().note_room_encrypted(SECRET_ROOM_ID)
+
+    await mx.send_image(client, ROOM_ID, _render(), "map.png")
+    for _ in range(3):
+        await mx.send_image(client, SECRET_ROOM_ID, _render(), "map.png")
+
+    # The plain upload is never reused for the encrypted room, or vice versa.
+    assert [u["encrypt"] for u in client.uploads] == [False, True]
+    plain, *encrypted = client.sent_content()
+    assert plain["url"] == "mxc://stub/1" and "file" not in plain
+    for content in encrypted:
+        assert "url" not in content
+        assert content["file"] == {
+            "key": {"k": "key-2"},
+            "iv": "iv",
+            "v": "v2",
+            "url": "mxc://stub/2",
+        }
+
+
+async def test_persisted_index_survives_restart(cache):
+    client = _StubHomeserver()
+    await mx.send_image(client, ROOM_ID, _render(), "map.png")
+
+    mx.reset_media_cache()
+    await mx.send_image(client, ROOM_ID, _render(), "map.png")
+    assert len(client.uploads) == 1
+
+    # Another homeserver has its own media repository.
+    other = _StubHomeserver()
+    other.homeserver = "https://elsewhere"
+    await mx.send_image(other, ROOM_ID, _render(), "map.png")
+    assert len(other.uploads) == 1
+
+
+def test_lru_limit_and_expiry(manager):
+    now = time.time()
+    cache = MediaCache(max_entries=3)
+    for index in range(4):
+        cache.store(
+            MediaCacheEntry(
+                "hs", f"{index:064x}", False, f"mxc://hs/{index}", None, now
+            )
+        )
+        # Touch the first entry so it outlives the second.
+        assert cache.lookup("hs", f"{0:064x}", False, now=now) is not None
+
+    assert len(cache) == 3
+    assert cache.lookup("hs", f"{1:064x}", False, now=now) is None
+    assert len(db_utils.load_media_cache(now, 10)) == 3
+
+    later = now + MEDIA_CACHE_MAX_AGE_SECS + 1
+    assert cache.lookup("hs", f"{0:064x}", False, now=later) is None
+    assert db_utils.load_media_cache(later, 10) == []
+    assert MediaCache(max_entries=3).lookup("hs", f"{3:064x}", False, now=later) is None
+
+
+async def test_failed_uploads_are_not_cached(cache):
+    client = _StubHomeserver()
+    client.upload = AsyncMock(
+        return_value=(SimpleNamespace(message="quota", status_code="M_LIMIT"), None)
+    )
+
+    for _ in range(2):
+        with pytest.raises(mx.ImageUploadError):
+            await mx.send_image(client, ROOM_ID, _render(), "map.png")
+
+    assert client.upload.await_count == 2
+    assert len(cache) == 0
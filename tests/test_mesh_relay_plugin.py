@@ -10,7 +10,9 @@ Tests the core mesh-to-Matrix relay functionality including:
 - Meshtastic packet reconstruction
 """
 
+import asyncio
 import base64
+import json
 import os
 import sys
 import unittest
@@ -363,6 +365,41 @@ class TestMeshRelayPlugin(unittest.TestCase):
 
         asyncio.run(run_test())
 
+    @patch("mmrelay.plugins.mesh_relay_plugin.config")
+    @patch("mmrelay.matrix_utils.connect_matrix")
+    def test_handle_meshtastic_message_does_not_mutate_packet(
+        self, mock_connect, mock_config
+    ):
+        """
+        The relayed JSON carries a base64 payload without rewriting or stripping the caller's packet.
+        """
+        mock_matrix_client = MagicMock()
+        mock_matrix_client.room_send = AsyncMock()
+        mock_connect.return_value = mock_matrix_client
+        mock_config.get.return_value = [{"meshtastic_channel": 0, "id": TEST_ROOM_ID_1}]
+
+        packet = {
+            "decoded": {"portnum": "POSITION_APP", "payload": b"\x01\x02"},
+            "channel": 0,
+            "raw": object(),
+        }
+
+        result = asyncio.run(
+            self.plugin.handle_meshtastic_message(
+                packet, "formatted_message", "longname", "meshnet_name"
+            )
+        )
+
+        self.assertTrue(result)
+        content = mock_matrix_client.room_send.call_args.kwargs["content"]
+        self.assertEqual(
+            json.loads(content[MATRIX_PACKET_KEY]),
+            {"decoded": {"portnum": "POSITION_APP", "payload": "AQI="}, "channel": 0},
+        )
+        self.assertEqual(packet["decoded"]["payload"], b"\x01\x02")
+        self.assertIn("raw", packet)
+        self.plugin.strip_raw.assert_not_called()
+
     @patch("mmrelay.plugins.mesh_relay_plugin.config")
     @patch("mmrelay.matrix_utils.connect_matrix")
     def test_handle_meshtastic_message_no_channel_field(
@@ -0,0 +1,188 @@
+"""Tests for the Meshtastic packet ingest pool."""
+
+import threading
+from unittest.mock import patch
+
+import pytest
+
+import mmrelay.meshtastic_utils as mu
+from mmrelay.constants.queue import DEFAULT_INGEST_QUEUE_SIZE, DEFAULT_INGEST_WORKERS
+from mmrelay.meshtastic.ingest import PacketIngestPool, _get_ingest_settings
+
+
+@pytest.fixture
+def stop_global_pool():
+    yield
+    mu.stop_packet_ingest(timeout=2)
+
+
+class TestPacketIngestPool:
+    def test_preserves_per_sender_order_across_workers(self):
+        seen: dict[int, list[int]] = {}
+        lock = threading.Lock()
+
+        def handler(packet, _interface):
+            with lock:
+                seen.setdefault(packet["from"], []).append(packet["seq"])
+
+        pool = PacketIngestPool(handler, workers=4, max_queue_size=1000)
+        pool.start()
+        try:
+            for seq in range(50):
+                for sender in range(10):
+                    assert pool.submit({"from": sender, "seq": seq}, None)
+            assert pool.drain(timeout=5)
+        finally:
+            assert pool.stop(timeout=2)
+
+        assert set(seen) == set(range(10))
+        for sequence in seen.values():
+            assert sequence == list(range(50))
+        status = pool.get_status()
+        assert status["processed"] == status["received"] == 500
+        assert status["dropped"] == 0
+
+    def test_full_lane_drops_without_blocking(self):
+        release = threading.Event()
+        started = threading.Event()
+
+        def handler(_packet, _interface):
+            started.set()
+            release.wait(5)
+
+        pool = PacketIngestPool(handler, workers=1, max_queue_size=2)
+        pool.start()
+        try:
+            assert pool.submit({"from": 1, "id": 0}, None)
+            assert started.wait(2)
+            assert pool.submit({"from": 1, "id": 1}, None)
+            assert pool.submit({"from": 1, "id": 2}, None)
+            assert pool.submit({"from": 1, "id": 3}, None) is False
+
+            status = pool.get_status()
+            assert status["received"] == 4
+            assert status["dropped"] == 1
+            assert status["queued"] == 3
+        finally:
+            release.set()
+            assert pool.drain(timeout=5)
+            pool.stop(timeout=2)
+
+        assert pool.get_status()["processed"] == 3
+
+    def test_handler_errors_are_counted(self):
+        def handler(_packet, _interface):
+            raise RuntimeError("boom")
+
+        pool = PacketIngestPool(handler, workers=1, max_queue_size=10)
+        pool.start()
+        try:
+            pool.submit({"from": 1, "id": 9}, None)
+            assert pool.drain(timeout=5)
+        finally:
+            pool.stop(timeout=2)
+
+        assert pool.get_status()["errors"] == 1
+
+    def test_submit_after_stop_is_rejected(self):
+        pool = PacketIngestPool(lambda *_: None, workers=1, max_queue_size=10)
+        pool.start()
+        pool.stop(timeout=2)
+
+        assert pool.submit({"from": 1}, None) is False
+        assert pool.get_status()["received"] == 0
+
+    @pytest.mark.parametrize("workers, queue_size", [(0, 10), (2, 0), (-1, 10)])
+    def test_rejects_non_positive_sizes(self, workers, queue_size):
+        with pytest.raises(ValueError):
+            PacketIngestPool(
+                lambda *_: None, workers=workers, max_queue_size=queue_size
+            )
+
+
+class TestIngestSettings:
+    def test_defaults_when_unset(self):
+        assert _get_ingest_settings({}) == (
+            DEFAULT_INGEST_WORKERS,
+            DEFAULT_INGEST_QUEUE_SIZE,
+        )
+
+    def test_zero_workers_disables_pool(self):
+        assert _get_ingest_settings({"meshtastic": {"ingest_workers": 0}})[0] == 0
+
+    def test_invalid_values_fall_back(self):
+        assert _get_ingest_settings(
+            {"meshtastic": {"ingest_workers": "x", "ingest_queue_size": True}}
+        ) == (DEFAULT_INGEST_WORKERS, DEFAULT_INGEST_QUEUE_SIZE)
+
+
+@pytest.mark.usefixtures("stop_global_pool")
+class TestOnMeshtasticMessageIngest:
+    def test_reader_thread_only_enqueues(self):
+        handled = threading.Event()
+        handler_threads: list[str] = []
+
+        def fake_process(_packet, _interface):
+            handler_threads.append(threading.current_thread().name)
+            handled.set()
+
+        with patch(
+            "mmrelay.meshtastic.events._process_meshtastic_message",
+            side_effect=fake_process,
+        ):
+            assert mu.start_packet_ingest({"meshtastic": {"ingest_workers": 2}})
+            mu.on_meshtastic_message({"from": 5, "id": 1}, object())
+            assert handled.wait(2)
+            assert mu._packet_ingest_pool.drain(timeout=2)
+
+        assert handler_threads[0].startswith("mmrelay-ingest-")
+        assert mu.get_packet_ingest_status()["processed"] == 1
+
+    def test_packet_bookkeeping_runs_on_ingest_workers(self):
+        threads: dict[str, str] = {}
+
+        def record(step, result=None):
+            def _record(*_args):
+                threads[step] = threading.current_thread().name
+                return result
+
+            return _record
+
+        packet = {"from": 5, "id": 1}
+        with (
+            patch.object(mu, "meshtastic_client", None),
+            patch.object(
+                mu.get_node_metrics_store(),
+                "note_packet",
+                side_effect=record("metrics"),
+            ),
+            patch.object(
+                mu, "_accept_radio_packet", side_effect=record("dedupe", True)
+            ),
+            patch.object(mu, "fragment_reassembly_enabled", return_value=True),
+            patch.object(
+                mu.get_fragment_reassembler(),
+                "accept",
+                side_effect=record("fragments", [(packet, None)]),
+            ),
+            patch("mmrelay.meshtastic.events._process_meshtastic_message"),
+        ):
+            assert mu.start_packet_ingest({"meshtastic": {"ingest_workers": 2}})
+            mu.on_meshtastic_message(packet, None)
+            assert mu._packet_ingest_pool.drain(timeout=2)
+
+        assert set(threads) == {"metrics", "dedupe", "fragments"}
+        assert all(name.startswith("mmrelay-ingest-") for name in threads.values())
+
+    def test_inline_processing_when_disabled(self):
+        with patch(
+            "mmrelay.meshtastic.events._process_meshtastic_message"
+        ) as mock_process:
+            assert (
+                mu.start_packet_ingest({"meshtastic": {"ingest_workers": 0}}) is False
+            )
+            packet = {"from": 5, "id": 1}
+            mu.on_meshtastic_message(packet, None)
+
+        assert mu.get_packet_ingest_status() is None
+        mock_process.assert_called_once_with(packet, None)
@@ -0,0 +1,242 @@
+"""Tests for the multi-radio Meshtastic interface pool."""
+
+import asyncio
+import functools
+import itertools
+import time
+from unittest.mock import MagicMock, patch
+
+import mmrelay.meshtastic_utils as mu
+from mmrelay.meshtastic.interface_pool import InterfacePool
+from mmrelay.message_queue import MessageQueue
+from tests.mocks import MockMeshtasticInterface
+
+_node_nums = itertools.count(0x0A000001)
+
+
+def _fake_radio(connected: bool = True) -> MockMeshtasticInterface:
+    return MockMeshtasticInterface(my_node_num=next(_node_nums), connected=connected)
+
+
+def _pool_with_radios(count: int, **queue_kwargs) -> tuple[InterfacePool, list]:
+    pool = InterfacePool()
+    radios = [_fake_radio() for _ in range(count)]
+    for index, radio in enumerate(radios, start=1):
+        pool.add(f"radio{index}", radio, MessageQueue(**queue_kwargs))
+    return pool, radios
+
+
+class TestInterfacePoolReceive:
+    def test_packet_heard_by_several_radios_is_relayed_once(self):
+        pool, radios = _pool_with_radios(2)
+        primary = _fake_radio()
+        processed = []
+
+        with (
+            patch.object(mu, "_interface_pool", pool),
+            patch.object(mu, "_submit_to_packet_ingest", return_value=False),
+            patch(
+                "mmrelay.meshtastic.events._process_meshtastic_message",
+                side_effect=lambda packet, interface: processed.append(
+                    (packet, interface)
+                ),
+            ),
+        ):
+            for interface in (radios[0], primary, radios[1]):
+                mu.on_meshtastic_message({"from": 7, "id": 42}, interface)
+            mu.on_meshtastic_message({"from": 8, "id": 42}, primary)
+
+            sources = [
+                mu.get_packet_source_radio(interface)
+                for _packet, interface in processed
+            ]
+
+        assert [interface for _packet, interface in processed] == [radios[0], primary]
+        assert sources == ["radio1", "primary"]
+        # The source radio is not written into the packet handed to plugins.
+        assert [packet for packet, _interface in processed] == [
+            {"from": 7, "id": 42},
+            {"from": 8, "id": 42},
+        ]
+        assert pool.get_status()["duplicates_dropped"] == 2
+
+    def test_own_transmissions_overheard_by_another_radio_are_dropped(self):
+        pool, radios = _pool_with_radios(2)
+        primary = _fake_radio()
+        processed = []
+
+        with (
+            patch.object(mu, "_interface_pool", pool),
+            patch.object(mu, "meshtastic_client", primary),
+            patch.object(mu, "_submit_to_packet_ingest", return_value=False),
+            patch(
+                "mmrelay.meshtastic.events._process_meshtastic_message",
+                side_effect=lambda packet, interface: processed.append(
+                    (packet, interface)
+                ),
+            ),
+        ):
+            # A Matrix message sent through radio1, heard by radio2 and the primary.
+            sent = {"from": radios[0].myInfo.my_node_num, "id": 1}
+            mu.on_meshtastic_message(dict(sent), radios[1])
+            mu.on_meshtastic_message(dict(sent), primary)
+            # Likewise for a message sent through the primary.
+            sent = {"from": primary.myInfo.my_node_num, "id": 2}
+            mu.on_meshtastic_message(dict(sent), radios[0])
+            # A radio's own packets, such as health-probe replies, still reach it.
+            own = {"from": primary.myInfo.my_node_num, "id": 3}
+            mu.on_meshtastic_message(dict(own), primary)
+
+        assert processed == [(own, primary)]
+        assert pool.get_status()["own_transmissions_dropped"] == 3
+
+    def test_dedupe_window_expires(self):
+        pool = InterfacePool(dedupe_window=10.0)
+        packet = {"from": 1, "id": 5}
+
+        with patch(
+            "mmrelay.meshtastic.interface_pool.time.monotonic",
+            side_effect=[100.0, 105.0, 111.0],
+        ):
+            assert pool.accept_packet(dict(packet), None)
+            assert not pool.accept_packet(dict(packet), None)
+            assert pool.accept_packet(dict(packet), None)
+
+    def test_pool_interfaces_are_not_treated_as_stale(self):
+        pool, radios = _pool_with_radios(1)
+        primary = _fake_radio()
+
+        with (
+            patch.object(mu, "_interface_pool", pool),
+            patch.object(mu, "meshtastic_client", primary),
+            patch.object(mu, "_relay_active_client_id", id(primary)),
+            patch.object(mu, "shutting_down", False),
+            patch.object(
+                mu, "_claim_health_probe_response_and_maybe_calibrate"
+            ) as claim,
+        ):
+            claim.return_value = True
+            mu._process_meshtastic_message({"from": 1, "id": 1}, radios[0])
+            mu._process_meshtastic_message({"from": 1, "id": 2}, _fake_radio())
+
+        claim.assert_called_once()
+
+    def test_lost_additional_radio_is_taken_out_of_rotation(self):
+        pool, radios = _pool_with_radios(2)
+        primary = _fake_radio()
+
+        with (
+            patch.object(mu, "_interface_pool", pool),
+            patch.object(mu, "meshtastic_client", primary),
+            patch.object(mu, "shutting_down", False),
+            patch.object(mu, "reconnecting", False),
+            patch(
+                "mmrelay.meshtastic.events._tear_down_meshtastic_client_for_disconnect"
+            ) as teardown,
+        ):
+            mu.on_lost_meshtastic_connection(interface=radios[0])
+            assert mu.meshtastic_client is primary
+
+        teardown.assert_not_called()
+        assert [slot.healthy for slot in pool.slots] == [False, True]
+
+    async def test_lost_additional_radio_reconnects_and_returns_to_rotation(self):
+        pool = InterfacePool()
+        lost = _fake_radio()
+        replacement = _fake_radio()
+        reopen = MagicMock(side_effect=[None, OSError("port busy"), replacement])
+        queue = MessageQueue(
+            connection_check=functools.partial(pool.is_radio_available, "radio1")
+        )
+        slot = pool.add("radio1", lost, queue, reopen)
+        primary = _fake_radio()
+        primary_queue = MagicMock()
+        primary_queue.get_queue_size.return_value = 5
+
+        with (
+            patch.object(mu, "_interface_pool", pool),
+            patch.object(mu, "meshtastic_client", primary),
+            patch.object(mu, "event_loop", asyncio.get_running_loop()),
+            patch.object(mu, "DEFAULT_BACKOFF_TIME", 0),
+            patch.object(mu, "shutting_down", False),
+            patch.object(mu, "reconnecting", False),
+        ):
+            lost.isConnected.clear()
+            mu.on_lost_meshtastic_connection(interface=lost)
+            # A second event for the same loss does not start another reconnect.
+            mu.on_lost_meshtastic_connection(interface=lost)
+            assert pool.select(primary, primary_queue) == (primary, primary_queue)
+            assert queue._should_send_message() is False
+
+            for _ in range(100):
+                if slot.healthy:
+                    break
+                await asyncio.sleep(0.01)
+
+            assert reopen.call_count == 3
+            assert lost.closed
+            assert slot.interface is replacement
+            assert not slot.reconnecting
+            assert queue._should_send_message() is True
+            assert pool.select(primary, primary_queue)[0] is replacement
+            assert mu._is_pool_interface(replacement)
+            assert not mu._is_pool_interface(lost)
+
+
+class TestInterfacePoolSend:
+    def test_select_prefers_shortest_available_queue(self):
+        pool, radios = _pool_with_radios(2)
+        primary = _fake_radio()
+        primary_queue = MagicMock()
+        primary_queue.get_queue_size.return_value = 3
+        depths = {radios[0]: 1, radios[1]: 0}
+        for slot in pool.slots:
+            slot.queue = MagicMock()
+            slot.queue.get_queue_size.return_value = depths[slot.interface]
+
+        with patch.object(mu, "reconnecting", False):
+            assert pool.select(primary, primary_queue)[0] is radios[1]
+            radios[1].isConnected.clear()
+            assert pool.select(primary, primary_queue)[0] is radios[0]
+            pool.mark_unhealthy(radios[0])
+            assert pool.select(primary, primary_queue) == (primary, primary_queue)
+
+    def test_select_radio_for_send_without_pool_uses_global_queue(self):
+        primary = _fake_radio()
+        with patch.object(mu, "_interface_pool", None):
+            assert mu.select_radio_for_send(primary) == (primary, None)
+
+    def test_sends_spread_across_radios_scale_throughput(self):
+        delay = 0.05
+        messages = 12
+
+        async def run(radio_count: int) -> tuple[float, list[int]]:
+            pool = InterfacePool()
+            radios = [_fake_radio() for _ in range(radio_count)]
+            queues = []
+            for index, radio in enumerate(radios):
+                queue = MessageQueue(connection_check=lambda: True)
+                pool.add(f"radio{index}", radio, queue)
+                queue.start(message_delay=delay)
+                queues.append(queue)
+            primary_queue = MessageQueue(connection_check=lambda: True)
+            start = time.monotonic()
+            try:
+                with patch.object(mu, "reconnecting", True):
+                    for number in range(messages):
+                        interface, queue = pool.select(None, primary_queue)
+                        assert queue.enqueue(interface.sendText, text=str(number))
+                for queue in queues:
+                    assert await queue.drain(timeout=5)
+                elapsed = time.monotonic() - start
+            finally:
+                for queue in queues:
+                    queue.stop()
+            return elapsed, [len(radio.sent_texts) for radio in radios]
+
+        single_elapsed, single_counts = asyncio.run(run(1))
+        multi_elapsed, multi_counts = asyncio.run(run(3))
+
+        assert single_counts == [messages]
+        assert multi_counts == [messages // 3] * 3
+        assert multi_elapsed < single_elapsed * 0.6
@@ -189,3 +189,105 @@ class TestRunMeshtasticPlugins:
         cfg = {"meshtastic": None}
         result = _resolve_plugin_timeout(cfg)
         assert result > 0
+
+
+class _DeclaredPlugin:
+    def __init__(self, name, portnums):
+        self.plugin_name = name
+        self.meshtastic_portnums = portnums
+        self.handle_meshtastic_message = MagicMock(return_value=False)
+
+
+@pytest.mark.usefixtures("reset_meshtastic_globals")
+class TestPluginPortnumInterest:
+    def test_undeclared_plugins_want_everything(self):
+        from mmrelay.meshtastic.plugins import _plugin_wants_portnum
+
+        assert _plugin_wants_portnum(MagicMock(), "POSITION_APP") is True
+        assert _plugin_wants_portnum(_DeclaredPlugin("p", None), "POSITION_APP")
+
+    def test_declared_interest_filters_portnums(self):
+        from mmrelay.meshtastic.plugins import _plugin_wants_portnum
+
+        plugin = _DeclaredPlugin("telemetry", frozenset({"TELEMETRY_APP"}))
+
+        assert _plugin_wants_portnum(plugin, "TELEMETRY_APP") is True
+        assert _plugin_wants_portnum(plugin, "POSITION_APP") is False
+
+    def test_loaded_plugins_union(self):
+        import mmrelay.plugin_loader as plugin_loader
+        from mmrelay.meshtastic.plugins import _loaded_plugins_want_portnum
+
+        plugins = [
+            _DeclaredPlugin("ping", frozenset({"TEXT_MESSAGE_APP"})),
+            _DeclaredPlugin("telemetry", frozenset({"TELEMETRY_APP"})),
+        ]
+        with (
+            patch.object(plugin_loader, "plugins_loaded", True),
+            patch.object(plugin_loader, "sorted_active_plugins", plugins),
+        ):
+            assert _loaded_plugins_want_portnum("TELEMETRY_APP") is True
+            assert _loaded_plugins_want_portnum("POSITION_APP") is False
+
+            plugins.append(_DeclaredPlugin("debug", None))
+            assert _loaded_plugins_want_portnum("POSITION_APP") is True
+
+    def test_not_loaded_is_conservative(self):
+        import mmrelay.plugin_loader as plugin_loader
+        from mmrelay.meshtastic.plugins import _loaded_plugins_want_portnum
+
+        with patch.object(plugin_loader, "plugins_loaded", False):
+            assert _loaded_plugins_want_portnum("POSITION_APP") is True
+
+    def test_run_plugins_skips_uninterested(self):
+        from mmrelay.meshtastic.plugins import _run_meshtastic_plugins
+
+        ping = _DeclaredPlugin("ping", frozenset({"TEXT_MESSAGE_APP"}))
+        telemetry = _DeclaredPlugin("telemetry", frozenset({"TELEMETRY_APP"}))
+        with patch(
+            "mmrelay.plugin_loader.load_plugins", return_value=[ping, telemetry]
+        ):
+            handled = _run_meshtastic_plugins(
+                packet={"decoded": {"portnum": "TELEMETRY_APP"}},
+                formatted_message=None,
+                longname=None,
+                meshnet_name=None,
+                loop=MagicMock(),
+                cfg={},
+                use_keyword_args=True,
+                portnum_name="TELEMETRY_APP",
+            )
+
+        assert handled is False
+        ping.handle_meshtastic_message.assert_not_called()
+        telemetry.handle_meshtastic_message.assert_called_once()
+
+    def test_interests_are_computed_once_per_plugin_list(self):
+        from mmrelay.meshtastic import plugins as meshtastic_plugins
+
+        loaded = [
+            _DeclaredPlugin("ping", frozenset({"TEXT_MESSAGE_APP"})),
+            _DeclaredPlugin("telemetry", frozenset({"TELEMETRY_APP"})),
+        ]
+        with (
+            patch("mmrelay.plugin_loader.load_plugins", return_value=loaded),
+            patch.object(
+                meshtastic_plugins,
+                "_plugin_portnum_interest",
+                wraps=meshtastic_plugins._plugin_portnum_interest,
+            ) as interest,
+        ):
+            for _ in range(5):
+                meshtastic_plugins._run_meshtastic_plugins(
+                    packet={"decoded": {"portnum": "POSITION_APP"}},
+                    formatted_message=None,
+                    longname=None,
+                    meshnet_name=None,
+                    loop=MagicMock(),
+                    cfg={},
+                    portnum_name="POSITION_APP",
+                )
+
+        assert interest.call_count == len(loaded)
+        for plugin in loaded:
+            plugin.handle_meshtastic_message.assert_not_called()
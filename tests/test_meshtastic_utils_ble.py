@@ -847,9 +847,9 @@ class TestBleInterfaceImport:
 
             with patch.object(importlib, "import_module", side_effect=_raising_import):
                 importlib.reload(mu_module)
-
-            assert mu_module._ble_interface_module is None
-            assert mu_module.MeshtasticBLEError is None
+                # BLE support is resolved on first access, not at import.
+                assert mu_module._ble_interface_module is None
+                assert mu_module.MeshtasticBLEError is None
         finally:
             if original_ble_interface is not None:
                 sys.modules["meshtastic.ble_interface"] = original_ble_interface
@@ -889,8 +889,7 @@ class TestBleInterfaceImport:
 
             with patch.object(importlib, "import_module", side_effect=_raising_import):
                 importlib.reload(mu_module)
-
-            assert mu_module._ble_gating_module is None
+                assert mu_module._ble_gating_module is None
         finally:
             importlib.reload(mu_module)
             for attr, value in saved.items():
@@ -933,8 +932,7 @@ class TestBleInterfaceImport:
 
             with patch.object(importlib, "import_module", side_effect=_fake_import):
                 importlib.reload(mu_module)
-
-            assert mu_module._ble_gating_module is fake_module
+                assert mu_module._ble_gating_module is fake_module
             assert mu_module._ble_gate_reset_callable is not None
         finally:
             importlib.reload(mu_module)
@@ -978,8 +976,7 @@ class TestBleInterfaceImport:
 
             with patch.object(importlib, "import_module", side_effect=_fake_import):
                 importlib.reload(mu_module)
-
-            assert mu_module._ble_gating_module is fake_module
+                assert mu_module._ble_gating_module is fake_module
             assert mu_module._ble_gate_reset_callable is None
         finally:
             importlib.reload(mu_module)
@@ -590,6 +590,23 @@ def test_on_meshtastic_message_falls_back_to_sender_id():
     mock_logger.debug.assert_any_call("Node info for sender 123 not available yet.")
 
 
+def test_on_meshtastic_message_without_sender_skips_node_lookup():
+    config = _base_config()
+    _set_globals(config)
+    packet = _base_packet()
+    del packet["fromId"]
+
+    with (
+        _patch_message_deps(longname=None, shortname=None, patch_logger=False),
+        patch("mmrelay.meshtastic_utils.lookup_node") as mock_lookup,
+        patch("mmrelay.matrix_utils.get_matrix_prefix") as mock_prefix,
+    ):
+        on_meshtastic_message(packet, _make_interface(nodes={}))
+
+    mock_lookup.assert_not_called()
+    mock_prefix.assert_called_once_with(config, "None", "None", "TestNet")
+
+
 def test_on_meshtastic_message_direct_message_skips_relay():
     config = _base_config()
     _set_globals(config)
@@ -1454,3 +1471,87 @@ def _make_plugin_routing(name, handled=False):
     plugin.plugin_name = name
     plugin.handle_meshtastic_message = AsyncMock(return_value=handled)
     return plugin
+
+
+def test_on_meshtastic_message_fast_rejects_packets_for_other_nodes():
+    config = _base_config()
+    _set_globals(config)
+    packet = _base_packet()
+    packet["to"] = 4242
+
+    plugin = MagicMock()
+    plugin.plugin_name = "observer"
+
+    with (
+        _patch_message_deps(plugins=[plugin]) as (mock_logger, mock_relay),
+        patch("mmrelay.matrix_utils.get_interaction_settings") as mock_interactions,
+        patch.object(mu, "_get_node_display_name") as mock_display_name,
+    ):
+        assert mock_logger is not None
+        mock_logger.isEnabledFor.return_value = False
+        on_meshtastic_message(packet, _make_interface())
+
+    assert mock_relay is not None
+    mock_relay.assert_not_called()
+    plugin.handle_meshtastic_message.assert_not_called()
+    mock_interactions.assert_not_called()
+    mock_display_name.assert_not_called()
+    mock_logger.debug.assert_any_call(
+        "Ignoring message intended for node %s (not broadcast or relay).", 4242
+    )
+
+
+def test_on_meshtastic_message_fast_rejects_packets_without_interested_plugins():
+    import mmrelay.plugin_loader as plugin_loader
+
+    config = _base_config()
+    _set_globals(config)
+    packet = {
+        "fromId": 123,
+        "to": BROADCAST_NUM,
+        "decoded": {"portnum": "POSITION_APP"},
+        "channel": 0,
+        "id": 999,
+    }
+
+    ping = MagicMock()
+    ping.plugin_name = "ping"
+    ping.meshtastic_portnums = frozenset({TEXT_MESSAGE_APP})
+
+    with (
+        _patch_message_deps(plugins=[ping]) as (mock_logger, _mock_relay),
+        patch.object(plugin_loader, "plugins_loaded", True),
+        patch.object(plugin_loader, "sorted_active_plugins", [ping]),
+        patch.object(mu, "_run_meshtastic_plugins") as mock_run_plugins,
+        patch.object(mu, "_get_packet_details") as mock_details,
+    ):
+        assert mock_logger is not None
+        mock_logger.isEnabledFor.return_value = False
+        on_meshtastic_message(packet, _make_interface())
+
+    mock_run_plugins.assert_not_called()
+    mock_details.assert_not_called()
+
+
+def test_on_meshtastic_message_skips_debug_formatting_when_debug_disabled():
+    config = _base_config()
+    _set_globals(config)
+    packet = {
+        "fromId": 123,
+        "to": BROADCAST_NUM,
+        "decoded": {"portnum": "TELEMETRY_APP"},
+        "channel": 0,
+        "id": 999,
+    }
+
+    with (
+        _patch_message_deps() as (mock_logger, _mock_relay),
+        patch.object(mu, "_get_node_display_name") as mock_display_name,
+        patch.object(mu, "_get_packet_details") as mock_details,
+    ):
+        assert mock_logger is not None
+        mock_logger.isEnabledFor.return_value = False
+        on_meshtastic_message(packet, _make_interface())
+
+    mock_display_name.assert_not_called()
+    mock_details.assert_not_called()
@@ -1790,6 +1790,7 @@ async def test_refresh_node_name_tables_handles_timeout_then_retries() -> None:
         await mu.refresh_node_name_tables(
             cast(asyncio.Event, event),
             refresh_interval_seconds=0.01,
+            reconcile_interval_seconds=0.0,
         )
     assert event.first_wait_cancelled is True
     assert event._wait_calls == 2
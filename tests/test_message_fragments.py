@@ -0,0 +1,265 @@
+"""Tests for byte-aware fragmentation of Matrix messages and their reassembly."""
+
+import random
+import threading
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+import mmrelay.meshtastic_utils as mu
+from mmrelay.constants.messages import (
+    DEFAULT_MESSAGE_TRUNCATE_BYTES,
+    FRAGMENT_GAP_MARKER,
+    FRAGMENT_REASSEMBLY_TIMEOUT_SECS,
+)
+from mmrelay.matrix_utils import on_room_message
+from mmrelay.message_fragments import (
+    FragmentReassembler,
+    fragment_message,
+    fragment_reassembly_enabled,
+    get_max_message_fragments,
+    parse_fragment,
+)
+
+# ASCII, 2-, 3- and 4-byte characters, a combining accent and whitespace.
+_ALPHABET = "abcxyz0189 .,\néßЖ中文한😀🛰️́"
+
+
+def _random_text(rng: random.Random, max_length: int = 900) -> str:
+    return "".join(rng.choice(_ALPHABET) for _ in range(rng.randint(1, max_length)))
+
+
+_REASSEMBLY_CONFIG = {"meshtastic": {"reassemble_fragments": True}}
+
+
+def _packet(text: str, sender: str = "!a1b2c3d4", packet_id: int = 1) -> dict:
+    return {
+        "fromId": sender,
+        "channel": 0,
+        "id": packet_id,
+        "decoded": {"portnum": "TEXT_MESSAGE_APP", "text": text},
+    }
+
+
+def test_fragments_fit_budget_on_character_boundaries_and_rejoin():
+    rng = random.Random(49)
+    for _ in range(500):
+        text = _random_text(rng)
+        prefix = rng.choice(["", "[Alice/M]: ", "Жанна[中]: "])
+        max_bytes = rng.choice([40, 100, DEFAULT_MESSAGE_TRUNCATE_BYTES])
+
+        fragments = fragment_message(text, prefix, max_bytes=max_bytes, max_fragments=9)
+
+        assert all(len(f.encode("utf-8")) <= max_bytes for f in fragments)
+        if len(fragments) == 1:
+            assert fragments[0] == f"{prefix}{text}"
+            continue
+        parsed = [parse_fragment(fragment) for fragment in fragments]
+        assert [p.part for p in parsed] == list(range(1, len(fragments) + 1))
+        assert {(p.tag, p.total) for p in parsed} == {(parsed[0].tag, len(fragments))}
+        joined = "".join(p.body for p in parsed)
+        # Whatever did not fit in nine fragments is cut from the end.
+        assert f"{prefix}{text}".startswith(joined)
+        if len(f"{prefix}{text}".encode("utf-8")) < 4 * max_bytes:
+            assert joined == f"{prefix}{text}"
+
+
+def test_fragmentation_limits_and_word_boundaries():
+    words = " ".join(["mesh"] * 100)
+    fragments = fragment_message(words, "[A/M]: ", max_fragments=3)
+    assert len(fragments) == 3
+    assert all(parse_fragment(f).body.endswith(" ") for f in fragments[:-1])
+
+    assert fragment_message("hi", "[A/M]: ") == ["[A/M]: hi"]
+    truncated = fragment_message("é" * 200, "[A/M]: ", max_fragments=1)
+    assert truncated == ["[A/M]: " + "é" * 110]
+    assert parse_fragment("[zz 1/2] not a marker") is None
+    assert parse_fragment("[0a 3/2] part past total") is None
+
+    # Fragmentation is opt-in; invalid values fall back to truncation.
+    assert get_max_message_fragments({}) == 1
+    assert get_max_message_fragments({"meshtastic": {"max_message_fragments": 3}}) == 3
+    assert get_max_message_fragments({"meshtastic": {"max_message_fragments": 12}}) == 1
+    assert (
+        get_max_message_fragments({"meshtastic": {"max_message_fragments": True}}) == 1
+    )
+    assert len(fragment_message(words, "[A/M]: ")) == 1
+
+
+def test_reassembly_of_shuffled_interleaved_messages():
+    rng = random.Random(4900)
+    reassembler = FragmentReassembler()
+    interface = MagicMock()
+    expected = {}
+    packets = []
+    for sender_index in range(20):
+        sender = f"!{sender_index:08x}"
+        text = _random_text(rng, 1500)
+        fragments = fragment_message(text, "[R/M]: ", max_fragments=9)
+        expected[sender] = "".join(
+            parse_fragment(f).body if len(fragments) > 1 else f for f in fragments
+        )
+        packets.extend(
+            _packet(f, sender, packet_id=sender_index * 10 + i)
+            for i, f in enumerate(fragments)
+        )
+    rng.shuffle(packets)
+    # The mesh sometimes delivers a fragment twice.
+    packets.extend(rng.sample(packets, 10))
+
+    ready = []
+    for packet in packets:
+        ready.extend(reassembler.accept(packet, interface, now=0.0))
+
+    assert {p["fromId"]: p["decoded"]["text"] for p, _ in ready} == expected
+    assert len(ready) == len(expected)
+    assert all(iface is interface for _, iface in ready)
+    assert reassembler.pending_count() == 0
+
+
+def test_missing_fragments_are_flushed_with_gap_markers():
+    rng = random.Random(490)
+    for _ in range(50):
+        reassembler = FragmentReassembler()
+        fragments = fragment_message(_random_text(rng, 2000), max_fragments=9)
+        if len(fragments) < 3:
+            continue
+        received = rng.sample(fragments, rng.randint(1, len(fragments) - 1))
+        for fragment in received:
+            assert reassembler.accept(_packet(fragment), None, now=0.0) == []
+
+        # Expired partial messages go out ahead of the packet that found them.
+        other = _packet("unrelated", sender="!ffffffff")
+        ready = reassembler.accept(
+            other, None, now=FRAGMENT_REASSEMBLY_TIMEOUT_SECS + 1
+        )
+        assert ready[-1] == (other, None)
+        assert len(ready) == 2
+        expected = "".join(
+            parse_fragment(f).body if f in received else FRAGMENT_GAP_MARKER
+            for f in fragments
+        )
+        assert ready[0][0]["decoded"]["text"] == expected
+
+
+@pytest.mark.usefixtures("reset_meshtastic_globals")
+def test_on_meshtastic_message_processes_joined_packet_once():
+    interface = MagicMock()
+    fragments = fragment_message("word " * 100, "[Bob/Far]: ", max_fragments=3)
+    with (
+        patch.object(mu, "config", _REASSEMBLY_CONFIG),
+        patch.object(
+            mu, "get_fragment_reassembler", return_value=FragmentReassembler()
+        ),
+        patch.object(mu, "_accept_radio_packet", return_value=True),
+        patch.object(mu, "_submit_to_packet_ingest", return_value=False),
+        patch("mmrelay.meshtastic.events._process_meshtastic_message") as process,
+    ):
+        for index, fragment in enumerate(reversed(fragments)):
+            mu.on_meshtastic_message(_packet(fragment, packet_id=index), interface)
+
+    process.assert_called_once()
+    packet, received_on = process.call_args.args
+    assert packet["decoded"]["text"] == "[Bob/Far]: " + "word " * 100
+    assert packet["id"] == len(fragments) - 1
+    assert received_on is interface
+
+
+@pytest.mark.usefixtures("reset_meshtastic_globals")
+def test_marker_like_text_passes_through_when_reassembly_is_off():
+    interface = MagicMock()
+    reassembler = MagicMock()
+    packet = _packet("[ab 1/2] hi")
+    with (
+        patch.object(mu, "config", {"meshtastic": {}}),
+        patch.object(mu, "get_fragment_reassembler", return_value=reassembler),
+        patch.object(mu, "_accept_radio_packet", return_value=True),
+        patch.object(mu, "_submit_to_packet_ingest", return_value=False),
+        patch("mmrelay.meshtastic.events._process_meshtastic_message") as process,
+    ):
+        mu.on_meshtastic_message(packet, interface)
+
+    process.assert_called_once_with(packet, interface)
+    assert packet["decoded"]["text"] == "[ab 1/2] hi"
+    reassembler.accept.assert_not_called()
+
+
+def test_fragment_reassembly_enabled_reads_a_boolean_option():
+    assert fragment_reassembly_enabled(None) is False
+    assert fragment_reassembly_enabled({"meshtastic": {}}) is False
+    assert fragment_reassembly_enabled(_REASSEMBLY_CONFIG) is True
+    assert (
+        fragment_reassembly_enabled({"meshtastic": {"reassemble_fragments": "yes"}})
+        is False
+    )
+
+
+@pytest.mark.usefixtures("reset_meshtastic_globals")
+def test_partial_message_is_flushed_when_the_mesh_goes_quiet():
+    interface = MagicMock()
+    fragments = fragment_message("word " * 100, "[Bob/Far]: ", max_fragments=3)
+    flushed = threading.Event()
+    with (
+        patch.object(mu, "config", _REASSEMBLY_CONFIG),
+        patch.object(
+            mu,
+            "get_fragment_reassembler",
+            return_value=FragmentReassembler(timeout_secs=0.05),
+        ),
+        patch.object(mu, "_accept_radio_packet", return_value=True),
+        patch.object(mu, "_submit_to_packet_ingest", return_value=False),
+        patch(
+            "mmrelay.meshtastic.events._process_meshtastic_message",
+            side_effect=lambda *_args: flushed.set(),
+        ) as process,
+    ):
+        # The last fragment never arrives and no other packet follows.
+        for index, fragment in enumerate(fragments[:-1]):
+            mu.on_meshtastic_message(_packet(fragment, packet_id=index), interface)
+        process.assert_not_called()
+
+        assert flushed.wait(timeout=5)
+
+    packet, received_on = process.call_args.args
+    assert packet["decoded"]["text"].endswith(FRAGMENT_GAP_MARKER)
+    assert packet["id"] == 0
+    assert received_on is interface
+    process.assert_called_once()
+
+
+@pytest.mark.asyncio
+async def test_on_room_message_queues_each_fragment(mock_room, mock_event, test_config):
+    long_text = "relay " * 100
+    mock_event.body = long_text
+    mock_event.source = {"content": {"body": long_text}}
+    mock_event.event_id = "$long"
+    test_config["meshtastic"]["message_interactions"]["replies"] = True
+    test_config["meshtastic"]["max_message_fragments"] = 3
+    dummy_queue = MagicMock()
+    dummy_queue.get_queue_size.return_value = 0
+
+    with (
+        patch("mmrelay.plugin_loader.load_plugins", return_value=[]),
+        patch("mmrelay.matrix_utils.get_user_display_name", return_value="user"),
+        patch("mmrelay.matrix_utils.get_message_queue", return_value=dummy_queue),
+        patch("mmrelay.matrix_utils.queue_message", return_value=True) as queue,
+        patch("mmrelay.matrix_utils.connect_meshtastic", return_value=MagicMock()),
+        patch("mmrelay.matrix_utils.bot_start_time", 1234567880),
+        patch("mmrelay.matrix_utils.config", test_config),
+        patch("mmrelay.matrix_utils.matrix_rooms", test_config["matrix_rooms"]),
+        patch("mmrelay.matrix_utils.bot_user_id", test_config["matrix"]["bot_user_id"]),
+    ):
+        await on_room_message(mock_room, mock_event)
+
+    sent = [call.kwargs for call in queue.call_args_list]
+    assert len(sent) == 3
+    assert all(
+        len(kwargs["text"].encode("utf-8")) <= DEFAULT_MESSAGE_TRUNCATE_BYTES
+        for kwargs in sent
+    )
+    assert "".join(parse_fragment(kwargs["text"]).body for kwargs in sent) == (
+        f"user[M]: {long_text.strip()}"
+    )
+    assert sent[0]["mapping_info"] is not None
+    assert sent[1]["mapping_info"] is None and sent[2]["mapping_info"] is None
+    assert sent[2]["description"] == "Message from user (part 3/3)"
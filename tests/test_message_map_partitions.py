@@ -0,0 +1,296 @@
+"""Tests for the partitioned message_map and its cost against the single table."""
+
+import sqlite3
+import time
+from unittest.mock import patch
+
+import pytest
+
+from mmrelay import db_utils
+from mmrelay.db_runtime import DatabaseManager
+
+
+def _partitioned_config(partition_rows: int) -> dict:
+    return {"database": {"msg_map": {"partition_rows": partition_rows}}}
+
+
+@pytest.fixture
+def manager(tmp_path):
+    db_manager = DatabaseManager(str(tmp_path / "meshtastic.sqlite"))
+    with (
+        patch("mmrelay.db_utils._get_db_manager", return_value=db_manager),
+        patch("mmrelay.db_utils.get_db_path", return_value=db_manager._path),
+        patch("mmrelay.db_utils.config", _partitioned_config(10)),
+        patch("mmrelay.db_utils.MIN_MSG_MAP_PARTITION_ROWS", 1),
+    ):
+        db_utils.initialize_database()
+        yield db_manager
+    db_manager.close()
+
+
+def _partitions(manager: DatabaseManager) -> list[int]:
+    return manager.run_sync(db_utils._list_message_map_partitions)
+
+
+def _store(start: int, count: int) -> None:
+    for index in range(start, start + count):
+        db_utils.store_message_map(
+            index, f"$event{index}", "!room:example.org", f"text {index}", "meshnet"
+        )
+
+
+def test_writes_rotate_and_lookups_prefer_newest_partition(manager):
+    _store(0, 25)
+
+    assert _partitions(manager) == [1, 2, 3]
+    assert db_utils.get_message_map_by_meshtastic_id(3) == (
+        "$event3",
+        "!room:example.org",
+        "text 3",
+        "meshnet",
+    )
+    assert db_utils.get_message_map_by_matrix_event_id("$event24")[0] == "24"
+
+    # A later message that reuses a Meshtastic ID wins over the older one.
+    db_utils.store_message_map(3, "$event-new", "!room:example.org", "again")
+    assert db_utils.get_message_map_by_meshtastic_id(3)[0] == "$event-new"
+    assert db_utils.get_message_map_by_meshtastic_id(999) is None
+
+
+def test_prune_drops_whole_expired_partitions(manager):
+    # Rows written before partitioning was turned on stay in message_map.
+    with manager.write() as cursor:
+        for index in range(5):
+            cursor.execute(
+                db_utils._UPSERT_MESSAGE_MAP_SQL,
+                (f"old{index}", f"$old{index}", "!room", "old", None),
+            )
+    _store(0, 35)
+
+    db_utils.prune_message_map(12)
+
+    # 40 rows: the 5 legacy rows go first, then partitions 1 and 2. Partition 3
+    # is kept whole, so 15 rows remain rather than exactly 12.
+    assert _partitions(manager) == [3, 4]
+    assert db_utils.get_message_map_by_matrix_event_id("$old4") is None
+    assert db_utils.get_message_map_by_meshtastic_id(19) is None
+    assert db_utils.get_message_map_by_meshtastic_id(20) is not None
+
+    db_utils.prune_message_map(1)
+    assert _partitions(manager) == [4]
+
+    db_utils.wipe_message_map()
+    assert _partitions(manager) == []
+    assert db_utils.get_message_map_by_meshtastic_id(34) is None
+
+
+def test_restoring_an_event_updates_it_in_place(manager):
+    # One legacy row from before partitioning was turned on.
+    with manager.write() as cursor:
+        cursor.execute(
+            db_utils._UPSERT_MESSAGE_MAP_SQL, ("old", "$old", "!room", "old", None)
+        )
+    _store(0, 25)
+
+    db_utils.store_message_map(3, "$event3", "!room:example.org", "edited")
+    db_utils.store_message_map("old", "$old", "!room", "edited")
+
+    assert _partitions(manager) == [1, 2, 3]
+    with manager.read() as cursor:
+        counts = [
+            cursor.execute(
+                f"SELECT count(*) FROM {db_utils._message_map_partition_table(seq)}"
+            ).fetchone()[0]
+            for seq in (1, 2, 3)
+        ]
+        assert counts == [10, 10, 5]
+        assert cursor.execute(
+            "SELECT meshtastic_text FROM message_map WHERE matrix_event_id='$old'"
+        ).fetchone() == ("edited",)
+    assert db_utils.get_message_map_by_matrix_event_id("$event3")[2] == "edited"
+
+
+def test_partitions_are_renumbered_when_names_run_out(manager):
+    last = db_utils._MESSAGE_MAP_PARTITION_MAX_SEQ
+    with manager.write() as cursor:
+        for seq in (last - 1, last):
+            table = db_utils._message_map_partition_table(seq)
+            cursor.execute(
+                db_utils._CREATE_TABLE_MESSAGE_MAP_PARTITION_SQL.format(table=table)
+            )
+            cursor.execute(
+                db_utils._CREATE_INDEX_MESSAGE_MAP_PARTITION_ID_SQL.format(table=table)
+            )
+            cursor.executemany(
+                db_utils._UPSERT_MESSAGE_MAP_PARTITION_SQL.format(table=table),
+                [
+                    (f"{seq}-{i}", f"${seq}-{i}", "!room", "text", None)
+                    for i in range(10)
+                ],
+            )
+
+    _store(0, 1)
+
+    assert _partitions(manager) == [1, 2, 3]
+    assert db_utils.get_message_map_by_meshtastic_id(f"{last - 1}-0") is not None
+    assert db_utils.get_message_map_by_meshtastic_id(f"{last}-9") is not None
+    assert db_utils.get_message_map_by_meshtastic_id(0)[0] == "$event0"
+    with manager.read() as cursor:
+        indexes = {
+            row[0]
+            for row in cursor.execute(
+                "SELECT name FROM sqlite_master WHERE type='index' "
+                "AND name LIKE 'idx_message_map_p%'"
+            )
+        }
+    assert indexes == {
+        f"idx_{db_utils._message_map_partition_table(seq)}_meshtastic_id"
+        for seq in (1, 2, 3)
+    }
+
+
+def test_disabling_partitioning_merges_partitions_back(manager):
+    _store(0, 25)
+    db_utils.store_message_map(3, "$event-new", "!room:example.org", "again")
+
+    with patch("mmrelay.db_utils.config", {}):
+        db_utils.initialize_database()
+
+        assert _partitions(manager) == []
+        assert db_utils.get_message_map_by_matrix_event_id("$event0")[0] == "0"
+        assert db_utils.get_message_map_by_matrix_event_id("$event-new")[0] == "3"
+        with manager.read() as cursor:
+            assert cursor.execute("SELECT count(*) FROM message_map").fetchone() == (
+                26,
+            )
+
+
+@pytest.mark.parametrize("value", [-1, "many", True, None])
+def test_invalid_partition_rows_disable_partitioning(value):
+    with (
+        patch("mmrelay.db_utils.config", _partitioned_config(value)),
+        patch("mmrelay.db_utils.logger") as mock_logger,
+    ):
+        assert db_utils._get_message_map_partition_rows(warn=True) == 0
+    mock_logger.warning.assert_called_once()
+    with patch("mmrelay.db_utils.config", {"db": {"msg_map": {"partition_rows": 500}}}):
+        assert db_utils._get_message_map_partition_rows() == 500
+
+
+def test_small_partition_rows_are_raised_to_the_minimum():
+    with (
+        patch("mmrelay.db_utils.config", _partitioned_config(1)),
+        patch("mmrelay.db_utils.logger") as mock_logger,
+    ):
+        assert (
+            db_utils._get_message_map_partition_rows(warn=True)
+            == db_utils.MIN_MSG_MAP_PARTITION_ROWS
+        )
+    mock_logger.warning.assert_called_once()
+
+
+def _rows(start: int, count: int) -> list[tuple]:
+    return [
+        (str(i), f"$event{i}", "!room:example.org", f"message {i}", "meshnet")
+        for i in range(start, start + count)
+    ]
+
+
+def _bulk_load(cursor: sqlite3.Cursor, rows: int, partition_rows: int) -> None:
+    """Load `rows` mappings the way the store path would lay them out."""
+    if not partition_rows:
+        cursor.executemany(db_utils._UPSERT_MESSAGE_MAP_SQL, _rows(0, rows))
+        return
+    for start in range(0, rows, partition_rows):
+        table = db_utils._get_writable_message_map_partition(cursor, partition_rows)
+        cursor.executemany(
+            db_utils._UPSERT_MESSAGE_MAP_PARTITION_SQL.format(table=table),
+            _rows(start, min(partition_rows, rows - start)),
+        )
+
+
+def _measure(tmp_path, label: str, rows: int, partition_rows: int) -> dict:
+    """Time inserts, point lookups and expiry of 10 percent on a map of `rows` rows."""
+    inserts = 10_000
+    with patch("mmrelay.db_utils.config", _partitioned_config(partition_rows)):
+        manager = DatabaseManager(str(tmp_path / f"{label}-{rows}.sqlite"))
+        try:
+
+            def _load(cursor: sqlite3.Cursor) -> None:
+                cursor.execute(db_utils._CREATE_TABLE_MESSAGE_MAP_SQL)
+                cursor.execute(db_utils._CREATE_INDEX_MESSAGE_MAP_ID_SQL)
+                _bulk_load(cursor, rows, partition_rows)
+
+            manager.run_sync(_load, write=True)
+
+            def _insert(cursor: sqlite3.Cursor) -> None:
+                for row in _rows(rows, inserts):
+                    db_utils._store_message_map_core(cursor, *row)
+
+            started = time.perf_counter()
+            manager.run_sync(_insert, write=True)
+            insert_seconds = (time.perf_counter() - started) / inserts
+
+            total = rows + inserts
+
+            def _lookup_seconds(probes: list[str]) -> float:
+                started = time.perf_counter()
+                with manager.read() as cursor:
+                    for probe in probes:
+                        assert db_utils._lookup_message_map(
+                            cursor,
+                            db_utils._GET_MESSAGE_MAP_BY_MESHTASTIC_ID_SQL,
+                            db_utils._GET_MESSAGE_MAP_PARTITION_BY_MESHTASTIC_ID_SQL,
+                            (probe,),
+                        )
+                return (time.perf_counter() - started) / len(probes)
+
+            # Replies and reactions mostly target recent messages; uniform
+            # probes across the whole map are the worst case for partitions.
+            recent_seconds = _lookup_seconds(
+                [str(total - 1 - (index * 7919) % 1000) for index in range(2000)]
+            )
+            any_seconds = _lookup_seconds(
+                [str((index * 7919) % total) for index in range(2000)]
+            )
+
+            started = time.perf_counter()
+            removed = manager.run_sync(
+                lambda cursor: db_utils._prune_message_map_core(
+                    cursor, total - rows // 10
+                ),
+                write=True,
+            )
+            expire_seconds = time.perf_counter() - started
+        finally:
+            manager.close()
+    assert removed == rows // 10
+    return {
+        "insert": insert_seconds,
+        "recent": recent_seconds,
+        "any": any_seconds,
+        "expire": expire_seconds,
+    }
+
+
+@pytest.mark.performance
+@pytest.mark.parametrize("rows", [100_000, 1_000_000])
+def test_partitioned_message_map_benchmark(tmp_path, capsys, rows):
+    """Compare insert, lookup and expiry cost of one table and ten partitions."""
+    single = _measure(tmp_path, "single", rows, 0)
+    partitioned = _measure(tmp_path, "partitioned", rows, rows // 10)
+
+    with capsys.disabled():
+        print(
+            f"\nmessage_map, {rows} rows, partitions of {rows // 10} rows, "
+            "expiring the oldest 10%:"
+        )
+        for label, result in (("single", single), ("partitioned", partitioned)):
+            print(
+                f"  {label:<12} insert {result['insert'] * 1e6:.0f} us/row, "
+                f"lookup recent {result['recent'] * 1e6:.0f} us / "
+                f"any {result['any'] * 1e6:.0f} us, "
+                f"expire {result['expire'] * 1000:.1f} ms"
+            )
+
+    assert partitioned["expire"] * 5 < single["expire"]
@@ -0,0 +1,164 @@
+"""Tests for the incrementally maintained node metrics store."""
+
+import random
+import statistics
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from mmrelay.constants.plugins import LOW_BATTERY_THRESHOLD_PERCENT
+from mmrelay.meshtastic.node_metrics import NodeMetricsStore
+from mmrelay.meshtastic_utils import get_node_metrics_store, reset_node_metrics_store
+from mmrelay.plugins.health_plugin import Plugin as HealthPlugin
+
+NODE_COUNT = 2000
+
+
+@pytest.fixture(autouse=True)
+def fresh_store():
+    reset_node_metrics_store()
+    yield
+    reset_node_metrics_store()
+
+
+def _random_node(rng: random.Random, node_id: str) -> dict:
+    node = {"user": {"id": node_id, "shortName": node_id[-4:], "longName": node_id}}
+    if rng.random() < 0.8:
+        node["deviceMetrics"] = {
+            "batteryLevel": rng.choice([None, rng.randint(0, 101)]),
+            "airUtilTx": rng.choice([None, round(rng.uniform(0, 30), 3)]),
+            "voltage": round(rng.uniform(3.0, 4.2), 2),
+        }
+    if rng.random() < 0.9:
+        node["snr"] = rng.choice([None, round(rng.uniform(-20, 12), 2)])
+    return node
+
+
+def _full_recomputation(nodes: dict) -> dict:
+    battery, air_util_tx, snr = [], [], []
+    for info in nodes.values():
+        metrics = info.get("deviceMetrics", {})
+        if metrics.get("batteryLevel") is not None:
+            battery.append(metrics["batteryLevel"])
+        if metrics.get("airUtilTx") is not None:
+            air_util_tx.append(metrics["airUtilTx"])
+        if info.get("snr") is not None:
+            snr.append(info["snr"])
+
+    def _stat(values):
+        return (statistics.mean(values), statistics.median(values)) if values else None
+
+    return {
+        "nodes": len(nodes),
+        "battery": _stat(battery),
+        "air_util_tx": _stat(air_util_tx),
+        "snr": _stat(snr),
+        "low_battery": sum(1 for v in battery if v <= LOW_BATTERY_THRESHOLD_PERCENT),
+    }
+
+
+def _assert_summary_matches(store: NodeMetricsStore, nodes: dict) -> None:
+    summary = store.summary()
+    expected = _full_recomputation(nodes)
+    assert summary["nodes"] == expected["nodes"]
+    assert summary["low_battery"] == expected["low_battery"]
+    for metric in ("battery", "air_util_tx", "snr"):
+        if expected[metric] is None:
+            assert summary[metric] is None
+        else:
+            assert summary[metric] == pytest.approx(expected[metric], abs=1e-9)
+
+
+def test_aggregates_match_full_recomputation_over_packet_stream():
+    rng = random.Random(2000)
+    nodes = {
+        f"!{num:08x}": _random_node(rng, f"!{num:08x}") for num in range(NODE_COUNT)
+    }
+    interface = SimpleNamespace(nodes=nodes)
+    store = NodeMetricsStore()
+    store.bind(nodes)
+    _assert_summary_matches(store, nodes)
+
+    for step in range(3000):
+        num = rng.randrange(NODE_COUNT + 200)
+        node_id = f"!{num:08x}"
+        roll = rng.random()
+        if roll < 0.6 and node_id in nodes:
+            # TELEMETRY: the library replaces deviceMetrics of a known node.
+            nodes[node_id]["deviceMetrics"] = _random_node(rng, node_id).get(
+                "deviceMetrics", {}
+            )
+            nodes[node_id]["snr"] = round(rng.uniform(-20, 12), 2)
+        elif roll < 0.9:
+            # NODEINFO: a new node appears, or a known one is re-announced.
+            nodes[node_id] = _random_node(rng, node_id)
+        elif node_id in nodes:
+            del nodes[node_id]
+        packet = {"fromId": node_id} if step % 2 else {"from": num}
+        store.note_packet(packet, interface)
+
+        if step % 500 == 0:
+            _assert_summary_matches(store, nodes)
+    _assert_summary_matches(store, nodes)
+
+
+def test_packets_from_other_interfaces_are_ignored():
+    nodes = {"!00000001": {"snr": 1.0}}
+    store = NodeMetricsStore()
+    store.bind(nodes)
+    version = store.version
+
+    nodes["!00000001"]["snr"] = 9.0
+    store.note_packet({"fromId": "!00000001"}, SimpleNamespace(nodes={}))
+    assert store.version == version
+    assert store.summary()["snr"] == (1.0, 1.0)
+
+    store.note_packet({"fromId": "!00000001"}, SimpleNamespace(nodes=nodes))
+    assert store.summary()["snr"] == (9.0, 9.0)
+
+
+def test_rendered_response_is_reused_until_a_shown_field_changes():
+    nodes = {"!00000001": {"snr": 1.0, "lastHeard": 100}}
+    interface = SimpleNamespace(nodes=nodes)
+    store = NodeMetricsStore()
+    store.bind(nodes)
+    render = MagicMock(side_effect=["first", "second", "third"])
+
+    assert store.cached_render("nodes", render) == "first"
+    nodes["!00000001"]["lastHeard"] = 200
+    store.note_packet({"fromId": "!00000001"}, interface)
+    assert store.cached_render("nodes", render) == "first"
+
+    nodes["!00000001"]["snr"] = 2.0
+    store.note_packet({"fromId": "!00000001"}, interface)
+    assert store.cached_render("nodes", render) == "second"
+
+    with patch("mmrelay.meshtastic.node_metrics.time.monotonic", return_value=1e12):
+        assert store.cached_render("nodes", render, max_age=60) == "third"
+
+
+@patch("mmrelay.meshtastic_utils.connect_meshtastic")
+def test_repeated_health_command_is_served_from_cache(mock_connect):
+    nodes = {
+        "!00000001": {"deviceMetrics": {"batteryLevel": 5}, "snr": 4.0},
+        "!00000002": {"deviceMetrics": {"batteryLevel": 95}, "snr": 8.0},
+    }
+    mock_connect.return_value = SimpleNamespace(nodes=nodes)
+    plugin = HealthPlugin()
+
+    with patch.object(
+        HealthPlugin, "_format_summary", wraps=HealthPlugin._format_summary
+    ) as format_summary:
+        first = plugin.generate_response()
+        assert plugin.generate_response() == first
+        assert format_summary.call_count == 1
+
+        nodes["!00000002"]["deviceMetrics"]["batteryLevel"] = 7
+        get_node_metrics_store().note_packet({"fromId": "!00000002"}, mock_connect())
+        updated = plugin.generate_response()
+
+    assert format_summary.call_count == 2
+    assert "Nodes with Low Battery (<= 10%): 1" in first
+    assert "Nodes with Low Battery (<= 10%): 2" in updated
+    assert "Battery: 6.0% / 6.0% (avg / median)" in updated
@@ -0,0 +1,290 @@
+"""Tests for the NODEINFO-driven node-name feed and its use by the refresh task."""
+
+import asyncio
+import sqlite3
+import time
+from typing import Any, cast
+from unittest.mock import patch
+
+import pytest
+
+import mmrelay.meshtastic_utils as mu
+from mmrelay import db_utils
+from mmrelay.db_runtime import DatabaseManager
+from mmrelay.db_utils import NodeNameEntry
+from mmrelay.meshtastic import node_refresh
+from mmrelay.meshtastic.node_name_feed import NodeNameFeed
+from mmrelay.replay import generate_synthetic_traffic
+from mmrelay.testing import FakeMeshtasticInterface
+
+
+def _nodeinfo(node_id: str, long_name: str | None, short_name: str | None) -> dict:
+    user: dict[str, Any] = {"id": node_id}
+    if long_name is not None:
+        user["longName"] = long_name
+    if short_name is not None:
+        user["shortName"] = short_name
+    return {"decoded": {"portnum": "NODEINFO_APP", "user": user}}
+
+
+@pytest.fixture
+def manager(tmp_path):
+    db_manager = DatabaseManager(str(tmp_path / "meshtastic.sqlite"))
+    with (
+        patch("mmrelay.db_utils._get_db_manager", return_value=db_manager),
+        patch("mmrelay.db_utils.get_db_path", return_value=db_manager._path),
+    ):
+        db_utils.initialize_database()
+        yield db_manager
+    db_manager.close()
+
+
+def test_feed_queues_only_real_changes_coalesced_per_node():
+    feed = NodeNameFeed()
+    interface = FakeMeshtasticInterface(node_count=1)
+    feed.reset([NodeNameEntry("!1", "Alpha", "A"), NodeNameEntry("!2", "Beta", "B")])
+
+    feed.note_packet(_nodeinfo("!1", "Alpha", "A"), interface)
+    feed.note_packet({"decoded": {"portnum": "TEXT_MESSAGE_APP"}}, interface)
+    assert feed.pending_count() == 0
+
+    feed.note_packet(_nodeinfo("!1", "Alpha 2", "A"), interface)
+    feed.note_packet(_nodeinfo("!1", "Alpha 3", None), interface)
+    feed.note_packet(_nodeinfo("!3", "Gamma", "G"), interface)
+    # Renamed and renamed back before a flush: nothing to write.
+    feed.note_packet(_nodeinfo("!2", "Beta 2", "B"), interface)
+    feed.note_packet(_nodeinfo("!2", "Beta", "B"), interface)
+
+    written: list[list[NodeNameEntry]] = []
+    assert feed.flush(lambda entries: written.append(entries) or True) == 2
+    assert written == [
+        [NodeNameEntry("!1", "Alpha 3", "A"), NodeNameEntry("!3", "Gamma", "G")]
+    ]
+    assert feed.flush(lambda entries: pytest.fail("nothing should be written")) == 0
+
+    feed.note_packet(_nodeinfo("!3", "Gamma", "G"), interface)
+    assert feed.pending_count() == 0
+
+
+def test_feed_requeues_failed_flush_and_keeps_newer_changes():
+    feed = NodeNameFeed()
+    feed.note_user({"id": "!1", "longName": "Alpha", "shortName": "A"})
+
+    def _failing_write(entries: list[NodeNameEntry]) -> bool:
+        # A newer NODEINFO arrives while the write is in flight.
+        feed.note_user({"id": "!1", "longName": "Alpha 2"})
+        return False
+
+    assert feed.flush(_failing_write) == 0
+    written: list[list[NodeNameEntry]] = []
+    assert feed.flush(lambda entries: written.append(entries) or True) == 1
+    assert written == [[NodeNameEntry("!1", "Alpha 2", "A")]]
+
+    # A reconcile that already wrote a queued change clears it; others stay.
+    feed.note_user({"id": "!1", "longName": "Alpha 3"})
+    feed.note_user({"id": "!2", "longName": "Beta"})
+    feed.reset([NodeNameEntry("!1", "Alpha 3", "A"), {"state": 1}])
+    assert feed.pending_count() == 1
+
+
+def test_feed_requests_reconcile_when_nodedb_is_replaced():
+    feed = NodeNameFeed()
+    interface = FakeMeshtasticInterface(node_count=2)
+
+    feed.note_packet({}, interface)
+    feed.note_packet({}, interface)
+    assert feed.take_reconcile_request() is False
+
+    interface.nodes = dict(interface.nodes)
+    feed.note_packet({}, interface)
+    assert feed.take_reconcile_request() is True
+    assert feed.take_reconcile_request() is False
+
+
+def test_upsert_node_names_writes_set_fields_in_one_transaction(manager):
+    db_utils.save_longname("!1", "Old")
+    db_utils.save_shortname("!1", "O")
+
+    with patch.object(manager, "run_sync", wraps=manager.run_sync) as run_sync:
+        assert db_utils.upsert_node_names(
+            [NodeNameEntry("!1", "New", None), NodeNameEntry("!2", "Two", "T")]
+        )
+
+    assert run_sync.call_count == 1
+    assert db_utils.get_longname("!1") == "New"
+    assert db_utils.get_shortname("!1") == "O"
+    assert db_utils.get_shortname("!2") == "T"
+    assert db_utils.upsert_node_names([]) is True
+
+
+def test_upsert_node_names_reports_database_errors(manager):
+    with (
+        patch.object(manager, "run_sync", side_effect=sqlite3.OperationalError("x")),
+        patch("mmrelay.db_utils.logger") as mock_logger,
+    ):
+        assert db_utils.upsert_node_names([NodeNameEntry("!1", "A", "A")]) is False
+    mock_logger.exception.assert_called_once()
+
+
+class _CountedEvent:
+    """Event that is set after `waits` timed-out waits."""
+
+    def __init__(self, waits: int, on_wait=None) -> None:
+        self._remaining = waits
+        self._on_wait = on_wait
+
+    def is_set(self) -> bool:
+        return self._remaining < 0
+
+    async def wait(self) -> None:
+        if self._on_wait is not None:
+            self._on_wait()
+        self._remaining -= 1
+        if self._remaining >= 0:
+            await asyncio.sleep(1)
+
+
+@pytest.mark.asyncio
+async def test_refresh_loop_writes_feed_between_reconciles():
+    feed = NodeNameFeed()
+    interface = FakeMeshtasticInterface(node_count=3)
+    state = (NodeNameEntry("!1", "Alpha", "A"),)
+    replacement = FakeMeshtasticInterface(node_count=3)
+    notes = iter(
+        [
+            lambda: feed.note_packet(_nodeinfo("!1", "Alpha 2", None), interface),
+            lambda: feed.note_packet({}, replacement),
+            lambda: None,
+            lambda: None,
+        ]
+    )
+    event = _CountedEvent(3, on_wait=lambda: next(notes)())
+
+    with (
+        patch.object(mu, "meshtastic_client", interface),
+        patch.object(mu, "get_node_name_feed", return_value=feed),
+        patch.object(mu, "sync_name_tables_if_changed", return_value=state) as sync,
+        patch.object(mu, "upsert_node_names", return_value=True) as upsert,
+    ):
+        await mu.refresh_node_name_tables(
+            cast(asyncio.Event, event),
+            refresh_interval_seconds=0.01,
+            reconcile_interval_seconds=3600.0,
+        )
+
+    # Reconcile, flush of the queued rename, reconcile after the NodeDB was
+    # replaced, then a quiet pass that writes nothing.
+    assert sync.call_count == 2
+    upsert.assert_called_once_with([NodeNameEntry("!1", "Alpha 2", "A")])
+
+
+def test_get_nodedb_reconcile_interval_reads_config():
+    config = {"meshtastic": {"nodedb_reconcile_interval": 60}}
+    assert node_refresh.get_nodedb_reconcile_interval_seconds(config) == 60.0
+    bad = {"meshtastic": {"nodedb_reconcile_interval": -1}}
+    assert node_refresh.get_nodedb_reconcile_interval_seconds(bad) == 3600.0
+
+
+def _hour_of_nodeinfo(interface: FakeMeshtasticInterface) -> list[tuple[float, dict]]:
+    """About 1,000 NODEINFO packets over one hour, a few of them renames."""
+    packets = generate_synthetic_traffic(
+        node_count=len(interface.nodes),
+        packet_count=1000,
+        mix={"nodeinfo": 1.0},
+        interval_secs=3.6,
+        seed=46,
+    )
+    timeline = []
+    for index, recorded in enumerate(packets):
+        packet = recorded.packet
+        if index % 100 == 0:
+            packet["decoded"]["user"]["longName"] += " (moved)"
+        timeline.append((recorded.offset, packet))
+    return timeline
+
+
+def _simulate_hour(manager: DatabaseManager, *, use_feed: bool) -> dict[str, float]:
+    """Drive one hour of 15 s refreshes on a simulated clock."""
+    interface = FakeMeshtasticInterface(node_count=3000)
+    timeline = _hour_of_nodeinfo(interface)
+    feed = NodeNameFeed()
+    writes = 0
+    snapshots = 0
+    lock_seconds = 0.0
+    run_sync = manager.run_sync
+
+    def _counting_run_sync(func, *args, write=False, **kwargs):
+        nonlocal writes
+        writes += bool(write)
+        return run_sync(func, *args, write=write, **kwargs)
+
+    def _reconcile(previous):
+        nonlocal lock_seconds, snapshots
+        snapshots += 1
+        started = time.perf_counter()
+        snapshot, _missing = node_refresh._snapshot_node_name_rows()
+        lock_seconds += time.perf_counter() - started
+        return db_utils.sync_name_tables_if_changed(snapshot, previous)
+
+    with (
+        patch.object(mu, "meshtastic_client", interface),
+        patch.object(manager, "run_sync", side_effect=_counting_run_sync),
+    ):
+        state = _reconcile(None)
+        feed.reset(state)
+        started = time.perf_counter()
+        position = 0
+        for tick in range(1, 241):
+            while position < len(timeline) and timeline[position][0] <= tick * 15:
+                packet = timeline[position][1]
+                user = packet["decoded"]["user"]
+                # The library applies NODEINFO to the NodeDB before publishing.
+                interface.nodes[user["id"]]["user"] = dict(user)
+                if use_feed:
+                    feed.note_packet(packet, interface)
+                position += 1
+            if use_feed:
+                feed.flush(db_utils.upsert_node_names)
+            else:
+                state = _reconcile(state)
+        if use_feed:
+            feed.reset(_reconcile(state))
+        elapsed = time.perf_counter() - started
+
+    return {
+        "writes": writes,
+        "snapshots": snapshots,
+        "lock": lock_seconds,
+        "elapsed": elapsed,
+    }
+
+
+@pytest.mark.performance
+def test_node_name_feed_benchmark(manager, capsys):
+    """Compare one hour of 15 s full snapshots with the feed plus one reconcile."""
+    snapshots = _simulate_hour(manager, use_feed=False)
+    with manager.read() as cursor:
+        expected = cursor.execute("SELECT * FROM longnames ORDER BY 1").fetchall()
+    with manager.write() as cursor:
+        cursor.execute("DELETE FROM longnames")
+        cursor.execute("DELETE FROM shortnames")
+    feed = _simulate_hour(manager, use_feed=True)
+    with manager.read() as cursor:
+        actual = cursor.execute("SELECT * FROM longnames ORDER BY 1").fetchall()
+
+    with capsys.disabled():
+        print("\nnode names, 3000 nodes, ~1000 NODEINFO/hour, 15 s refresh:")
+        for label, result in (("snapshots", snapshots), ("feed", feed)):
+            print(
+                f"  {label:<10} {result['writes']:>4} write transactions, "
+                f"{result['snapshots']:>3} NodeDB snapshots, "
+                f"meshtastic_lock held {result['lock'] * 1000:.1f} ms, "
+                f"total {result['elapsed'] * 1000:.0f} ms"
+            )
+
+    assert actual == expected
+    assert feed["writes"] * 2 < snapshots["writes"]
+    # Each NodeDB snapshot holds meshtastic_lock; the feed takes one at
+    # startup and one reconcile instead of one per refresh.
+    assert snapshots["snapshots"] == 241
+    assert feed["snapshots"] == 2
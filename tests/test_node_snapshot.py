@@ -0,0 +1,160 @@
+"""Tests for the persistent NodeDB snapshot and its read-through cache."""
+
+import asyncio
+import threading
+import time
+from unittest.mock import patch
+
+import pytest
+
+import mmrelay.meshtastic_utils as mu
+from mmrelay import db_utils
+from mmrelay.constants.database import NODE_SNAPSHOT_MAX_AGE_SECS
+from mmrelay.db_runtime import DatabaseManager
+from mmrelay.meshtastic.messaging import _get_node_display_name
+from mmrelay.testing import FakeMeshtasticInterface
+
+
+class _SlowNodeDBInterface(FakeMeshtasticInterface):
+    """Fake interface whose NodeDB arrives over `delay` seconds after connect."""
+
+    def __init__(self, node_count: int, delay: float) -> None:
+        super().__init__(node_count)
+        self._streamed = self.nodes
+        self.nodes = {}
+        self._stream = threading.Thread(
+            target=self._stream_nodedb, args=(delay,), daemon=True
+        )
+        self._stream.start()
+
+    def _stream_nodedb(self, delay: float) -> None:
+        pause = delay / len(self._streamed)
+        for node_id, node in self._streamed.items():
+            time.sleep(pause)
+            self.nodes[node_id] = node
+
+    def wait_for_nodedb(self) -> None:
+        self._stream.join()
+
+
+@pytest.fixture
+def manager(tmp_path):
+    db_manager = DatabaseManager(str(tmp_path / "meshtastic.sqlite"))
+    with (
+        patch("mmrelay.db_utils._get_db_manager", return_value=db_manager),
+        patch("mmrelay.db_utils.get_db_path", return_value=db_manager._path),
+    ):
+        db_utils.initialize_database()
+        yield db_manager
+    db_manager.close()
+
+
+@pytest.fixture
+def cache():
+    mu.reset_node_snapshot_cache()
+    yield mu.get_node_snapshot_cache()
+    mu.reset_node_snapshot_cache()
+
+
+def test_snapshot_round_trip_drops_raw_values_and_expired_rows(manager, cache):
+    interface = FakeMeshtasticInterface(node_count=2)
+    node_id = next(iter(interface.nodes))
+    interface.nodes[node_id]["position"] = {
+        "latitude": 52.1,
+        "longitude": 4.3,
+        "raw": object(),
+    }
+    interface.nodes[node_id]["user"]["publicKey"] = b"\x01\x02"
+    cache.bind(interface.nodes)
+
+    now = time.time()
+    assert db_utils.save_node_snapshot({"!old": {"num": 1}}, now - 2 * 86400)
+    with patch.object(mu, "meshtastic_client", interface):
+        assert mu.save_node_snapshot_now()
+    assert db_utils.save_node_snapshot(
+        {"!expired": {"num": 2}}, now - NODE_SNAPSHOT_MAX_AGE_SECS - 60
+    )
+
+    loaded = db_utils.load_node_snapshot(now)
+    assert set(loaded) == {"!old", *interface.nodes}
+    node, saved_at = loaded[node_id]
+    assert node["position"] == {"latitude": 52.1, "longitude": 4.3}
+    assert "publicKey" not in node["user"]
+    assert saved_at == pytest.approx(now, abs=60)
+
+
+def test_name_resolution_works_right_after_connect(manager, cache):
+    # The previous run saved the NodeDB before it stopped.
+    previous = FakeMeshtasticInterface(node_count=50)
+    cache.bind(previous.nodes)
+    with patch.object(mu, "meshtastic_client", previous):
+        assert mu.save_node_snapshot_now()
+    mu.reset_node_snapshot_cache()
+    cache = mu.get_node_snapshot_cache()
+
+    assert mu.hydrate_node_snapshot({}) == 50
+    interface = _SlowNodeDBInterface(node_count=50, delay=1.0)
+    cache.bind(interface.nodes)
+    # The last node of the stream is the last to arrive.
+    node_id = list(previous.nodes)[-1]
+    expected = previous.nodes[node_id]["user"]["shortName"]
+
+    with patch.object(mu, "meshtastic_client", interface):
+        # The name tables are empty and the radio has not streamed the node yet.
+        assert node_id not in interface.nodes
+        assert _get_node_display_name(node_id, interface) == expected
+        cached = mu.lookup_node(node_id)
+        assert cached.stale is True and cached.saved_at is not None
+        assert cache.stale_count() > 0
+
+        interface.wait_for_nodedb()
+        interface.nodes[node_id]["user"] = {"id": node_id, "shortName": "LIVE"}
+        assert mu.lookup_node(node_id) == (interface.nodes[node_id], False, None)
+        assert _get_node_display_name(node_id, interface) == "LIVE"
+        assert cache.stale_count() == 0
+
+        # Other radios never fall back to the primary radio's snapshot.
+        assert mu.lookup_node("!ffffffff", FakeMeshtasticInterface(1)) is None
+
+
+def test_reconnect_serves_last_live_entries_until_new_nodedb_arrives(cache):
+    first = FakeMeshtasticInterface(node_count=3)
+    cache.bind(first.nodes)
+    node_id = list(first.nodes)[-1]
+    first.nodes[node_id]["user"]["longName"] = "Renamed before reconnect"
+
+    second = _SlowNodeDBInterface(node_count=3, delay=1.5)
+    cache.bind(second.nodes)
+
+    cached = cache.lookup(node_id)
+    assert cached.stale is True
+    assert cached.node["user"]["longName"] == "Renamed before reconnect"
+    second.wait_for_nodedb()
+    assert cache.lookup(node_id).stale is False
+
+
+@pytest.mark.asyncio
+async def test_persist_task_saves_on_schedule_and_at_shutdown(cache):
+    shutdown_event = asyncio.Event()
+    with patch.object(mu, "save_node_snapshot_now", return_value=True) as save:
+        task = asyncio.create_task(
+            mu.persist_node_snapshot(shutdown_event, interval_seconds=0.01)
+        )
+        await asyncio.sleep(0.05)
+        shutdown_event.set()
+        await asyncio.wait_for(task, timeout=2)
+        saves = save.call_count
+        assert saves >= 2
+
+        await mu.persist_node_snapshot(shutdown_event, interval_seconds=0)
+        assert save.call_count == saves
+
+
+def test_snapshot_interval_config_and_disabled_hydrate(cache):
+    config = {"meshtastic": {"nodedb_snapshot_interval": 0}}
+    assert mu.get_nodedb_snapshot_interval_seconds(config) == 0.0
+    with patch.object(mu, "load_node_snapshot") as load:
+        assert mu.hydrate_node_snapshot(config) == 0
+    load.assert_not_called()
+    bad = {"meshtastic": {"nodedb_snapshot_interval": "often"}}
+    assert mu.get_nodedb_snapshot_interval_seconds(bad) == 300.0
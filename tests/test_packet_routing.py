@@ -1,4 +1,5 @@
 from typing import Any, cast
+from unittest.mock import patch
 
 from mmrelay.constants.config import (
     DEFAULT_ENCRYPTED_ACTION,
@@ -15,6 +16,8 @@ from mmrelay.meshtastic.packet_routing import (
     _resolve_portnum_set,
     _warn_once,
     classify_packet,
+    clear_routing_policy_cache,
+    compile_routing_policy,
 )
 
 
@@ -544,3 +547,52 @@ class TestClassifyPacket:
         }
         action = classify_packet(None, config, {"encrypted": True})
         assert action == PacketAction.PLUGIN_ONLY
+
+
+class TestCompiledRoutingPolicy:
+    def setup_method(self):
+        clear_routing_policy_cache()
+
+    def test_policy_is_reused_for_same_config(self):
+        config = {"meshtastic": {"packet_routing": {"disabled_portnums": ["X_APP"]}}}
+
+        assert compile_routing_policy(config) is compile_routing_policy(config)
+
+    def test_replacing_config_recompiles(self):
+        first = {"meshtastic": {"packet_routing": {"disabled_portnums": []}}}
+        second = {
+            "meshtastic": {"packet_routing": {"disabled_portnums": ["POSITION_APP"]}}
+        }
+
+        assert classify_packet("POSITION_APP", first) == PacketAction.PLUGIN_ONLY
+        assert classify_packet("POSITION_APP", second) == PacketAction.DROP
+
+    def test_detection_sensor_toggle_recompiles(self):
+        config: dict[str, Any] = {"meshtastic": {"detection_sensor": True}}
+        assert classify_packet("DETECTION_SENSOR_APP", config) == PacketAction.RELAY
+
+        config["meshtastic"]["detection_sensor"] = False
+        assert (
+            classify_packet("DETECTION_SENSOR_APP", config) == PacketAction.PLUGIN_ONLY
+        )
+
+    def test_memoizes_portnum_actions(self):
+        config = {"meshtastic": {}}
+        policy = compile_routing_policy(config)
+
+        with patch(
+            "mmrelay.meshtastic.packet_routing._get_portnum_name",
+            wraps=_get_portnum_name,
+        ) as mock_name:
+            for _ in range(5):
+                assert policy.resolve(PORTNUM_TEXT_MESSAGE_APP)[0] == PacketAction.RELAY
+
+        assert mock_name.call_count == 1
+
+    def test_int_and_string_portnums_do_not_collide(self):
+        policy = compile_routing_policy(None)
+
+        assert policy.resolve(PORTNUM_TEXT_MESSAGE_APP)[0] == PacketAction.RELAY
+        assert policy.resolve(str(PORTNUM_TEXT_MESSAGE_APP))[0] == (
+            PacketAction.PLUGIN_ONLY
+        )
@@ -0,0 +1,96 @@
+"""Tests for the shared per-packet PacketView used by Meshtastic plugins."""
+
+import json
+from unittest.mock import MagicMock, patch
+
+from mmrelay.meshtastic.packet_view import (
+    PacketView,
+    _strip_raw_copy,
+    get_packet_view,
+    packet_view_scope,
+)
+from mmrelay.meshtastic_utils import _run_meshtastic_plugins
+
+
+def _packet() -> dict:
+    return {
+        "id": 1,
+        "channel": 0,
+        "raw": object(),
+        "decoded": {
+            "portnum": "POSITION_APP",
+            "payload": b"\x01\x02",
+            "raw": object(),
+            "items": [{"raw": 1, "value": 2}],
+        },
+    }
+
+
+class TestPacketView:
+    def test_strip_raw_copy_leaves_input_untouched(self):
+        packet = _packet()
+
+        clean = _strip_raw_copy(packet)
+
+        assert "raw" not in clean and "raw" not in clean["decoded"]
+        assert clean["decoded"]["items"] == [{"value": 2}]
+        assert "raw" in packet and "raw" in packet["decoded"]
+        assert packet["decoded"]["items"][0]["raw"] == 1
+
+    def test_transport_encodes_payload_and_json_is_cached(self):
+        packet = _packet()
+        view = PacketView(packet)
+
+        assert view.transport["decoded"]["payload"] == "AQI="
+        assert view.stripped["decoded"]["payload"] == b"\x01\x02"
+        assert packet["decoded"]["payload"] == b"\x01\x02"
+
+        with patch("mmrelay.meshtastic.packet_view.json.dumps") as mock_dumps:
+            mock_dumps.return_value = "{}"
+            assert view.json == view.json == "{}"
+        mock_dumps.assert_called_once()
+
+    def test_transport_without_bytes_payload_reuses_stripped(self):
+        view = PacketView({"decoded": {"text": "hi"}, "raw": "x"})
+
+        assert view.transport is view.stripped
+        assert json.loads(view.json) == {"decoded": {"text": "hi"}}
+
+    def test_scope_shares_one_view_per_packet(self):
+        packet = _packet()
+
+        with packet_view_scope(packet) as view:
+            assert get_packet_view(packet) is view
+            assert get_packet_view(dict(packet)) is not view
+
+        assert get_packet_view(packet) is not view
+
+    def test_plugins_share_the_view_during_dispatch(self):
+        packet = _packet()
+        seen = []
+
+        def handler(pkt, *_args):
+            seen.append(get_packet_view(pkt))
+            return False
+
+        plugins = [MagicMock(plugin_name=name) for name in ("a", "b")]
+        for plugin in plugins:
+            plugin.handle_meshtastic_message.side_effect = handler
+
+        with (
+            patch("mmrelay.plugin_loader.load_plugins", return_value=plugins),
+            patch(
+                "mmrelay.meshtastic_utils._resolve_plugin_result", return_value=False
+            ),
+        ):
+            _run_meshtastic_plugins(
+                packet=packet,
+                formatted_message=None,
+                longname=None,
+                meshnet_name=None,
+                loop=MagicMock(),
+                cfg={},
+            )
+
+        assert len(seen) == 2
+        assert seen[0] is seen[1]
@@ -0,0 +1,259 @@
+"""Tests for the plugin_data codec and the plugin_series side table."""
+
+import json
+import random
+import sqlite3
+import time
+from unittest.mock import patch
+
+import pytest
+
+from mmrelay import db_utils
+from mmrelay.constants.plugins import TELEMETRY_MAX_DATA_ROWS
+from mmrelay.db_runtime import DatabaseManager
+from mmrelay.plugin_data_codec import (
+    FORMAT_JSON_ZLIB,
+    FORMAT_RECORDS,
+    PluginDataCodecError,
+    decode_plugin_data,
+    encode_plugin_data,
+    plugin_data_to_json,
+)
+
+
+def _telemetry_history(rows: int, rng: random.Random) -> list[dict]:
+    """Rows shaped like the ones the telemetry plugin stores per node."""
+    start = 1_760_000_000
+    return [
+        {
+            "time": start + index * 900 + rng.randrange(60),
+            "batteryLevel": rng.randrange(20, 101),
+            "voltage": round(rng.uniform(3.4, 4.2), 3),
+            "airUtilTx": None if rng.random() < 0.1 else rng.uniform(0, 5),
+        }
+        for index in range(rows)
+    ]
+
+
+@pytest.fixture
+def manager(tmp_path):
+    db_manager = DatabaseManager(str(tmp_path / "meshtastic.sqlite"))
+    with (
+        patch("mmrelay.db_utils._get_db_manager", return_value=db_manager),
+        patch("mmrelay.db_utils.get_db_path", return_value=db_manager._path),
+    ):
+        db_utils.initialize_database()
+        yield db_manager
+    db_manager.close()
+
+
+def test_telemetry_history_round_trips_through_records_format():
+    history = _telemetry_history(TELEMETRY_MAX_DATA_ROWS, random.Random(1))
+
+    encoded = encode_plugin_data(history)
+
+    assert isinstance(encoded, bytes) and encoded[0] == FORMAT_RECORDS
+    decoded = decode_plugin_data(encoded)
+    # Same values, same key order and the same int/float/None types as JSON.
+    assert json.dumps(decoded) == json.dumps(history)
+
+
+@pytest.mark.parametrize(
+    "data",
+    [
+        # Too few rows to be worth packing.
+        [{"time": 1, "value": 2.0}],
+        # Booleans, strings and int/float mixes would not round-trip exactly.
+        [{"ok": True}] * 10,
+        [{"text": "hello"}] * 10,
+        [{"value": 1}, {"value": 1.5}] * 5,
+        # Differing key sets or order.
+        [{"a": 1, "b": 2}, {"b": 2, "a": 1}] * 5,
+        {"a": 1},
+        "text",
+        None,
+    ],
+)
+def test_irregular_small_values_stay_json_text(data):
+    encoded = encode_plugin_data(data)
+
+    assert encoded == json.dumps(data)
+    assert decode_plugin_data(encoded) == data
+
+
+def test_large_irregular_values_are_compressed():
+    messages = [
+        {"location": [52.1, 4.3], "text": f"dropped message {index} " * 5}
+        for index in range(40)
+    ]
+
+    encoded = encode_plugin_data(messages)
+
+    assert isinstance(encoded, bytes) and encoded[0] == FORMAT_JSON_ZLIB
+    assert len(encoded) < len(json.dumps(messages)) / 3
+    assert decode_plugin_data(encoded) == messages
+    assert json.loads(plugin_data_to_json(encoded)) == messages
+
+
+@pytest.mark.parametrize(
+    "blob",
+    [
+        b"",
+        b"\x7fgarbage",
+        bytes((FORMAT_JSON_ZLIB,)) + b"not zlib",
+        encode_plugin_data(_telemetry_history(10, random.Random(2)))[:-3],
+        encode_plugin_data(_telemetry_history(10, random.Random(2))) + b"\x00",
+    ],
+)
+def test_corrupt_values_raise_codec_error(blob):
+    with pytest.raises(PluginDataCodecError):
+        decode_plugin_data(blob)
+
+
+def test_store_and_read_encoded_and_legacy_rows(manager):
+    history = _telemetry_history(TELEMETRY_MAX_DATA_ROWS, random.Random(3))
+    db_utils.store_plugin_data("telemetry", "!node1", history)
+    with manager.write() as cursor:
+        # A row written by an older release.
+        cursor.execute(
+            "INSERT INTO plugin_data (plugin_name, meshtastic_id, data) VALUES (?, ?, ?)",
+            ("telemetry", "!node2", json.dumps(history[:3])),
+        )
+        cursor.execute(
+            "INSERT INTO plugin_data (plugin_name, meshtastic_id, data) VALUES (?, ?, ?)",
+            ("telemetry", "!node3", b"\x7fcorrupt"),
+        )
+        stored_type = cursor.execute(
+            "SELECT typeof(data) FROM plugin_data WHERE meshtastic_id='!node1'"
+        ).fetchone()[0]
+
+    assert stored_type == "blob"
+    assert db_utils.get_plugin_data_for_node("telemetry", "!node1") == history
+    assert db_utils.get_plugin_data_for_node("telemetry", "!node2") == history[:3]
+    assert db_utils.get_plugin_data_for_node("telemetry", "!node3") == []
+    # Plugins that parse get_plugin_data() rows with json.loads keep working.
+    rows = [json.loads(row[0]) for row in db_utils.get_plugin_data("telemetry")]
+    assert sorted(rows, key=len) == [history[:3], history]
+
+
+def test_plugin_series_store_query_and_prune(manager):
+    for hour in range(6):
+        timestamp = 1_760_000_000 + hour * 3600
+        db_utils.store_plugin_series(
+            "telemetry", "!node1", timestamp, {"voltage": 4.0 - hour / 10}
+        )
+        db_utils.store_plugin_series(
+            "telemetry",
+            "!node2",
+            timestamp,
+            {"voltage": 3.9, "batteryLevel": 80 - hour},
+        )
+    # Storing the same sample again replaces it.
+    db_utils.store_plugin_series(
+        "telemetry", "!node2", 1_760_000_000, {"batteryLevel": None}
+    )
+
+    voltage = db_utils.get_plugin_series("telemetry", "voltage")
+    assert len(voltage) == 12
+    assert [row[1] for row in voltage] == sorted(row[1] for row in voltage)
+    battery = db_utils.get_plugin_series(
+        "telemetry", "batteryLevel", meshtastic_id="!node2"
+    )
+    assert battery[0] == ("!node2", 1_760_000_000.0, None)
+    assert battery[-1] == ("!node2", 1_760_018_000.0, 75.0)
+    assert (
+        len(
+            db_utils.get_plugin_series(
+                "telemetry", "voltage", meshtastic_id="!node1", since=1_760_007_200
+            )
+        )
+        == 4
+    )
+
+    assert db_utils.prune_plugin_series("telemetry", 1_760_007_200) == 6
+    db_utils.delete_plugin_series("telemetry", "!node1")
+    assert db_utils.get_plugin_series("telemetry", "voltage") == [
+        ("!node2", 1_760_000_000.0 + hour * 3600, 3.9) for hour in range(2, 6)
+    ]
+    assert db_utils.get_plugin_series("other", "voltage") == []
+
+
+def test_prune_plugin_data_keeps_newest_keys_with_prefix(manager):
+    for name in ("a", "b", "c", "d"):
+        db_utils.store_plugin_data("weather", f"geocode:{name}", {"name": name})
+    db_utils.store_plugin_data("weather", "!node1", {"name": "node"})
+    db_utils.store_plugin_data("other", "geocode:a", {"name": "other"})
+    # Updating a key keeps its place in the order.
+    db_utils.store_plugin_data("weather", "geocode:a", {"name": "a2"})
+
+    assert db_utils.prune_plugin_data("weather", "geocode:", 2) == 2
+    assert db_utils.prune_plugin_data("weather", "geocode:", 2) == 0
+
+    assert db_utils.get_plugin_data_for_node("weather", "geocode:a") == []
+    assert db_utils.get_plugin_data_for_node("weather", "geocode:b") == []
+    assert db_utils.get_plugin_data_for_node("weather", "geocode:d") == {"name": "d"}
+    assert db_utils.get_plugin_data_for_node("weather", "!node1") == {"name": "node"}
+    assert db_utils.get_plugin_data_for_node("other", "geocode:a") == {"name": "other"}
+
+
+def test_plugin_series_errors_are_logged(manager):
+    with (
+        patch.object(manager, "run_sync", side_effect=sqlite3.OperationalError("x")),
+        patch("mmrelay.db_utils.logger") as mock_logger,
+    ):
+        db_utils.store_plugin_series("telemetry", "!node1", 0, {"voltage": 4.0})
+        assert db_utils.get_plugin_series("telemetry", "voltage") == []
+        assert db_utils.prune_plugin_series("telemetry", 0) == 0
+        db_utils.delete_plugin_series("telemetry", "!node1")
+
+    assert mock_logger.exception.call_count == 4
+
+
+def _best_of(repeats: int, func) -> float:
+    timings = []
+    for _ in range(repeats):
+        started = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - started)
+    return min(timings)
+
+
+@pytest.mark.performance
+def test_telemetry_codec_benchmark(tmp_path, capsys):
+    """Compare JSON and the records format on 200 nodes of full telemetry history."""
+    rng = random.Random(4)
+    histories = [_telemetry_history(TELEMETRY_MAX_DATA_ROWS, rng) for _ in range(200)]
+    json_rows = [json.dumps(history) for history in histories]
+    packed_rows = [encode_plugin_data(history) for history in histories]
+
+    json_encode = _best_of(5, lambda: [json.dumps(h) for h in histories])
+    packed_encode = _best_of(5, lambda: [encode_plugin_data(h) for h in histories])
+    json_decode = _best_of(5, lambda: [json.loads(row) for row in json_rows])
+    packed_decode = _best_of(5, lambda: [decode_plugin_data(r) for r in packed_rows])
+
+    def _bytes_on_disk(name: str, rows: list) -> int:
+        path = tmp_path / f"{name}.sqlite"
+        with sqlite3.connect(path) as conn:
+            conn.execute(db_utils._CREATE_TABLE_PLUGIN_DATA_SQL)
+            conn.executemany(
+                "INSERT INTO plugin_data VALUES ('telemetry', ?, ?)",
+                [(f"!{index:08x}", row) for index, row in enumerate(rows)],
+            )
+        conn.close()
+        return path.stat().st_size
+
+    json_disk = _bytes_on_disk("json", json_rows)
+    packed_disk = _bytes_on_disk("packed", packed_rows)
+
+    with capsys.disabled():
+        print(
+            f"\nplugin_data telemetry, 200 nodes x {TELEMETRY_MAX_DATA_ROWS} rows:"
+            f"\n  json:    encode {json_encode * 1000:.1f} ms, decode "
+            f"{json_decode * 1000:.1f} ms, {json_disk} bytes on disk"
+            f"\n  records: encode {packed_encode * 1000:.1f} ms, decode "
+            f"{packed_decode * 1000:.1f} ms, {packed_disk} bytes on disk"
+        )
+
+    assert [decode_plugin_data(row) for row in packed_rows] == histories
+    assert packed_disk * 2 < json_disk
+    assert packed_decode < json_decode * 1.5
@@ -0,0 +1,200 @@
+"""Tests for plugin loader: parallel community plugin sync against local bare repos."""
+
+import os
+import shutil
+import subprocess  # nosec B404
+import tempfile
+import threading
+import time
+import unittest
+from unittest.mock import patch
+
+import mmrelay.plugin_loader as pl
+from mmrelay.plugin_loader import (
+    PLUGIN_SYNC_MANIFEST_FILENAME,
+    CommunityPluginJob,
+    _sync_community_plugins,
+)
+from tests._plugin_loader_helpers import TEST_GIT_TIMEOUT
+
+_GIT_IDENTITY = [
+    "-c",
+    "user.name=Test",
+    "-c",
+    "user.email=test@example.org",
+    "-c",
+    "init.defaultBranch=main",
+]
+
+
+def _git(*args: str, cwd: str | None = None) -> str:
+    return subprocess.run(  # nosec B603 B607
+        ["git", *_GIT_IDENTITY, *args],
+        cwd=cwd,
+        check=True,
+        capture_output=True,
+        text=True,
+        timeout=TEST_GIT_TIMEOUT,
+    ).stdout.strip()
+
+
+class TestCommunityPluginSync(unittest.TestCase):
+    """Sync community plugins from local bare repositories standing in for remotes."""
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.remotes_dir = os.path.join(self.temp_dir, "remotes")
+        self.plugins_dir = os.path.join(self.temp_dir, "plugins", "community")
+        os.makedirs(self.plugins_dir)
+        self.original_config = pl.config
+        pl.config = {"security": {"allow_local_plugin_paths": True}}
+
+    def tearDown(self):
+        pl.config = self.original_config
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def _make_remote(self, name: str) -> str:
+        """Create a bare repo with one plugin commit on main and an annotated tag v1."""
+        bare_path = os.path.join(self.remotes_dir, f"{name}.git")
+        work_path = os.path.join(self.remotes_dir, f"{name}-work")
+        _git("init", "--bare", bare_path)
+        _git("clone", bare_path, work_path)
+        self._commit(work_path, "v1")
+        _git("tag", "-a", "v1", "-m", "release v1", cwd=work_path)
+        _git("push", "origin", "main", "--tags", cwd=work_path)
+        return bare_path
+
+    def _commit(self, work_path: str, content: str) -> str:
+        with open(os.path.join(work_path, "plugin.py"), "w", encoding="utf-8") as f:
+            f.write(f"VERSION = {content!r}\n")
+        _git("add", "plugin.py", cwd=work_path)
+        _git("commit", "-m", content, cwd=work_path)
+        return _git("rev-parse", "HEAD", cwd=work_path)
+
+    def _job(self, name: str, repo_url: str, ref_type: str, ref_value: str):
+        repo_name = os.path.basename(repo_url)[: -len(".git")]
+        return CommunityPluginJob(
+            plugin_name=name,
+            repo_url=repo_url,
+            ref={"type": ref_type, "value": ref_value},
+            repo_name=repo_name,
+            repo_path=os.path.join(self.plugins_dir, repo_name),
+            install_requirements=False,
+            has_explicit_ref=True,
+        )
+
+    def test_unchanged_repos_are_not_fetched_again(self):
+        remotes = [self._make_remote(f"plugin{index}") for index in range(3)]
+        jobs = [
+            self._job("plugin0", remotes[0], "branch", "main"),
+            self._job("plugin1", remotes[1], "tag", "v1"),
+            self._job(
+                "plugin2",
+                remotes[2],
+                "commit",
+                _git("rev-parse", "main", cwd=remotes[2]),
+            ),
+        ]
+
+        with patch.object(
+            pl, "clone_or_update_repo", wraps=pl.clone_or_update_repo
+        ) as clone:
+            first = _sync_community_plugins(jobs, self.plugins_dir, max_workers=3)
+            self.assertEqual(clone.call_count, 3)
+            second = _sync_community_plugins(jobs, self.plugins_dir, max_workers=3)
+            self.assertEqual(clone.call_count, 3)
+
+        self.assertEqual(
+            [(r.plugin_name, r.ready, r.fetch_skipped) for r in first],
+            [
+                ("plugin0", True, False),
+                ("plugin1", True, False),
+                ("plugin2", True, False),
+            ],
+        )
+        self.assertTrue(all(r.ready and r.fetch_skipped for r in second))
+        for job in jobs:
+            self.assertTrue(
+                os.path.isfile(
+                    os.path.join(job.repo_path, PLUGIN_SYNC_MANIFEST_FILENAME)
+                )
+            )
+
+    def test_new_upstream_commit_is_fetched(self):
+        remote = self._make_remote("moving")
+        job = self._job("moving", remote, "branch", "main")
+        self.assertTrue(_sync_community_plugins([job], self.plugins_dir)[0].ready)
+
+        work_path = os.path.join(self.remotes_dir, "moving-work")
+        new_head = self._commit(work_path, "v2")
+        _git("push", "origin", "main", cwd=work_path)
+
+        result = _sync_community_plugins([job], self.plugins_dir)[0]
+
+        self.assertTrue(result.ready)
+        self.assertFalse(result.fetch_skipped)
+        self.assertEqual(_git("rev-parse", "HEAD", cwd=job.repo_path), new_head)
+        self.assertTrue(
+            _sync_community_plugins([job], self.plugins_dir)[0].fetch_skipped
+        )
+
+    def test_retargeted_tag_is_fetched(self):
+        remote = self._make_remote("tagged")
+        job = self._job("tagged", remote, "tag", "v1")
+        _sync_community_plugins([job], self.plugins_dir)
+
+        work_path = os.path.join(self.remotes_dir, "tagged-work")
+        self._commit(work_path, "v1-fixed")
+        _git("tag", "-f", "-a", "v1", "-m", "retagged", cwd=work_path)
+        _git("push", "-f", "origin", "main", "--tags", cwd=work_path)
+
+        with patch.object(pl, "clone_or_update_repo", return_value=True) as clone:
+            result = _sync_community_plugins([job], self.plugins_dir)[0]
+
+        clone.assert_called_once()
+        self.assertFalse(result.fetch_skipped)
+
+    def test_syncs_run_in_parallel_up_to_the_worker_limit(self):
+        active = 0
+        peak = 0
+        paths_in_use: set[str] = set()
+        lock = threading.Lock()
+
+        def slow_clone(repo_url, ref, plugins_dir):
+            nonlocal active, peak
+            repo_path = os.path.join(plugins_dir, os.path.basename(repo_url)[:-4])
+            with lock:
+                self.assertNotIn(repo_path, paths_in_use)
+                paths_in_use.add(repo_path)
+                active += 1
+                peak = max(peak, active)
+            time.sleep(0.05)
+            with lock:
+                active -= 1
+                paths_in_use.discard(repo_path)
+            return not repo_url.endswith("broken.git")
+
+        jobs = [
+            self._job(f"plugin{index}", f"/srv/repo{index}.git", "branch", "main")
+            for index in range(6)
+        ]
+        # Two plugins from one repository share a checkout and must not overlap.
+        jobs.append(self._job("plugin0-extra", "/srv/repo0.git", "branch", "main"))
+        jobs.append(self._job("broken", "/srv/broken.git", "branch", "main"))
+
+        with patch.object(pl, "clone_or_update_repo", side_effect=slow_clone):
+            started = time.monotonic()
+            results = _sync_community_plugins(jobs, self.plugins_dir, max_workers=3)
+            elapsed = time.monotonic() - started
+
+        self.assertEqual(peak, 3)
+        self.assertLess(elapsed, 0.05 * len(jobs))
+        self.assertEqual(
+            [r.plugin_name for r in results], [j.plugin_name for j in jobs]
+        )
+        self.assertEqual([r.ready for r in results], [True] * 7 + [False])
+        self.assertTrue(all(r.fetch_seconds >= 0.05 for r in results))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,69 @@
+"""Tests for the geohash spatial index."""
+
+import random
+
+import pytest
+
+from mmrelay.spatial_index import GeohashIndex, geohash_encode, haversine_km
+
+
+def _linear_scan(points, latitude, longitude, radius_km):
+    origin = (latitude, longitude)
+    return {
+        key for key, point in points.items() if haversine_km(origin, point) <= radius_km
+    }
+
+
+def test_geohash_encode_matches_reference():
+    assert geohash_encode(57.64911, 10.40744, precision=11) == "u4pruydqqvj"
+    assert geohash_encode(-90.0, -180.0, precision=5) == "00000"
+    assert geohash_encode(90.0, 180.0, precision=5) == "zzzzz"
+
+
+def test_haversine_km_known_distance():
+    # Lyon to Paris, the reference example of the haversine package.
+    assert haversine_km((45.7597, 4.8422), (48.8567, 2.3508)) == pytest.approx(
+        392.2172595594006
+    )
+
+
+def test_query_radius_matches_linear_scan_everywhere():
+    rng = random.Random(7)
+    index = GeohashIndex()
+    points = {}
+    for key in range(5000):
+        point = (rng.uniform(-90, 90), rng.uniform(-180, 180))
+        points[key] = point
+        assert index.add(key, *point)
+    # Dense clusters on the antimeridian and near a pole.
+    for key, (lat, lon) in enumerate(
+        [(0.0, 179.99), (0.0, -179.99), (89.99, 0.0), (89.99, 120.0)], start=5000
+    ):
+        points[key] = (lat, lon)
+        index.add(key, lat, lon)
+
+    queries = [(0.0, 180.0, 5), (89.98, -60.0, 5), (-89.9, 10.0, 50)] + [
+        (rng.uniform(-90, 90), rng.uniform(-180, 180), rng.choice([1, 5, 100, 2000]))
+        for _ in range(200)
+    ]
+    for lat, lon, radius in queries:
+        found = {key for key, _ in index.query_radius(lat, lon, radius)}
+        assert found == _linear_scan(points, lat, lon, radius)
+
+
+def test_add_discard_and_invalid_positions():
+    index = GeohashIndex()
+
+    assert index.add("a", 40.0, -74.0)
+    assert not index.add("b", "north", -74.0)
+    assert not index.add("c", 91.0, 0.0)
+    assert len(index) == 1 and "b" not in index
+
+    index.add("a", 10.0, 10.0)
+    assert index.query_radius(40.0, -74.0, 5) == []
+    assert [key for key, _ in index.query_radius(10.0, 10.0, 1)] == ["a"]
+
+    index.discard("a")
+    index.discard("missing")
+    assert len(index) == 0
+    assert index.query_radius(10.0, 10.0, 1) == []
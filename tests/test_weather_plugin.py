@@ -14,10 +14,17 @@ Tests the weather forecast functionality including:
 
 import asyncio
 import copy
+import json
 import os
 import sys
+import threading
+import time
 import unittest
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
 from unittest.mock import AsyncMock, MagicMock, patch
+from urllib.parse import urlencode, urlsplit
+from urllib.request import urlopen
 
 import pytest
 
@@ -27,7 +34,11 @@ sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
 from meshtastic import BROADCAST_NUM
 
 from mmrelay.constants.messages import PORTNUM_TEXT_MESSAGE_APP
-from mmrelay.constants.plugins import WEATHER_UNITS_IMPERIAL, WEATHER_UNITS_METRIC
+from mmrelay.constants.plugins import (
+    WEATHER_GEOCODE_CACHE_MAX_AGE_SECONDS,
+    WEATHER_UNITS_IMPERIAL,
+    WEATHER_UNITS_METRIC,
+)
 from mmrelay.plugins.weather_plugin import Plugin
 from tests.constants import (
     TEST_LAT_NYC,
@@ -75,6 +86,42 @@ def _make_ok_response(payload):
     return r
 
 
+@pytest.fixture(autouse=True)
+def isolated_plugin_data(monkeypatch):
+    """
+    Back plugin data with a per-test dict so cached geocoding results cannot leak between tests.
+
+    Returns:
+        dict: The backing store, keyed by (plugin_name, node_id).
+    """
+    store = {}
+    monkeypatch.setattr(
+        "mmrelay.plugins.base_plugin.get_plugin_data_for_node",
+        lambda plugin_name, node_id: store.get((plugin_name, str(node_id)), []),
+    )
+    monkeypatch.setattr(
+        "mmrelay.plugins.base_plugin.store_plugin_data",
+        lambda plugin_name, node_id, data: store.__setitem__(
+            (plugin_name, str(node_id)), data
+        ),
+    )
+
+    def _prune(plugin_name, key_prefix, keep):
+        # Dicts keep insertion order, like plugin_data rowids.
+        keys = [
+            key
+            for key in store
+            if key[0] == plugin_name and key[1].startswith(key_prefix)
+        ]
+        stale = keys[: max(0, len(keys) - keep)]
+        for key in stale:
+            del store[key]
+        return len(stale)
+
+    monkeypatch.setattr("mmrelay.plugins.base_plugin.prune_plugin_data", _prune)
+    return store
+
+
 @pytest.mark.usefixtures("mock_to_thread")
 class TestWeatherPlugin(unittest.IsolatedAsyncioTestCase):
     """Test cases for the weather plugin."""
@@ -414,7 +461,7 @@ class TestWeatherPlugin(unittest.IsolatedAsyncioTestCase):
         )
         self.plugin.send_matrix_message.assert_called_once()
 
-    @patch("mmrelay.plugins.weather_plugin.requests.get")
+    @patch("mmrelay.http_client.http_get")
     def test_generate_forecast_metric_units(self, mock_get):
         """
         Test that the weather forecast is generated correctly using metric units.
@@ -482,7 +529,7 @@ class TestWeatherPlugin(unittest.IsolatedAsyncioTestCase):
         self.assertIn("Precip 10%", forecast)
         self.assertNotIn("+1h", forecast)
 
-    @patch("mmrelay.plugins.weather_plugin.requests.get")
+    @patch("mmrelay.http_client.http_get")
     def test_generate_forecast_imperial_units(self, mock_get):
         """
         Test that the weather forecast is generated with temperatures converted to Fahrenheit when imperial units are configured.
@@ -500,7 +547,7 @@ class TestWeatherPlugin(unittest.IsolatedAsyncioTestCase):
         self.assertIn("72.5°F", forecast)
         self.assertIn("Wind", forecast)
 
-    @patch("mmrelay.plugins.weather_plugin.requests.get")
+    @patch("mmrelay.http_client.http_get")
     def test_generate_forecast_time_based_indexing_early_morning(self, mock_get):
         """Test time-based indexing when current time is early morning (2:00 AM)."""
         # Create weather data for early morning scenario
@@ -534,7 +581,7 @@ class TestWeatherPlugin(unittest.IsolatedAsyncioTestCase):
         self.assertIn("+6h", forecast)
         self.assertIn("+12h", forecast)
 
-    @patch("mmrelay.plugins.weather_plugin.requests.get")
+    @patch("mmrelay.http_client.http_get")
     def test_generate_forecast_time_based_indexing_late_evening(self, mock_get):
         """Test time-based indexing when current time is late evening (22:00)."""
         # Create weather data for late evening scenario
@@ -567,7 +614,7 @@ class TestWeatherPlugin(unittest.IsolatedAsyncioTestCase):
         self.assertIn("+6h", forecast)
         self.assertIn("+12h", forecast)
 
-    @patch("mmrelay.plugins.weather_plugin.requests.get")
+    @patch("mmrelay.http_client.http_get")
     def test_generate_forecast_bounds_checking(self, mock_get):
         """Test that forecast indices are properly bounded to prevent array overflow."""
         # Create weather data with limited hours (only 24 hours)
@@ -598,7 +645,7 @@ class TestWeatherPlugin(unittest.IsolatedAsyncioTestCase):
         self.assertIn("+3h", forecast)
         self.assertIn("+6h", forecast)
 
-    @patch("mmrelay.plugins.weather_plugin.requests.get")
+    @patch("mmrelay.http_client.http_get")
     def test_generate_forecast_datetime_parsing_with_timezone(self, mock_get):
         """Test datetime parsing with different timezone formats."""
         timezone_data = {
@@ -626,7 +673,7 @@ class TestWeatherPlugin(unittest.IsolatedAsyncioTestCase):
         self.assertIn("25.0°C", forecast)
         self.assertIn("☀️ Clear sky", forecast)
 
-    @patch("mmrelay.plugins.weather_plugin.requests.get")
+    @patch("mmrelay.http_client.http_get")
     def test_generate_forecast_timezone_offset_parsing(self, mock_get):
         """Test datetime parsing with timezone offset format."""
         offset_data = {
@@ -654,7 +701,7 @@ class TestWeatherPlugin(unittest.IsolatedAsyncioTestCase):
         self.assertIn("22.0°C", forecast)
         self.assertIn("⛅️ Partly cloudy", forecast)
 
-    @patch("mmrelay.plugins.weather_plugin.requests.get")
+    @patch("mmrelay.http_client.http_get")
     def test_generate_forecast_invalid_time_defaults_to_zero(self, mock_get):
         """Test that malformed timestamps default to hour=0 without raising exceptions."""
         invalid_time_data = {
@@ -680,7 +727,7 @@ class TestWeatherPlugin(unittest.IsolatedAsyncioTestCase):
         self.assertIn("Now:", forecast)
         self.assertIn("20.0°C", forecast)  # Current temp
 
-    @patch("mmrelay.plugins.weather_plugin.requests.get")
+    @patch("mmrelay.http_client.http_get")
     def test_generate_forecast_http_error(self, mock_get):
         """Test that HTTP errors are handled gracefully."""
         import requests
@@ -693,7 +740,7 @@ class TestWeatherPlugin(unittest.IsolatedAsyncioTestCase):
         # The test should pass with either error message since both indicate proper error handling
         self.assertIn("Error", forecast)
 
-    @patch("mmrelay.plugins.weather_plugin.requests.get")
+    @patch("mmrelay.http_client.http_get")
     def test_generate_forecast_malformed_data_returns_parse_error(self, mock_get):
         """Malformed payloads should be caught by the parse-error handler."""
         malformed_payload = {
@@ -723,7 +770,7 @@ class TestWeatherPlugin(unittest.IsolatedAsyncioTestCase):
         )
         self.assertIn("50.0°F/32.0°F", output)
 
-    @patch("mmrelay.plugins.weather_plugin.requests.get")
+    @patch("mmrelay.http_client.http_get")
     def test_generate_forecast_empty_hourly_data(self, mock_get):
         """Test that empty hourly data is handled gracefully."""
         empty_hourly_data = {
@@ -750,7 +797,7 @@ class TestWeatherPlugin(unittest.IsolatedAsyncioTestCase):
         forecast = self.plugin.generate_forecast(TEST_LAT_NYC, TEST_LON_NYC)
         self.assertEqual(forecast, "Weather data temporarily unavailable.")
 
-    @patch("mmrelay.plugins.weather_plugin.requests.get")
+    @patch("mmrelay.http_client.http_get")
     def test_generate_forecast_timestamp_anchoring(self, mock_get):
         """Test that forecast indexing uses timestamp anchoring when available."""
         # Create data where timestamp anchoring would give different results than hour-of-day
@@ -784,7 +831,7 @@ class TestWeatherPlugin(unittest.IsolatedAsyncioTestCase):
         self.assertIn("+3h", forecast)
         self.assertIn("+6h", forecast)
 
-    @patch("mmrelay.plugins.weather_plugin.requests.get")
+    @patch("mmrelay.http_client.http_get")
     def test_generate_forecast_night_weather_codes(self, mock_get):
         """
         Test that the forecast generation uses night-specific weather descriptions and emojis when night weather codes are present in the API response.
@@ -802,7 +849,7 @@ class TestWeatherPlugin(unittest.IsolatedAsyncioTestCase):
         # Should use night weather descriptions
         self.assertIn(_normalize_emoji("🌙🌤️ Mainly clear"), _normalize_emoji(forecast))
 
-    @patch("mmrelay.plugins.weather_plugin.requests.get")
+    @patch("mmrelay.http_client.http_get")
     def test_generate_forecast_unknown_weather_code(self, mock_get):
         """
         Test that the forecast generation handles unknown weather codes gracefully.
@@ -853,7 +900,7 @@ class TestWeatherPlugin(unittest.IsolatedAsyncioTestCase):
         )  # longitude out of bounds
         self.assertIsNone(self.plugin._parse_location_override("abc,def"))
 
-    @patch("mmrelay.plugins.weather_plugin.requests.get")
+    @patch("mmrelay.http_client.http_get")
     def test_geocode_location_request_error_returns_none(self, mock_get):
         """Request failures during geocoding should return None."""
         import requests
@@ -913,7 +960,7 @@ class TestWeatherPlugin(unittest.IsolatedAsyncioTestCase):
         )
 
     @patch("mmrelay.meshtastic_utils.connect_meshtastic")
-    @patch("mmrelay.plugins.weather_plugin.requests.get")
+    @patch("mmrelay.http_client.http_get")
     async def test_handle_meshtastic_message_direct_message_with_location(
         self, mock_get, mock_connect
     ):
@@ -1109,7 +1156,7 @@ class TestWeatherPlugin(unittest.IsolatedAsyncioTestCase):
         self.assertAlmostEqual(call_args.kwargs["longitude"], 20.0)
 
     @patch("mmrelay.meshtastic_utils.connect_meshtastic")
-    @patch("mmrelay.plugins.weather_plugin.requests.get")
+    @patch("mmrelay.http_client.http_get")
     async def test_handle_meshtastic_message_broadcast_with_location(
         self, mock_get, mock_connect
     ):
@@ -1253,7 +1300,7 @@ class TestWeatherPlugin(unittest.IsolatedAsyncioTestCase):
             },
         }
 
-        with patch("requests.get") as mock_get:
+        with patch("mmrelay.http_client.http_get") as mock_get:
             mock_get.return_value = _make_ok_response(mock_response_data)
 
             # Mock logger to capture warning
@@ -1275,7 +1322,7 @@ class TestWeatherPlugin(unittest.IsolatedAsyncioTestCase):
 
     def test_generate_forecast_unexpected_exception_reraise(self):
         """Test that unexpected exceptions are re-raised."""
-        with patch("requests.get") as mock_get:
+        with patch("mmrelay.http_client.http_get") as mock_get:
             # Simulate an unexpected exception (not requests-related or data parsing)
             mock_get.side_effect = RuntimeError("Unexpected error")
 
@@ -1322,7 +1369,7 @@ class TestWeatherPlugin(unittest.IsolatedAsyncioTestCase):
                 0, is_direct_message=False
             )
 
-    @patch("mmrelay.plugins.weather_plugin.requests.get")
+    @patch("mmrelay.http_client.http_get")
     def test_generate_forecast_requests_exception(self, mock_get):
         """Test generate_forecast handles requests.RequestException."""
         import requests
@@ -1386,7 +1433,7 @@ class TestWeatherPlugin(unittest.IsolatedAsyncioTestCase):
             },
         }
 
-        with patch("requests.get") as mock_get:
+        with patch("mmrelay.http_client.http_get") as mock_get:
             mock_get.return_value = _make_ok_response(daily_data)
             result = self.plugin.generate_forecast(
                 TEST_LAT_NYC, TEST_LON_NYC, mode="daily"
@@ -1394,7 +1441,7 @@ class TestWeatherPlugin(unittest.IsolatedAsyncioTestCase):
             self.assertIn("25.0°C/15.0°C", result)
             self.assertIn("|", result)
 
-    @patch("mmrelay.plugins.weather_plugin.requests.get")
+    @patch("mmrelay.http_client.http_get")
     def test_generate_forecast_invalid_units_fallback(self, mock_get):
         """Invalid units in config should fall back to metric."""
         mock_get.return_value = _make_ok_response(self.sample_weather_data)
@@ -1402,7 +1449,7 @@ class TestWeatherPlugin(unittest.IsolatedAsyncioTestCase):
         result = self.plugin.generate_forecast(TEST_LAT_NYC, TEST_LON_NYC)
         self.assertIn("°C", result)
 
-    @patch("mmrelay.plugins.weather_plugin.requests.get")
+    @patch("mmrelay.http_client.http_get")
     def test_generate_forecast_daily_no_data(self, mock_get):
         """Daily forecast with no data returns unavailable message."""
         daily_data = {
@@ -1428,7 +1475,7 @@ class TestWeatherPlugin(unittest.IsolatedAsyncioTestCase):
         result = self.plugin.generate_forecast(TEST_LAT_NYC, TEST_LON_NYC, mode="daily")
         self.assertEqual(result, "Weather data temporarily unavailable.")
 
-    @patch("mmrelay.plugins.weather_plugin.requests.get")
+    @patch("mmrelay.http_client.http_get")
     def test_generate_forecast_daily_with_none_data(self, mock_get):
         """Daily forecast with None values shows Data unavailable."""
         daily_data = {
@@ -1454,7 +1501,7 @@ class TestWeatherPlugin(unittest.IsolatedAsyncioTestCase):
         result = self.plugin.generate_forecast(TEST_LAT_NYC, TEST_LON_NYC, mode="daily")
         self.assertIn("Data unavailable", result)
 
-    @patch("mmrelay.plugins.weather_plugin.requests.get")
+    @patch("mmrelay.http_client.http_get")
     def test_geocode_location_success(self, mock_get):
         """Successful geocoding should return coordinates."""
         mock_response = MagicMock()
@@ -1468,7 +1515,7 @@ class TestWeatherPlugin(unittest.IsolatedAsyncioTestCase):
         self.assertAlmostEqual(result[0], 41.8781)
         self.assertAlmostEqual(result[1], -87.6298)
 
-    @patch("mmrelay.plugins.weather_plugin.requests.get")
+    @patch("mmrelay.http_client.http_get")
     def test_geocode_location_empty_results(self, mock_get):
         """Geocoding with empty results should return None."""
         mock_response = MagicMock()
@@ -1479,7 +1526,7 @@ class TestWeatherPlugin(unittest.IsolatedAsyncioTestCase):
         result = self.plugin._geocode_location("NowhereXYZ")
         self.assertIsNone(result)
 
-    @patch("mmrelay.plugins.weather_plugin.requests.get")
+    @patch("mmrelay.http_client.http_get")
     def test_geocode_location_malformed_response(self, mock_get):
         """Geocoding with malformed response should return None."""
         mock_response = MagicMock()
@@ -1531,7 +1578,7 @@ class TestWeatherPlugin(unittest.IsolatedAsyncioTestCase):
         result = asyncio.run(self.plugin._resolve_location_from_args(None))
         self.assertIsNone(result)
 
-    @patch("mmrelay.plugins.weather_plugin.requests.get")
+    @patch("mmrelay.http_client.http_get")
     def test_resolve_location_from_args_geocode(self, mock_get):
         """Should geocode free-form text."""
         mock_response = MagicMock()
@@ -1777,7 +1824,7 @@ class TestWeatherPlugin(unittest.IsolatedAsyncioTestCase):
         self.assertIsNone(call_kwargs.get("reply_to_event_id"))
 
     @patch("mmrelay.meshtastic_utils.connect_meshtastic")
-    @patch("mmrelay.plugins.weather_plugin.requests.get")
+    @patch("mmrelay.http_client.http_get")
     async def test_handle_meshtastic_message_reply_id_passed(
         self, mock_get, mock_connect
     ):
@@ -1813,7 +1860,7 @@ class TestWeatherPlugin(unittest.IsolatedAsyncioTestCase):
         self.assertEqual(call_kwargs.get("channel"), 0)
 
     @patch("mmrelay.meshtastic_utils.connect_meshtastic")
-    @patch("mmrelay.plugins.weather_plugin.requests.get")
+    @patch("mmrelay.http_client.http_get")
     async def test_handle_meshtastic_dm_reply_id_and_channel(
         self, mock_get, mock_connect
     ):
@@ -1872,7 +1919,7 @@ class TestWeatherPlugin(unittest.IsolatedAsyncioTestCase):
                 "wave_period": 8.0,
             }
         }
-        with patch("mmrelay.plugins.weather_plugin.requests.get") as mock_get:
+        with patch("mmrelay.http_client.http_get") as mock_get:
             mock_get.return_value = _make_ok_response(marine_payload)
             result = self.plugin.generate_marine_forecast(40.0, -10.0)
         self.assertIsNotNone(result)
@@ -1890,7 +1937,7 @@ class TestWeatherPlugin(unittest.IsolatedAsyncioTestCase):
                 "wave_period": None,
             }
         }
-        with patch("mmrelay.plugins.weather_plugin.requests.get") as mock_get:
+        with patch("mmrelay.http_client.http_get") as mock_get:
             mock_get.return_value = _make_ok_response(marine_payload)
             result = self.plugin.generate_marine_forecast(40.7128, -74.006)
         self.assertIsNone(result)
@@ -1899,7 +1946,7 @@ class TestWeatherPlugin(unittest.IsolatedAsyncioTestCase):
         """A network error fetching marine data should return None, not raise."""
         import requests as req
 
-        with patch("mmrelay.plugins.weather_plugin.requests.get") as mock_get:
+        with patch("mmrelay.http_client.http_get") as mock_get:
             mock_get.side_effect = req.exceptions.ConnectionError("timeout")
             result = self.plugin.generate_marine_forecast(40.0, -10.0)
         self.assertIsNone(result)
@@ -1920,7 +1967,7 @@ class TestWeatherPlugin(unittest.IsolatedAsyncioTestCase):
         }
 
         with (
-            patch("mmrelay.plugins.weather_plugin.requests.get") as mock_get,
+            patch("mmrelay.http_client.http_get") as mock_get,
             patch("mmrelay.plugins.weather_plugin.datetime") as mock_datetime,
             patch.object(
                 self.plugin, "_format_hourly_marine", return_value="🌊 fallback"
@@ -1959,7 +2006,7 @@ class TestWeatherPlugin(unittest.IsolatedAsyncioTestCase):
                 "wave_period": None,
             }
         }
-        with patch("mmrelay.plugins.weather_plugin.requests.get") as mock_get:
+        with patch("mmrelay.http_client.http_get") as mock_get:
             mock_get.return_value = _make_ok_response(marine_payload)
             result = self.plugin.generate_marine_forecast(40.0, -10.0)
         self.assertIsNotNone(result)
@@ -1980,7 +2027,7 @@ class TestWeatherPlugin(unittest.IsolatedAsyncioTestCase):
                 "time": ["2023-08-20", "2023-08-21"],
             }
         }
-        with patch("mmrelay.plugins.weather_plugin.requests.get") as mock_get:
+        with patch("mmrelay.http_client.http_get") as mock_get:
             mock_get.return_value = _make_ok_response(marine_payload)
             result = self.plugin.generate_marine_forecast(40.0, -10.0, mode="daily")
             called_url = mock_get.call_args.args[0]
@@ -1999,7 +2046,7 @@ class TestWeatherPlugin(unittest.IsolatedAsyncioTestCase):
         marine_payload = {
             "current": {"wave_height": 1.0, "wave_direction": 90.0, "wave_period": 6.0}
         }
-        with patch("mmrelay.plugins.weather_plugin.requests.get") as mock_get:
+        with patch("mmrelay.http_client.http_get") as mock_get:
             mock_get.return_value = _make_ok_response(marine_payload)
             self.plugin.generate_marine_forecast(40.0, -10.0, mode="weather")
             called_url = mock_get.call_args.args[0]
@@ -2023,7 +2070,7 @@ class TestWeatherPlugin(unittest.IsolatedAsyncioTestCase):
                 "wave_period": [7.0] * 24,
             },
         }
-        with patch("mmrelay.plugins.weather_plugin.requests.get") as mock_get:
+        with patch("mmrelay.http_client.http_get") as mock_get:
             mock_get.return_value = _make_ok_response(marine_payload)
             result = self.plugin.generate_marine_forecast(40.0, -10.0, mode="hourly")
             called_url = mock_get.call_args.args[0]
@@ -2093,7 +2140,7 @@ class TestWeatherPlugin(unittest.IsolatedAsyncioTestCase):
         self.assertIn("1.5m", result)
 
     @patch("mmrelay.meshtastic_utils.connect_meshtastic")
-    @patch("mmrelay.plugins.weather_plugin.requests.get")
+    @patch("mmrelay.http_client.http_get")
     async def test_handle_meshtastic_message_combines_marine_when_fits(
         self, mock_get, mock_connect
     ):
@@ -2130,7 +2177,7 @@ class TestWeatherPlugin(unittest.IsolatedAsyncioTestCase):
         self.assertIn("Now:", sent_text)
 
     @patch("mmrelay.meshtastic_utils.connect_meshtastic")
-    @patch("mmrelay.plugins.weather_plugin.requests.get")
+    @patch("mmrelay.http_client.http_get")
     async def test_handle_meshtastic_message_sends_marine_separately_when_too_long(
         self, mock_get, mock_connect
     ):
@@ -2196,5 +2243,166 @@ class TestWeatherPlugin(unittest.IsolatedAsyncioTestCase):
         self.assertIn("|", sent_text)
 
 
+class _StubOpenMeteo(ThreadingHTTPServer):
+    """Local Open-Meteo stand-in that counts upstream requests per endpoint."""
+
+    daemon_threads = True
+
+    def __init__(self, latency: float = 0.05) -> None:
+        super().__init__(("127.0.0.1", 0), _StubOpenMeteoHandler)
+        self.latency = latency
+        self.hits: dict[str, int] = {}
+        self.hits_lock = threading.Lock()
+
+    @property
+    def url(self) -> str:
+        return f"http://127.0.0.1:{self.server_address[1]}"
+
+
+class _StubOpenMeteoHandler(BaseHTTPRequestHandler):
+    FORECAST = {
+        "current_weather": {
+            "temperature": 21.0,
+            "weathercode": 1,
+            "is_day": 1,
+            "time": "2023-08-20T10:00",
+        },
+        "hourly": {
+            "time": [f"2023-08-20T{h:02d}:00" for h in range(24)],
+            "temperature_2m": [20.0] * 24,
+            "precipitation_probability": [10] * 24,
+            "weathercode": [1] * 24,
+            "is_day": [1] * 24,
+            "relativehumidity_2m": [50] * 24,
+            "windspeed_10m": [5.0] * 24,
+            "winddirection_10m": [180] * 24,
+        },
+    }
+    GEOCODE = {"results": [{"latitude": 42.36, "longitude": -71.06}]}
+
+    def do_GET(self):  # noqa: N802 - http.server API
+        path = urlsplit(self.path).path
+        with self.server.hits_lock:
+            self.server.hits[path] = self.server.hits.get(path, 0) + 1
+        time.sleep(self.server.latency)
+        body = json.dumps(
+            self.GEOCODE if path == "/geocode" else self.FORECAST
+        ).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *_args):
+        pass
+
+
+def _urllib_get(url, params=None, timeout=None):
+    """Real HTTP GET for the stub, since the test suite replaces `requests` with a mock."""
+    if params:
+        url = f"{url}?{urlencode(params)}"
+    with urlopen(url, timeout=timeout) as response:
+        payload = json.loads(response.read())
+    result = MagicMock()
+    result.json.return_value = payload
+    result.raise_for_status.return_value = None
+    return result
+
+
+@pytest.fixture
+def open_meteo_stub(monkeypatch):
+    server = _StubOpenMeteo()
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    monkeypatch.setattr("mmrelay.http_client.http_get", _urllib_get)
+    monkeypatch.setattr(
+        "mmrelay.plugins.weather_plugin.OPEN_METEO_FORECAST_API_URL",
+        f"{server.url}/forecast",
+    )
+    monkeypatch.setattr(
+        "mmrelay.plugins.weather_plugin.OPEN_METEO_GEOCODING_API_URL",
+        f"{server.url}/geocode",
+    )
+    yield server
+    server.shutdown()
+    server.server_close()
+    thread.join()
+
+
+class TestWeatherHttpCaching:
+    BURST = 10
+
+    def _plugin(self):
+        plugin = Plugin()
+        plugin.logger = MagicMock()
+        plugin.config = {"units": WEATHER_UNITS_METRIC}
+        return plugin
+
+    def test_burst_of_identical_requests_makes_one_upstream_call(self, open_meteo_stub):
+        plugin = self._plugin()
+        # Nearby positions round to the same cache key.
+        coords = [(42.3601 + i * 0.0001, -71.0589) for i in range(self.BURST)]
+
+        with ThreadPoolExecutor(max_workers=self.BURST) as pool:
+            forecasts = list(
+                pool.map(lambda c: plugin.generate_forecast(c[0], c[1]), coords)
+            )
+        forecasts.append(plugin.generate_forecast(42.36, -71.06))
+
+        print(
+            f"\n{self.BURST + 1} !weather requests -> "
+            f"{open_meteo_stub.hits['/forecast']} upstream forecast call(s) "
+            f"({plugin._http.coalesced_requests} coalesced, "
+            f"{plugin._http.cache_hits} cache hits)"
+        )
+        assert open_meteo_stub.hits["/forecast"] == 1
+        assert len(set(forecasts)) == 1
+        assert "21.0°C" in forecasts[0]
+
+        # Far-away coordinates are a separate cache entry.
+        plugin.generate_forecast(10.0, 10.0)
+        assert open_meteo_stub.hits["/forecast"] == 2
+
+    def test_geocode_results_persist_across_plugin_instances(
+        self, open_meteo_stub, isolated_plugin_data
+    ):
+        plugin = self._plugin()
+        with ThreadPoolExecutor(max_workers=self.BURST) as pool:
+            results = list(pool.map(plugin._geocode_location, ["Boston"] * self.BURST))
+
+        assert set(results) == {(42.36, -71.06)}
+        assert open_meteo_stub.hits["/geocode"] == 1
+
+        # A fresh instance (e.g. after restart) reads the plugin database.
+        assert self._plugin()._geocode_location("  boston ") == (42.36, -71.06)
+        assert open_meteo_stub.hits["/geocode"] == 1
+        assert ("weather", "geocode:boston") in isolated_plugin_data
+
+    def test_geocode_cache_is_bounded_and_expires(
+        self, open_meteo_stub, isolated_plugin_data, monkeypatch
+    ):
+        monkeypatch.setattr(
+            "mmrelay.plugins.weather_plugin.WEATHER_GEOCODE_CACHE_MAX_ENTRIES", 2
+        )
+        plugin = self._plugin()
+        for name in ("Boston", "Chicago", "Denver"):
+            assert plugin._geocode_location(name) == (42.36, -71.06)
+
+        assert sorted(key for _plugin, key in isolated_plugin_data) == [
+            "geocode:chicago",
+            "geocode:denver",
+        ]
+        assert open_meteo_stub.hits["/geocode"] == 3
+
+        # An entry past the age limit is looked up again.
+        isolated_plugin_data[("weather", "geocode:denver")][0]["cached_at"] -= (
+            WEATHER_GEOCODE_CACHE_MAX_AGE_SECONDS + 1
+        )
+        plugin._http.clear()
+        assert plugin._geocode_location("Denver") == (42.36, -71.06)
+        assert open_meteo_stub.hits["/geocode"] == 4
+
+
 if __name__ == "__main__":
     unittest.main()